@@ -90,13 +90,29 @@ class Settings:
     DEFAULT_CONFIG = {
         "hotkey": {"modifiers": ["ctrl", "shift"], "key": "space"},
         "overlay": {"position": "top-right", "size": 100, "opacity": 0.9},
-        "transcription": {"api_key": "", "language": "es", "model": "v3-turbo"},
+        "transcription": {
+            "api_key": "",
+            "language": "es",
+            "model": "v3-turbo",
+            "upload_codec": "flac",
+            "segment_seconds": 300,
+            "max_parallel_segments": 3,
+            "trim_silence": True,
+            "upload_mode": "file",
+            "preconnect": True,
+            "hedge_requests": False,
+            "hedge_max_extra": 0.1,
+        },
         "audio": {
             "sample_rate": 16000,
             "max_duration": 7200,
             "channels": 1,
             "input_device": None,
             "include_system_audio": False,
+            "stream_to_disk": False,
+            "warm_mic": False,
+            "preroll_ms": 300,
+            "journal": True,
         },
         "behavior": {
             "auto_paste": False,
@@ -105,10 +121,19 @@ class Settings:
             "persistent_overlay": False,
             "recording_mode": "hold",
             "restore_clipboard": True,
+            "auto_stop": False,
+            "auto_stop_silence_ms": 2000,
+            "auto_stop_min_speech_ms": 500,
         },
         "transformation": {"model": "qwen/qwen3-32b"},
         "edit_hotkey": {"modifiers": ["ctrl", "alt"], "key": "space"},
         "edition": {"model": "qwen/qwen3-32b"},
+        "network": {
+            "http2": True,
+            "max_connections": 10,
+            "max_keepalive_connections": 5,
+            "keepalive_s": 120,
+        },
         "ui_language": "es",
     }
 
@@ -190,6 +215,45 @@ class Settings:
     transcription_api_key: str = _config_property("transcription", "api_key", "")
     transcription_language: str = _config_property("transcription", "language", "es")
     transcription_model: str = _config_property("transcription", "model", "v3-turbo")
+    # Codec the recording is re-encoded to before upload: "wav", "flac"
+    # (lossless, about half the bytes) or "opus" (lossy, ~10x smaller).
+    transcription_upload_codec: str = _config_property(
+        "transcription", "upload_codec", "flac"
+    )
+    # Longer recordings are split at pauses into segments of at most this many
+    # seconds and transcribed concurrently (0 = only split to fit the 25 MB cap).
+    transcription_segment_seconds: float = _config_property(
+        "transcription", "segment_seconds", 300
+    )
+    transcription_max_parallel_segments: int = _config_property(
+        "transcription", "max_parallel_segments", 3
+    )
+    # Cut leading/trailing silence and shorten pauses over a second before
+    # uploading; a recording with no speech is rejected without a request.
+    transcription_trim_silence: bool = _config_property(
+        "transcription", "trim_silence", True
+    )
+    # When audio goes to the API: "file" uploads the recording after the
+    # hotkey is released; "live" transcribes each phrase as soon as a pause
+    # ends it, so only the last one is still in flight on release; "stream"
+    # sends the whole recording as one upload that starts with the mic.
+    transcription_upload_mode: str = _config_property(
+        "transcription", "upload_mode", "file"
+    )
+    # Connect to the API when a recording starts, so the upload does not
+    # wait for DNS, TCP and TLS after the hotkey is released.
+    transcription_preconnect: bool = _config_property(
+        "transcription", "preconnect", True
+    )
+    # Send a second copy of an upload the API is slower than usual to answer
+    # and use whichever answer comes first; at most `hedge_max_extra` of the
+    # uploads get a copy.
+    transcription_hedge_requests: bool = _config_property(
+        "transcription", "hedge_requests", False
+    )
+    transcription_hedge_max_extra: float = _config_property(
+        "transcription", "hedge_max_extra", 0.1
+    )
 
     # ── Audio settings ───────────────────────────────────────
 
@@ -200,6 +264,17 @@ class Settings:
     audio_include_system_audio: bool = _config_property(
         "audio", "include_system_audio", False
     )
+    # Write the recording to disk while capturing, so stopping does not have to
+    # encode the whole take first.
+    audio_stream_to_disk: bool = _config_property("audio", "stream_to_disk", False)
+    # Keep the mic open while idle so a recording starts the moment the hotkey
+    # is pressed, seeded with the last `preroll_ms` of audio. The OS will show
+    # the mic as in use the whole time the app runs.
+    audio_warm_mic: bool = _config_property("audio", "warm_mic", False)
+    audio_preroll_ms: int = _config_property("audio", "preroll_ms", 300)
+    # Also write each recording to a journal next to config.yaml while
+    # capturing, so a crash or a failed transcription does not lose it.
+    audio_journal: bool = _config_property("audio", "journal", True)
 
     # ── Behavior settings ────────────────────────────────────
 
@@ -213,6 +288,16 @@ class Settings:
     # After an auto-paste, put back whatever the user had on the clipboard
     # before we hijacked it. Only applies when auto-paste actually ran.
     restore_clipboard: bool = _config_property("behavior", "restore_clipboard", True)
+    # Toggle mode only: stop by itself once the user has said something and then
+    # been silent for `auto_stop_silence_ms`, instead of waiting for the second
+    # press.
+    auto_stop: bool = _config_property("behavior", "auto_stop", False)
+    auto_stop_silence_ms: int = _config_property(
+        "behavior", "auto_stop_silence_ms", 2000
+    )
+    auto_stop_min_speech_ms: int = _config_property(
+        "behavior", "auto_stop_min_speech_ms", 500
+    )
     edit_auto_paste: bool = _config_property("behavior", "edit_auto_paste", False)
     edit_auto_enter: bool = _config_property("behavior", "edit_auto_enter", False)
 
@@ -233,6 +318,19 @@ class Settings:
 
     edition_model: str = _config_property("edition", "model", "qwen/qwen3-32b")
 
+    # ── Network settings ─────────────────────────────────────
+
+    # One client serves every API call (see src/services/api_client.py).
+    # HTTP/2 multiplexes concurrent requests over one connection when the
+    # server offers it.
+    network_http2: bool = _config_property("network", "http2", True)
+    network_max_connections: int = _config_property("network", "max_connections", 10)
+    network_max_keepalive_connections: int = _config_property(
+        "network", "max_keepalive_connections", 5
+    )
+    # How long an idle connection is kept for the next request.
+    network_keepalive_s: float = _config_property("network", "keepalive_s", 120)
+
     # ── UI settings ──────────────────────────────────────────
 
     ui_language: str = _flat_config_property("ui_language", "es")
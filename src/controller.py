@@ -4,19 +4,37 @@ Main controller that orchestrates all application components.
 
 from __future__ import annotations
 
+import threading
 import traceback
-from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from enum import Enum
+from pathlib import Path
 
 from PySide6.QtCore import QObject, Signal, Slot, QTimer
 
 from src.config.settings import Settings
 from src.i18n import t
+from src.services.api_client import ApiClient
+from src.services.event_loop import CancelToken
+from src.services.hedging import HedgePolicy
 from src.services.hotkey import HotkeyListener, create_hotkey_listener
 from src.services.keyboard_actions import KeyboardService
+from src.services.live_transcription import LiveTranscription
+from src.services.upload_stream import StreamingUpload
 from src.services.recorder import AudioRecorder
-from src.services.transcriber import Transcriber, TranscriptionError, APIKeyError
+from src.services.recording_journal import FAILED, JournalEntry, RecordingJournal
+from src.services.task_lanes import Lane, LaneScheduler
+from src.services.transcriber import (
+    Transcriber,
+    TranscriptionCancelled,
+    TranscriptionError,
+    APIKeyError,
+)
+from src.services.transcription_queue import (
+    TranscriptionJob,
+    TranscriptionQueue,
+    is_retryable,
+)
 from src.services.clipboard import ClipboardManager
 from src.utils.logger import get_logger
 
@@ -60,13 +78,40 @@ class Controller(QObject):
     # error_occurred so the UI can show it as advice instead of a failure.
     warning_occurred = Signal(str)
     audio_level_changed = Signal(float)
+    # Live mode: the text transcribed so far, in order, while the user is
+    # still speaking (and while the tail is in flight). Only a preview: the
+    # final text still arrives through transcription_completed.
+    partial_transcription = Signal(str)
+    # The text of a recording that was not transcribed when it was made (the
+    # transcription failed and was retried from the queue, or a crash
+    # interrupted it). Not pasted: the user has moved on, so it is only shown.
+    recovered_transcription = Signal(str)
 
     cancel_completed = Signal()
     presets_loaded = Signal(list)  # list of preset dicts
 
     # Internal signals to bounce results back to the main thread
     _transcription_done = Signal(str)
-    _transcription_failed = Signal(str)
+    # (error, whether a retry could fix it, which keeps the journaled audio)
+    _transcription_failed = Signal(str, bool)
+    # (audio file, error): failed for now, to be retried from the queue
+    _transcription_deferred = Signal(str, str)
+    # The transcription was aborted by cancel(); there is nothing to deliver
+    _transcription_cancelled = Signal()
+    # Raised on the recording thread when auto-stop hears the speech end
+    _speech_ended = Signal()
+
+    # Lanes of the worker pool, most urgent first. One transcription at a
+    # time keeps results in dictation order; clipboard restores and the
+    # presets fetch share the background lane.
+    TRANSCRIPTION = "transcription"
+    TRANSFORM = "transform"
+    BACKGROUND = "background"
+    TASK_LANES = [
+        Lane(TRANSCRIPTION, priority=0, limit=1),
+        Lane(TRANSFORM, priority=1, limit=1),
+        Lane(BACKGROUND, priority=2, limit=2),
+    ]
 
     def __init__(self, settings: Settings):
         super().__init__()
@@ -76,9 +121,18 @@ class Controller(QObject):
         self.hotkey_listener: HotkeyListener | None = None
         self.recorder: AudioRecorder | None = None
         self.transcriber: Transcriber | None = None
+        # The HTTP client shared by every API call (network.* settings).
+        self.api: ApiClient | None = None
+        # Latencies and budget of hedged uploads, shared by every transcriber
+        # (transcription.hedge_requests); None when hedging is off.
+        self.hedging: HedgePolicy | None = None
         self.keyboard = KeyboardService()
 
         self._cancelled: bool = False
+        # Aborts the requests of the dictation being transcribed (cancel() in
+        # PROCESSING), and of the transform a newer one replaced.
+        self._processing_cancel: CancelToken | None = None
+        self._transform_cancel: CancelToken | None = None
         # State for the transcription currently being delivered. Each one gets a
         # fresh _Delivery, so nothing leaks between overlapping dictations.
         self._delivery: _Delivery | None = None
@@ -90,28 +144,58 @@ class Controller(QObject):
         # The delivery that timer owes a restore to, so a superseding
         # transcription can inherit the clipboard snapshot it never put back.
         self._pending_restore: _Delivery | None = None
-
-        # Single persistent thread pool – no QThread lifecycle issues
-        self._pool = ThreadPoolExecutor(max_workers=1)
+        # Work started on the recording while it is still being captured
+        # (upload_mode "live" or "stream"); None in the default "file" mode.
+        self._live: LiveTranscription | StreamingUpload | None = None
+        # Crash-safe copies of the recordings (audio.journal), and the entry of
+        # the recording being transcribed, deleted once its text is delivered.
+        self._journal: RecordingJournal | None = None
+        self._journal_entry: JournalEntry | None = None
+        # Recordings whose transcription failed for now, retried in the
+        # background until it works. Needs a transcriber.
+        self._queue: TranscriptionQueue | None = None
+
+        # Persistent worker threads – no QThread lifecycle issues – split into
+        # lanes, so a transform or a slow presets fetch never holds up a
+        # dictation queued behind it.
+        self._pool = LaneScheduler(self.TASK_LANES)
 
         # Connect internal signals (thread-safe delivery to main thread)
         self._transcription_done.connect(self._on_transcribe_finished)
         self._transcription_failed.connect(self._on_transcribe_error)
+        self._transcription_deferred.connect(self._on_transcribe_deferred)
+        self._transcription_cancelled.connect(self._on_transcribe_cancelled)
+        self._speech_ended.connect(self._on_speech_ended)
 
         self._init_services()
         if self.recorder:
             self.recorder.set_audio_level_callback(self._on_audio_level)
+            self._configure_auto_stop()
 
     def _init_services(self):
         try:
+            if self.settings.audio_journal:
+                self._journal = RecordingJournal(
+                    Path(self.settings.config_path).parent / "journal"
+                )
             self.recorder = AudioRecorder(
                 sample_rate=self.settings.audio_sample_rate,
                 channels=self.settings.audio_channels,
                 max_duration=self.settings.audio_max_duration,
                 input_device=self.settings.audio_input_device,
                 include_system_audio=self.settings.audio_include_system_audio,
+                stream_to_disk=self.settings.audio_stream_to_disk,
+                warm_mic=self.settings.audio_warm_mic,
+                preroll_ms=self.settings.audio_preroll_ms,
+                watch_devices=True,
+                journal=self._journal,
             )
 
+            self.api = ApiClient.from_settings(self.settings)
+            if self.settings.transcription_hedge_requests:
+                self.hedging = HedgePolicy(
+                    max_extra=self.settings.transcription_hedge_max_extra
+                )
             api_key = self.settings.transcription_api_key
             if not api_key:
                 logger.warning(
@@ -123,6 +207,20 @@ class Controller(QObject):
                     language=self.settings.transcription_language,
                     model=self.settings.transcription_model,
                     transformation_model=self.settings.transformation_model,
+                    upload_codec=self.settings.transcription_upload_codec,
+                    segment_seconds=self.settings.transcription_segment_seconds,
+                    max_parallel_segments=self.settings.transcription_max_parallel_segments,
+                    trim_silence=self.settings.transcription_trim_silence,
+                    api=self.api,
+                    hedging=self.hedging,
+                )
+                self._queue = TranscriptionQueue(
+                    Path(self.settings.config_path).parent / "queue",
+                    transcribe=self._transcribe_queued,
+                    on_result=lambda job, text: self.recovered_transcription.emit(text),
+                    on_failure=lambda job, error: self.warning_occurred.emit(
+                        t("transcription_queue_failed", path=str(job.audio))
+                    ),
                 )
 
             # Global hotkeys require a supported keyboard backend (X11 on Linux,
@@ -136,7 +234,9 @@ class Controller(QObject):
                     key=self.settings.hotkey_key,
                     # In toggle mode the single press routes to _on_hotkey_toggle,
                     # which decides start vs stop from the controller's state.
-                    on_press=self._on_hotkey_toggle if toggle else self._on_hotkey_press,
+                    on_press=self._on_hotkey_toggle
+                    if toggle
+                    else self._on_hotkey_press,
                     on_release=self._on_hotkey_release,
                     on_toggle=self._on_hotkey_toggle,
                     mode=self._record_listener_mode(),
@@ -161,6 +261,9 @@ class Controller(QObject):
             self.hotkey_listener.start()
         self._set_state(AppState.IDLE)
         self.fetch_presets()
+        if self._queue is not None:
+            self._queue.start()
+        self._recover_journal()
         logger.info("Controller started successfully")
 
     def fetch_presets(self):
@@ -176,7 +279,69 @@ class Controller(QObject):
             except Exception as e:
                 logger.warning(f"Failed to fetch presets: {e}")
 
-        self._pool.submit(_do_fetch)
+        self._pool.submit(self.BACKGROUND, _do_fetch)
+
+    def _recover_journal(self):
+        """Queue the recordings left in the journal for transcription.
+
+        Those are recordings a crash interrupted, and ones the recorder could
+        not save. Rebuilding them runs on its own thread rather than a lane,
+        so recovering an hour-long take never delays a new dictation; the
+        transcription queue does the rest.
+        """
+        if self._journal is None:
+            return
+        if self._queue is None:
+            # Nothing can retry them (no API key); an interrupted recording
+            # is kept for when there is.
+            for entry in self._journal.pending():
+                if entry.state == FAILED:
+                    entry.discard()
+            return
+        entries = self._journal.pending()
+        if not entries:
+            return
+        queue = self._queue
+        options = self._transcription_options()
+
+        def _do_recover():
+            for entry in entries:
+                if entry.frames == 0:
+                    entry.discard()
+                    continue
+                logger.info(
+                    f"Recovering recording {entry.id} ({entry.state}, "
+                    f"{entry.duration:.1f}s)"
+                )
+                try:
+                    queue.enqueue(entry.export_wav(), options)
+                except Exception as e:
+                    logger.error(f"Could not recover recording {entry.id}: {e}")
+                    continue
+                entry.discard()
+
+        threading.Thread(
+            target=_do_recover, name="dicto-journal-recovery", daemon=True
+        ).start()
+
+    def _settle_journal(self, error: str | None = None):
+        """Delete the journaled copy of the recording just handled.
+
+        With an `error` (the transcription failed for a reason time can fix)
+        it is kept instead, and retried at the next start; not without a
+        queue to retry it in.
+        """
+        entry, self._journal_entry = self._journal_entry, None
+        if entry is None:
+            return
+        try:
+            if error is None or entry.frames == 0 or self._queue is None:
+                entry.discard()
+            else:
+                entry.mark_failed(error)
+                logger.info(f"Recording kept in the journal for retry: {entry.path}")
+        except OSError as e:
+            logger.error(f"Error updating recording journal: {e}")
 
     def stop(self):
         logger.info("Stopping controller...")
@@ -184,13 +349,22 @@ class Controller(QObject):
             self.hotkey_listener.stop()
         if self.recorder and self.recorder.is_recording:
             self.recorder.stop_recording()
+        self._cancel_live()
+        if self._queue is not None:
+            self._queue.stop()
         self._pool.shutdown(wait=True, cancel_futures=True)
         if self.recorder:
             self.recorder.close()
         if self.transcriber:
             self.transcriber.close()
+        if self.api:
+            self.api.close()
         logger.info("Controller stopped")
 
+    def get_task_stats(self) -> dict:
+        """Queue-wait times and backlog of each worker lane (error reports)."""
+        return self._pool.stats()
+
     # ── State ────────────────────────────────────────────────
 
     def _set_state(self, new_state: AppState):
@@ -236,16 +410,40 @@ class Controller(QObject):
 
     # ── Recording ────────────────────────────────────────────
 
+    def _configure_auto_stop(self):
+        """Arm the recorder's end-of-speech stop (toggle mode only).
+
+        In hold mode releasing the key is the stop, and a pause while holding
+        it must not end the recording.
+        """
+        assert self.recorder is not None
+        if self.settings.auto_stop and self.settings.recording_mode == "toggle":
+            self.recorder.set_auto_stop(
+                self._speech_ended.emit,
+                trailing_silence_s=self.settings.auto_stop_silence_ms / 1000,
+                min_speech_s=self.settings.auto_stop_min_speech_ms / 1000,
+            )
+        else:
+            self.recorder.set_auto_stop(None)
+
+    def _on_speech_ended(self):
+        """Auto-stop: the user stopped speaking, same as the second press."""
+        if self.current_state == AppState.RECORDING:
+            logger.info("Auto-stop: speech ended")
+            self._stop_recording_and_process()
+
     def _start_recording(self):
         if not self.recorder:
             self._handle_error("Audio recorder not initialized")
             return
         try:
             self._cancelled = False
+            self._begin_live()
             # Start first, announce after: flipping the UI to RECORDING before
             # knowing the recorder accepted leaves a phantom "recording" frame
             # on screen whenever the start fails.
             if not self.recorder.start_recording():
+                self._cancel_live()
                 self._handle_error(
                     self.recorder.get_last_error()
                     or "Could not start recording — the audio device is busy. "
@@ -254,9 +452,28 @@ class Controller(QObject):
                 return
             self._set_state(AppState.RECORDING)
             self.recording_started.emit()
+            self._preconnect()
         except Exception as e:
+            self._cancel_live()
             self._handle_error(f"Error starting recording: {e}")
 
+    def _preconnect(self):
+        """Warm the API connection while the user speaks (transcription.preconnect).
+
+        The upload then reuses it instead of paying for DNS, TCP and TLS after
+        the release. Stream mode needs none: its upload opens with the mic.
+        """
+        if (
+            not self.transcriber
+            or not self.settings.transcription_preconnect
+            or self.settings.transcription_upload_mode == "stream"
+        ):
+            return
+        try:
+            self._pool.submit(self.BACKGROUND, self.transcriber.preconnect)
+        except RuntimeError:
+            logger.debug("Skipping preconnect: worker pool is shut down")
+
     def _stop_recording_and_process(self):
         if not self.recorder:
             self._handle_error("Audio recorder not initialized")
@@ -265,17 +482,113 @@ class Controller(QObject):
             audio_file_path = self.recorder.stop_recording()
             duration = self.recorder.get_recording_duration()
             self.recording_stopped.emit(duration)
+            live, self._live = self._live, None
+            self._journal_entry = self.recorder.get_journal_entry()
 
             if not audio_file_path:
-                rec_error = self.recorder.get_last_error()
-                self._handle_error(rec_error or "No audio recorded")
+                if live is not None:
+                    live.cancel()
+                rec_error = self.recorder.get_last_error() or "No audio recorded"
+                # The journal may hold audio the recorder could not save.
+                self._settle_journal(rec_error)
+                self._handle_error(rec_error)
                 return
 
             self._set_state(AppState.PROCESSING)
-            self._transcribe_audio(audio_file_path)
+            tap_result = self.recorder.get_capture_tap_result()
+            if live is not None and tap_result is not None:
+                self._transcribe_live(live, tap_result, audio_file_path)
+            else:
+                if live is not None:
+                    live.cancel()
+                self._transcribe_audio(audio_file_path)
         except Exception as e:
+            self._cancel_live()
             self._handle_error(f"Error stopping recording: {e}")
 
+    # ── Live transcription ───────────────────────────────────
+
+    def _begin_live(self):
+        """Set up work that runs during the recording about to start.
+
+        "live" transcribes speech segments as pauses close them; "stream"
+        uploads the whole recording as one request that opens with the mic.
+        Either way the recorder feeds it through a capture tap.
+        """
+        self._cancel_live()
+        assert self.recorder is not None
+        mode = self.settings.transcription_upload_mode
+        if mode == "live" and self.transcriber:
+            self._live = LiveTranscription(
+                self.transcriber,
+                on_partial=self.partial_transcription.emit,
+                max_parallel=self.settings.transcription_max_parallel_segments,
+            )
+        elif mode == "stream" and self.transcriber:
+            self._live = StreamingUpload(self.transcriber)
+        else:
+            self.recorder.set_capture_tap(None)
+            return
+        self.recorder.set_capture_tap(self._live.capture_tap)
+
+    def _cancel_live(self):
+        live, self._live = self._live, None
+        if live is not None:
+            live.cancel()
+
+    def _transcribe_live(
+        self,
+        live: LiveTranscription | StreamingUpload,
+        tap_result: int,
+        audio_file_path: str,
+    ):
+        """Collect the text of the work done during capture, or use the file.
+
+        `tap_result` is what the recorder's capture tap returned at stop (the
+        segment count in live mode, the frames streamed in stream mode). The
+        recording is always saved in full, so a segment or stream that failed,
+        or a take the segmenter judged silent, costs a normal transcription of
+        the file rather than the dictation.
+        """
+        if not self.transcriber:
+            live.cancel()
+            self._transcribe_audio(audio_file_path)
+            return
+
+        cancel = self._processing_cancel = CancelToken()
+        cancel.add_callback(live.cancel)
+
+        def _do_finish():
+            assert self.transcriber is not None
+            try:
+                text = live.finish(tap_result)
+            except APIKeyError as e:
+                self._transcription_failed.emit(str(e), False)
+                return
+            except TranscriptionCancelled:
+                self._transcription_cancelled.emit()
+                return
+            except Exception as e:
+                logger.warning(
+                    f"Transcription during capture failed ({e}); transcribing "
+                    "the whole recording instead"
+                )
+                try:
+                    text = self.transcriber.transcribe(audio_file_path, cancel=cancel)
+                except TranscriptionCancelled:
+                    self._transcription_cancelled.emit()
+                    return
+                except (APIKeyError, TranscriptionError) as e:
+                    self._report_failure(audio_file_path, e)
+                    return
+                except Exception as e:
+                    traceback.print_exc()
+                    self._transcription_failed.emit(f"Unexpected error: {e}", False)
+                    return
+            self._transcription_done.emit(text)
+
+        self._pool.submit(self.TRANSCRIPTION, _do_finish)
+
     # ── Transcription ────────────────────────────────────────
 
     def _transcribe_audio(self, audio_file_path: str):
@@ -286,25 +599,72 @@ class Controller(QObject):
             return
 
         logger.info(f"Transcribing audio: {audio_file_path}")
+        cancel = self._processing_cancel = CancelToken()
 
         def _do_transcribe():
             try:
                 assert self.transcriber is not None
-                text = self.transcriber.transcribe(audio_file_path)
+                text = self.transcriber.transcribe(audio_file_path, cancel=cancel)
                 if text:
                     self._transcription_done.emit(text)
                 else:
-                    self._transcription_failed.emit("Transcription returned empty text")
+                    self._transcription_failed.emit(
+                        "Transcription returned empty text", False
+                    )
+            except TranscriptionCancelled:
+                self._transcription_cancelled.emit()
             except (APIKeyError, TranscriptionError) as e:
-                self._transcription_failed.emit(str(e))
+                self._report_failure(audio_file_path, e)
             except Exception as e:
                 traceback.print_exc()
-                self._transcription_failed.emit(f"Unexpected error: {e}")
+                self._transcription_failed.emit(f"Unexpected error: {e}", False)
+
+        self._pool.submit(self.TRANSCRIPTION, _do_transcribe)
+
+    def _report_failure(self, audio_file_path: str, error: TranscriptionError):
+        """Hand a failed transcription back to the main thread.
 
-        self._pool.submit(_do_transcribe)
+        One that time may fix (network, server, rate limit) is deferred to the
+        queue rather than reported as lost.
+        """
+        if self._queue is not None and is_retryable(error):
+            self._transcription_deferred.emit(audio_file_path, str(error))
+        else:
+            self._transcription_failed.emit(str(error), is_retryable(error))
+
+    def _transcription_options(self) -> dict:
+        """The settings a queued transcription is retried with."""
+        assert self.transcriber is not None
+        return {"language": self.transcriber.language, "model": self.transcriber.model}
+
+    def _transcribe_queued(self, job: TranscriptionJob) -> str:
+        """One attempt at a queued job (called on the queue's worker).
+
+        With the settings it was queued with: a job queued before the user
+        switched language is still transcribed in the old one.
+        """
+        transcriber = self.transcriber
+        assert transcriber is not None
+        if job.options == self._transcription_options():
+            return transcriber.transcribe(str(job.audio))
+        snapshot = Transcriber(
+            api_key=transcriber.api_key,
+            upload_codec=transcriber.upload_codec,
+            segment_seconds=transcriber.segment_seconds,
+            max_parallel_segments=transcriber.max_parallel_segments,
+            trim_silence=transcriber.trim_silence,
+            api=self.api,
+            hedging=self.hedging,
+            **job.options,
+        )
+        try:
+            return snapshot.transcribe(str(job.audio))
+        finally:
+            snapshot.close()
 
     @Slot(str)
     def _on_transcribe_finished(self, text: str):
+        self._settle_journal()
         if self._cancelled:
             self._cancelled = False
             if self.recorder:
@@ -341,8 +701,40 @@ class Controller(QObject):
         else:
             self._handle_error("Failed to copy to clipboard")
 
-    @Slot(str)
-    def _on_transcribe_error(self, error_message: str):
+    @Slot(str, str)
+    def _on_transcribe_deferred(self, audio_file_path: str, error_message: str):
+        """The transcription failed for now: queue the recording for retries."""
+        if self._cancelled or self._queue is None:
+            self._on_transcribe_error(error_message, retryable=True)
+            return
+        try:
+            self._queue.enqueue(
+                audio_file_path, self._transcription_options(), error=error_message
+            )
+        except Exception as e:
+            logger.error(f"Could not queue the recording for retry: {e}")
+            self._on_transcribe_error(error_message, retryable=True)
+            return
+        # The queue has its own copy of the audio now.
+        self._settle_journal()
+        logger.warning(f"Transcription failed ({error_message}); queued for retry")
+        self._set_state(AppState.IDLE)
+        self.warning_occurred.emit(t("transcription_queued"))
+
+    @Slot()
+    def _on_transcribe_cancelled(self):
+        """The cancelled transcription has stopped: drop its recording."""
+        self._cancelled = False
+        self._settle_journal()
+        if self.recorder:
+            self.recorder.cleanup_temp_file()
+
+    @Slot(str, bool)
+    def _on_transcribe_error(self, error_message: str, retryable: bool = False):
+        # Neither a cancelled transcription nor one that failed for good (no
+        # speech, a bad key, audio too long) is worth retrying.
+        keep = retryable and not self._cancelled
+        self._settle_journal(error_message if keep else None)
         if self.recorder:
             self.recorder.cleanup_temp_file()
         self._handle_error(error_message)
@@ -463,11 +855,11 @@ class Controller(QObject):
         On Linux pyperclip shells out to xclip/wl-copy, and a restore is a read
         plus a write — up to two subprocesses. A hung selection owner (a classic
         X11 failure) would otherwise freeze the whole UI, so this goes to the
-        worker pool. Nothing downstream touches Qt widgets, so no marshalling
+        background lane. Nothing downstream touches Qt widgets, so no marshalling
         back to the main thread is needed.
         """
         try:
-            self._pool.submit(fn)
+            self._pool.submit(self.BACKGROUND, fn)
         except RuntimeError:
             # Pool already shut down (app quitting): the restore no longer
             # matters, and running it inline could block the exit path.
@@ -523,10 +915,17 @@ class Controller(QObject):
             if self.recorder and self.recorder.is_recording:
                 self.recorder.stop_recording()
                 self.recorder.cleanup_temp_file()
+                self._journal_entry = self.recorder.get_journal_entry()
+                self._settle_journal()
+            self._cancel_live()
             self._set_state(AppState.IDLE)
             self.cancel_completed.emit()
         elif self.current_state == AppState.PROCESSING:
             self._cancelled = True
+            # Abort the upload too, freeing the transcription lane now rather
+            # than when the server answers a request nobody wants.
+            if self._processing_cancel is not None:
+                self._processing_cancel.cancel()
             self._set_state(AppState.IDLE)
             self.cancel_completed.emit()
 
@@ -610,22 +1009,32 @@ class Controller(QObject):
         self.update_recording_hotkey(
             self.settings.hotkey_modifiers, self.settings.hotkey_key
         )
+        if self.recorder:
+            self._configure_auto_stop()
 
     # ── Transform ─────────────────────────────────────────────
 
     @Slot(str, str, str)
     def request_transform(self, format_id: str, text: str, instructions: str):
-        """Request a text transformation in the background thread pool."""
+        """Request a text transformation on the transform lane."""
         if not self.transcriber:
             self.transform_failed.emit(format_id, "Transcriber not initialized")
             return
 
+        # Only the newest selection is shown: abort the transform still
+        # running (or queued) for the previous one.
+        if self._transform_cancel is not None:
+            self._transform_cancel.cancel()
+        cancel = self._transform_cancel = CancelToken()
+
         def _do_transform():
             try:
                 assert self.transcriber is not None
-                result = self.transcriber.transform(text, instructions)
+                result = self.transcriber.transform(text, instructions, cancel=cancel)
                 self.transform_completed.emit(format_id, result)
+            except TranscriptionCancelled:
+                logger.info(f"Transform to {format_id} superseded")
             except Exception as e:
                 self.transform_failed.emit(format_id, str(e))
 
-        self._pool.submit(_do_transform)
+        self._pool.submit(self.TRANSFORM, _do_transform)
@@ -138,6 +138,9 @@ TRANSLATIONS = {
         "presets_select": "Presets ▾",
         # Auto-paste
         "auto_paste_failed": "Your text is safe on the clipboard — press Ctrl+V to paste it. Auto-paste needs ydotool: install it (sudo apt install ydotool) and start the ydotoold daemon, or install xdotool. See INSTALL_LINUX.md.",
+        "recording_recovered": "Recovered a recording that was not transcribed: its text is in the Dicto window.",
+        "transcription_queued": "Could not transcribe right now. Dicto keeps the recording and retries in the background; the text will appear in the Dicto window.",
+        "transcription_queue_failed": "Dicto gave up transcribing a recording after retrying it for too long. The audio is kept at {path}.",
     },
     "es": {
         "loading": "Cargando Dicto...",
@@ -263,6 +266,9 @@ TRANSLATIONS = {
         "apply": "Aplicar",
         "presets_select": "Presets ▾",
         "auto_paste_failed": "Tu texto está a salvo en el portapapeles: pulsa Ctrl+V para pegarlo. El auto-pegado necesita ydotool: instálalo (sudo apt install ydotool) y arranca el demonio ydotoold, o instala xdotool. Consulta INSTALL_LINUX.md.",
+        "recording_recovered": "Se ha recuperado una grabación que no se llegó a transcribir: su texto está en la ventana de Dicto.",
+        "transcription_queued": "No se ha podido transcribir ahora. Dicto guarda la grabación y lo reintentará en segundo plano; el texto aparecerá en la ventana de Dicto.",
+        "transcription_queue_failed": "Dicto ha dejado de intentar transcribir una grabación tras reintentarlo demasiado tiempo. El audio se conserva en {path}.",
     },
     "de": {
         "loading": "Dicto wird geladen...",
@@ -388,6 +394,9 @@ TRANSLATIONS = {
         "apply": "Anwenden",
         "presets_select": "Presets ▾",
         "auto_paste_failed": "Dein Text liegt sicher in der Zwischenablage – zum Einfügen Strg+V drücken. Automatisches Einfügen benötigt ydotool: installiere es (sudo apt install ydotool) und starte den ydotoold-Dienst, oder installiere xdotool. Siehe INSTALL_LINUX.md.",
+        "recording_recovered": "Eine nicht transkribierte Aufnahme wurde wiederhergestellt: Der Text steht im Dicto-Fenster.",
+        "transcription_queued": "Die Transkription ist gerade nicht möglich. Dicto behält die Aufnahme und versucht es im Hintergrund erneut; der Text erscheint im Dicto-Fenster.",
+        "transcription_queue_failed": "Dicto hat die Transkription einer Aufnahme nach zu vielen Versuchen aufgegeben. Die Audiodatei liegt unter {path}.",
     },
     "fr": {
         "loading": "Chargement de Dicto...",
@@ -513,6 +522,9 @@ TRANSLATIONS = {
         "apply": "Appliquer",
         "presets_select": "Presets ▾",
         "auto_paste_failed": "Votre texte est en sécurité dans le presse-papiers : appuyez sur Ctrl+V pour le coller. Le collage automatique nécessite ydotool : installez-le (sudo apt install ydotool) et démarrez le démon ydotoold, ou installez xdotool. Voir INSTALL_LINUX.md.",
+        "recording_recovered": "Un enregistrement non transcrit a été récupéré : son texte est dans la fenêtre de Dicto.",
+        "transcription_queued": "Transcription impossible pour le moment. Dicto garde l'enregistrement et réessaiera en arrière-plan ; le texte apparaîtra dans la fenêtre de Dicto.",
+        "transcription_queue_failed": "Dicto a abandonné la transcription d'un enregistrement après l'avoir réessayée trop longtemps. L'audio est conservé dans {path}.",
     },
     "pt": {
         "loading": "Carregando Dicto...",
@@ -638,6 +650,9 @@ TRANSLATIONS = {
         "apply": "Aplicar",
         "presets_select": "Presets ▾",
         "auto_paste_failed": "O seu texto está seguro na área de transferência: pressione Ctrl+V para colá-lo. A colagem automática requer ydotool: instale-o (sudo apt install ydotool) e inicie o daemon ydotoold, ou instale xdotool. Consulte INSTALL_LINUX.md.",
+        "recording_recovered": "Uma gravação que não foi transcrita foi recuperada: o texto está na janela do Dicto.",
+        "transcription_queued": "Não foi possível transcrever agora. O Dicto guarda a gravação e tentará novamente em segundo plano; o texto aparecerá na janela do Dicto.",
+        "transcription_queue_failed": "O Dicto desistiu de transcrever uma gravação depois de tentar por tempo demais. O áudio está guardado em {path}.",
     },
 }
 
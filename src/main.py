@@ -88,7 +88,7 @@ from PySide6.QtCore import Qt, QTimer, Slot  # noqa: E402
 from PySide6.QtGui import QIcon  # noqa: E402
 
 from src.config.settings import get_settings  # noqa: E402
-from src.i18n import set_language  # noqa: E402
+from src.i18n import set_language, t  # noqa: E402
 from src.controller import Controller, AppState  # noqa: E402
 from src.ui.tray import TrayManager  # noqa: E402
 from src.ui.overlay import OverlayWindow  # noqa: E402
@@ -280,12 +280,19 @@ class DictoApp:
         )
         self.controller.error_occurred.connect(self._on_error)
         self.controller.warning_occurred.connect(self._on_warning)
+        self.controller.partial_transcription.connect(self.overlay.show_partial)
 
         # Controller events -> Update main window
         # recording_started -> main window is handled in _on_recording_started_overlay
         self.controller.transcription_completed.connect(
             self.main_window.update_transcription
         )
+        self.controller.partial_transcription.connect(
+            self.main_window.update_partial_transcription
+        )
+        self.controller.recovered_transcription.connect(
+            self._on_recovered_transcription
+        )
 
         # Main window actions -> Controller
         self.main_window.play_clicked.connect(self.controller.start_recording_manual)
@@ -415,6 +422,19 @@ class DictoApp:
         # Return to idle after overlay hides
         QTimer.singleShot(1500, self.controller.return_to_idle)
 
+    @Slot(str)
+    def _on_recovered_transcription(self, text: str):
+        """Show the text of a recording recovered from the journal.
+
+        Only shown: no paste, no clipboard, no overlay, since whatever the user
+        is doing now has nothing to do with that recording.
+        """
+        assert self.tray_manager is not None
+        assert self.main_window is not None
+
+        self.main_window.update_transcription(text)
+        self.tray_manager.show_success(t("recording_recovered"))
+
     @Slot(str)
     def _on_warning(self, message: str):
         """Handle a partial success (e.g. the auto-paste could not be delivered).
@@ -0,0 +1,184 @@
+"""
+The shared HTTP client every Dicto API call goes through.
+
+Each `Transcriber` used to build its own `httpx.Client` with default limits,
+the queue's snapshot transcriber another, and the "send report" button made an
+ad-hoc `httpx.post` from the UI: several pools of HTTP/1.1 connections to one
+host, each needing its own handshakes, and a transform that ran next to a
+transcription opened a second connection for it.
+
+`ApiClient` owns the one client instead (`network.*` in config.yaml):
+
+- HTTP/2 when the server offers it (negotiated by TLS ALPN; HTTP/1.1
+  otherwise), so concurrent requests - segments, a transform next to a
+  transcription, the presets fetch - are multiplexed as streams over a
+  single connection rather than queuing for, or opening, more of them.
+  It needs the `h2` package (`httpx[http2]`); without it the client logs
+  and stays on HTTP/1.1.
+- Explicit pool limits, and idle connections kept for `keepalive_s` rather
+  than httpx's 5 s, so the connection `Transcriber.preconnect()` opens at
+  the hotkey press is still there at the release.
+- Connection statistics (`connection_stats`) for error reports.
+- Timeouts sized to the upload (`upload_timeouts()`): a fixed 30 s was
+  too short for a large file on a slow uplink and needlessly long to notice
+  that a short clip's request went nowhere. The wait for the answer grows
+  with the payload, and the whole request gets a deadline from the payload
+  size and the uplink measured on earlier uploads.
+- The retry budget (`retry_budget`, see retry.py) that every transcription
+  and transform retry draws from.
+
+The client is an `httpx.AsyncClient` on the shared event-loop thread (see
+event_loop.py), so that a request in flight can be cancelled; `run()` is how
+synchronous callers use it.
+
+The controller creates one and hands it to every transcriber; a transcriber
+built without one makes its own, as before.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import logging
+from concurrent.futures import TimeoutError
+from dataclasses import dataclass
+from typing import Any, Coroutine
+
+import httpx
+
+from src.services import routes
+from src.services.connection_stats import ConnectionStats
+from src.services.event_loop import CancelToken, EventLoopThread, shared_loop
+from src.services.retry import RetryBudget
+
+logger = logging.getLogger(__name__)
+
+# Path the "send report" button posts to, relative to routes.BASE_URL.
+REPORT_PATH = "/api/report"
+REPORT_TIMEOUT_S = 15.0
+# How long close() waits for the connections to shut down cleanly.
+CLOSE_TIMEOUT_S = 2.0
+
+# Timeouts of an upload (see ApiClient.upload_timeouts()). Connecting, and
+# waiting for the pool, is the same for any payload; a write that makes no
+# progress this long has stalled.
+CONNECT_TIMEOUT_S = 10.0
+WRITE_TIMEOUT_S = 20.0
+# The answer, once the upload is sent: the API's work grows with the audio.
+RESPONSE_BASE_S = 15.0
+RESPONSE_S_PER_MB = 3.0
+# Uplink assumed until one has been measured (1 Mbit/s), the slack given on
+# top of the expected upload time, and the longest deadline of any upload.
+DEFAULT_UPLINK_BPS = 125_000
+UPLOAD_MARGIN = 3.0
+MAX_DEADLINE_S = 15 * 60.0
+
+
+@dataclass(frozen=True)
+class UploadTimeouts:
+    """httpx per-phase timeouts for an upload, and its overall deadline."""
+
+    timeout: httpx.Timeout
+    deadline_s: float
+
+
+def http2_available() -> bool:
+    """Whether httpx can speak HTTP/2 here (the `h2` package is installed)."""
+    return importlib.util.find_spec("h2") is not None
+
+
+class ApiClient:
+    """Owner of the pooled `httpx.AsyncClient` shared by all Dicto API calls.
+
+    `http1=False` speaks HTTP/2 from the first byte, without negotiating it,
+    to a server known to accept that (an h2c test server, for instance).
+    """
+
+    def __init__(
+        self,
+        http2: bool = True,
+        max_connections: int = 10,
+        max_keepalive_connections: int = 5,
+        keepalive_s: float = 120.0,
+        timeout: float = 30.0,
+        http1: bool = True,
+        loop: EventLoopThread | None = None,
+    ):
+        if http2 and not http2_available():
+            logger.info(
+                "HTTP/2 unavailable (the h2 package is missing); using HTTP/1.1"
+            )
+            http2 = False
+        self.http2 = http2
+        self.loop = loop if loop is not None else shared_loop()
+        self.connection_stats = ConnectionStats()
+        self.retry_budget = RetryBudget()
+        self._closed = False
+        self.client = httpx.AsyncClient(
+            http1=http1 or not http2,
+            http2=http2,
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_s,
+            ),
+            event_hooks={"request": [self.connection_stats.on_request]},
+        )
+
+    @classmethod
+    def from_settings(cls, settings) -> ApiClient:
+        return cls(
+            http2=settings.network_http2,
+            max_connections=settings.network_max_connections,
+            max_keepalive_connections=settings.network_max_keepalive_connections,
+            keepalive_s=settings.network_keepalive_s,
+        )
+
+    def run(self, coro: Coroutine, cancel: CancelToken | None = None) -> Any:
+        """Run a request coroutine on the loop and wait for its result.
+
+        Raises `concurrent.futures.CancelledError` once `cancel` is cancelled.
+        """
+        return self.loop.run(coro, cancel)
+
+    def upload_timeouts(self, nbytes: int) -> UploadTimeouts:
+        """Timeouts for a request uploading `nbytes` of audio."""
+        response_s = RESPONSE_BASE_S + RESPONSE_S_PER_MB * nbytes / (1024 * 1024)
+        uplink_bps = self.connection_stats.uplink_bps or DEFAULT_UPLINK_BPS
+        upload_s = nbytes / uplink_bps * UPLOAD_MARGIN
+        return UploadTimeouts(
+            timeout=httpx.Timeout(
+                connect=CONNECT_TIMEOUT_S,
+                write=WRITE_TIMEOUT_S,
+                read=response_s,
+                pool=CONNECT_TIMEOUT_S,
+            ),
+            deadline_s=min(MAX_DEADLINE_S, CONNECT_TIMEOUT_S + upload_s + response_s),
+        )
+
+    def send_report(self, api_key: str, payload: dict) -> bool:
+        """POST an error report (logs and telemetry). Returns whether it landed."""
+        try:
+            response = self.run(
+                self.client.post(
+                    routes.url(REPORT_PATH),
+                    headers={"Authorization": f"Bearer {api_key}"},
+                    json=payload,
+                    timeout=REPORT_TIMEOUT_S,
+                )
+            )
+        except httpx.HTTPError as e:
+            logger.warning(f"Error sending report: {e}")
+            return False
+        return response.status_code in (200, 201)
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self.loop.run(self.client.aclose(), timeout=CLOSE_TIMEOUT_S)
+        except (RuntimeError, TimeoutError) as e:
+            # The loop is gone or stuck (interpreter shutdown); the sockets
+            # go with the process.
+            logger.debug(f"Closing the API client: {e!r}")
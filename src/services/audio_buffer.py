@@ -0,0 +1,194 @@
+"""
+Compact in-memory storage for captured audio.
+
+Keeping a recording as a Python list of per-callback `indata.copy()` arrays
+costs one small numpy object per 1024-frame block (~112k of them for a two-hour
+take) and forces a full `np.concatenate` before anything can read it. The arena
+below copies blocks into a few large preallocated int16 chunks instead, so the
+capture callback never allocates in the steady state and consumers can walk the
+audio through zero-copy views.
+
+`FrameRing` is the hand-off between the capture callback and the thread that
+processes the audio: a fixed-size queue the callback copies each block into and
+nothing else, so no Python work beyond one copy runs on the realtime thread.
+"""
+
+from __future__ import annotations
+
+from typing import Iterator
+
+import numpy as np
+
+# First chunk: ~32 s of 16 kHz audio. Covers a typical dictation without any
+# growth, and costs 1 MB for a mono int16 recording.
+INITIAL_CHUNK_FRAMES = 1 << 19
+# Chunks double until they reach this size (~4.4 min at 16 kHz, 8 MB mono), then
+# stay there: doubling forever would leave up to half of a huge last chunk unused.
+MAX_CHUNK_FRAMES = 1 << 22
+
+
+class FrameArena:
+    """Append-only audio buffer made of large preallocated chunks.
+
+    `append()` copies a block into the current chunk, spilling into a new one
+    (twice the previous size, capped) when it fills up. Existing chunks are
+    never moved or reallocated, so views handed out by `views()` stay valid
+    until `clear()`. `len()` is the running frame count and costs O(1).
+
+    Single producer: `append()` is meant to be called from one capture thread.
+    Readers may call `len()` concurrently; everything else should wait until
+    capture has stopped.
+    """
+
+    def __init__(
+        self,
+        channels: int | None = None,
+        dtype=np.int16,
+        initial_frames: int = INITIAL_CHUNK_FRAMES,
+        max_chunk_frames: int = MAX_CHUNK_FRAMES,
+    ):
+        # None: take the channel count from the first block (loopback streams
+        # only know theirs once the device is open).
+        self.channels = channels
+        self.dtype = np.dtype(dtype)
+        self._initial_frames = max(1, initial_frames)
+        self._max_chunk_frames = max(self._initial_frames, max_chunk_frames)
+        self._chunks: list[np.ndarray] = []
+        # Frames used in the last chunk; every earlier chunk is full.
+        self._fill = 0
+        self._frames = 0
+
+    def __len__(self) -> int:
+        return self._frames
+
+    @property
+    def capacity(self) -> int:
+        """Frames allocated across all chunks (used + spare)."""
+        return sum(len(c) for c in self._chunks)
+
+    def _new_chunk(self):
+        if self._chunks:
+            size = min(len(self._chunks[-1]) * 2, self._max_chunk_frames)
+        else:
+            size = self._initial_frames
+        assert self.channels is not None
+        self._chunks.append(np.empty((size, self.channels), dtype=self.dtype))
+        self._fill = 0
+
+    def append(self, block: np.ndarray):
+        """Copy `block` (frames × channels, or 1-D mono) into the arena."""
+        if self.channels is None:
+            self.channels = 1 if block.ndim == 1 else block.shape[1]
+        block = block.reshape(-1, self.channels)
+        n = len(block)
+        offset = 0
+        while offset < n:
+            if not self._chunks or self._fill == len(self._chunks[-1]):
+                self._new_chunk()
+            chunk = self._chunks[-1]
+            take = min(n - offset, len(chunk) - self._fill)
+            # Slice assignment casts to the arena dtype in place, with no
+            # temporary array.
+            chunk[self._fill : self._fill + take] = block[offset : offset + take]
+            self._fill += take
+            offset += take
+        self._frames += n
+
+    def views(self) -> list[np.ndarray]:
+        """Zero-copy views of the recorded frames, in order."""
+        if not self._chunks:
+            return []
+        out = list(self._chunks[:-1])
+        if self._fill:
+            out.append(self._chunks[-1][: self._fill])
+        return out
+
+    def iter_blocks(self, frames: int) -> Iterator[np.ndarray]:
+        """Yield the audio in pieces of at most `frames`, without copying."""
+        for view in self.views():
+            for start in range(0, len(view), frames):
+                yield view[start : start + frames]
+
+    def to_array(self) -> np.ndarray:
+        """The whole recording as one contiguous array.
+
+        Free when the recording fits in the first chunk (a view is returned);
+        otherwise this is the one copy the arena cannot avoid, so prefer
+        `views()`/`iter_blocks()` when the consumer can work piecewise.
+        """
+        views = self.views()
+        if not views:
+            return np.empty((0, self.channels or 1), dtype=self.dtype)
+        if len(views) == 1:
+            return views[0]
+        return np.concatenate(views, axis=0)
+
+    def clear(self):
+        """Drop all audio and release the chunks."""
+        self._chunks = []
+        self._fill = 0
+        self._frames = 0
+
+
+class FrameRing:
+    """Bounded single-producer/single-consumer queue of audio frames.
+
+    The producer (an audio callback) calls `push()`, which copies the block
+    into a preallocated ring and advances the write counter; the consumer
+    thread calls `pop()`, which copies out everything written since its last
+    call and advances the read counter. Each counter is written by one side
+    only, and only after the data it covers, so neither side takes a lock and
+    `push()` never allocates or blocks.
+
+    A block that does not fit (the consumer has fallen `capacity` frames
+    behind) is dropped whole and counted in `overflows`/`dropped_frames`, so
+    the callback always returns at once.
+    """
+
+    def __init__(self, capacity: int, channels: int, dtype=np.int16):
+        self.channels = channels
+        self._ring = np.zeros((max(1, capacity), channels), dtype=dtype)
+        # Absolute frame counts: [_read, _write) is queued.
+        self._write = 0
+        self._read = 0
+        self.overflows = 0
+        self.dropped_frames = 0
+
+    def __len__(self) -> int:
+        return self._write - self._read
+
+    @property
+    def capacity(self) -> int:
+        return len(self._ring)
+
+    def push(self, block: np.ndarray) -> bool:
+        """Queue a copy of `block`; False if it was dropped for lack of room."""
+        block = block.reshape(len(block), -1)
+        n = len(block)
+        size = len(self._ring)
+        write = self._write
+        if n > size - (write - self._read):
+            self.overflows += 1
+            self.dropped_frames += n
+            return False
+        pos = write % size
+        first = min(n, size - pos)
+        self._ring[pos : pos + first] = block[:first]
+        self._ring[: n - first] = block[first:]
+        self._write = write + n
+        return True
+
+    def pop(self) -> np.ndarray | None:
+        """Everything queued so far, as one new array; None when empty."""
+        read = self._read
+        n = self._write - read
+        if n <= 0:
+            return None
+        size = len(self._ring)
+        pos = read % size
+        first = min(n, size - pos)
+        out = np.empty((n, self.channels), dtype=self._ring.dtype)
+        out[:first] = self._ring[pos : pos + first]
+        out[first:] = self._ring[: n - first]
+        self._read = read + n
+        return out
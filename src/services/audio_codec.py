@@ -0,0 +1,118 @@
+"""
+Upload encoding for recorded audio.
+
+The recorder always produces 16-bit PCM WAV, which is the simplest thing to
+write while capturing but the most expensive thing to upload: ~1.9 MB per
+minute at 16 kHz mono, so the API's 25 MB cap ends a dictation at about 13
+minutes. Before uploading, the transcriber re-encodes the WAV into the codec
+chosen in `transcription.upload_codec`:
+
+- "wav":  upload as recorded.
+- "flac": lossless, always available through libsndfile; roughly halves speech.
+- "opus": lossy Ogg/Opus, ~10x smaller than WAV but far more CPU to encode
+  (on the order of a second per 30 s of audio on a slow core), so it only pays
+  off on slow uplinks. Needs a libsndfile built with Opus (1.0.29+) and one of
+  the sample rates Opus supports; otherwise we fall back to FLAC.
+"""
+
+from __future__ import annotations
+
+import logging
+from pathlib import Path
+
+import soundfile as sf
+
+from src.services.audio_sink import new_temp_recording_path
+
+logger = logging.getLogger(__name__)
+
+UPLOAD_CODECS = ("wav", "flac", "opus")
+
+# codec -> (file suffix, libsndfile format, libsndfile subtype)
+_CODEC_FORMATS = {
+    "flac": (".flac", "FLAC", "PCM_16"),
+    "opus": (".ogg", "OGG", "OPUS"),
+}
+
+# Sample rates the Opus encoder accepts; anything else has to go through FLAC.
+OPUS_SAMPLE_RATES = (8000, 12000, 16000, 24000, 48000)
+
+MIME_TYPES = {
+    ".wav": "audio/wav",
+    ".flac": "audio/flac",
+    ".mp3": "audio/mpeg",
+    ".webm": "audio/webm",
+    ".m4a": "audio/m4a",
+    ".ogg": "audio/ogg",
+    ".opus": "audio/ogg",
+}
+
+# Frames per read/write while re-encoding, so a long recording is never loaded
+# into memory whole.
+_ENCODE_BLOCK_FRAMES = 1 << 16
+
+
+def mime_type_for(path: str | Path) -> str:
+    """MIME type for an audio file, guessed from its extension."""
+    return MIME_TYPES.get(Path(path).suffix.lower(), "audio/wav")
+
+
+def opus_available() -> bool:
+    """Whether the bundled libsndfile can write Ogg/Opus."""
+    try:
+        return "OPUS" in sf.available_subtypes("OGG")
+    except Exception:
+        return False
+
+
+def resolve_codec(codec: str, samplerate: int | None = None) -> str:
+    """Map a configured codec to one this machine can actually produce."""
+    codec = (codec or "wav").lower()
+    if codec not in UPLOAD_CODECS:
+        logger.warning(f"Unknown upload codec {codec!r}; uploading WAV")
+        return "wav"
+    if codec == "opus":
+        if not opus_available():
+            logger.info("Opus encoding unavailable in libsndfile; using FLAC")
+            return "flac"
+        if samplerate is not None and samplerate not in OPUS_SAMPLE_RATES:
+            logger.info(f"Opus cannot encode {samplerate} Hz audio; using FLAC")
+            return "flac"
+    return codec
+
+
+def encode_for_upload(path: str | Path, codec: str) -> Path:
+    """Re-encode a recorded WAV for upload and return the file to send.
+
+    Returns `path` unchanged when no re-encoding applies (codec "wav", or the
+    file is not a WAV). Otherwise the encoded copy is a new temp file that the
+    caller owns and must delete. Encoding is CPU work proportional to the
+    recording, so call this from a worker thread, never the GUI thread.
+    """
+    path = Path(path)
+    if path.suffix.lower() != ".wav":
+        return path
+    info = sf.info(str(path))
+    codec = resolve_codec(codec, info.samplerate)
+    if codec == "wav":
+        return path
+
+    suffix, fmt, subtype = _CODEC_FORMATS[codec]
+    out_path = Path(new_temp_recording_path(suffix=suffix))
+    try:
+        with sf.SoundFile(
+            str(out_path),
+            mode="w",
+            samplerate=info.samplerate,
+            channels=info.channels,
+            format=fmt,
+            subtype=subtype,
+        ) as out:
+            for block in sf.blocks(
+                str(path), blocksize=_ENCODE_BLOCK_FRAMES, dtype="int16"
+            ):
+                out.write(block)
+    except Exception:
+        out_path.unlink(missing_ok=True)
+        raise
+    return out_path
@@ -0,0 +1,142 @@
+"""
+Live mixing of system audio (loopback) into the mic recording.
+
+The mic and the loopback device run on separate sample clocks: two nominal
+48 kHz devices easily disagree by 50-200 ppm, i.e. 10-40 ms over an hour.
+Mixing them once at stop time meant keeping the whole loopback capture in RAM
+and lining the tracks up by truncating to the shorter one, so whatever the
+clocks had drifted apart was lost at the end and the tracks slid apart along
+the way. `LoopbackMixer` instead mixes each mic block as it is captured, taking
+the matching stretch of loopback from a small jitter buffer, and nudges the
+rate it reads that buffer at so the buffer neither fills up nor runs dry.
+"""
+
+from __future__ import annotations
+
+import threading
+
+import numpy as np
+
+# How far behind the mic the loopback is played back. Covers the jitter between
+# the two streams' callbacks (the loopback delivers ~20 ms blocks).
+LATENCY_S = 0.15
+# Hard cap on buffered loopback; past it the oldest audio is dropped. Only
+# reached if the mic stalls while system audio keeps coming.
+CAPACITY_S = 2.0
+# Rate correction per second of buffer error, and its limit. At 0.05/s a
+# 100 ppm drift settles 2 ms above the target latency; real devices stay well
+# inside 1000 ppm.
+DRIFT_GAIN = 0.05
+MAX_CORRECTION = 0.001
+# Time constant (seconds) of the buffer-level average the correction tracks, so
+# it follows the drift rather than callback jitter.
+SMOOTHING_S = 1.0
+
+
+class LoopbackMixer:
+    """Mixes a mono loopback track into mic blocks as both are captured.
+
+    The loopback thread calls `push()` with mono blocks already at the
+    recording rate; the mic thread calls `mix()` with each mic block and gets
+    it back with the loopback added. The mic clock is the reference: the
+    loopback buffer is read at `ratio` samples per mic sample, by linear
+    interpolation (the correction is at most 0.1%, far too small to hear), and
+    `ratio` follows the buffer level so that it stays around `latency`.
+
+    Memory is the fixed-size buffer, whatever the recording length. If the
+    loopback stops delivering, mic blocks pass through alone until it has
+    buffered `latency` again.
+    """
+
+    def __init__(
+        self,
+        samplerate: int,
+        latency: float = LATENCY_S,
+        capacity: float = CAPACITY_S,
+    ):
+        self.samplerate = samplerate
+        self._target = max(1, int(latency * samplerate))
+        self._ring = np.zeros(
+            max(self._target * 2, int(capacity * samplerate)), np.float32
+        )
+        # Absolute sample positions: everything in [_read, _write) is buffered.
+        self._write = 0
+        self._read = 0.0
+        self._primed = False
+        self._level = float(self._target)
+        self.ratio = 1.0
+        self.underruns = 0
+        self.overruns = 0
+        self._lock = threading.Lock()
+
+    @property
+    def drift_ppm(self) -> float:
+        """Current rate correction, in parts per million (loopback vs mic)."""
+        return (self.ratio - 1.0) * 1e6
+
+    def push(self, mono: np.ndarray):
+        """Buffer the next loopback block (1-D, at the recording rate)."""
+        size = len(self._ring)
+        mono = mono.reshape(-1)[-size:]
+        n = len(mono)
+        if n == 0:
+            return
+        with self._lock:
+            pos = self._write % size
+            first = min(n, size - pos)
+            self._ring[pos : pos + first] = mono[:first]
+            self._ring[: n - first] = mono[first:]
+            self._write += n
+            if self._write - self._read > size - 2:
+                # Mic stalled: drop the oldest audio rather than grow.
+                self.overruns += 1
+                self._read = float(self._write - self._target)
+
+    def mix(self, mic: np.ndarray) -> np.ndarray:
+        """Return `mic` (int16, frames × channels) with the loopback added."""
+        n = len(mic)
+        with self._lock:
+            loopback = self._take(n)
+        if loopback is None:
+            return mic
+        mixed = mic.astype(np.float32)
+        mixed += loopback.reshape(-1, 1) if mixed.ndim > 1 else loopback
+        np.clip(mixed, -32768, 32767, out=mixed)
+        return mixed.astype(np.int16)
+
+    def _take(self, n: int) -> np.ndarray | None:
+        fill = self._write - self._read
+        if not self._primed:
+            if fill < self._target:
+                return None
+            # Start exactly `latency` behind the newest loopback audio.
+            self._primed = True
+            self._read = float(self._write - self._target)
+            self._level = float(self._target)
+            fill = self._target
+        weight = min(1.0, n / (self.samplerate * SMOOTHING_S))
+        self._level += weight * (fill - self._level)
+        error = (self._level - self._target) / self.samplerate
+        self.ratio = 1.0 + float(
+            np.clip(error * DRIFT_GAIN, -MAX_CORRECTION, MAX_CORRECTION)
+        )
+
+        positions = self._read + np.arange(n) * self.ratio
+        idx = positions.astype(np.int64)
+        # Interpolating needs the sample after each position too.
+        valid = int(np.searchsorted(idx, self._write - 1))
+        size = len(self._ring)
+        frac = (positions[:valid] - idx[:valid]).astype(np.float32)
+        a = self._ring[idx[:valid] % size]
+        b = self._ring[(idx[:valid] + 1) % size]
+        out = np.zeros(n, dtype=np.float32)
+        out[:valid] = a + (b - a) * frac
+        if valid < n:
+            # Ran dry: the rest of this block is mic only, then wait until the
+            # buffer is back at the target latency.
+            self.underruns += 1
+            self._primed = False
+            self._read = float(self._write)
+        else:
+            self._read += n * self.ratio
+        return out
@@ -0,0 +1,143 @@
+"""
+Recording sinks: where captured audio ends up while the recorder is running.
+
+The default recorder keeps every block in memory and encodes the whole take at
+stop time, so the gap between releasing the hotkey and starting the upload grows
+with the length of the recording. A streaming sink instead appends each block to
+an already-open sound file from a writer thread; stopping only has to drain the
+few blocks still queued and patch the header, which costs the same for a 5 s
+note as for a 2 h meeting.
+"""
+
+from __future__ import annotations
+
+import logging
+import queue
+import tempfile
+import threading
+from pathlib import Path
+
+import numpy as np
+import soundfile as sf
+
+logger = logging.getLogger(__name__)
+
+# Queue sentinel telling the writer thread to finalize the file and exit.
+_CLOSE = object()
+
+# How much audio the writer lets accumulate before syncing it to disk. Closing
+# a SoundFile syncs everything still unsynced, so without this the "O(1)" stop
+# would quietly grow with the recording again (~0.1 s per hour of 16 kHz audio).
+SYNC_INTERVAL_S = 2.0
+
+
+def new_temp_recording_path(suffix: str = ".wav") -> str:
+    """Create an empty temp file for a recording and return its path."""
+    temp_file = tempfile.NamedTemporaryFile(
+        suffix=suffix, delete=False, prefix="voice_recording_"
+    )
+    temp_file.close()
+    return temp_file.name
+
+
+class StreamingWavSink:
+    """Writes int16 blocks to a WAV file on a background thread as they arrive.
+
+    `write()` only enqueues, so it is safe to call from the PortAudio callback:
+    the disk write happens on the writer thread. `close()` drains whatever is
+    still queued, rewrites the header with the final length and returns the
+    number of frames in the file.
+    """
+
+    def __init__(self, path: str, samplerate: int, channels: int = 1):
+        self.path = path
+        self.samplerate = samplerate
+        self.channels = channels
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        # Counted on the producer side so the live duration is exact even while
+        # the writer is a few blocks behind.
+        self._frames_queued = 0
+        self._frames_written = 0
+        self._error: Exception | None = None
+        self._closed = False
+        self._file = sf.SoundFile(
+            path,
+            mode="w",
+            samplerate=samplerate,
+            channels=channels,
+            format="WAV",
+            subtype="PCM_16",
+        )
+        self._sync_every = max(1, int(samplerate * SYNC_INTERVAL_S))
+        self._thread = threading.Thread(
+            target=self._run, name="dicto-wav-writer", daemon=True
+        )
+        self._thread.start()
+
+    @property
+    def frames_queued(self) -> int:
+        """Frames handed to `write()` so far (written or still pending)."""
+        return self._frames_queued
+
+    @property
+    def frames_written(self) -> int:
+        """Frames that have actually reached the file."""
+        return self._frames_written
+
+    @property
+    def error(self) -> Exception | None:
+        """The first write error, if the writer hit one."""
+        return self._error
+
+    def write(self, block: np.ndarray):
+        """Queue a block for writing. The caller must not mutate it afterwards."""
+        if self._closed:
+            return
+        self._frames_queued += len(block)
+        self._queue.put(block)
+
+    def _run(self):
+        unsynced = 0
+        try:
+            while True:
+                block = self._queue.get()
+                if block is _CLOSE:
+                    break
+                if self._error is not None:
+                    # Keep draining so close() never waits on a full queue, but
+                    # stop touching a file that already failed once.
+                    continue
+                try:
+                    self._file.write(block)
+                    self._frames_written += len(block)
+                    unsynced += len(block)
+                    if unsynced >= self._sync_every:
+                        self._file.flush()
+                        unsynced = 0
+                except Exception as e:
+                    logger.error(f"Error writing recording to {self.path}: {e}")
+                    self._error = e
+        finally:
+            try:
+                self._file.close()
+            except Exception as e:
+                logger.error(f"Error finalizing recording {self.path}: {e}")
+                self._error = self._error or e
+
+    def close(self, timeout: float | None = 10.0) -> int:
+        """Flush pending blocks, finalize the header, return frames written."""
+        if not self._closed:
+            self._closed = True
+            self._queue.put(_CLOSE)
+        self._thread.join(timeout=timeout)
+        if self._thread.is_alive():
+            logger.warning(f"WAV writer did not finish within {timeout}s")
+        return self._frames_written
+
+    def discard(self):
+        """Close the file and delete it (aborted or cancelled recording)."""
+        self.close()
+        try:
+            Path(self.path).unlink(missing_ok=True)
+        except Exception as e:
+            logger.debug(f"Could not delete discarded recording {self.path}: {e}")
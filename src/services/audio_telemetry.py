@@ -0,0 +1,175 @@
+"""
+Capture stream telemetry: overflows, callback timing, queue depth, drops.
+
+A choppy recording on a loaded machine leaves little trace: PortAudio drops
+input when a callback runs late, and the only sign used to be a status line in
+the log. Each capture stream now keeps a `StreamTelemetry` for the duration of
+a recording (or of a mic test): counters for the stream's flags and for audio
+the recorder had to drop, and fixed-size histograms of how long each callback
+took, how far apart callbacks arrived compared with the block length, and how
+much audio was waiting when the recording thread came to collect it. The "send
+report" button attaches the last recording's numbers.
+
+Recording into the histograms is a bisect and an increment, cheap enough to do
+from the callback itself.
+"""
+
+from __future__ import annotations
+
+import time
+from bisect import bisect_left
+
+# Upper bucket edges, in milliseconds, shared by every histogram: fine enough
+# below a block period (21-64 ms) to tell healthy from marginal, coarse above.
+BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2, 5, 10, 20, 50, 100, 250, 1000)
+
+
+class Histogram:
+    """Counts of values per bucket of `BUCKETS_MS`, plus the maximum.
+
+    The last bucket holds everything above the largest edge.
+    """
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS_MS) + 1)
+        self.count = 0
+        self.max = 0.0
+
+    def add(self, value: float):
+        self.counts[bisect_left(BUCKETS_MS, value)] += 1
+        self.count += 1
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, q: float) -> float:
+        """Upper edge of the bucket holding the `q` (0-1) quantile.
+
+        Values past the largest edge report the maximum seen instead.
+        """
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank and n:
+                return BUCKETS_MS[i] if i < len(BUCKETS_MS) else self.max
+        return self.max
+
+    def as_dict(self) -> dict:
+        edges = [f"<={edge:g}" for edge in BUCKETS_MS] + [f">{BUCKETS_MS[-1]:g}"]
+        return {
+            "count": self.count,
+            "p50": self.percentile(0.5),
+            "p99": self.percentile(0.99),
+            "max": round(self.max, 3),
+            "buckets_ms": {e: n for e, n in zip(edges, self.counts) if n},
+        }
+
+
+class StreamTelemetry:
+    """Per-recording statistics of one capture stream.
+
+    The stream callback brackets its work with `callback_started()` and
+    `callback_finished()`; the consumer reports the queue it finds with
+    `queued()` and blocks it could not take with `dropped()`. Each method is
+    called from a single thread (the callback or the consumer), and readers
+    only take snapshots, so nothing is locked.
+    """
+
+    def __init__(self, name: str, samplerate: int):
+        self.name = name
+        self.samplerate = samplerate
+        self.callbacks = 0
+        self.frames = 0
+        self.input_overflows = 0
+        self.input_underflows = 0
+        self.dropped_blocks = 0
+        self.dropped_frames = 0
+        self.callback_ms = Histogram()
+        # |actual - expected| time between callbacks, expected being the
+        # length of the previous block.
+        self.jitter_ms = Histogram()
+        self.queue_ms = Histogram()
+        self._last_start: float | None = None
+        self._last_frames = 0
+
+    def callback_started(self, frames: int, status=None) -> float:
+        """Count one callback and its `sd.CallbackFlags`; returns its start time."""
+        now = time.perf_counter()
+        if self._last_start is not None and self._last_frames:
+            expected = self._last_frames / self.samplerate
+            self.jitter_ms.add(abs(now - self._last_start - expected) * 1000)
+        self._last_start = now
+        self._last_frames = frames
+        self.callbacks += 1
+        self.frames += frames
+        if status:
+            self.input_overflows += bool(getattr(status, "input_overflow", False))
+            self.input_underflows += bool(getattr(status, "input_underflow", False))
+        return now
+
+    def callback_finished(self, started: float):
+        self.callback_ms.add((time.perf_counter() - started) * 1000)
+
+    def queued(self, frames: int):
+        """Audio waiting in the stream's queue when the consumer came for it."""
+        self.queue_ms.add(frames * 1000 / self.samplerate)
+
+    def dropped(self, frames: int):
+        """A block the consumer was too far behind to queue."""
+        self.dropped_blocks += 1
+        self.dropped_frames += frames
+
+    @property
+    def clean(self) -> bool:
+        return not (
+            self.input_overflows or self.input_underflows or self.dropped_blocks
+        )
+
+    def summary(self) -> str:
+        callback, jitter = self.callback_ms, self.jitter_ms
+        return (
+            f"{self.name}: {self.callbacks} callbacks, "
+            f"{self.input_overflows} overflows, {self.input_underflows} underflows, "
+            f"{self.dropped_blocks} blocks dropped; callback p99 "
+            f"{callback.percentile(0.99):g} ms (max {callback.max:.1f}), "
+            f"jitter p99 {jitter.percentile(0.99):g} ms (max {jitter.max:.1f}), "
+            f"queue max {self.queue_ms.max:.0f} ms"
+        )
+
+    def as_dict(self) -> dict:
+        return {
+            "samplerate": self.samplerate,
+            "callbacks": self.callbacks,
+            "seconds": round(self.frames / self.samplerate, 2),
+            "input_overflows": self.input_overflows,
+            "input_underflows": self.input_underflows,
+            "dropped_blocks": self.dropped_blocks,
+            "dropped_frames": self.dropped_frames,
+            "callback_ms": self.callback_ms.as_dict(),
+            "jitter_ms": self.jitter_ms.as_dict(),
+            "queue_ms": self.queue_ms.as_dict(),
+        }
+
+
+class CaptureTelemetry:
+    """The telemetry of every stream of one recording (or mic test)."""
+
+    def __init__(self):
+        self.streams: dict[str, StreamTelemetry] = {}
+
+    def stream(self, name: str, samplerate: int) -> StreamTelemetry:
+        """A fresh `StreamTelemetry` for a stream being opened."""
+        telemetry = self.streams[name] = StreamTelemetry(name, samplerate)
+        return telemetry
+
+    @property
+    def clean(self) -> bool:
+        return all(s.clean for s in self.streams.values())
+
+    def summary(self) -> str:
+        return "; ".join(s.summary() for s in self.streams.values()) or "no streams"
+
+    def as_dict(self) -> dict:
+        return {name: s.as_dict() for name, s in self.streams.items()}
@@ -0,0 +1,308 @@
+"""
+Capture pipeline: the steps each captured block goes through.
+
+The recording thread used to hard-wire what happened to a block (resample it,
+mix system audio in, meter it, store it, hand it to the capture tap), so every
+new consumer of live audio meant another branch in the recorder. Each capture
+stream now has a `CapturePipeline`, a chain of stages the recorder assembles
+from its settings when a recording starts, and that other code can extend with
+`AudioRecorder.add_capture_stage()`.
+
+A stage takes a block and returns the block for the next stage: transformed
+(the resampler, the mixer) or unchanged, so observers (the level meter, the
+end-of-speech detector, the writer) all see the same audio, a fan-out. Stages
+run on the recording thread, one block per poll; a consumer that may block or
+do real work goes behind a `QueuedStage`, which runs it on its own thread
+behind a bounded queue.
+
+Backpressure: when a queued stage falls behind, `process()` waits for room,
+which holds up the recording thread, which lets audio accumulate in the
+stream's `FrameRing`. The ring is the one place audio is dropped (and counted
+in the telemetry). A stage still stuck after `QUEUE_TIMEOUT_S` is given up on
+instead, so a wedged optional consumer cannot cost the recording itself.
+"""
+
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+from typing import Callable, Iterable
+
+import numpy as np
+
+from src.services.audio_mix import LoopbackMixer
+from src.services.resampler import StreamingResampler
+
+logger = logging.getLogger(__name__)
+
+# Blocks a queued stage may have waiting: the recording thread passes one per
+# 20 ms poll, so about a second of audio.
+QUEUE_BLOCKS = 50
+# How long process() waits for room before failing the stage. Under the
+# recorder's RING_S, so the ring absorbs the wait without dropping audio.
+QUEUE_TIMEOUT_S = 1.0
+# How long flush() waits for a queued stage's worker to finish its queue.
+FLUSH_TIMEOUT_S = 5.0
+# RMS that reads as a full level bar.
+FULL_SCALE_RMS = 400.0
+
+
+def block_rms(block: np.ndarray) -> float:
+    x = block.reshape(-1).astype(np.float32)
+    return float(np.sqrt(np.dot(x, x) / len(x))) if len(x) else 0.0
+
+
+class CaptureStage:
+    """One step of a capture pipeline.
+
+    Subclasses override `process()` and, when they hold audio back, `flush()`.
+    A `required` stage that raises ends the recording; any other stage is
+    logged, dropped from the pipeline and marked `failed`, and the audio
+    carries on without it.
+    """
+
+    name = "stage"
+    required = True
+
+    def __init__(self):
+        self.failed = False
+
+    def process(self, block: np.ndarray) -> np.ndarray | None:
+        """The block for the next stage (None or empty ends its trip)."""
+        return block
+
+    def flush(self) -> np.ndarray | None:
+        """End of the recording: audio still held back, if any."""
+        return None
+
+    def close(self):
+        """Release resources without flushing (the recording was abandoned)."""
+
+
+class CapturePipeline:
+    """An ordered chain of `CaptureStage`s.
+
+    Single producer: `push()`, `flush()` and `close()` are called from one
+    thread at a time (the recording thread, then stop_recording()).
+    """
+
+    def __init__(self, stages: Iterable[CaptureStage] = ()):
+        self.stages = list(stages)
+
+    def __iter__(self):
+        return iter(list(self.stages))
+
+    def stage(self, name: str) -> CaptureStage | None:
+        """The first stage called `name`, if it is (still) in the pipeline."""
+        return next((s for s in self.stages if s.name == name), None)
+
+    def push(self, block: np.ndarray):
+        self._run(block, 0)
+
+    def flush(self):
+        """Flush every stage in order, running what each releases downstream."""
+        i = 0
+        while i < len(self.stages):
+            stage = self.stages[i]
+            try:
+                tail = stage.flush()
+            except Exception as e:
+                self._fail(stage, e)
+                continue
+            if tail is not None and len(tail):
+                self._run(tail, i + 1)
+            i += 1
+
+    def close(self):
+        for stage in self.stages:
+            try:
+                stage.close()
+            except Exception as e:
+                logger.debug(f"Error closing capture stage '{stage.name}': {e}")
+
+    def _run(self, block: np.ndarray | None, start: int):
+        i = start
+        while i < len(self.stages) and block is not None and len(block):
+            stage = self.stages[i]
+            try:
+                block = stage.process(block)
+            except Exception as e:
+                # The failed stage is gone; the next one takes the same block.
+                self._fail(stage, e)
+                continue
+            i += 1
+
+    def _fail(self, stage: CaptureStage, error: Exception):
+        if stage.required:
+            raise error
+        logger.error(f"Capture stage '{stage.name}' failed: {error}")
+        stage.failed = True
+        self.stages.remove(stage)
+        try:
+            stage.close()
+        except Exception as e:
+            logger.debug(f"Error closing capture stage '{stage.name}': {e}")
+
+
+class FeedStage(CaptureStage):
+    """Hands each block to `feed` and passes it on unchanged.
+
+    `flush`, if given, is called at the end of the recording and what it
+    returns is kept in `result`.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        feed: Callable[[np.ndarray], object],
+        flush: Callable[[], object] | None = None,
+        required: bool = True,
+    ):
+        super().__init__()
+        self.name = name
+        self.required = required
+        self._feed = feed
+        self._flush = flush
+        self.result = None
+
+    def process(self, block):
+        self._feed(block)
+        return block
+
+    def flush(self):
+        if self._flush is not None:
+            self.result = self._flush()
+
+
+class LevelMeter(CaptureStage):
+    """Keeps the 0.0-1.0 level of the latest block in `level`."""
+
+    required = False
+
+    def __init__(self, name: str = "level"):
+        super().__init__()
+        self.name = name
+        self.level = 0.0
+
+    def process(self, block):
+        self.level = min(1.0, block_rms(block) / FULL_SCALE_RMS)
+        return block
+
+
+class ResampleStage(CaptureStage):
+    """Converts blocks to another sample rate (see `StreamingResampler`)."""
+
+    name = "resample"
+
+    def __init__(self, resampler: StreamingResampler):
+        super().__init__()
+        self.resampler = resampler
+
+    def process(self, block):
+        return self.resampler.process(block)
+
+    def flush(self):
+        return self.resampler.flush()
+
+
+class DownmixStage(CaptureStage):
+    """Averages the channels into a float32 mono block."""
+
+    name = "downmix"
+
+    def process(self, block):
+        if block.ndim == 1:
+            return block.astype(np.float32, copy=False)
+        return block.mean(axis=1, dtype=np.float32)
+
+
+class MixStage(CaptureStage):
+    """Mixes buffered system audio into each block (see `LoopbackMixer`)."""
+
+    name = "mix"
+
+    def __init__(self, mixer: LoopbackMixer):
+        super().__init__()
+        self.mixer = mixer
+
+    def process(self, block):
+        return self.mixer.mix(block)
+
+
+class QueuedStage(CaptureStage):
+    """Runs `stage` on its own thread behind a bounded queue.
+
+    `process()` queues the block and passes it on at once, so the stages after
+    it do not wait for this one. `flush()` lets the worker finish the queue,
+    then flushes the inner stage on the calling thread; whatever the inner
+    stage returns (from `process` or `flush`) is discarded, so wrap observers,
+    not transforms. A worker error fails this stage on the next call.
+    """
+
+    _STOP = object()
+
+    def __init__(
+        self,
+        stage: CaptureStage,
+        max_blocks: int | None = None,
+        timeout: float | None = None,
+    ):
+        super().__init__()
+        self.stage = stage
+        self.name = stage.name
+        self.required = stage.required
+        self._timeout = QUEUE_TIMEOUT_S if timeout is None else timeout
+        max_blocks = QUEUE_BLOCKS if max_blocks is None else max_blocks
+        self._queue: queue.Queue = queue.Queue(maxsize=max(1, max_blocks))
+        self._error: Exception | None = None
+        self._thread = threading.Thread(
+            target=self._run, name=f"dicto-stage-{stage.name}", daemon=True
+        )
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            block = self._queue.get()
+            if block is self._STOP:
+                return
+            if self._error is not None:
+                continue
+            try:
+                self.stage.process(block)
+            except Exception as e:
+                self._error = e
+
+    def _raise_worker_error(self):
+        if self._error is not None:
+            raise self._error
+
+    def process(self, block):
+        self._raise_worker_error()
+        try:
+            self._queue.put(block, timeout=self._timeout)
+        except queue.Full:
+            raise RuntimeError(
+                f"fell {self._queue.maxsize} blocks behind for {self._timeout:g}s"
+            ) from None
+        return block
+
+    def _stop_worker(self, timeout: float | None) -> bool:
+        try:
+            self._queue.put(self._STOP, timeout=self._timeout)
+        except queue.Full:
+            return False
+        self._thread.join(timeout)
+        return not self._thread.is_alive()
+
+    def flush(self):
+        if not self._stop_worker(timeout=FLUSH_TIMEOUT_S):
+            raise RuntimeError(f"still busy after {FLUSH_TIMEOUT_S:g}s")
+        self._raise_worker_error()
+        self.stage.flush()
+
+    def close(self):
+        # Abandoned: skip what is still queued.
+        self._error = self._error or RuntimeError("closed")
+        if self._stop_worker(timeout=self._timeout):
+            self.stage.close()
@@ -0,0 +1,109 @@
+"""
+Connection statistics of the API client: reuse and handshake times.
+
+A request that finds an idle keep-alive connection in the pool goes straight
+to sending; one that does not first pays for DNS, the TCP handshake and the
+TLS handshake, which on a mobile or far-away link is a few hundred
+milliseconds on the critical path of a dictation. `ConnectionStats` makes
+that visible: installed as a request hook on an `httpx.AsyncClient`, it
+follows httpcore's trace events to count how many requests reused a
+connection and how long each new connection took to set up.
+
+It also estimates the uplink: the time a large request body (an audio file)
+takes to send gives the upload throughput (`uplink_bps`, a moving average),
+from which the transcriber sizes its upload timeouts. Small bodies are not
+timed, since they fit in the socket buffers and "send" at memory speed.
+
+Concurrent requests (segments, the transcription queue) run as tasks on the
+same event-loop thread, so each request gets a trace callback of its own,
+holding its own timings.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any
+
+import httpx
+
+from src.services.audio_telemetry import Histogram
+
+# Bodies smaller than this say nothing about the link (see above).
+MIN_TIMED_BODY_BYTES = 512 * 1024
+# Weight of the newest upload in the uplink estimate.
+UPLINK_SMOOTHING = 0.3
+
+
+class ConnectionStats:
+    """Counts connection reuse and times new connections of one client.
+
+    Pass `on_request` in the client's `event_hooks["request"]`.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.reused = 0
+        # DNS + TCP (+ TLS) of each new connection.
+        self.handshake_ms = Histogram()
+        # Bytes per second of recent large uploads; None until one was timed.
+        self.uplink_bps: float | None = None
+
+    async def on_request(self, request: httpx.Request):
+        timings: dict[str, Any] = {}
+        length = request.headers.get("content-length")
+        if length and length.isdigit() and int(length) >= MIN_TIMED_BODY_BYTES:
+            timings["body_bytes"] = int(length)
+
+        async def trace(event: str, info: dict):
+            self._trace(timings, event)
+
+        request.extensions["trace"] = trace
+
+    def _trace(self, timings: dict, event: str):
+        if event == "connection.connect_tcp.started":
+            timings["connect_started"] = time.monotonic()
+            timings["connected_at"] = None
+        elif event in (
+            "connection.connect_tcp.complete",
+            "connection.start_tls.complete",
+        ):
+            timings["connected_at"] = time.monotonic()
+        elif event.endswith(".send_request_headers.started"):
+            started = timings.pop("connect_started", None)
+            connected = timings.pop("connected_at", None)
+            with self._lock:
+                self.requests += 1
+                if started is None:
+                    self.reused += 1
+                elif connected is not None:
+                    self.handshake_ms.add((connected - started) * 1000)
+        elif event.endswith(".send_request_body.started"):
+            timings["body_started"] = time.monotonic()
+        elif event.endswith(".send_request_body.complete"):
+            started = timings.pop("body_started", None)
+            size = timings.get("body_bytes")
+            if started is not None and size:
+                elapsed = time.monotonic() - started
+                if elapsed > 0:
+                    self._add_uplink(size / elapsed)
+
+    def _add_uplink(self, bps: float):
+        with self._lock:
+            if self.uplink_bps is None:
+                self.uplink_bps = bps
+            else:
+                self.uplink_bps += UPLINK_SMOOTHING * (bps - self.uplink_bps)
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "reused": self.reused,
+                "new_connections": self.requests - self.reused,
+                "handshake_ms": self.handshake_ms.as_dict(),
+                "uplink_kbps": None
+                if self.uplink_bps is None
+                else round(self.uplink_bps * 8 / 1000),
+            }
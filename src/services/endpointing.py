@@ -0,0 +1,125 @@
+"""
+End-of-speech detection for hands-free stopping.
+
+In toggle mode a recording runs until the hotkey is pressed again, and the
+time between the last word and that press is dead latency: the audio is
+silence and the transcription cannot start. `EndpointDetector` watches the
+captured blocks and reports when the user has spoken for a while and then been
+quiet for `trailing_silence_s`, so the recorder can stop on its own.
+
+It runs on every capture block, so it works on whole blocks: one RMS, one
+zero-crossing count and a handful of float operations each. Speech is judged
+against a noise floor tracked across the recording, with the same rules as the
+upload-time detector in `vad.py`.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+
+import numpy as np
+
+from src.services.segmenter import SILENCE_RMS
+from src.services.vad import FRICATIVE_ZCR, SPEECH_OVER_FLOOR
+
+# Pause after the last word that ends the recording. Long enough to survive a
+# dictating user's thinking pauses.
+TRAILING_SILENCE_S = 2.0
+# Speech needed before the detector arms, so a recording started ahead of the
+# first word is not stopped before it begins.
+MIN_SPEECH_S = 0.5
+# How fast (per second) the noise floor may rise: it drops to any quieter block
+# at once but only creeps up, so it follows a room getting louder without
+# mistaking a stretch of speech for noise.
+FLOOR_RISE = 0.5
+# Resolution of the level histogram speech is counted from: bins per octave,
+# and octaves (int16 RMS stays under 2**15).
+BINS_PER_OCTAVE = 8
+OCTAVES = 16
+
+
+class EndpointDetector:
+    """Reports the end of speech in a stream of capture blocks.
+
+    `feed()` takes int16 blocks (frames × channels, or 1-D) in capture order
+    and returns True once: for the block that completes `trailing_silence_s`
+    of silence after at least `min_speech_s` of speech. Speech need not be
+    continuous to count towards the minimum. Later blocks return False.
+
+    Both conditions are judged against the noise floor as it stands when the
+    silence ends, not as it was when each block arrived: a take that opens
+    mid-word has no floor to go by until the first pause. So the detector
+    keeps a histogram of block levels (for the amount of speech) and the
+    loudest blocks of the last `trailing_silence_s` (for the silence), both a
+    fixed size whatever the recording length.
+
+    Not thread-safe: one producer per instance.
+    """
+
+    def __init__(
+        self,
+        samplerate: int,
+        trailing_silence_s: float = TRAILING_SILENCE_S,
+        min_speech_s: float = MIN_SPEECH_S,
+    ):
+        self.samplerate = samplerate
+        self._trailing = int(trailing_silence_s * samplerate)
+        self._min_speech = int(min_speech_s * samplerate)
+        self._floor: float | None = None
+        self._pos = 0
+        # Samples per level bin, over the whole recording.
+        self._levels = np.zeros(BINS_PER_OCTAVE * OCTAVES + 1, dtype=np.int64)
+        # (level, end position) of the blocks in the trailing window, loudest
+        # first: each block evicts the quieter ones before it, since while it is
+        # in the window they can no longer decide whether the window is quiet.
+        self._window: deque[tuple[float, int]] = deque()
+        self.fired = False
+
+    @staticmethod
+    def _bin(level: float) -> int:
+        return min(
+            int(np.log2(level + 1.0) * BINS_PER_OCTAVE), BINS_PER_OCTAVE * OCTAVES
+        )
+
+    @property
+    def threshold(self) -> float:
+        """Block level that counts as speech, given the current noise floor."""
+        return max(SILENCE_RMS, SPEECH_OVER_FLOOR * (self._floor or 0.0))
+
+    @property
+    def speech_samples(self) -> int:
+        """Samples of speech so far, judged by the current threshold."""
+        return int(self._levels[self._bin(self.threshold) :].sum())
+
+    def feed(self, block: np.ndarray) -> bool:
+        if self.fired or not len(block):
+            return False
+        if block.ndim > 1:
+            block = block[:, 0] if block.shape[1] == 1 else block.mean(axis=1)
+        n = len(block)
+        x = block.astype(np.float32)
+        rms = float(np.sqrt(np.dot(x, x) / n))
+        if self._floor is None or rms < self._floor:
+            self._floor = max(rms, SILENCE_RMS / SPEECH_OVER_FLOOR)
+        else:
+            self._floor *= 1.0 + FLOOR_RISE * n / self.samplerate
+        # Unvoiced consonants count as speech at half the energy: doubling
+        # their level applies the same threshold to every block.
+        signs = np.signbit(block)
+        zcr = np.count_nonzero(signs[1:] != signs[:-1]) / n
+        level = rms * 2 if zcr >= FRICATIVE_ZCR else rms
+
+        self._pos += n
+        self._levels[self._bin(level)] += n
+        window = self._window
+        while window and window[-1][0] <= level:
+            window.pop()
+        window.append((level, self._pos))
+        while window[0][1] <= self._pos - self._trailing:
+            window.popleft()
+
+        if self._pos < self._trailing or (window and window[0][0] >= self.threshold):
+            return False
+        if self.speech_samples >= self._min_speech:
+            self.fired = True
+        return self.fired
@@ -0,0 +1,165 @@
+"""
+The event-loop thread API requests run on, and the tokens that cancel them.
+
+A blocking `httpx.Client.post` cannot be interrupted from another thread:
+once a dictation was being uploaded, `Controller.cancel()` could only mark
+the result as unwanted, while the upload, the wait for the answer and the
+worker of the transcription lane were tied up until the request ended on its
+own. A transform the user had already replaced by picking another format ran
+to the end the same way.
+
+Requests are made with `httpx.AsyncClient` instead, as coroutines on one
+long-lived loop running on its own daemon thread (`shared_loop()`). Callers
+stay synchronous: `EventLoopThread.run()` submits the coroutine and blocks
+until it finishes, the way the blocking call did. Given a `CancelToken`, the
+wait ends as soon as the token is cancelled: the coroutine's task is
+cancelled on the loop, which closes the stream (or the connection, for
+HTTP/1.1) the request was using, and `run()` raises
+`concurrent.futures.CancelledError` in the caller, freeing its thread.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+from concurrent.futures import CancelledError, TimeoutError
+from typing import Any, Callable, Coroutine
+
+logger = logging.getLogger(__name__)
+
+
+class CancelToken:
+    """A cancellation request shared by the pieces of one unit of work.
+
+    One token covers a dictation (all its segments, retries and the fallback
+    upload) or a transform. `cancel()` may be called from any thread, any
+    number of times; callbacks run once, on the cancelling thread.
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks: list[Callable[[], Any]] = []
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self):
+        with self._lock:
+            if self._event.is_set():
+                return
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                logger.warning(f"Cancel callback failed: {e}")
+
+    def add_callback(self, callback: Callable[[], Any]):
+        """Call `callback` on cancel; right away if already cancelled."""
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return
+        callback()
+
+    def remove_callback(self, callback: Callable[[], Any]):
+        with self._lock:
+            try:
+                self._callbacks.remove(callback)
+            except ValueError:
+                pass
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """Sleep up to `timeout`, waking early on cancel. Returns `cancelled`."""
+        return self._event.wait(timeout)
+
+
+class EventLoopThread:
+    """An asyncio loop running forever on a daemon thread."""
+
+    def __init__(self, name: str = "dicto-event-loop"):
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._main, name=name, daemon=True)
+        self._thread.start()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        return self._loop
+
+    def _main(self):
+        asyncio.set_event_loop(self._loop)
+        try:
+            self._loop.run_forever()
+        finally:
+            pending = asyncio.all_tasks(self._loop)
+            for task in pending:
+                task.cancel()
+            if pending:
+                self._loop.run_until_complete(
+                    asyncio.gather(*pending, return_exceptions=True)
+                )
+            self._loop.close()
+
+    def run(
+        self,
+        coro: Coroutine,
+        cancel: CancelToken | None = None,
+        timeout: float | None = None,
+    ) -> Any:
+        """Run `coro` on the loop and wait for its result.
+
+        Raises `concurrent.futures.CancelledError` when `cancel` is (or
+        already was) cancelled, once the request has been told to stop,
+        `concurrent.futures.TimeoutError` (the coroutine cancelled) after
+        `timeout`, and `RuntimeError` on the loop's own thread (it would wait
+        for itself) or after `stop()`.
+        """
+        if threading.current_thread() is self._thread:
+            coro.close()
+            raise RuntimeError("EventLoopThread.run() called from the loop thread")
+        if cancel is not None and cancel.cancelled:
+            coro.close()
+            raise CancelledError()
+        try:
+            future = asyncio.run_coroutine_threadsafe(coro, self._loop)
+        except RuntimeError:
+            coro.close()
+            raise
+        if cancel is not None:
+            cancel.add_callback(future.cancel)
+        try:
+            return future.result(timeout)
+        except TimeoutError:
+            future.cancel()
+            raise
+        finally:
+            if cancel is not None:
+                cancel.remove_callback(future.cancel)
+
+    def stop(self, timeout: float = 5.0):
+        """Stop the loop, cancelling what still runs on it, and join."""
+        if self._loop.is_closed():
+            return
+        try:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+        except RuntimeError:
+            return  # closed in between
+        if threading.current_thread() is not self._thread:
+            self._thread.join(timeout)
+
+
+_shared: EventLoopThread | None = None
+_shared_lock = threading.Lock()
+
+
+def shared_loop() -> EventLoopThread:
+    """The process-wide loop API requests run on, started on first use."""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = EventLoopThread()
+        return _shared
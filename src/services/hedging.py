@@ -0,0 +1,143 @@
+"""
+Hedged requests: a second copy of a transcription that is slow to answer.
+
+Most transcriptions come back in a second or two, but now and then one sits
+on a slow server instance for much longer, and that tail is what the user
+waits for after releasing the hotkey. The retry loop does not help there: it
+only kicks in once the request has failed, after the full client timeout.
+
+`HedgePolicy.run()` sends the request, and if it has not answered by the
+time most requests have (the `percentile` of recent latencies, and never
+sooner than `min_delay_s`), sends the same request again and takes whichever
+answer comes first; the other is cancelled, which aborts it (see
+event_loop.py). A copy that fails does not fail the call while the other is
+still running. Duplicates are capped at `max_extra` of all requests, so a
+server that is slow for everyone gets at most that much extra load, and no
+request is hedged until `min_samples` latencies have been seen.
+
+The latency of a request that lost to its hedge is recorded as the time it
+had been running when it was cancelled: a lower bound, but it keeps the slow
+tail in the window instead of letting the threshold drift down.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from typing import Awaitable, Callable, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Recent latencies the threshold is computed from.
+WINDOW = 100
+
+
+def _retrieve(task: asyncio.Task):
+    # A copy that failed after the other won: its error is not news.
+    if not task.cancelled():
+        task.exception()
+
+
+class HedgePolicy:
+    """When to send a duplicate of a slow request, and how many to allow.
+
+    One policy is shared by everything that sends the same kind of request,
+    so the latencies and the budget are the whole app's. Thread-safe.
+    """
+
+    def __init__(
+        self,
+        percentile: float = 0.9,
+        min_delay_s: float = 1.0,
+        max_extra: float = 0.1,
+        min_samples: int = 10,
+    ):
+        self.percentile = percentile
+        self.min_delay_s = min_delay_s
+        self.max_extra = max_extra
+        self.min_samples = min_samples
+        self._latencies: deque[float] = deque(maxlen=WINDOW)
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.hedged = 0
+        # Hedges that answered before the original.
+        self.won = 0
+
+    def delay(self) -> float | None:
+        """Seconds to wait before hedging; None while there is too little data."""
+        with self._lock:
+            if len(self._latencies) < self.min_samples:
+                return None
+            ordered = sorted(self._latencies)
+        threshold = ordered[int(self.percentile * (len(ordered) - 1))]
+        return max(self.min_delay_s, threshold)
+
+    def record(self, seconds: float):
+        with self._lock:
+            self._latencies.append(seconds)
+
+    def _take_budget(self) -> bool:
+        with self._lock:
+            if self.hedged + 1 > self.max_extra * self.requests:
+                return False
+            self.hedged += 1
+            return True
+
+    async def run(self, request: Callable[[], Awaitable[T]]) -> T:
+        """Await `request()`, racing a second call of it if the first is slow.
+
+        `request` must be safe to call twice (an idempotent request whose
+        body can be sent again). Raises the first error when every copy
+        failed.
+        """
+        with self._lock:
+            self.requests += 1
+        delay = self.delay()
+        started = time.monotonic()
+        primary = asyncio.ensure_future(request())
+        primary.add_done_callback(_retrieve)
+        tasks = [primary]
+        try:
+            if delay is not None:
+                done, _ = await asyncio.wait(tasks, timeout=delay)
+                if not done and self._take_budget():
+                    logger.info(
+                        f"No answer after {delay:.1f}s; sending a hedged request"
+                    )
+                    hedge = asyncio.ensure_future(request())
+                    hedge.add_done_callback(_retrieve)
+                    tasks.append(hedge)
+            error: BaseException | None = None
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in (t for t in tasks if t in done):
+                    if task.exception() is None:
+                        self.record(time.monotonic() - started)
+                        if task is not primary:
+                            with self._lock:
+                                self.won += 1
+                        return task.result()
+                    error = error or task.exception()
+            assert error is not None
+            raise error
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def as_dict(self) -> dict:
+        delay = self.delay()
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "hedged": self.hedged,
+                "won": self.won,
+                "delay_ms": None if delay is None else round(delay * 1000),
+            }
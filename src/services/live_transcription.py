@@ -0,0 +1,130 @@
+"""
+Live transcription: transcribing a recording while it is still being captured.
+
+In the default flow nothing is sent until the hotkey is released, so a 60 s
+dictation waits for the whole server round-trip after the user has stopped
+speaking. In live mode the recorder hands over each speech segment as soon as
+a pause closes it (see `LiveSegmenter`), this session posts it right away, and
+by the time the user releases the hotkey only the tail segment is still in
+flight. Texts are published in recording order as they land, for a preview,
+and stitched into the final transcription at the end.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable
+
+from src.services.event_loop import CancelToken
+from src.services.segmenter import LiveSegment, LiveSegmenter
+from src.services.transcriber import (
+    EmptyTranscriptionError,
+    Transcriber,
+    TranscriptionError,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class LiveTranscription:
+    """Transcribes the segments of one recording as they are captured.
+
+    `capture_tap` plugs into `AudioRecorder.set_capture_tap`; the segmenter it
+    builds calls `submit()`, which only queues the upload, so it is cheap
+    enough for the recording thread. `on_partial` receives the text of every
+    segment transcribed so far, joined in order, each time that prefix grows;
+    it is called from worker threads. `finish()` waits for all segments and
+    returns the final text.
+    """
+
+    def __init__(
+        self,
+        transcriber: Transcriber,
+        on_partial: Callable[[str], None] | None = None,
+        max_parallel: int = 2,
+    ):
+        self._transcriber = transcriber
+        self._on_partial = on_partial
+        self._pool = ThreadPoolExecutor(
+            max_workers=max(1, max_parallel), thread_name_prefix="live-segment"
+        )
+        self._lock = threading.Lock()
+        self._futures: dict[int, Future] = {}
+        self._texts: dict[int, str] = {}
+        # Segments [0, _published) have been included in a partial already.
+        self._published = 0
+        self._cancelled = False
+        # Aborts the segment uploads in flight on cancel().
+        self._cancel = CancelToken()
+
+    def capture_tap(self, samplerate: int, channels: int) -> LiveSegmenter:
+        """Recorder capture tap: segments the capture and submits each segment."""
+        return LiveSegmenter(samplerate, channels, self.submit)
+
+    def submit(self, segment: LiveSegment):
+        """Start transcribing a completed segment."""
+        with self._lock:
+            if self._cancelled:
+                return
+            duration = len(segment.audio) / segment.samplerate
+            logger.info(
+                f"Live segment {segment.index + 1} closed "
+                f"({duration:.1f}s at {segment.start / segment.samplerate:.1f}s)"
+            )
+            future = self._pool.submit(self._run, segment)
+            self._futures[segment.index] = future
+
+    def _run(self, segment: LiveSegment) -> str:
+        text = self._transcriber.transcribe_audio(
+            segment.audio, segment.samplerate, self._cancel
+        )
+        self._publish(segment.index, text)
+        return text
+
+    def _publish(self, index: int, text: str):
+        with self._lock:
+            self._texts[index] = text
+            start = self._published
+            while self._published in self._texts:
+                self._published += 1
+            if self._published == start or self._cancelled:
+                return
+            partial = self._join(self._published)
+        if self._on_partial is not None and partial:
+            try:
+                self._on_partial(partial)
+            except Exception as e:
+                logger.debug(f"Partial transcription callback failed: {e}")
+
+    def _join(self, count: int) -> str:
+        return " ".join(t for t in (self._texts.get(i, "") for i in range(count)) if t)
+
+    def finish(self, segment_count: int, timeout: float | None = None) -> str:
+        """Wait for segments [0, segment_count) and return their joined text.
+
+        Raises the first segment's TranscriptionError if any segment failed
+        after its retries, and EmptyTranscriptionError when no segment had
+        speech; the caller decides whether to fall back to the full recording.
+        """
+        logger.info(f"Finishing live transcription ({segment_count} segments)")
+        try:
+            with self._lock:
+                futures = [self._futures.get(i) for i in range(segment_count)]
+            if any(f is None for f in futures):
+                raise TranscriptionError("Live transcription is missing segments")
+            texts = [f.result(timeout=timeout) for f in futures]  # type: ignore[union-attr]
+        finally:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+        text = " ".join(t for t in texts if t)
+        if not text:
+            raise EmptyTranscriptionError("API returned empty transcription")
+        return text
+
+    def cancel(self):
+        """Drop pending uploads and abort the ones in flight."""
+        with self._lock:
+            self._cancelled = True
+        self._cancel.cancel()
+        self._pool.shutdown(wait=False, cancel_futures=True)
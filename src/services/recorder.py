@@ -2,19 +2,46 @@
 Audio recording service using sounddevice.
 """
 
+import contextlib
 import logging
 import sys
 import sounddevice as sd
 import soundfile as sf
 import numpy as np
 import threading
-import tempfile
 import time
 from pathlib import Path
 from typing import Optional
 
+from src.services.audio_buffer import FrameArena, FrameRing
+from src.services.audio_mix import LoopbackMixer
+from src.services.audio_telemetry import CaptureTelemetry
+from src.services.audio_sink import StreamingWavSink, new_temp_recording_path
+from src.services.capture_pipeline import (
+    FULL_SCALE_RMS,
+    CapturePipeline,
+    DownmixStage,
+    FeedStage,
+    LevelMeter,
+    MixStage,
+    QueuedStage,
+    ResampleStage,
+    block_rms,
+)
+from src.services.endpointing import MIN_SPEECH_S, TRAILING_SILENCE_S, EndpointDetector
+from src.services.recording_journal import JournalEntry, JournalStage, RecordingJournal
+from src.services.resampler import StreamingResampler
+
 logger = logging.getLogger(__name__)
 
+# Captured audio waits in a ring between the stream callback and the recording
+# thread. The thread empties it every POLL_S; RING_S is how long it may stall
+# (a GC pause, the GUI holding the GIL) before blocks are dropped.
+POLL_S = 0.02
+RING_S = 2.0
+# How often the device watcher looks for plugged and unplugged devices.
+DEVICE_POLL_S = 3.0
+
 
 def list_input_devices() -> list[dict]:
     """Return available input devices as [{id, name, channels, is_default}].
@@ -26,7 +53,7 @@ def list_input_devices() -> list[dict]:
     """
     devices = []
     try:
-        raw = sd.query_devices()
+        raw = get_capture_hub().devices.devices()
         try:
             default_in = sd.default.device[0]
         except Exception:
@@ -63,7 +90,8 @@ def _find_wasapi_loopback_device() -> tuple[int, int, int] | None:
     if sys.platform != "win32":
         return None
     try:
-        hostapis = sd.query_hostapis()
+        registry = get_capture_hub().devices
+        hostapis = registry.hostapis()
         wasapi_idx = next(
             (i for i, h in enumerate(hostapis) if "WASAPI" in h.get("name", "")),
             None,
@@ -73,7 +101,7 @@ def _find_wasapi_loopback_device() -> tuple[int, int, int] | None:
         out_idx = hostapis[wasapi_idx].get("default_output_device", -1)
         if out_idx is None or out_idx < 0:
             return None
-        dev = sd.query_devices(out_idx)
+        dev = registry.device(out_idx)
         channels = max(1, int(dev.get("max_output_channels", 2)))
         rate = int(dev.get("default_samplerate", 48000))
         logger.info(
@@ -94,7 +122,7 @@ def _find_stereo_mix_device() -> tuple[int, int] | None:
         return None
     try:
         keywords = ("stereo mix", "mezcla estéreo", "mezcla estereo", "loopback")
-        for i, dev in enumerate(sd.query_devices()):
+        for i, dev in enumerate(get_capture_hub().devices.devices()):
             name = dev.get("name", "").lower()
             ch = dev.get("max_input_channels", 0)
             if ch > 0 and any(kw in name for kw in keywords):
@@ -105,9 +133,46 @@ def _find_stereo_mix_device() -> tuple[int, int] | None:
     return None
 
 
+class _LoopbackConverter:
+    """Turns soundcard's float32 [-1, 1] blocks into mono int16, in place.
+
+    Downmixing, scaling, clipping and the int16 cast all write into two
+    buffers allocated once, instead of three fresh arrays per block on the
+    capture thread. The mix is mono because that is all the recorder mixes in,
+    and it halves what the later stages copy. The returned block is a view the
+    next call overwrites, like the `indata` of a PortAudio callback: consumers
+    copy what they keep. Channels are averaged before clipping, so one channel
+    past full scale no longer clips the mix.
+    """
+
+    def __init__(self, blocksize: int):
+        self._allocate(blocksize)
+
+    def _allocate(self, frames: int):
+        self._mix = np.empty(frames, dtype=np.float32)
+        self._out = np.empty((frames, 1), dtype=np.int16)
+
+    def convert(self, data: np.ndarray) -> np.ndarray:
+        n = len(data)
+        if n > len(self._mix):
+            self._allocate(n)
+        mix = self._mix[:n]
+        data = data.reshape(n, -1)
+        channels = data.shape[1]
+        if channels == 1:
+            np.multiply(data[:, 0], 32767.0, out=mix)
+        else:
+            np.sum(data, axis=1, out=mix)
+            np.multiply(mix, 32767.0 / channels, out=mix)
+        np.clip(mix, -32768, 32767, out=mix)
+        out = self._out[:n]
+        np.copyto(out[:, 0], mix, casting="unsafe")
+        return out
+
+
 class _SoundcardLoopbackStream:
     """Wraps `soundcard` loopback capture behind a start/stop/close interface
-    compatible with `sd.InputStream`, pushing int16 blocks to a callback.
+    compatible with `sd.InputStream`, pushing mono int16 blocks to a callback.
 
     - Windows: captures the default speaker with `include_loopback=True`.
     - Linux (PulseAudio/PipeWire): uses the default speaker's monitor source.
@@ -119,7 +184,11 @@ class _SoundcardLoopbackStream:
         self._callback = callback
         self._blocksize = blocksize
         self._samplerate = samplerate
-        self._channels = channels
+        # Captured in `capture_channels`, delivered as mono (see
+        # _LoopbackConverter).
+        self.capture_channels = channels
+        self.channels = 1
+        self._converter = _LoopbackConverter(blocksize)
         self._running = False
         self._thread: threading.Thread | None = None
 
@@ -140,23 +209,26 @@ class _SoundcardLoopbackStream:
         try:
             with self._mic.recorder(
                 samplerate=self._samplerate,
-                channels=self._channels,
+                channels=self.capture_channels,
                 blocksize=self._blocksize,
             ) as rec:
                 while self._running:
                     data = rec.record(numframes=self._blocksize)
                     if not self._running:
                         break
-                    # soundcard returns float32 in [-1, 1]; convert to int16
-                    int16 = np.clip(data * 32767.0, -32768, 32767).astype(np.int16)
+                    block = self._converter.convert(data)
                     try:
-                        self._callback(int16, len(int16), None, None)
+                        self._callback(block, len(block), None, None)
                     except Exception as e:
                         logger.debug(f"Loopback callback error: {e}")
         except Exception as e:
             logger.warning(f"Soundcard loopback stream error: {e}")
             self._running = False
 
+    @property
+    def active(self) -> bool:
+        return self._running
+
     def stop(self):
         self._running = False
         if self._thread is not None:
@@ -206,7 +278,7 @@ def _open_loopback_input_stream(callback, blocksize: int, dtype: str = "int16"):
             logger.warning("No loopback device available (no Stereo Mix found).")
             return None
         device, channels = result
-        dev_info = sd.query_devices(device)
+        dev_info = get_capture_hub().devices.device(device)
         native_rate = int(dev_info.get("default_samplerate", 48000))
         stream = sd.InputStream(
             samplerate=native_rate,
@@ -222,6 +294,600 @@ def _open_loopback_input_stream(callback, blocksize: int, dtype: str = "int16"):
         return None
 
 
+class DeviceRegistry:
+    """Cached view of the audio devices, refreshed in the background.
+
+    Listing devices and probing which rate a mic accepts are PortAudio calls
+    that take tens to hundreds of milliseconds, and the rate probe used to run
+    between the hotkey and the first captured sample. Here both are answered
+    from a cache filled on first use; the rate per (device, channels, dtype,
+    preferred rate).
+
+    PortAudio only sees hotplugged devices after a re-initialization, which
+    closes every stream. So `start_watching()` only compares, every
+    DEVICE_POLL_S, the list the OS reports (`_os_devices()`, a few
+    milliseconds), and `refresh()` re-initializes PortAudio when that list
+    changed or when asked to (`request_refresh()`: settings opened, a stream
+    that failed to open). It runs outside the lock the hub takes to open
+    streams and look up rates: cached answers keep coming, and only opening a
+    stream waits for it. Streams in use keep it from running;
+    `release_streams()` hands over those it may close (the warm mic between
+    recordings), which the listeners then reopen.
+    """
+
+    def __init__(self, lock=None, release_streams=None):
+        # Shared with the CaptureHub, so a re-initialization never runs while
+        # a stream is being opened.
+        self._lock = lock or threading.RLock()
+        # Called with the lock held: the streams to close before
+        # re-initializing, or None when one of them is in use.
+        self._release_streams = release_streams or (lambda: [])
+        self._restarting = False
+        self._restart_done = threading.Condition(self._lock)
+        self._refresh_requested = False
+        self._seen: tuple | None = None
+        self._devices: list[dict] | None = None
+        self._hostapis: list[dict] | None = None
+        self._rates: dict = {}
+        self._listeners: list = []
+        self._watch_stop: threading.Event | None = None
+
+    def wait_restart(self):
+        """Block until a re-initialization of PortAudio in progress is over."""
+        with self._lock:
+            while self._restarting:
+                self._restart_done.wait()
+
+    def devices(self) -> list[dict]:
+        """Every device PortAudio knows, as in `sd.query_devices()`."""
+        with self._lock:
+            if self._devices is None:
+                self.wait_restart()
+                self._devices = [dict(d) for d in sd.query_devices()]
+            return self._devices
+
+    def device(self, index: int) -> dict:
+        devices = self.devices()
+        if not 0 <= index < len(devices):
+            raise ValueError(f"No audio device {index}")
+        return devices[index]
+
+    def hostapis(self) -> list[dict]:
+        with self._lock:
+            if self._hostapis is None:
+                self.wait_restart()
+                self._hostapis = [dict(h) for h in sd.query_hostapis()]
+            return self._hostapis
+
+    def input_samplerate(
+        self, device: int | None, channels: int, preferred: int, dtype: str = "int16"
+    ) -> int:
+        """Return a sample rate the input device accepts.
+
+        Prefer `preferred`. If the device rejects it (some Linux devices only
+        expose 44.1/48 kHz), fall back to the device's default rate; the
+        recorder resamples the captured blocks.
+        """
+        key = (device, channels, dtype, preferred)
+        with self._lock:
+            rate = self._rates.get(key)
+            if rate is None:
+                self.wait_restart()
+                rate = self._rates[key] = self._probe_samplerate(*key)
+            return rate
+
+    def _probe_samplerate(
+        self, device: int | None, channels: int, dtype: str, preferred: int
+    ) -> int:
+        try:
+            sd.check_input_settings(
+                device=device, channels=channels, dtype=dtype, samplerate=preferred
+            )
+            return preferred
+        except Exception:
+            try:
+                target = device
+                if target is None:
+                    target = sd.default.device[0]
+                # sd.default.device[0] is -1 when there is no default input
+                # device; querying device -1 raises "Error querying device -1".
+                if target is None or target < 0:
+                    native = 48000
+                else:
+                    native = int(self.device(target).get("default_samplerate", 48000))
+            except Exception:
+                native = 48000
+            logger.info(
+                f"Mic does not support {preferred} Hz; "
+                f"recording at {native} Hz and resampling"
+            )
+            return native
+
+    def invalidate(self, device: int | None = None):
+        """Forget the rates probed for `device` (a stream on it failed to open)."""
+        with self._lock:
+            for key in [k for k in self._rates if k[0] == device]:
+                del self._rates[key]
+
+    def add_listener(self, callback):
+        """Call `callback()` (from the refreshing thread) when the devices
+        change or a re-initialization closed released streams."""
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        with contextlib.suppress(ValueError):
+            self._listeners.remove(callback)
+
+    @staticmethod
+    def _fingerprint(devices: list[dict]) -> list[tuple]:
+        return [
+            (
+                d.get("name"),
+                d.get("hostapi"),
+                d.get("max_input_channels"),
+                d.get("default_samplerate"),
+            )
+            for d in devices
+        ]
+
+    @staticmethod
+    def _os_devices() -> tuple | None:
+        """The capture devices the OS sees right now; None if it cannot tell.
+
+        Asked through `soundcard` (PulseAudio/PipeWire, WASAPI), which needs
+        no re-initialization to see a hotplugged device.
+        """
+        try:
+            import soundcard as sc
+
+            return tuple(
+                sorted(m.id for m in sc.all_microphones(include_loopback=True))
+            )
+        except Exception:
+            return None
+
+    def refresh(self, force: bool = False) -> bool:
+        """Re-initialize PortAudio if the OS device list changed (or `force`).
+
+        Returns True, and calls the listeners, if PortAudio's device list
+        changed; the listeners are also called when released streams were
+        closed. Does nothing while a stream is in use: the next poll (or
+        request) tries again.
+        """
+        seen = self._os_devices()
+        if not force and (seen is None or seen == self._seen):
+            return False
+        with self._lock:
+            if self._restarting:
+                return False
+            released = self._release_streams()
+            if released is None:
+                return False
+            self._restarting = True
+            before = self._devices
+        after = None
+        try:
+            for shared in released:
+                shared.close()
+            try:
+                # Private, but the only way to make PortAudio rescan.
+                sd._terminate()
+                sd._initialize()
+            except Exception as e:
+                logger.debug(f"Could not re-initialize PortAudio: {e}")
+            try:
+                after = [dict(d) for d in sd.query_devices()]
+            except Exception as e:
+                logger.warning(f"Failed to list audio devices: {e}")
+        finally:
+            with self._lock:
+                self._restarting = False
+                changed = (
+                    after is not None
+                    and before is not None
+                    and self._fingerprint(before) != self._fingerprint(after)
+                )
+                if after is not None:
+                    self._devices = after
+                    self._hostapis = None
+                if changed:
+                    self._rates.clear()
+                self._restart_done.notify_all()
+        self._seen = seen
+        if changed:
+            logger.info(f"Audio devices changed ({len(after)} devices)")
+        if changed or released:
+            for callback in list(self._listeners):
+                try:
+                    callback()
+                except Exception as e:
+                    logger.error(f"Device change listener failed: {e}")
+        return changed
+
+    def request_refresh(self):
+        """Run `refresh(force=True)` on a daemon thread, once at a time."""
+        with self._lock:
+            if self._refresh_requested:
+                return
+            self._refresh_requested = True
+
+        def run():
+            try:
+                self.refresh(force=True)
+            finally:
+                with self._lock:
+                    self._refresh_requested = False
+
+        threading.Thread(target=run, name="dicto-devices", daemon=True).start()
+
+    def start_watching(self, interval: float = DEVICE_POLL_S):
+        """Watch the OS device list every `interval` seconds until stopped."""
+        if self._watch_stop is not None:
+            return
+        stop = self._watch_stop = threading.Event()
+
+        def watch():
+            self._seen = self._os_devices()
+            while not stop.wait(interval):
+                self.refresh()
+
+        threading.Thread(target=watch, name="dicto-devices", daemon=True).start()
+
+    def stop_watching(self):
+        stop, self._watch_stop = self._watch_stop, None
+        if stop is not None:
+            stop.set()
+
+
+# Key of the system-audio stream in a CaptureHub (mic streams are keyed by
+# (device, channels)).
+LOOPBACK = "loopback"
+
+
+class _SharedStream:
+    """One open stream and the callbacks subscribed to it."""
+
+    def __init__(self, key):
+        self.key = key
+        self.stream = None
+        self.samplerate = 0
+        self.channels = 0
+        # Replaced, never mutated, so the callback can read it without a lock.
+        self.subscribers: tuple = ()
+        # Subscriber -> whether it can lose the stream right now (see
+        # `CaptureHub.subscribe`).
+        self.standby: dict = {}
+        # Closed for a re-initialization of PortAudio.
+        self.released = False
+        self._subscriber_failed = False
+
+    def dispatch(self, indata, frames, time_info, status):
+        for callback in self.subscribers:
+            try:
+                callback(indata, frames, time_info, status)
+            except Exception as e:
+                # Once per stream at warning level; after that the same error
+                # on every block would flood the log.
+                if self._subscriber_failed:
+                    logger.debug(f"Capture subscriber error: {e}")
+                else:
+                    self._subscriber_failed = True
+                    logger.warning(f"Capture subscriber error on {self.key}: {e}")
+
+    @property
+    def active(self) -> bool:
+        if self.released:
+            return False
+        try:
+            return bool(self.stream.active)
+        except Exception:
+            return False
+
+    def close(self):
+        try:
+            self.stream.stop()
+            self.stream.close()
+        except Exception as e:
+            logger.debug(f"Error closing shared capture stream: {e}")
+
+
+class CaptureSubscription:
+    """A callback's share of a `CaptureHub` stream; `close()` gives it back.
+
+    Usable as a context manager, like the `sd.InputStream` it stands in for.
+    """
+
+    def __init__(self, hub: "CaptureHub", shared: _SharedStream, callback):
+        self._hub = hub
+        self._shared = shared
+        self._callback = callback
+        self.samplerate = shared.samplerate
+        self.channels = shared.channels
+        self._closed = False
+
+    @property
+    def active(self) -> bool:
+        return not self._closed and self._shared.active
+
+    def close(self):
+        if not self._closed:
+            self._closed = True
+            self._hub._unsubscribe(self._shared, self._callback)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class CaptureHub:
+    """Opens each capture device once and shares it between its users.
+
+    The recorder, its warm mic and the settings "test audio" monitor all
+    subscribe a callback instead of opening their own stream: the first
+    subscriber to a device opens it, later ones join it, and the last one to
+    leave closes it. Some backends refuse a second open of a device, and on the
+    others it doubles the capture cost. Every subscriber of a stream gets every
+    block, so callbacks must stay as cheap as any stream callback.
+
+    `devices` is the `DeviceRegistry` the sample rates come from; it only
+    re-initializes PortAudio while every open stream is held by standby
+    subscribers alone, and closes those streams first.
+    """
+
+    def __init__(self):
+        # Reentrant: subscribe() negotiates the rate while holding it.
+        self._lock = threading.RLock()
+        self._streams: dict = {}
+        self.devices = DeviceRegistry(self._lock, self._release_standby)
+
+    def samplerate(self, device: int | None, channels: int, preferred: int) -> int:
+        """The rate a subscriber to `device` would get right now.
+
+        That of the stream already open on it, or else the negotiated one.
+        """
+        with self._lock:
+            shared = self._streams.get((device, channels))
+            if shared is not None and shared.active:
+                return shared.samplerate
+            return self.devices.input_samplerate(device, channels, preferred)
+
+    def subscribe(
+        self,
+        device: int | None,
+        channels: int,
+        callback,
+        samplerate: int,
+        blocksize: int = 1024,
+        standby=None,
+    ) -> CaptureSubscription:
+        """Route the blocks of the mic `device` to `callback` until closed.
+
+        Joins the stream already open on the device, or opens (and starts) one
+        at `samplerate`. Raises if the device is open at another rate, or if
+        it cannot be opened.
+
+        `standby()`, if given, tells whether the subscriber can lose the
+        stream right now: the device registry may then close it to
+        re-initialize PortAudio (`active` turns False) and notifies its
+        listeners afterwards.
+        """
+        key = (device, channels)
+        with self._lock:
+            self.devices.wait_restart()
+            shared = self._streams.get(key)
+            if shared is not None and not shared.active:
+                # Died under its subscribers (device unplugged, server
+                # restarted): they keep the dead one, newcomers get a new one.
+                shared = None
+            if shared is None:
+                shared = _SharedStream(key)
+                try:
+                    shared.stream = sd.InputStream(
+                        samplerate=samplerate,
+                        channels=channels,
+                        dtype="int16",
+                        blocksize=blocksize,
+                        callback=shared.dispatch,
+                        device=device,
+                    )
+                    shared.samplerate = samplerate
+                    shared.channels = channels
+                    self._start(shared)
+                except Exception:
+                    # Unplugged, or its settings changed: probe afresh next
+                    # time, and have PortAudio rescan the devices.
+                    self.devices.invalidate(device)
+                    self.devices.request_refresh()
+                    raise
+                self._streams[key] = shared
+                logger.debug(f"Capture stream opened: device={device}, {samplerate} Hz")
+            elif shared.samplerate != samplerate:
+                raise RuntimeError(
+                    f"Input device is already open at {shared.samplerate} Hz"
+                )
+            return self._add(shared, callback, standby)
+
+    def subscribe_loopback(
+        self, callback, blocksize: int = 1024
+    ) -> CaptureSubscription | None:
+        """Route system audio to `callback`; None when no loopback is available."""
+        with self._lock:
+            self.devices.wait_restart()
+            shared = self._streams.get(LOOPBACK)
+            if shared is None:
+                shared = _SharedStream(LOOPBACK)
+                result = _open_loopback_input_stream(shared.dispatch, blocksize)
+                if result is None:
+                    return None
+                shared.stream, shared.samplerate = result
+                shared.channels = shared.stream.channels
+                self._start(shared)
+                self._streams[LOOPBACK] = shared
+            return self._add(shared, callback)
+
+    @staticmethod
+    def _start(shared: _SharedStream):
+        try:
+            shared.stream.start()
+        except Exception:
+            shared.close()
+            raise
+
+    def _add(
+        self, shared: _SharedStream, callback, standby=None
+    ) -> CaptureSubscription:
+        if standby is not None:
+            shared.standby = {**shared.standby, callback: standby}
+        shared.subscribers = shared.subscribers + (callback,)
+        return CaptureSubscription(self, shared, callback)
+
+    def _release_standby(self) -> list | None:
+        """Unregister every open stream, for a re-initialization of PortAudio.
+
+        None, and nothing released, unless each subscriber of each stream is
+        a standby one that can lose it now. Called with the lock held.
+        """
+        for shared in self._streams.values():
+            for callback in shared.subscribers:
+                standby = shared.standby.get(callback)
+                if standby is None or not standby():
+                    return None
+        released = list(self._streams.values())
+        for shared in released:
+            shared.released = True
+        self._streams.clear()
+        return released
+
+    def _unsubscribe(self, shared: _SharedStream, callback):
+        with self._lock:
+            subscribers = list(shared.subscribers)
+            if callback in subscribers:
+                subscribers.remove(callback)
+            shared.subscribers = tuple(subscribers)
+            shared.standby = {
+                k: v for k, v in shared.standby.items() if k is not callback
+            }
+            # A released stream was closed by the device registry already.
+            if subscribers or shared.released:
+                return
+            if self._streams.get(shared.key) is shared:
+                del self._streams[shared.key]
+        # Outside the lock: closing can block for a while (PipeWire), and
+        # other devices' subscribers need not wait for it.
+        shared.close()
+        logger.debug(f"Capture stream closed: {shared.key}")
+
+
+_capture_hub = CaptureHub()
+
+
+def get_capture_hub() -> CaptureHub:
+    """The hub shared by every recorder and monitor in the process."""
+    return _capture_hub
+
+
+class _WarmMic:
+    """A mic stream kept open between recordings (`audio.warm_mic`).
+
+    Opening an input stream is the slow part of starting a recording: the rate
+    probe plus `sd.InputStream` can take hundreds of milliseconds on PipeWire,
+    which clips the first syllable. Kept open (a `CaptureHub` subscription,
+    so the test-audio monitor shares it), the stream costs one callback per
+    block that copies it into a small ring of the most recent audio, and a
+    recording starts by attaching to it: the ring becomes the recording's
+    pre-roll and the following blocks go straight to the recorder's callback.
+
+    It is a standby subscriber: unless attached or `in_use()` (the recorder is
+    recording), the hub may close its stream to re-initialize PortAudio, and
+    the recorder's device listener reopens it.
+    """
+
+    def __init__(
+        self,
+        hub: CaptureHub,
+        samplerate: int,
+        channels: int,
+        device: int | None,
+        blocksize: int,
+        preroll_frames: int,
+        in_use=None,
+    ):
+        self.samplerate = samplerate
+        self.channels = channels
+        self.device = device
+        self._ring = np.zeros((max(0, preroll_frames), channels), dtype=np.int16)
+        self._ring_pos = 0
+        self._ring_filled = 0
+        # Taken by every callback, so attach/detach happen between two blocks.
+        self._lock = threading.Lock()
+        self._consumer = None
+        self._in_use = in_use or (lambda: False)
+        self._subscription = hub.subscribe(
+            device,
+            channels,
+            self._callback,
+            samplerate,
+            blocksize,
+            standby=lambda: self._consumer is None and not self._in_use(),
+        )
+
+    @property
+    def active(self) -> bool:
+        return self._subscription.active
+
+    def _callback(self, indata, frames, time_info, status):
+        with self._lock:
+            consumer = self._consumer
+            if consumer is None:
+                self._remember(indata)
+                return
+            consumer(indata, frames, time_info, status)
+
+    def _remember(self, block: np.ndarray):
+        size = len(self._ring)
+        if size == 0:
+            return
+        block = block[-size:]
+        n = len(block)
+        first = min(n, size - self._ring_pos)
+        self._ring[self._ring_pos : self._ring_pos + first] = block[:first]
+        self._ring[: n - first] = block[first:]
+        self._ring_pos = (self._ring_pos + n) % size
+        self._ring_filled = min(size, self._ring_filled + n)
+
+    def _preroll(self) -> np.ndarray:
+        if self._ring_filled < len(self._ring):
+            return self._ring[: self._ring_filled].copy()
+        return np.concatenate(
+            [self._ring[self._ring_pos :], self._ring[: self._ring_pos]]
+        )
+
+    def attach(self, consumer, preroll: bool = True):
+        """Route blocks to `consumer` (an InputStream callback) from now on.
+
+        With `preroll` the ring is handed to it first, before any live block.
+        """
+        with self._lock:
+            if preroll and self._ring_filled:
+                seed = self._preroll()
+                consumer(seed, len(seed), None, None)
+            self._consumer = consumer
+
+    def detach(self):
+        """Back to idle; the next pre-roll only holds audio from after this."""
+        with self._lock:
+            self._consumer = None
+            self._ring_pos = 0
+            self._ring_filled = 0
+
+    def close(self):
+        with self._lock:
+            self._consumer = None
+        self._subscription.close()
+
+
 class AudioRecorder:
     """Records audio from the microphone, optionally mixing system audio (Windows)."""
 
@@ -232,15 +898,28 @@ class AudioRecorder:
         max_duration: int = 7200,
         input_device: int | None = None,
         include_system_audio: bool = False,
+        stream_to_disk: bool = False,
+        warm_mic: bool = False,
+        preroll_ms: int = 300,
+        hub: CaptureHub | None = None,
+        watch_devices: bool = False,
+        journal: RecordingJournal | None = None,
     ):
         self.sample_rate = sample_rate
         self.channels = channels
         self.max_duration = max_duration
         self.input_device = input_device
         self.include_system_audio = include_system_audio
+        # Append blocks to the WAV file as they are captured instead of keeping
+        # them in memory until stop. See StreamingWavSink.
+        self.stream_to_disk = stream_to_disk
         self.chunk_size = 1024
+        # Where the streams come from: shared with the warm mic and the
+        # settings audio test, so a device is never open twice.
+        self._hub = hub or get_capture_hub()
 
-        self.frames = []
+        # Captured mic audio, copied block by block into preallocated chunks.
+        self.frames = FrameArena(channels)
         self.is_recording = False
         self.recording_thread = None
         # Guards start/stop against a previous recording thread that outlived
@@ -255,20 +934,67 @@ class AudioRecorder:
         self._stale_threads: list[threading.Thread] = []
         self.temp_file_path = None
         self._audio_level_callback = None
-        self._loopback_frames: list[np.ndarray] = []
-        self._loopback_lock = threading.Lock()
+        # Mixes system audio into the mic blocks as they are captured; set
+        # while a recording with include_system_audio has its loopback open.
+        self._mixer: LoopbackMixer | None = None
         self._loopback_samplerate = sample_rate
         # Actual sample rate the mic stream opened at; may differ from
         # self.sample_rate if the device doesn't support 16 kHz natively.
         self._mic_samplerate = sample_rate
-        self._mic_level = 0.0
-        self._loopback_level = 0.0
+        # What the recording thread does with the captured mic blocks (see
+        # _build_pipeline), kept until stop_recording() flushes it.
+        self._pipeline: CapturePipeline | None = None
+        # Factories of stages added with add_capture_stage().
+        self._stage_factories: list = []
+        # Stream flags, callback timing and dropped audio of the current (or
+        # last) recording.
+        self._telemetry = CaptureTelemetry()
         # Duration (seconds) of the last completed recording. Captured at
         # stop time because stop_recording() clears self.frames afterwards.
         self._last_duration = 0.0
         # Set by the recording thread when it aborts (e.g. no input device);
         # surfaced by stop_recording so the UI can show the real cause.
         self._record_error: str | None = None
+        # Open while a streaming (stream_to_disk) recording is in progress.
+        self._sink: StreamingWavSink | None = None
+        # Capture tap: something that consumes the audio while it is being
+        # recorded (the live segmenter, or a streaming upload). It runs as a
+        # queued stage at the end of the pipeline, on its own thread.
+        self._tap_factory = None
+        self._tap_stage: QueuedStage | None = None
+        # What the last recording's tap.flush() returned, or None if the
+        # recording ran without a tap (or the tap failed).
+        self._tap_result = None
+        # Crash-safe copy of each recording (see RecordingJournal), written by
+        # a queued stage; the entry of the current (or last) recording.
+        self.journal = journal
+        self._journal_stage: QueuedStage | None = None
+        self._journal_entry: JournalEntry | None = None
+        # Hands-free stopping: called (from the recording thread) once an
+        # EndpointDetector on the mic blocks hears the user stop speaking.
+        self._on_speech_end = None
+        self._trailing_silence_s = TRAILING_SILENCE_S
+        self._min_speech_s = MIN_SPEECH_S
+        self._endpoint: EndpointDetector | None = None
+        # Start latency: perf_counter() when start_recording() was called (the
+        # controller calls it straight from the hotkey callback), and how long
+        # the first captured sample took to arrive after that.
+        self._start_requested_at = 0.0
+        self._start_latency: float | None = None
+        self._start_was_warm = False
+        # Warm standby stream (see _WarmMic); None when disabled or unavailable.
+        self.warm_mic = warm_mic
+        self.preroll_ms = preroll_ms
+        self._warm: _WarmMic | None = None
+        self._warm_lock = threading.Lock()
+        if warm_mic:
+            self._ensure_warm_mic()
+        # Keep the device list and rates current as devices come and go.
+        self._watch_devices = watch_devices
+        if watch_devices:
+            self._hub.devices.add_listener(self._on_devices_changed)
+            self._hub.devices.start_watching()
+            self._prefetch_samplerate()
 
     # ── Configuration updates ─────────────────────────────────
 
@@ -278,10 +1004,183 @@ class AudioRecorder:
 
     def set_input_device(self, device_id: int | None):
         self.input_device = device_id
+        if self._watch_devices:
+            self._prefetch_samplerate()
+        # A recording in progress keeps its stream; the warm mic moves to the
+        # new device once it ends.
+        if self.warm_mic and not self.is_recording:
+            self._rewarm_in_background()
 
     def set_include_system_audio(self, enabled: bool):
         self.include_system_audio = enabled
 
+    def set_stream_to_disk(self, enabled: bool):
+        self.stream_to_disk = enabled
+
+    def set_capture_tap(self, factory):
+        """Consume audio while recording (None disables).
+
+        `factory(samplerate, channels)` is called once the mic is open and
+        returns an object with `feed(block)` and `flush()`. Blocks are what gets
+        recorded: int16 at self.sample_rate, system audio mixed in. `feed` runs
+        on the recording thread as the blocks are processed, and `flush` runs
+        from stop_recording() after the last block, so both must return
+        quickly. Takes effect from the next recording.
+        """
+        self._tap_factory = factory
+
+    def add_capture_stage(self, factory):
+        """Run a stage of your own on the audio of every recording.
+
+        `factory(samplerate, channels)` is called when a recording starts and
+        returns a `CaptureStage`, appended to the end of the mic pipeline: it
+        sees the blocks as recorded (int16 at self.sample_rate, system audio
+        mixed in), on the recording thread. Wrap it in a `QueuedStage` if it
+        may block. Takes effect from the next recording.
+        """
+        self._stage_factories.append(factory)
+
+    def remove_capture_stage(self, factory):
+        with contextlib.suppress(ValueError):
+            self._stage_factories.remove(factory)
+
+    def set_auto_stop(
+        self,
+        callback,
+        trailing_silence_s: float = TRAILING_SILENCE_S,
+        min_speech_s: float = MIN_SPEECH_S,
+    ):
+        """Call `callback()` when the user stops speaking (None disables).
+
+        Fires once per recording, after at least `min_speech_s` of speech
+        followed by `trailing_silence_s` of silence. It runs on the recording
+        thread and only reports: stopping is up to the callback, which must
+        not call stop_recording() from that thread. Takes effect from the next
+        recording.
+        """
+        self._on_speech_end = callback
+        self._trailing_silence_s = trailing_silence_s
+        self._min_speech_s = min_speech_s
+
+    def get_telemetry(self) -> CaptureTelemetry:
+        """Stream statistics of the current (or last) recording.
+
+        Overflows, callback durations, inter-callback jitter, queue depth and
+        dropped blocks, per stream (mic, loopback). Live while recording.
+        """
+        return self._telemetry
+
+    def get_capture_tap_result(self):
+        """What the last recording's tap returned from flush(), if it had one."""
+        return self._tap_result
+
+    def get_journal_entry(self) -> JournalEntry | None:
+        """The journal entry of the last recording, once it has stopped.
+
+        None without a journal, or if journaling that recording failed. The
+        caller owns it: `discard()` it once the recording is delivered.
+        """
+        return self._journal_entry
+
+    def set_warm_mic(self, enabled: bool, preroll_ms: int | None = None):
+        """Keep the mic open while idle so recordings start instantly."""
+        self.warm_mic = enabled
+        if preroll_ms is not None and preroll_ms != self.preroll_ms:
+            self.preroll_ms = preroll_ms
+            self._close_warm_mic()
+        if enabled:
+            self._ensure_warm_mic()
+        else:
+            self._close_warm_mic()
+
+    def get_start_latency(self) -> float | None:
+        """Seconds from start_recording() to the first captured sample.
+
+        None until the first block of the current (or last) recording has
+        arrived. With a warm mic the first block is the pre-roll, which holds
+        audio from before the call.
+        """
+        return self._start_latency
+
+    # ── Warm mic ─────────────────────────────────────────────
+
+    def _ensure_warm_mic(self):
+        """Open the warm stream unless one is already running on this device.
+
+        Failures only log: recordings then open their own stream as usual.
+        """
+        with self._warm_lock:
+            warm = self._warm
+        if warm is not None and warm.active and warm.device == self.input_device:
+            return
+        self._close_warm_mic()
+        if not self.warm_mic:
+            return
+        try:
+            if self.input_device is None and sd.default.device[0] < 0:
+                return
+            rate = self._negotiate_mic_samplerate()
+            warm = _WarmMic(
+                self._hub,
+                rate,
+                self.channels,
+                self.input_device,
+                self.chunk_size,
+                preroll_frames=int(rate * self.preroll_ms / 1000),
+                in_use=lambda: self.is_recording,
+            )
+        except Exception as e:
+            logger.warning(f"Could not keep the mic open between recordings: {e}")
+            return
+        with self._warm_lock:
+            old, self._warm = self._warm, warm
+        if old is not None:
+            old.close()
+        logger.info(
+            f"Warm mic open (device={self.input_device}, {rate} Hz, "
+            f"{self.preroll_ms} ms pre-roll)"
+        )
+
+    def _prefetch_samplerate(self):
+        """Probe the mic's rate in the background, so no recording waits on it."""
+
+        def probe():
+            try:
+                self._negotiate_mic_samplerate()
+            except Exception as e:
+                logger.debug(f"Could not probe the mic's sample rate: {e}")
+
+        threading.Thread(target=probe, name="dicto-rate-probe", daemon=True).start()
+
+    def _on_devices_changed(self):
+        # A device came or went, or PortAudio was re-initialized: the cached
+        # rates may be gone, and the warm mic's stream closed or dead. Runs on
+        # the refreshing thread, so probing and reopening here block no one.
+        with contextlib.suppress(Exception):
+            self._negotiate_mic_samplerate()
+        if self.warm_mic and not self.is_recording:
+            self._ensure_warm_mic()
+
+    def _rewarm_in_background(self):
+        # Opening a stream is the slow operation the warm mic exists to take
+        # off the hotkey path, so it must not land on the stop path either.
+        threading.Thread(
+            target=self._ensure_warm_mic, name="dicto-warm-mic", daemon=True
+        ).start()
+
+    def _close_warm_mic(self):
+        with self._warm_lock:
+            warm, self._warm = self._warm, None
+        if warm is not None:
+            warm.close()
+
+    def _usable_warm_mic(self) -> _WarmMic | None:
+        with self._warm_lock:
+            warm = self._warm
+        if warm is None or warm.device != self.input_device or not warm.active:
+            return None
+        return warm
+
     def set_audio_level_callback(self, callback):
         """Set a callback that receives audio level (0.0-1.0) for each chunk."""
         self._audio_level_callback = callback
@@ -299,10 +1198,20 @@ class AudioRecorder:
                 return False
             try:
                 self._reap_stale_threads()
-                self.frames = []
-                self._loopback_frames = []
+                self.frames = FrameArena(self.channels)
+                self._mixer = None
+                self._sink = None
+                self._pipeline = None
+                self._tap_stage = None
+                self._tap_result = None
+                self._journal_stage = None
+                self._journal_entry = None
+                self._endpoint = None
+                self._telemetry = CaptureTelemetry()
                 self._record_error = None
                 self._last_duration = 0.0
+                self._start_requested_at = time.perf_counter()
+                self._start_latency = None
                 self._session_id += 1
                 session = self._session_id
                 self.is_recording = True
@@ -349,38 +1258,45 @@ class AudioRecorder:
                 self._reap_stale_threads()
         self.recording_thread = None
 
+        self._flush_pipeline()
+        mixer, self._mixer = self._mixer, None
+        if mixer is not None:
+            logger.info(
+                f"System audio mixed live (clock drift {mixer.drift_ppm:+.0f} ppm, "
+                f"{mixer.underruns} underruns, {mixer.overruns} overruns)"
+            )
+        telemetry = self._telemetry
+        if telemetry.clean:
+            logger.debug(f"Capture telemetry: {telemetry.summary()}")
+        else:
+            logger.warning(f"Audio lost while recording: {telemetry.summary()}")
+
+        if self._sink is not None:
+            return self._finish_sink()
+
         if len(self.frames) == 0:
             logger.warning("No audio data recorded")
             return None
 
+        # Hand the arena over and give the recorder a fresh one, so its chunks
+        # are released as soon as the encoding below is done with them.
+        frames, self.frames = self.frames, FrameArena(self.channels)
         try:
-            temp_file = tempfile.NamedTemporaryFile(
-                suffix=".wav", delete=False, prefix="voice_recording_"
-            )
-            self.temp_file_path = temp_file.name
-            temp_file.close()
-
-            audio_data = np.concatenate(self.frames, axis=0)
-            # Free frame buffers immediately after concatenation
-            self.frames = []
-            # Resample to self.sample_rate if the device recorded at a
-            # different native rate.
-            audio_data = self._resample_mic(audio_data)
-            duration = len(audio_data) / self.sample_rate
+            self.temp_file_path = new_temp_recording_path()
+            # Already resampled and mixed: stream the arena's chunks straight
+            # into the file without building one big array.
+            duration = len(frames) / self.sample_rate
             self._last_duration = duration
-
-            try:
-                if self.include_system_audio and self._loopback_frames:
-                    mixed = self._mix_with_loopback(audio_data)
-                    del audio_data
-                    sf.write(self.temp_file_path, mixed, self.sample_rate)
-                    del mixed
-                else:
-                    sf.write(self.temp_file_path, audio_data, self.sample_rate)
-                    del audio_data
-            finally:
-                with self._loopback_lock:
-                    self._loopback_frames = []
+            with sf.SoundFile(
+                self.temp_file_path,
+                mode="w",
+                samplerate=self.sample_rate,
+                channels=self.channels,
+                subtype="PCM_16",
+            ) as out:
+                for view in frames.views():
+                    out.write(view)
+            del frames
 
             logger.info(f"Recording saved: {self.temp_file_path} ({duration:.1f}s)")
 
@@ -388,113 +1304,135 @@ class AudioRecorder:
 
         except Exception as e:
             logger.error(f"Error saving recording: {e}")
-            self.frames = []
-            with self._loopback_lock:
-                self._loopback_frames = []
             return None
 
-    def _mix_with_loopback(self, mic_int16: np.ndarray) -> np.ndarray:
-        """Sum mic and loopback buffers as int16, clipping to avoid overflow."""
+    def _flush_pipeline(self):
+        """Run the audio the stages still hold through, and flush the tap."""
+        pipeline, self._pipeline = self._pipeline, None
+        tap, self._tap_stage = self._tap_stage, None
+        journal, self._journal_stage = self._journal_stage, None
+        if pipeline is None:
+            return
         try:
-            with self._loopback_lock:
-                loopback_frames = self._loopback_frames
-                self._loopback_frames = []  # release immediately under lock
-            loopback = (
-                np.concatenate(loopback_frames, axis=0) if loopback_frames else None
+            pipeline.flush()
+        except Exception as e:
+            logger.error(
+                f"Error flushing the capture pipeline: {e}; the recording is "
+                "truncated (audio still held in the stages is lost)"
             )
-            del loopback_frames  # free list of chunks
+            pipeline.close()
+            # Neither the tap's work nor the journal covers the whole take:
+            # transcribe the saved file, and don't keep a copy for recovery.
+            self._tap_result = None
+            entry, self._journal_entry = self._journal_entry, None
+            if journal is not None:
+                entry = journal.stage.entry
+            if entry is not None:
+                entry.discard()
+            return
+        # A tap is only a head start: one that failed is left out, and the
+        # caller transcribes the finished file instead.
+        if tap is not None and not tap.failed:
+            self._tap_result = tap.stage.result
+        # A journal with a gap in it is no use for recovery.
+        if journal is not None and journal.failed:
+            self._journal_entry = None
+            journal.stage.entry.discard()
+
+    def _open_sink(self, samplerate: int):
+        """Start a streaming recording file at `samplerate`."""
+        self._sink = StreamingWavSink(
+            new_temp_recording_path(), samplerate=samplerate, channels=self.channels
+        )
 
-            if loopback is None:
-                return mic_int16
+    def _build_pipeline(self, mic_rate: int) -> CapturePipeline:
+        """The stages the mic blocks of this recording go through.
 
-            if loopback.ndim > 1 and loopback.shape[1] > 1:
-                loopback_mono = loopback.mean(axis=1).astype(np.int16)
-                del loopback
+        The level meter and the end-of-speech detector see the mic as
+        captured. The audio is then brought to self.sample_rate, system audio
+        is mixed in, and the result goes to the sink (or the arena), the
+        capture tap, the journal and any stages added with add_capture_stage().
+        """
+        stages = [LevelMeter("mic_level")]
+        if self._endpoint is not None:
+            stages.append(FeedStage("endpoint", self._endpoint.feed, required=False))
+        if mic_rate != self.sample_rate:
+            stages.append(
+                ResampleStage(
+                    StreamingResampler(mic_rate, self.sample_rate, self.channels)
+                )
+            )
+        if self._mixer is not None:
+            stages.append(MixStage(self._mixer))
+        sink = self._sink
+        stages.append(
+            FeedStage("writer", sink.write if sink is not None else self.frames.append)
+        )
+        if self._tap_factory is not None:
+            tap = self._tap_factory(self.sample_rate, self.channels)
+            self._tap_stage = QueuedStage(
+                FeedStage("tap", tap.feed, tap.flush, required=False)
+            )
+            stages.append(self._tap_stage)
+        if self.journal is not None:
+            try:
+                entry = self.journal.begin(self.sample_rate, self.channels)
+            except OSError as e:
+                logger.error(f"Recording without a journal: {e}")
             else:
-                loopback_mono = loopback.reshape(-1).astype(np.int16)
-                del loopback
-
-            # Resample loopback to mic sample rate if they differ (e.g., WASAPI
-            # loopback at 48 kHz vs mic at 16 kHz).
-            if self._loopback_samplerate != self.sample_rate:
-                n_out = int(
-                    round(
-                        len(loopback_mono)
-                        * self.sample_rate
-                        / self._loopback_samplerate
+                self._journal_entry = entry
+                self._journal_stage = QueuedStage(JournalStage(entry))
+                stages.append(self._journal_stage)
+        for factory in self._stage_factories:
+            stages.append(factory(self.sample_rate, self.channels))
+        return CapturePipeline(stages)
+
+    def _build_loopback_pipeline(self) -> CapturePipeline:
+        """System audio: metered, then mono at self.sample_rate into the mixer."""
+        assert self._mixer is not None
+        stages = [LevelMeter("loopback_level"), DownmixStage()]
+        if self._loopback_samplerate != self.sample_rate:
+            stages.append(
+                ResampleStage(
+                    StreamingResampler(
+                        self._loopback_samplerate, self.sample_rate, dtype=np.float32
                     )
                 )
-                if n_out > 0:
-                    x_old = np.linspace(
-                        0, 1, len(loopback_mono), endpoint=False, dtype=np.float32
-                    )
-                    x_new = np.linspace(0, 1, n_out, endpoint=False, dtype=np.float32)
-                    loopback_mono = np.interp(
-                        x_new, x_old, loopback_mono.astype(np.float32, copy=False)
-                    ).astype(np.int16)
-                    del x_old, x_new
-
-            length = min(len(mic_int16.reshape(-1)), len(loopback_mono))
-            mic_flat = mic_int16.reshape(-1)[:length].astype(np.int32, copy=False)
-            loopback_i32 = loopback_mono[:length].astype(np.int32, copy=False)
-            del loopback_mono
-            np.add(mic_flat, loopback_i32, out=mic_flat)
-            del loopback_i32
-            np.clip(mic_flat, -32768, 32767, out=mic_flat)
-            mixed = mic_flat.astype(np.int16)
-            del mic_flat
-            return mixed.reshape(-1, 1) if self.channels == 1 else mixed
+            )
+        stages.append(FeedStage("mixer", self._mixer.push))
+        return CapturePipeline(stages)
+
+    def _finish_sink(self) -> Optional[str]:
+        """Finalize the streaming file; the audio is already on disk."""
+        sink, self._sink = self._sink, None
+        assert sink is not None
+        try:
+            frames = sink.close()
         except Exception as e:
-            logger.warning(f"Failed to mix loopback audio: {e}")
-            return mic_int16
+            logger.error(f"Error finalizing recording: {e}")
+            sink.discard()
+            return None
+        if sink.error is not None or frames == 0:
+            if frames == 0:
+                logger.warning("No audio data recorded")
+            sink.discard()
+            return None
+        self.temp_file_path = sink.path
+        self._last_duration = frames / sink.samplerate
+        logger.info(
+            f"Recording saved: {self.temp_file_path} ({self._last_duration:.1f}s)"
+        )
+        return self.temp_file_path
 
     def _negotiate_mic_samplerate(self) -> int:
-        """Return a sample rate the input device accepts.
+        """The rate to capture the mic at.
 
-        Prefer self.sample_rate (16 kHz). If the device rejects it (some Linux
-        devices only expose 44.1/48 kHz), fall back to the device's default
-        rate. Captured audio is resampled to self.sample_rate before saving.
+        That of the stream already open on the device (the settings audio test
+        may have it), or else one the device accepts, preferring
+        self.sample_rate. Captured blocks are resampled to self.sample_rate as
+        they arrive.
         """
-        try:
-            sd.check_input_settings(
-                device=self.input_device,
-                channels=self.channels,
-                dtype="int16",
-                samplerate=self.sample_rate,
-            )
-            return self.sample_rate
-        except Exception:
-            try:
-                target = self.input_device
-                if target is None:
-                    target = sd.default.device[0]
-                # sd.default.device[0] is -1 when there is no default input
-                # device; query_devices(-1) raises "Error querying device -1".
-                if target is None or target < 0:
-                    native = 48000
-                else:
-                    dev = sd.query_devices(target)
-                    native = int(dev.get("default_samplerate", 48000))
-            except Exception:
-                native = 48000
-            logger.info(
-                f"Mic does not support {self.sample_rate} Hz; "
-                f"recording at {native} Hz and resampling"
-            )
-            return native
-
-    def _resample_mic(self, audio_int16: np.ndarray) -> np.ndarray:
-        """Resample mic audio from self._mic_samplerate to self.sample_rate."""
-        if self._mic_samplerate == self.sample_rate:
-            return audio_int16
-        flat = audio_int16.reshape(-1).astype(np.float32, copy=False)
-        n_out = int(round(len(flat) * self.sample_rate / self._mic_samplerate))
-        if n_out <= 0:
-            return audio_int16
-        x_old = np.linspace(0, 1, len(flat), endpoint=False, dtype=np.float32)
-        x_new = np.linspace(0, 1, n_out, endpoint=False, dtype=np.float32)
-        resampled = np.interp(x_new, x_old, flat).astype(np.int16)
-        return resampled.reshape(-1, 1) if self.channels == 1 else resampled
+        return self._hub.samplerate(self.input_device, self.channels, self.sample_rate)
 
     def _record_audio(self, session: int = 0):
         """Records audio in a loop until stopped or max duration reached.
@@ -509,53 +1447,118 @@ class AudioRecorder:
         def is_current() -> bool:
             return self._session_id == session
 
-        def emit_level():
-            if self._audio_level_callback is not None:
-                self._audio_level_callback(max(self._mic_level, self._loopback_level))
+        # The callbacks run on the audio backend's realtime threads. Anything
+        # slow there (or anything waiting for the GIL while the GUI holds it)
+        # makes PortAudio drop input, so they only record their telemetry and
+        # copy the block into a ring; this thread runs the pipelines.
+        telemetry = self._telemetry
+        mic_ring: FrameRing | None = None
+        loopback_ring: FrameRing | None = None
+        pipeline: CapturePipeline | None = None
+        loopback_pipeline: CapturePipeline | None = None
+        mic_meter = loopback_meter = None
 
         def mic_callback(indata, frames, time_info, status):
-            if status:
-                logger.warning(f"Audio stream status: {status}")
+            if mic_ring is None:
+                return
+            stats = telemetry.streams["mic"]
+            started = stats.callback_started(len(indata), status)
             if self.is_recording and is_current():
-                self.frames.append(indata.copy())
-                rms = np.sqrt(np.mean(indata.astype(np.float32) ** 2))
-                self._mic_level = min(1.0, rms / 400.0)
-                emit_level()
+                if self._start_latency is None:
+                    self._start_latency = started - self._start_requested_at
+                if not mic_ring.push(indata):
+                    stats.dropped(len(indata))
+            stats.callback_finished(started)
 
         def loopback_callback(indata, frames, time_info, status):
-            if status:
-                logger.debug(f"Loopback stream status: {status}")
+            if loopback_ring is None:
+                return
+            stats = telemetry.streams["loopback"]
+            started = stats.callback_started(len(indata), status)
             if self.is_recording and is_current():
-                with self._loopback_lock:
-                    self._loopback_frames.append(indata.copy())
-                rms = np.sqrt(np.mean(indata.astype(np.float32) ** 2))
-                self._loopback_level = min(1.0, rms / 400.0)
-                emit_level()
+                if not loopback_ring.push(indata):
+                    stats.dropped(len(indata))
+            stats.callback_finished(started)
+
+        def drain(ring: FrameRing | None, name: str) -> np.ndarray | None:
+            if ring is None:
+                return None
+            telemetry.streams[name].queued(len(ring))
+            return ring.pop()
+
+        def process_queued():
+            # System audio first, so the mic blocks find it already buffered.
+            block = drain(loopback_ring, "loopback")
+            if block is not None and loopback_pipeline is not None:
+                loopback_pipeline.push(block)
+            block = drain(mic_ring, "mic")
+            if block is None or pipeline is None:
+                return
+            pipeline.push(block)
+            if self._audio_level_callback is not None:
+                level = mic_meter.level
+                if loopback_meter is not None:
+                    level = max(level, loopback_meter.level)
+                self._audio_level_callback(level)
 
         loopback_stream = None
+        warm = self._usable_warm_mic()
+        self._start_was_warm = warm is not None
         try:
-            if self.input_device is None and sd.default.device[0] < 0:
-                raise RuntimeError(
-                    "No input audio device available (check microphone permissions "
-                    "and that an audio server is running)"
-                )
-            mic_rate = self._negotiate_mic_samplerate()
+            if warm is not None:
+                mic_rate = warm.samplerate
+            else:
+                if self.input_device is None and sd.default.device[0] < 0:
+                    raise RuntimeError(
+                        "No input audio device available (check microphone "
+                        "permissions and that an audio server is running)"
+                    )
+                mic_rate = self._negotiate_mic_samplerate()
             self._mic_samplerate = mic_rate
-            mic_stream = sd.InputStream(
-                samplerate=mic_rate,
-                channels=self.channels,
-                dtype="int16",
-                blocksize=self.chunk_size,
-                callback=mic_callback,
-                device=self.input_device,
+            # Room for the pre-roll plus a stall of the processing below.
+            telemetry.stream("mic", mic_rate)
+            mic_ring = FrameRing(
+                int((RING_S + self.preroll_ms / 1000) * mic_rate), self.channels
             )
-
+            if self.stream_to_disk and is_current():
+                self._open_sink(self.sample_rate)
+            on_speech_end = self._on_speech_end
+            if on_speech_end is not None and is_current():
+                self._endpoint = EndpointDetector(
+                    mic_rate, self._trailing_silence_s, self._min_speech_s
+                )
+            # System audio before the mic pipeline: the mixer it feeds is one
+            # of the mic stages.
             if self.include_system_audio:
                 loopback_stream = self._open_loopback_stream(loopback_callback)
+                if loopback_stream is not None:
+                    telemetry.stream("loopback", self._loopback_samplerate)
+                    loopback_pipeline = self._build_loopback_pipeline()
+                    loopback_meter = loopback_pipeline.stage("loopback_level")
+                    loopback_ring = FrameRing(
+                        int(RING_S * self._loopback_samplerate),
+                        loopback_stream.channels,
+                    )
+            pipeline = self._build_pipeline(mic_rate)
+            mic_meter = pipeline.stage("mic_level")
+            if is_current():
+                self._pipeline = pipeline
+            if warm is not None:
+                mic_stream = contextlib.nullcontext()
+            else:
+                mic_stream = self._hub.subscribe(
+                    self.input_device,
+                    self.channels,
+                    mic_callback,
+                    mic_rate,
+                    self.chunk_size,
+                )
 
             with mic_stream:
-                if loopback_stream is not None:
-                    loopback_stream.start()
+                if warm is not None:
+                    warm.attach(mic_callback)
+                latency_logged = False
+                speech_end_reported = False
                 while self.is_recording and is_current():
                     elapsed = time.time() - start_time
                     if elapsed > self.max_duration:
@@ -563,18 +1566,41 @@ class AudioRecorder:
                             f"Max recording duration ({self.max_duration}s) reached"
                         )
                         break
-                    time.sleep(0.1)
+                    time.sleep(POLL_S)
+                    process_queued()
+                    if not latency_logged and self._start_latency is not None:
+                        latency_logged = True
+                        self._log_start_latency()
+                    endpoint = self._endpoint
+                    if (
+                        endpoint is not None
+                        and endpoint.fired
+                        and not speech_end_reported
+                        and is_current()
+                    ):
+                        speech_end_reported = True
+                        logger.info(
+                            f"End of speech: {self._trailing_silence_s:.1f}s of "
+                            f"silence after {endpoint.speech_samples / mic_rate:.1f}s "
+                            "of speech"
+                        )
+                        try:
+                            on_speech_end()
+                        except Exception as e:
+                            logger.error(f"Auto-stop callback failed: {e}")
         except Exception as e:
             logger.error(f"Error in recording thread: {e}")
             if is_current():
                 self._record_error = str(e)
         finally:
+            if warm is not None:
+                warm.detach()
+            elif self.warm_mic and is_current():
+                # Recorded cold (warm mic missing, dead or on another device):
+                # get one ready for the next recording.
+                self._rewarm_in_background()
             if loopback_stream is not None:
-                try:
-                    loopback_stream.stop()
-                    loopback_stream.close()
-                except Exception as e:
-                    logger.debug(f"Error closing loopback stream: {e}")
+                loopback_stream.close()
             # A thread whose session has been superseded owns none of this
             # state any more: clearing the buffers or the flag here would wipe
             # the recording that is running right now. Written as if/else
@@ -584,23 +1610,49 @@ class AudioRecorder:
                 logger.debug(
                     "Stale recording thread finished; leaving current session untouched"
                 )
+                if pipeline is not None:
+                    pipeline.close()
             else:
                 # Always clean up loopback buffer on abnormal exit to prevent leaks
                 if self.is_recording:
                     # Abnormal exit (max duration or exception): clear buffers
                     self.frames.clear()
-                    with self._loopback_lock:
-                        self._loopback_frames.clear()
-                # else: stopped normally — frames were cleaned in stop_recording
+                    if self._sink is not None:
+                        self._sink.discard()
+                        self._sink = None
+                    if pipeline is not None:
+                        pipeline.close()
+                    self._pipeline = None
+                    self._tap_stage = None
+                    # What the journal holds is picked up at the next start.
+                    self._journal_stage = None
+                    self._journal_entry = None
+                else:
+                    # Stopped normally: the streams are closed, so what is
+                    # still queued is the last of the recording.
+                    try:
+                        process_queued()
+                    except Exception as e:
+                        logger.error(f"Error processing the last audio: {e}")
                 self.is_recording = False
 
-    def _open_loopback_stream(self, callback):
-        result = _open_loopback_input_stream(callback, self.chunk_size)
-        if result is None:
+    def _log_start_latency(self):
+        assert self._start_latency is not None
+        if self._start_was_warm:
+            mode = f"warm mic, {self.preroll_ms} ms pre-roll"
+        else:
+            mode = "cold start"
+        logger.info(
+            f"Hotkey to first sample: {self._start_latency * 1000:.0f} ms ({mode})"
+        )
+
+    def _open_loopback_stream(self, callback) -> CaptureSubscription | None:
+        subscription = self._hub.subscribe_loopback(callback, self.chunk_size)
+        if subscription is None:
             return None
-        stream, native_rate = result
-        self._loopback_samplerate = native_rate
-        return stream
+        self._loopback_samplerate = subscription.samplerate
+        self._mixer = LoopbackMixer(self.sample_rate)
+        return subscription
 
     def cleanup_temp_file(self):
         if self.temp_file_path and Path(self.temp_file_path).exists():
@@ -614,14 +1666,26 @@ class AudioRecorder:
     def get_recording_duration(self) -> float:
         # While recording, derive it live from the buffered frames; after
         # stop_recording() has consumed them, fall back to the saved duration.
-        if self.frames:
-            total_frames = sum(len(f) for f in self.frames)
-            return total_frames / self._mic_samplerate
+        sink = self._sink
+        if sink is not None:
+            return sink.frames_queued / sink.samplerate
+        if len(self.frames):
+            return len(self.frames) / self.sample_rate
         return self._last_duration
 
     def close(self):
         if self.is_recording:
             self.stop_recording()
+        if getattr(self, "_watch_devices", False):
+            self._watch_devices = False
+            self._hub.devices.remove_listener(self._on_devices_changed)
+            self._hub.devices.stop_watching()
+        if getattr(self, "_warm_lock", None) is not None:
+            self.warm_mic = False
+            self._close_warm_mic()
+        if getattr(self, "_sink", None) is not None:
+            self._sink.discard()
+            self._sink = None
         self.cleanup_temp_file()
 
     def __del__(self):
@@ -633,6 +1697,10 @@ class AudioMonitor:
 
     Does not play audio back to the speakers — just reports a 0.0-1.0 level so the UI
     can show a waveform to confirm the selected mic is picking up sound.
+
+    Like the recorder's, its stream callbacks only copy the blocks into a ring
+    (they run on the hub's realtime thread, next to the recording); metering
+    and the level callback run on the monitor's own thread.
     """
 
     def __init__(
@@ -640,61 +1708,64 @@ class AudioMonitor:
         sample_rate: int = 16000,
         input_device: int | None = None,
         include_system_audio: bool = False,
+        hub: CaptureHub | None = None,
     ):
         self.sample_rate = sample_rate
         self.input_device = input_device
         self.include_system_audio = include_system_audio
-        self._mic_stream: sd.InputStream | None = None
-        self._loopback_stream: sd.InputStream | None = None
+        # Shared with the recorder: with the warm mic on, the test joins the
+        # stream that is already open instead of opening the device again.
+        self._hub = hub or get_capture_hub()
+        self._mic_stream: CaptureSubscription | None = None
+        self._loopback_stream: CaptureSubscription | None = None
+        self._mic_ring: FrameRing | None = None
+        self._loopback_ring: FrameRing | None = None
+        self._thread: threading.Thread | None = None
+        self._stop = threading.Event()
         self._running = False
         self._level_callback = None
         self._mic_level = 0.0
         self._loopback_level = 0.0
+        # Stream statistics of the current (or last) monitoring session.
+        self._telemetry = CaptureTelemetry()
 
     def set_level_callback(self, callback):
         """Set a callback that receives audio level (0.0-1.0) for each chunk."""
         self._level_callback = callback
 
+    def get_telemetry(self) -> CaptureTelemetry:
+        """Stream statistics since the last start(), like the recorder's."""
+        return self._telemetry
+
     def start(self) -> bool:
         if self._running:
             return True
         try:
-            mic_rate = self.sample_rate
-            try:
-                sd.check_input_settings(
-                    device=self.input_device,
-                    channels=1,
-                    dtype="int16",
-                    samplerate=self.sample_rate,
-                )
-            except Exception:
+            mic_rate = self._hub.samplerate(self.input_device, 1, self.sample_rate)
+            self._telemetry = CaptureTelemetry()
+            self._telemetry.stream("mic", mic_rate)
+            self._mic_ring = FrameRing(int(RING_S * mic_rate), 1)
+            self._mic_stream = self._hub.subscribe(
+                self.input_device, 1, self._mic_callback, mic_rate, 1024
+            )
+            if self.include_system_audio:
                 try:
-                    dev = sd.query_devices(
-                        self.input_device
-                        if self.input_device is not None
-                        else sd.default.device[0]
+                    self._loopback_stream = self._hub.subscribe_loopback(
+                        self._loopback_callback, 1024
                     )
-                    mic_rate = int(dev.get("default_samplerate", 48000))
-                except Exception:
-                    mic_rate = 48000
-            self._mic_stream = sd.InputStream(
-                samplerate=mic_rate,
-                channels=1,
-                dtype="int16",
-                blocksize=1024,
-                callback=self._mic_callback,
-                device=self.input_device,
+                except Exception as e:
+                    logger.warning(f"Failed to start loopback monitor stream: {e}")
+                loopback = self._loopback_stream
+                if loopback is not None:
+                    self._telemetry.stream("loopback", loopback.samplerate)
+                    self._loopback_ring = FrameRing(
+                        int(RING_S * loopback.samplerate), loopback.channels
+                    )
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="dicto-audio-monitor", daemon=True
             )
-            self._mic_stream.start()
-            if self.include_system_audio:
-                result = _open_loopback_input_stream(self._loopback_callback, 1024)
-                if result is not None:
-                    self._loopback_stream, _ = result
-                    try:
-                        self._loopback_stream.start()
-                    except Exception as e:
-                        logger.warning(f"Failed to start loopback monitor stream: {e}")
-                        self._loopback_stream = None
+            self._thread.start()
             self._running = True
             return True
         except Exception as e:
@@ -707,12 +1778,13 @@ class AudioMonitor:
         for stream_attr in ("_mic_stream", "_loopback_stream"):
             stream = getattr(self, stream_attr)
             if stream is not None:
-                try:
-                    stream.stop()
-                    stream.close()
-                except Exception:
-                    pass
+                stream.close()
             setattr(self, stream_attr, None)
+        self._stop.set()
+        thread, self._thread = self._thread, None
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=1.0)
+        self._mic_ring = self._loopback_ring = None
         self._mic_level = 0.0
         self._loopback_level = 0.0
 
@@ -720,21 +1792,44 @@ class AudioMonitor:
     def is_running(self) -> bool:
         return self._running
 
+    def _queue_block(self, ring: FrameRing | None, name: str, indata, status):
+        stats = self._telemetry.streams.get(name)
+        started = (
+            stats.callback_started(len(indata), status) if stats is not None else 0.0
+        )
+        if ring is not None and not ring.push(indata) and stats is not None:
+            stats.dropped(len(indata))
+        if stats is not None:
+            stats.callback_finished(started)
+
     def _mic_callback(self, indata, frames, time_info, status):
-        try:
-            rms = np.sqrt(np.mean(indata.astype(np.float32) ** 2))
-            self._mic_level = min(1.0, rms / 400.0)
-            self._emit_level()
-        except Exception:
-            pass
+        self._queue_block(self._mic_ring, "mic", indata, status)
 
     def _loopback_callback(self, indata, frames, time_info, status):
-        try:
-            rms = np.sqrt(np.mean(indata.astype(np.float32) ** 2))
-            self._loopback_level = min(1.0, rms / 400.0)
-            self._emit_level()
-        except Exception:
-            pass
+        self._queue_block(self._loopback_ring, "loopback", indata, status)
+
+    def _run(self):
+        """Meter what the callbacks queued and report the level."""
+        failed = False
+        while not self._stop.wait(POLL_S):
+            mic_ring, loopback_ring = self._mic_ring, self._loopback_ring
+            fresh = False
+            for ring, attr in (
+                (mic_ring, "_mic_level"),
+                (loopback_ring, "_loopback_level"),
+            ):
+                block = ring.pop() if ring is not None else None
+                if block is not None:
+                    setattr(self, attr, min(1.0, block_rms(block) / FULL_SCALE_RMS))
+                    fresh = True
+            if not fresh:
+                continue
+            try:
+                self._emit_level()
+            except Exception as e:
+                if not failed:
+                    failed = True
+                    logger.warning(f"Audio monitor level callback failed: {e}")
 
     def _emit_level(self):
         if self._level_callback is None:
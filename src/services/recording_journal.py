@@ -0,0 +1,287 @@
+"""
+Recording journal: a crash-safe copy of each recording while it is captured.
+
+Until a recording is stopped its audio only exists in the recorder's memory
+(or in a temp WAV whose header is patched at stop), and the temp WAV is
+deleted once the transcription is over, whether it worked or not. A crash, a
+machine that goes to sleep mid-meeting or an upload that fails for good all
+lost the take.
+
+With a journal, every recording also gets a directory under the config dir
+(`<config dir>/journal/<id>/`) that the recorder appends to as it captures:
+raw int16 chunk files of `CHUNK_S` each, synced to disk every
+`SYNC_INTERVAL_S`, plus a small `index.json` (sample rate, channels, chunk
+list, state). The index is only rewritten when a chunk is opened or the state
+changes, always atomically, and the length of the audio comes from the chunk
+sizes, so a process killed mid-write leaves at most a torn last frame.
+
+An entry is deleted once its transcription has been delivered or queued for
+retry (see `transcription_queue.py`). Whatever is still there at the next
+start is a recording that was interrupted (state "recording") or one the
+recorder or the queue could not take ("failed"); the controller rebuilds each
+as a WAV with `export_wav()` and queues it for transcription.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import shutil
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+import numpy as np
+import soundfile as sf
+
+from src.services.capture_pipeline import CaptureStage
+
+logger = logging.getLogger(__name__)
+
+INDEX = "index.json"
+# Audio per chunk file: 30 s of 16 kHz mono is ~1 MB.
+CHUNK_S = 30.0
+# How much audio may sit in the OS cache, not yet on the disk. A killed
+# process loses nothing (each block is written straight to its file); this
+# bounds what a power loss or a machine that never wakes up costs.
+SYNC_INTERVAL_S = 2.0
+
+RECORDING = "recording"
+RECORDED = "recorded"
+FAILED = "failed"
+
+
+def write_json_atomic(path: Path, data: dict):
+    """Replace `path` with `data`, so a crash leaves the old or the new file."""
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+class JournalEntry:
+    """The journaled audio of one recording.
+
+    Single writer: `append()`, `finish()` and `close()` are called from one
+    thread (the journal stage's worker).
+    """
+
+    def __init__(self, path: Path, index: dict):
+        self.path = path
+        self._index = index
+        self._file = None
+        self._chunk_frames = 0
+        self._unsynced = 0
+
+    @classmethod
+    def create(cls, path: Path, samplerate: int, channels: int) -> JournalEntry:
+        path.mkdir(parents=True)
+        entry = cls(
+            path,
+            {
+                "samplerate": samplerate,
+                "channels": channels,
+                "created": time.time(),
+                "state": RECORDING,
+                "error": None,
+                "chunks": [],
+            },
+        )
+        entry._save_index()
+        return entry
+
+    @classmethod
+    def load(cls, path: Path) -> JournalEntry:
+        with open(path / INDEX, encoding="utf-8") as f:
+            return cls(path, json.load(f))
+
+    @property
+    def id(self) -> str:
+        return self.path.name
+
+    @property
+    def samplerate(self) -> int:
+        return self._index["samplerate"]
+
+    @property
+    def channels(self) -> int:
+        return self._index["channels"]
+
+    @property
+    def created(self) -> float:
+        return self._index["created"]
+
+    @property
+    def state(self) -> str:
+        return self._index["state"]
+
+    @property
+    def error(self) -> str | None:
+        return self._index["error"]
+
+    @property
+    def frames(self) -> int:
+        """Whole frames on disk (a torn last frame is not counted)."""
+        frame_bytes = 2 * self.channels
+        total = 0
+        for name in self._index["chunks"]:
+            try:
+                total += (self.path / name).stat().st_size // frame_bytes
+            except FileNotFoundError:
+                pass
+        return total
+
+    @property
+    def duration(self) -> float:
+        return self.frames / self.samplerate
+
+    def _save_index(self):
+        write_json_atomic(self.path / INDEX, self._index)
+
+    def _sync(self):
+        if self._file is not None:
+            os.fsync(self._file.fileno())
+        self._unsynced = 0
+
+    def _open_chunk(self):
+        self._close_chunk()
+        name = f"{len(self._index['chunks']):06d}.pcm"
+        # Unbuffered: each block goes to the OS as soon as it is written. The
+        # chunk stays open across append() calls, so no context manager: the
+        # entry owns the handle, and _close_chunk() (from the next chunk,
+        # finish() or close()) closes it.
+        self._file = open(self.path / name, "ab", buffering=0)  # noqa: SIM115
+        self._chunk_frames = 0
+        self._index["chunks"].append(name)
+        self._save_index()
+
+    def _close_chunk(self):
+        if self._file is not None:
+            self._sync()
+            self._file.close()
+            self._file = None
+
+    def append(self, block: np.ndarray):
+        """Write int16 frames (frames × channels, or 1-D mono)."""
+        if self._file is None or self._chunk_frames >= CHUNK_S * self.samplerate:
+            self._open_chunk()
+        assert self._file is not None
+        data = np.ascontiguousarray(block, dtype=np.int16)
+        self._file.write(data.tobytes())
+        n = len(data)
+        self._chunk_frames += n
+        self._unsynced += n
+        if self._unsynced >= SYNC_INTERVAL_S * self.samplerate:
+            self._sync()
+
+    def finish(self) -> int:
+        """The recording ended normally: sync and close. Returns the frames."""
+        self._close_chunk()
+        self._set_state(RECORDED)
+        return self.frames
+
+    def close(self):
+        """Sync and close, leaving the state as it is."""
+        self._close_chunk()
+
+    def mark_failed(self, error: str):
+        """Keep the audio: its transcription failed and is to be retried."""
+        self._index["error"] = error
+        self._set_state(FAILED)
+
+    def _set_state(self, state: str):
+        self._index["state"] = state
+        self._save_index()
+
+    def export_wav(self, path: str | None = None) -> str:
+        """Rebuild the recording as a WAV file (a new temp file by default)."""
+        self.close()
+        if path is None:
+            fd, path = tempfile.mkstemp(suffix=".wav", prefix="voice_recovered_")
+            os.close(fd)
+        frame_bytes = 2 * self.channels
+        with sf.SoundFile(
+            path,
+            mode="w",
+            samplerate=self.samplerate,
+            channels=self.channels,
+            format="WAV",
+            subtype="PCM_16",
+        ) as out:
+            for name in self._index["chunks"]:
+                chunk = self.path / name
+                if not chunk.exists():
+                    continue
+                raw = chunk.read_bytes()
+                raw = raw[: len(raw) - len(raw) % frame_bytes]
+                out.write(np.frombuffer(raw, np.int16).reshape(-1, self.channels))
+        return path
+
+    def discard(self):
+        """Delete the entry (transcribed, cancelled or empty)."""
+        try:
+            self.close()
+        except OSError as e:
+            logger.debug(f"Error closing journal entry {self.id}: {e}")
+        shutil.rmtree(self.path, ignore_errors=True)
+
+
+class RecordingJournal:
+    """The journal directory: one entry per recording not yet delivered."""
+
+    def __init__(self, root: str | Path):
+        self.root = Path(root)
+
+    def begin(self, samplerate: int, channels: int) -> JournalEntry:
+        """Start the entry of a new recording."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        name = f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        return JournalEntry.create(self.root / name, samplerate, channels)
+
+    def pending(self) -> list[JournalEntry]:
+        """Entries left over from earlier recordings, oldest first.
+
+        Meant for start-up, when no recording of this process is writing.
+        Unreadable entries are skipped and logged.
+        """
+        if not self.root.is_dir():
+            return []
+        entries = []
+        for path in sorted(p for p in self.root.iterdir() if p.is_dir()):
+            try:
+                entries.append(JournalEntry.load(path))
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning(f"Skipping unreadable journal entry {path.name}: {e}")
+        return sorted(entries, key=lambda e: e.created)
+
+
+class JournalStage(CaptureStage):
+    """Appends the recorded blocks to a `JournalEntry`.
+
+    Meant to run behind a `QueuedStage`, so disk writes and syncs never hold
+    up the recording thread. Optional: a journal that fails costs its
+    crash-safety, not the recording. Closed without a flush (recording
+    abandoned), the entry stays in the "recording" state and is picked up at
+    the next start.
+    """
+
+    name = "journal"
+    required = False
+
+    def __init__(self, entry: JournalEntry):
+        super().__init__()
+        self.entry = entry
+
+    def process(self, block):
+        self.entry.append(block)
+        return block
+
+    def flush(self):
+        self.entry.finish()
+
+    def close(self):
+        self.entry.close()
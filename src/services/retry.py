@@ -0,0 +1,104 @@
+"""
+Retrying failed API requests without making an outage worse.
+
+The transcriber used to wait `RETRY_DELAY * 2**attempt` between attempts:
+every client that failed at the same moment (an API restart, a network
+blip) came back at the same moments too, and a 429 or 503 telling us when to
+come back (`Retry-After`) was ignored.
+
+- `backoff_delay()` is exponential backoff with "full jitter": a random
+  point anywhere in the window, which spreads clients out the most. When the
+  server sent `Retry-After`, the delay is that, plus a jitter.
+- `RetryBudget` is a token bucket shared by every request of the app (it
+  lives on the `ApiClient`): each retry takes a token, and tokens come back
+  slowly. A few failures are retried at once; a failing API is not hit with
+  a retry per request per attempt across transcriptions, segments and
+  transforms, since once the bucket is empty an error is returned (and a
+  transcription queued, see `transcription_queue.py`) instead.
+"""
+
+from __future__ import annotations
+
+import email.utils
+import random
+import threading
+import time
+from typing import Callable
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Seconds from a `Retry-After` header (delta-seconds or HTTP date)."""
+    if not isinstance(value, str) or not value.strip():
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+def backoff_delay(
+    attempt: int, base: float, cap: float, retry_after: float | None = None
+) -> float:
+    """Seconds to wait before retry number `attempt + 1` (0-based attempt).
+
+    Full jitter: uniform in [0, min(cap, base * 2**attempt)]. A server's
+    `retry_after` is honoured, with up to `base` added so that clients told
+    the same thing do not all return on the same second.
+    """
+    if retry_after is not None:
+        return retry_after + random.uniform(0, base)
+    return random.uniform(0, min(cap, base * 2**attempt))
+
+
+class RetryBudget:
+    """Token bucket of retries, shared by all the requests of one client.
+
+    Holds up to `capacity` tokens and regains `refill_per_s` a second. A
+    retry goes ahead only if it can take a token. Thread-safe.
+    """
+
+    def __init__(
+        self,
+        capacity: float = 10.0,
+        refill_per_s: float = 0.1,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.capacity = capacity
+        self.refill_per_s = refill_per_s
+        self._clock = clock
+        self._tokens = capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+        self.spent = 0
+        self.denied = 0
+
+    def _refill(self):
+        now = self._clock()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated) * self.refill_per_s
+        )
+        self._updated = now
+
+    def try_acquire(self) -> bool:
+        """Take a token for one retry; False when the budget is spent."""
+        with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                self.denied += 1
+                return False
+            self._tokens -= 1
+            self.spent += 1
+            return True
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            self._refill()
+            return {
+                "tokens": round(self._tokens, 2),
+                "spent": self.spent,
+                "denied": self.denied,
+            }
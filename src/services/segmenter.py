@@ -0,0 +1,308 @@
+"""
+Splitting long recordings into bounded segments at natural pauses.
+
+A long dictation or meeting capture is too big for one upload (the API caps a
+file at 25 MB) and too slow for one request (the client times out after 30 s).
+The transcriber cuts such recordings into segments of at most
+`max_segment_s`, transcribes them concurrently and stitches the texts back in
+order. Where the cut lands matters: slicing through a word garbles it on both
+sides, so each boundary is placed at the quietest stretch (energy smoothed over
+a few hundred milliseconds, i.e. a pause between phrases rather than the gap
+inside a plosive) within a search window just before the length limit.
+
+`LiveSegmenter` applies the same idea while the recording is still running:
+it closes a segment at the first real pause, so the transcriber can start on
+it before the user has finished speaking.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Callable
+
+import numpy as np
+import soundfile as sf
+
+# Energy is measured over 20 ms frames, the usual speech analysis frame.
+FRAME_S = 0.02
+# Smoothing span for picking a cut point: long enough that a stop consonant's
+# brief silence does not look like a pause, short enough to find one.
+SMOOTH_S = 0.3
+
+
+def frame_rms(audio: np.ndarray, frame_len: int) -> np.ndarray:
+    """RMS of consecutive `frame_len`-sample frames of int16 audio.
+
+    Multichannel audio is averaged to mono first. A trailing partial frame is
+    measured on its own, so the result covers every sample.
+    """
+    if audio.ndim > 1:
+        audio = audio.mean(axis=1) if audio.shape[1] > 1 else audio[:, 0]
+    n = len(audio)
+    if n == 0:
+        return np.zeros(0, dtype=np.float32)
+    full = n // frame_len
+    x = audio.astype(np.float32, copy=False)
+    out = np.empty(full + (1 if n % frame_len else 0), dtype=np.float32)
+    if full:
+        frames = x[: full * frame_len].reshape(full, frame_len)
+        out[:full] = np.sqrt(np.einsum("ij,ij->i", frames, frames) / frame_len)
+    if n % frame_len:
+        tail = x[full * frame_len :]
+        out[full] = np.sqrt(np.dot(tail, tail) / len(tail))
+    return out
+
+
+def _smooth(energy: np.ndarray, span: int) -> np.ndarray:
+    if span <= 1 or len(energy) < span:
+        return energy
+    kernel = np.ones(span, dtype=np.float32) / span
+    return np.convolve(energy, kernel, mode="same")
+
+
+def find_split_points(
+    energy: np.ndarray,
+    frame_len: int,
+    total_samples: int,
+    max_segment_samples: int,
+    search_samples: int | None = None,
+    smooth_frames: int = 1,
+) -> list[int]:
+    """Sample offsets at which to cut, given per-frame energy.
+
+    Every resulting segment is at most `max_segment_samples` long. Each cut is
+    the quietest frame (after smoothing) in the last `search_samples` before the
+    limit; the default window is the last fifth of a segment.
+    """
+    if total_samples <= max_segment_samples:
+        return []
+    if search_samples is None:
+        search_samples = max_segment_samples // 5
+    smoothed = _smooth(energy, smooth_frames)
+    points: list[int] = []
+    start = 0
+    while total_samples - start > max_segment_samples:
+        hi = start + max_segment_samples
+        lo = max(start + 1, hi - search_samples)
+        f_lo = -(-lo // frame_len)  # first frame starting at or after lo
+        f_hi = hi // frame_len  # frames must end by hi
+        if f_hi > f_lo:
+            best = f_lo + int(np.argmin(smoothed[f_lo:f_hi]))
+            cut = best * frame_len + frame_len // 2
+        else:
+            cut = hi
+        cut = min(max(cut, start + 1), hi)
+        points.append(cut)
+        start = cut
+    return points
+
+
+def split_ranges(total_samples: int, points: list[int]) -> list[tuple[int, int]]:
+    """Turn cut points into consecutive (start, end) sample ranges."""
+    bounds = [0, *points, total_samples]
+    return [(a, b) for a, b in zip(bounds, bounds[1:]) if b > a]
+
+
+def plan_segments(
+    audio: np.ndarray, samplerate: int, max_segment_s: float
+) -> list[tuple[int, int]]:
+    """(start, end) sample ranges of at most `max_segment_s`, cut at pauses."""
+    frame_len = max(1, int(samplerate * FRAME_S))
+    energy = frame_rms(audio, frame_len)
+    points = find_split_points(
+        energy,
+        frame_len,
+        len(audio),
+        int(max_segment_s * samplerate),
+        smooth_frames=max(1, int(SMOOTH_S / FRAME_S)),
+    )
+    return split_ranges(len(audio), points)
+
+
+def plan_file_segments(
+    path: str, max_segment_s: float
+) -> tuple[int, list[tuple[int, int]]]:
+    """Like `plan_segments`, for a sound file, without loading it whole.
+
+    Returns (samplerate, ranges). Energy is computed block by block, so even a
+    two-hour recording only ever has one block in memory here.
+    """
+    with sf.SoundFile(path) as f:
+        samplerate, total = f.samplerate, f.frames
+        if total <= max_segment_s * samplerate:
+            return samplerate, [(0, total)] if total else []
+        frame_len = max(1, int(samplerate * FRAME_S))
+        energy = np.concatenate(
+            [
+                frame_rms(block, frame_len)
+                for block in f.blocks(blocksize=frame_len * 4096, dtype="int16")
+            ]
+        )
+    points = find_split_points(
+        energy,
+        frame_len,
+        total,
+        int(max_segment_s * samplerate),
+        smooth_frames=max(1, int(SMOOTH_S / FRAME_S)),
+    )
+    return samplerate, split_ranges(total, points)
+
+
+# ── Live segmentation ───────────────────────────────────────
+
+# A live segment closes at the first pause this long once it holds at least
+# LIVE_MIN_SEGMENT_S of audio, and is forced closed at LIVE_MAX_SEGMENT_S.
+# Short segments would cost the model its context (and a request each); long
+# ones would leave more audio in flight when the user releases the hotkey.
+LIVE_PAUSE_S = 0.5
+LIVE_MIN_SEGMENT_S = 4.0
+LIVE_MAX_SEGMENT_S = 30.0
+# Frame RMS (int16 scale) below which a frame is always a pause, ~-50 dBFS.
+# Louder rooms are handled by the relative threshold in LiveSegmenter.
+SILENCE_RMS = 100.0
+
+
+@dataclass
+class LiveSegment:
+    """A stretch of a recording that is complete and can be transcribed."""
+
+    index: int
+    audio: np.ndarray  # int16, frames × channels
+    samplerate: int
+    # Offset of the first frame within the recording.
+    start: int
+
+
+class LiveSegmenter:
+    """Cuts audio into speech segments at pauses while it is being captured.
+
+    `feed()` takes blocks in capture order and calls `on_segment` with each
+    segment as soon as it is complete, i.e. at the first pause of at least
+    `pause_s` after `min_segment_s` of audio; a segment that reaches
+    `max_segment_s` without one is cut at its quietest point instead, like the
+    file segmenter does. `flush()` emits the tail at the end of the take.
+
+    Segments with no frame above the silence threshold are dropped rather than
+    emitted, so a stretch of room noise costs no request. Indexes count only
+    emitted segments and are contiguous.
+
+    Not thread-safe: feed and flush from one thread at a time.
+    """
+
+    def __init__(
+        self,
+        samplerate: int,
+        channels: int,
+        on_segment: Callable[[LiveSegment], None],
+        min_segment_s: float = LIVE_MIN_SEGMENT_S,
+        max_segment_s: float = LIVE_MAX_SEGMENT_S,
+        pause_s: float = LIVE_PAUSE_S,
+    ):
+        self.samplerate = samplerate
+        self.channels = channels
+        self._on_segment = on_segment
+        self._frame_len = max(1, int(samplerate * FRAME_S))
+        self._min = int(min_segment_s * samplerate)
+        # Whole frames, so a forced cut never has to split one.
+        self._max = max(
+            self._frame_len,
+            int(max_segment_s * samplerate) // self._frame_len * self._frame_len,
+        )
+        self._pause_frames = max(1, int(pause_s / FRAME_S))
+        self._smooth_frames = max(1, int(SMOOTH_S / FRAME_S))
+        # The segment being built, preallocated at its maximum length.
+        self._buf = np.empty((self._max, channels), dtype=np.int16)
+        self._fill = 0
+        self._energy = np.empty(self._max // self._frame_len, dtype=np.float32)
+        self._frames = 0  # entries of _energy that are valid
+        # Pause detection walks the frames one at a time, so the cuts do not
+        # depend on how the capture happened to be chunked into blocks.
+        self._scanned = 0
+        self._quiet = 0  # length of the quiet run ending at _scanned
+        self._peak = 0.0  # loudest frame of the segment so far
+        self._offset = 0  # recording offset of _buf[0]
+        self._count = 0
+
+    @property
+    def segments_emitted(self) -> int:
+        return self._count
+
+    def feed(self, block: np.ndarray):
+        block = block.reshape(-1, self.channels)
+        pos = 0
+        while pos < len(block):
+            take = min(len(block) - pos, self._max - self._fill)
+            self._buf[self._fill : self._fill + take] = block[pos : pos + take]
+            self._fill += take
+            pos += take
+            self._measure()
+            cut = self._find_cut()
+            if cut is not None:
+                self._emit(cut)
+
+    def flush(self) -> int:
+        """Emit whatever is left as the last segment; returns the total count."""
+        if self._fill:
+            self._emit(self._fill)
+        return self._count
+
+    def _measure(self):
+        complete = self._fill // self._frame_len
+        if complete > self._frames:
+            lo, hi = self._frames * self._frame_len, complete * self._frame_len
+            self._energy[self._frames : complete] = frame_rms(
+                self._buf[lo:hi], self._frame_len
+            )
+            self._frames = complete
+
+    def _find_cut(self) -> int | None:
+        while self._scanned < self._frames:
+            level = float(self._energy[self._scanned])
+            self._scanned += 1
+            self._peak = max(self._peak, level)
+            # Relative to the segment's loudest frame, so a noisy room's floor
+            # still reads as a pause next to speech.
+            if level < max(SILENCE_RMS, 0.1 * self._peak):
+                self._quiet += 1
+            else:
+                self._quiet = 0
+            if self._quiet >= self._pause_frames:
+                # Cut half a pause into the silence: both segments keep a
+                # little of it around their speech.
+                frame = self._scanned - self._pause_frames + self._pause_frames // 2
+                if frame * self._frame_len >= self._min:
+                    return frame * self._frame_len
+        if self._fill >= self._max:
+            energy = _smooth(self._energy[: self._frames], self._smooth_frames)
+            lo = self._frames - self._frames // 5
+            best = lo + int(np.argmin(energy[lo:]))
+            return max(1, best) * self._frame_len
+        return None
+
+    def _emit(self, cut: int):
+        audio = self._buf[:cut]
+        # Judge silence on the whole segment, including a trailing partial
+        # frame that _energy does not cover yet.
+        voiced = float(frame_rms(audio, self._frame_len).max()) >= SILENCE_RMS
+        if voiced:
+            segment = LiveSegment(
+                index=self._count,
+                audio=audio.copy(),
+                samplerate=self.samplerate,
+                start=self._offset,
+            )
+            self._count += 1
+            self._on_segment(segment)
+        rest = self._fill - cut
+        # Overlapping slice assignment is safe in numpy.
+        self._buf[:rest] = self._buf[cut : self._fill]
+        self._fill = rest
+        shift = cut // self._frame_len
+        kept = max(0, self._frames - shift)
+        self._energy[:kept] = self._energy[shift : self._frames]
+        self._frames = kept
+        self._scanned = max(0, self._scanned - shift)
+        # Whatever survived the cut of the trailing quiet run is still quiet.
+        self._quiet = min(self._quiet, self._scanned)
+        self._peak = float(self._energy[: self._scanned].max()) if self._scanned else 0.0
+        self._offset += cut
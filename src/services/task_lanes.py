@@ -0,0 +1,183 @@
+"""
+Task lanes: the controller's background work, split by how urgent it is.
+
+The controller used to run everything on one single-worker thread pool:
+transcriptions, the favourite presets fetched at start-up, text transforms
+and clipboard restores. A slow presets fetch at launch delayed the first
+dictation, and a transform the user asked for held up the next transcription
+behind it.
+
+`LaneScheduler` keeps one FIFO queue per `Lane`, each with its own limit on
+how many of its tasks run at once, and a shared set of worker threads. A
+worker that comes free takes the oldest task of the most urgent lane (lowest
+`priority`) that still has room, so a dictation queued behind a transform
+starts as soon as a worker is available instead of after the transform. Tasks
+of one lane with a limit of 1 run in the order they were submitted, which is
+what keeps transcriptions delivered in the order they were dictated.
+
+How long each task waited between `submit()` and starting is recorded per
+lane (`stats()`, included in error reports) and logged when it is long, so
+head-of-line blocking shows up in the numbers rather than as "it felt slow".
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Callable
+
+from src.services.audio_telemetry import Histogram
+
+logger = logging.getLogger(__name__)
+
+# A task that waited longer than this for a worker is logged.
+SLOW_WAIT_MS = 250.0
+
+
+@dataclass(frozen=True)
+class Lane:
+    """A class of work: its name, urgency (lower first) and concurrency."""
+
+    name: str
+    priority: int
+    limit: int = 1
+
+
+@dataclass
+class _Task:
+    fn: Callable
+    args: tuple
+    kwargs: dict
+    future: Future
+    submitted: float = field(default_factory=time.monotonic)
+
+
+class LaneScheduler:
+    """Runs tasks on worker threads, by lane priority within per-lane limits.
+
+    The interface follows `ThreadPoolExecutor` where it overlaps: `submit()`
+    returns a `Future`, and `shutdown()` takes the same arguments. Workers are
+    started as needed, up to `workers` (by default the sum of the limits, so
+    every lane can always run its share).
+    """
+
+    def __init__(
+        self,
+        lanes: list[Lane],
+        workers: int | None = None,
+        thread_name_prefix: str = "dicto-task",
+    ):
+        self._lanes = sorted(lanes, key=lambda lane: lane.priority)
+        self._queues: dict[str, deque[_Task]] = {lane.name: deque() for lane in lanes}
+        self._running = {lane.name: 0 for lane in lanes}
+        self._waits = {lane.name: Histogram() for lane in lanes}
+        self._max_workers = workers or sum(lane.limit for lane in lanes)
+        self._prefix = thread_name_prefix
+        self._threads: list[threading.Thread] = []
+        self._idle = 0
+        self._cond = threading.Condition()
+        self._shutdown = False
+
+    def submit(self, lane: str, fn: Callable, /, *args, **kwargs) -> Future:
+        """Queue `fn(*args, **kwargs)` on `lane`.
+
+        Raises `RuntimeError` after `shutdown()`, like an executor, and
+        `KeyError` for a lane the scheduler was not given.
+        """
+        queue = self._queues[lane]
+        future: Future = Future()
+        with self._cond:
+            if self._shutdown:
+                raise RuntimeError("cannot schedule new tasks after shutdown")
+            queue.append(_Task(fn, args, kwargs, future))
+            # A worker notified but not yet awake still counts as idle, so
+            # compare with everything queued rather than with zero.
+            queued = sum(len(q) for q in self._queues.values())
+            if self._idle < queued and len(self._threads) < self._max_workers:
+                thread = threading.Thread(
+                    target=self._work,
+                    name=f"{self._prefix}-{len(self._threads)}",
+                    daemon=True,
+                )
+                self._threads.append(thread)
+                thread.start()
+            self._cond.notify()
+        return future
+
+    def shutdown(self, wait: bool = True, cancel_futures: bool = False):
+        """Stop accepting tasks; the workers finish what is queued and exit.
+
+        With `cancel_futures`, tasks that have not started are cancelled
+        instead of run.
+        """
+        with self._cond:
+            self._shutdown = True
+            if cancel_futures:
+                for queue in self._queues.values():
+                    while queue:
+                        queue.popleft().future.cancel()
+            self._cond.notify_all()
+            threads = list(self._threads)
+        if wait:
+            for thread in threads:
+                if thread is not threading.current_thread():
+                    thread.join()
+
+    def stats(self) -> dict:
+        """Per lane: tasks queued and running now, and queue-wait times."""
+        with self._cond:
+            return {
+                lane.name: {
+                    "queued": len(self._queues[lane.name]),
+                    "running": self._running[lane.name],
+                    "wait_ms": self._waits[lane.name].as_dict(),
+                }
+                for lane in self._lanes
+            }
+
+    def _take(self) -> tuple[Lane, _Task] | None:
+        """The next task to run, most urgent lane with room first."""
+        for lane in self._lanes:
+            queue = self._queues[lane.name]
+            if queue and self._running[lane.name] < lane.limit:
+                self._running[lane.name] += 1
+                return lane, queue.popleft()
+        return None
+
+    def _work(self):
+        while True:
+            with self._cond:
+                while (taken := self._take()) is None:
+                    if self._shutdown and not any(self._queues.values()):
+                        return
+                    self._idle += 1
+                    self._cond.wait()
+                    self._idle -= 1
+                lane, task = taken
+                waited_ms = (time.monotonic() - task.submitted) * 1000
+                self._waits[lane.name].add(waited_ms)
+            if waited_ms > SLOW_WAIT_MS:
+                logger.info(
+                    f"Task on the {lane.name} lane waited {waited_ms:.0f}ms to start"
+                )
+            try:
+                self._run(task)
+            finally:
+                with self._cond:
+                    self._running[lane.name] -= 1
+                    self._cond.notify_all()
+
+    @staticmethod
+    def _run(task: _Task):
+        if not task.future.set_running_or_notify_cancel():
+            return
+        try:
+            result = task.fn(*task.args, **task.kwargs)
+        except BaseException as e:
+            task.future.set_exception(e)
+        else:
+            task.future.set_result(result)
@@ -3,26 +3,53 @@ Transcription and transformation service using the Dicto API.
 
 All endpoint URLs come from `src.services.routes` (see that module for the
 base URL and paths). This service wraps transcribe, transform and presets.
+
+Requests are coroutines (`atransform`, `atranscribe_stream`, ...) run on the
+shared event-loop thread of the `ApiClient`; the synchronous methods wait for
+them, and the ones given a `CancelToken` raise `TranscriptionCancelled` as
+soon as it is cancelled, with the request aborted (see event_loop.py).
+
+Failed requests are retried with jittered backoff, honouring a server's
+`Retry-After`, for as long as the client's shared retry budget allows (see
+retry.py); file uploads get timeouts sized to the file (see api_client.py).
 """
 
 from __future__ import annotations
 
+import asyncio
 import logging
-from typing import NoReturn
+import secrets
+from concurrent.futures import CancelledError, ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Coroutine, Iterable, NoReturn
 import time
 from pathlib import Path
 
 import httpx
+import numpy as np
+import soundfile as sf
 
 from src.services import routes
+from src.services.audio_codec import encode_for_upload, mime_type_for
+from src.services.audio_sink import new_temp_recording_path
+from src.services.api_client import ApiClient
+from src.services.event_loop import CancelToken
+from src.services.hedging import HedgePolicy
+from src.services.retry import backoff_delay, parse_retry_after
+from src.services.segmenter import plan_file_segments
+from src.services.vad import MIN_SAVING_S, plan_file_compaction, write_compacted
 
 logger = logging.getLogger(__name__)
 
 
 class TranscriptionError(Exception):
-    """Base exception for transcription errors."""
+    """Base exception for transcription errors.
 
-    pass
+    `retry_after` is the wait in seconds the server asked for, if it did.
+    """
+
+    def __init__(self, *args, retry_after: float | None = None):
+        super().__init__(*args)
+        self.retry_after = retry_after
 
 
 class APIKeyError(TranscriptionError):
@@ -37,6 +64,22 @@ class RateLimitError(TranscriptionError):
     pass
 
 
+class ServerError(TranscriptionError):
+    """The API failed (5xx); the same request may succeed later."""
+
+    pass
+
+
+class NetworkError(TranscriptionError):
+    """The request did not get an answer: no connection, or a timeout."""
+
+    pass
+
+
+# Failures a retry can fix, whatever the request was.
+TRANSIENT_ERRORS = (RateLimitError, ServerError, NetworkError)
+
+
 class AudioTooShortError(TranscriptionError):
     """Audio file is too short."""
 
@@ -49,11 +92,35 @@ class AudioTooLongError(TranscriptionError):
     pass
 
 
+class EmptyTranscriptionError(TranscriptionError):
+    """No speech: the API heard none, or the recording was silent."""
+
+    pass
+
+
+class TranscriptionCancelled(Exception):
+    """The request was cancelled (see `CancelToken`); there is no result.
+
+    Not a `TranscriptionError`: nothing failed, and nothing should retry it.
+    """
+
+    pass
+
+
 class Transcriber:
     """Handles audio transcription and text transformation via the Dicto API."""
 
     MAX_RETRIES = 3
-    RETRY_DELAY = 2  # seconds
+    RETRY_DELAY = 2  # seconds; backoff base (see retry.backoff_delay)
+    MAX_RETRY_DELAY = 30.0
+    # A server asking for a longer wait than this is not retried inline:
+    # the error goes to the caller (the queue keeps the job for later).
+    MAX_RETRY_AFTER_S = 30.0
+    TRANSFORM_TIMEOUT_S = 30.0
+    TRANSFORM_S_PER_1K_CHARS = 2.0
+    PRESETS_TIMEOUT_S = 10.0
+    MAX_UPLOAD_MB = 25
+    PRECONNECT_TIMEOUT_S = 5.0
 
     def __init__(
         self,
@@ -61,6 +128,12 @@ class Transcriber:
         language: str = "es",
         model: str = "v3-turbo",
         transformation_model: str = "qwen/qwen3-32b",
+        upload_codec: str = "wav",
+        segment_seconds: float = 300,
+        max_parallel_segments: int = 3,
+        trim_silence: bool = True,
+        api: ApiClient | None = None,
+        hedging: HedgePolicy | None = None,
     ):
         if not api_key:
             raise APIKeyError("Dicto API key is required")
@@ -69,91 +142,490 @@ class Transcriber:
         self.language = language
         self.model = model
         self.transformation_model = transformation_model
-        self.client = httpx.Client(timeout=30.0)
+        # "wav", "flac" or "opus"; see src.services.audio_codec.
+        self.upload_codec = upload_codec
+        # Recordings longer than this are split at pauses and transcribed as
+        # concurrent segments (0 disables splitting).
+        self.segment_seconds = segment_seconds
+        self.max_parallel_segments = max(1, max_parallel_segments)
+        # Trim leading/trailing silence and shorten long pauses before upload;
+        # see src.services.vad.
+        self.trim_silence = trim_silence
+        # The shared client (see api_client.py); one of our own, closed with
+        # us, when none is given.
+        self._owns_api = api is None
+        self.api = api if api is not None else ApiClient()
+        self.client = self.api.client
+        self.connection_stats = self.api.connection_stats
+        # Duplicates file uploads that are slow to answer (see hedging.py).
+        self.hedging = hedging
+
+    def _run(self, coro: Coroutine, cancel: CancelToken | None = None) -> Any:
+        """Wait for a request coroutine; raise TranscriptionCancelled on cancel."""
+        try:
+            return self.api.run(coro, cancel)
+        except CancelledError:
+            raise TranscriptionCancelled("Cancelled") from None
+
+    @staticmethod
+    def _sleep(delay: float, cancel: CancelToken | None):
+        """Back off between retries, cut short by a cancel."""
+        if cancel is None:
+            time.sleep(delay)
+        elif cancel.wait(delay):
+            raise TranscriptionCancelled("Cancelled")
+
+    def preconnect(self) -> bool:
+        """Open a connection to the API ahead of the next request.
+
+        Sends a HEAD to the base URL, whose answer does not matter: what is
+        left behind is a keep-alive connection in the pool, DNS, TCP and TLS
+        done, that the upload will reuse. Called when a recording starts, so
+        the handshakes happen while the user is speaking. Returns whether the
+        API was reached; failing is harmless (the upload connects as before).
+        """
+        return self._run(self.apreconnect())
+
+    async def apreconnect(self) -> bool:
+        try:
+            await self.client.head(routes.url("/"), timeout=self.PRECONNECT_TIMEOUT_S)
+        except httpx.HTTPError as e:
+            logger.debug(f"Preconnect failed: {e}")
+            return False
+        return True
 
     # ── Transcribe ──────────────────────────────────────────
 
-    def transcribe(self, audio_file_path: str) -> str:
+    def transcribe(
+        self, audio_file_path: str, cancel: CancelToken | None = None
+    ) -> str:
         audio_path = Path(audio_file_path)
 
         if not audio_path.exists():
             raise TranscriptionError(f"Audio file not found: {audio_file_path}")
 
         file_size_mb = audio_path.stat().st_size / (1024 * 1024)
-        if file_size_mb > 25:
-            raise AudioTooLongError(
-                f"Audio file too large: {file_size_mb:.1f}MB (max 25MB)"
-            )
+        # Checked on the recording itself: a compressed encoding of a short
+        # clip is legitimately tiny and would trip this falsely.
         if file_size_mb < 0.001:
             raise AudioTooShortError("Audio file too small (likely no audio recorded)")
 
+        compacted_path = self._compact_for_upload(audio_path)
+        try:
+            return self._transcribe_file(compacted_path, cancel)
+        finally:
+            if compacted_path != audio_path:
+                compacted_path.unlink(missing_ok=True)
+
+    def _transcribe_file(
+        self, audio_path: Path, cancel: CancelToken | None = None
+    ) -> str:
+        plan = self._plan_segments(audio_path)
+        if plan is not None:
+            samplerate, ranges = plan
+            return self._transcribe_segmented(audio_path, samplerate, ranges, cancel)
+
+        upload_path = self._encode_for_upload(audio_path)
+        try:
+            upload_mb = upload_path.stat().st_size / (1024 * 1024)
+            if upload_mb > self.MAX_UPLOAD_MB:
+                raise AudioTooLongError(
+                    f"Audio file too large: {upload_mb:.1f}MB (max {self.MAX_UPLOAD_MB}MB)"
+                )
+            return self._transcribe_with_retries(upload_path, cancel)
+        finally:
+            if upload_path != audio_path:
+                upload_path.unlink(missing_ok=True)
+
+    # ── Silence compaction ──────────────────────────────────
+
+    def _compact_for_upload(self, audio_path: Path) -> Path:
+        """Drop the silence around and between the speech before uploading.
+
+        Returns a compacted copy, or `audio_path` itself when there is too
+        little to gain or the analysis fails. Raises EmptyTranscriptionError
+        for a recording with no speech at all, which would otherwise be
+        uploaded only for the API to report the same.
+        """
+        if not self.trim_silence:
+            return audio_path
+        try:
+            t0 = time.monotonic()
+            plan = plan_file_compaction(str(audio_path))
+        except Exception as e:
+            logger.warning(f"Silence detection failed, uploading as recorded: {e}")
+            return audio_path
+        if not plan.has_speech:
+            logger.info(
+                f"No speech in {plan.total / plan.samplerate:.1f}s recording; "
+                "not uploading"
+            )
+            raise EmptyTranscriptionError("No speech detected in the recording")
+        if plan.removed < MIN_SAVING_S * plan.samplerate:
+            return audio_path
+        compacted = Path(new_temp_recording_path())
+        try:
+            write_compacted(str(audio_path), str(compacted), plan.ranges)
+        except Exception as e:
+            logger.warning(f"Silence trimming failed, uploading as recorded: {e}")
+            compacted.unlink(missing_ok=True)
+            return audio_path
+        rate = plan.samplerate
+        logger.info(
+            f"Trimmed silence: {plan.total / rate:.1f}s -> {plan.kept / rate:.1f}s "
+            f"({plan.removed / plan.total:.0%} removed, {len(plan.ranges)} spans) "
+            f"in {time.monotonic() - t0:.2f}s"
+        )
+        return compacted
+
+    # ── Segmented transcription ─────────────────────────────
+
+    def _max_segment_seconds(self, info) -> float:
+        """Longest segment that fits both segment_seconds and the upload cap.
+
+        The byte bound assumes the segment is uploaded as 16-bit PCM, so it
+        holds even when the configured codec falls back to WAV.
+        """
+        bytes_per_s = info.samplerate * info.channels * 2
+        by_size = 0.9 * self.MAX_UPLOAD_MB * 1024 * 1024 / bytes_per_s
+        if self.segment_seconds and self.segment_seconds > 0:
+            return min(self.segment_seconds, by_size)
+        return by_size
+
+    def _plan_segments(self, audio_path: Path) -> tuple[int, list] | None:
+        """Return (samplerate, ranges) when the recording needs splitting."""
+        try:
+            info = sf.info(str(audio_path))
+        except Exception:
+            return None  # not something libsndfile can read; upload as-is
+        max_s = self._max_segment_seconds(info)
+        if info.duration <= max_s:
+            return None
+        try:
+            samplerate, ranges = plan_file_segments(str(audio_path), max_s)
+        except Exception as e:
+            logger.warning(f"Could not plan segments, uploading whole file: {e}")
+            return None
+        return (samplerate, ranges) if len(ranges) > 1 else None
+
+    def _transcribe_segmented(
+        self,
+        audio_path: Path,
+        samplerate: int,
+        ranges: list[tuple[int, int]],
+        cancel: CancelToken | None = None,
+    ) -> str:
+        """Transcribe `ranges` of the recording concurrently, in order.
+
+        Each segment goes through its own retry loop, so one flaky request
+        costs a retry of that segment rather than of the whole recording. A
+        segment that still fails fails the transcription: stitching around a
+        hole would silently drop part of what the user said, so the first
+        failure also aborts the segments still in flight.
+        """
+        workers = min(self.max_parallel_segments, len(ranges))
+        duration = ranges[-1][1] / samplerate
+        logger.info(
+            f"Transcribing {duration:.0f}s recording as {len(ranges)} segments "
+            f"({workers} in parallel)"
+        )
+
+        # Cancelled by the caller's token, or by the first segment to fail.
+        abort = CancelToken()
+        if cancel is not None:
+            cancel.add_callback(abort.cancel)
+        failures: list[BaseException] = []
+
+        def run(index: int, start: int, end: int) -> str:
+            try:
+                with sf.SoundFile(str(audio_path)) as f:
+                    f.seek(start)
+                    data = f.read(end - start, dtype="int16")
+                return self.transcribe_audio(data, samplerate, abort)
+            except TranscriptionCancelled:
+                raise
+            except Exception as e:
+                logger.warning(f"Segment {index + 1}/{len(ranges)} failed: {e}")
+                failures.append(e)
+                # Don't keep uploading segments nobody will use.
+                abort.cancel()
+                raise
+
+        pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="segment")
+        try:
+            futures = [pool.submit(run, i, a, b) for i, (a, b) in enumerate(ranges)]
+            texts = [future.result() for future in futures]
+        except TranscriptionCancelled:
+            # An earlier segment was aborted because a later one failed.
+            if failures:
+                raise failures[0] from None
+            raise
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+            if cancel is not None:
+                cancel.remove_callback(abort.cancel)
+
+        text = " ".join(t for t in texts if t)
+        if not text:
+            raise EmptyTranscriptionError("API returned empty transcription")
+        return text
+
+    def transcribe_audio(
+        self, audio: np.ndarray, samplerate: int, cancel: CancelToken | None = None
+    ) -> str:
+        """Transcribe one in-memory segment of int16 audio.
+
+        Used for the pieces of a split recording and for live segments. The
+        segment goes through the same encoding and retry loop as a whole file;
+        a segment the API hears no speech in yields "" rather than an error,
+        since one quiet stretch says nothing about the rest of the recording.
+        """
+        segment_path = Path(new_temp_recording_path())
+        try:
+            sf.write(str(segment_path), audio, samplerate, subtype="PCM_16")
+            upload_path = self._encode_for_upload(segment_path)
+            try:
+                return self._transcribe_with_retries(upload_path, cancel)
+            except EmptyTranscriptionError:
+                return ""
+            finally:
+                if upload_path != segment_path:
+                    upload_path.unlink(missing_ok=True)
+        finally:
+            segment_path.unlink(missing_ok=True)
+
+    # ── Upload encoding ─────────────────────────────────────
+
+    def _encode_for_upload(self, audio_path: Path) -> Path:
+        """Re-encode the recording in the configured upload codec.
+
+        Runs on the caller's thread, which for the app is the controller's
+        worker pool. Falls back to the original file if encoding fails: a
+        bigger upload beats a lost dictation.
+        """
+        if self.upload_codec == "wav":
+            return audio_path
+        try:
+            t0 = time.monotonic()
+            encoded = encode_for_upload(audio_path, self.upload_codec)
+        except Exception as e:
+            logger.warning(f"Upload encoding ({self.upload_codec}) failed: {e}")
+            return audio_path
+        if encoded != audio_path:
+            before = audio_path.stat().st_size
+            after = encoded.stat().st_size
+            logger.info(
+                f"Encoded upload as {encoded.suffix[1:]}: {before / 1024:.0f} KB -> "
+                f"{after / 1024:.0f} KB in {time.monotonic() - t0:.2f}s"
+            )
+        return encoded
+
+    def _transcribe_with_retries(
+        self, audio_path: Path, cancel: CancelToken | None = None
+    ) -> str:
+        return self._with_retries(
+            lambda: self._transcribe_request(audio_path, cancel=cancel),
+            cancel,
+            what="Transcription",
+        )
+
+    def _with_retries(
+        self,
+        request: Callable[[], str],
+        cancel: CancelToken | None,
+        what: str,
+        retryable: tuple[type[TranscriptionError], ...] = (TranscriptionError,),
+    ) -> str:
+        """Call `request()`, retrying `retryable` errors with backoff.
+
+        A retry needs a token from the client's retry budget; without one, or
+        when the server asked for a wait over `MAX_RETRY_AFTER_S`, the error
+        is raised as it is.
+        """
         last_error = None
         for attempt in range(self.MAX_RETRIES):
             try:
-                return self._transcribe_request(audio_path)
-            except RateLimitError as e:
+                return request()
+            except (APIKeyError, EmptyTranscriptionError):
+                # Neither changes on a retry: the key is still wrong, and the
+                # same audio still contains no speech.
+                raise
+            except retryable as e:
                 last_error = e
-                if attempt < self.MAX_RETRIES - 1:
-                    delay = self.RETRY_DELAY * (2**attempt)
+                if attempt == self.MAX_RETRIES - 1:
+                    break
+                if e.retry_after is not None and e.retry_after > self.MAX_RETRY_AFTER_S:
                     logger.warning(
-                        f"Rate limit hit, retrying in {delay}s… (attempt {attempt + 1}/{self.MAX_RETRIES})"
+                        f"{what} failed ({e}); the API asks to wait {e.retry_after:.0f}s, not retrying now"
                     )
-                    time.sleep(delay)
-            except APIKeyError:
-                raise
-            except TranscriptionError as e:
-                last_error = e
-                if attempt < self.MAX_RETRIES - 1:
-                    delay = self.RETRY_DELAY * (2**attempt)
+                    break
+                if not self.api.retry_budget.try_acquire():
                     logger.warning(
-                        f"Transcription failed, retrying in {delay}s… (attempt {attempt + 1}/{self.MAX_RETRIES})"
+                        f"{what} failed ({e}); retry budget spent, not retrying"
                     )
-                    time.sleep(delay)
+                    break
+                delay = backoff_delay(
+                    attempt, self.RETRY_DELAY, self.MAX_RETRY_DELAY, e.retry_after
+                )
+                logger.warning(
+                    f"{what} failed ({e}), retrying in {delay:.1f}s… (attempt {attempt + 1}/{self.MAX_RETRIES})"
+                )
+                self._sleep(delay, cancel)
 
-        raise last_error or TranscriptionError("Transcription failed after all retries")
+        raise last_error or TranscriptionError(f"{what} failed after all retries")
 
-    def _transcribe_request(self, audio_path: Path) -> str:
+    def _transcribe_request(
+        self,
+        audio_path: Path,
+        mime: str | None = None,
+        cancel: CancelToken | None = None,
+    ) -> str:
+        return self._run(self._atranscribe_hedged(audio_path, mime), cancel)
+
+    async def _atranscribe_hedged(
+        self, audio_path: Path, mime: str | None = None
+    ) -> str:
+        if self.hedging is None:
+            return await self._atranscribe_request(audio_path, mime)
+        return await self.hedging.run(
+            lambda: self._atranscribe_request(audio_path, mime)
+        )
+
+    async def _atranscribe_request(
+        self, audio_path: Path, mime: str | None = None
+    ) -> str:
         try:
             headers = {"Authorization": f"Bearer {self.api_key}"}
-
-            # Guess MIME type from extension
-            suffix = audio_path.suffix.lower()
-            mime_types = {
-                ".wav": "audio/wav",
-                ".mp3": "audio/mpeg",
-                ".webm": "audio/webm",
-                ".m4a": "audio/m4a",
-                ".ogg": "audio/ogg",
-            }
-            mime = mime_types.get(suffix, "audio/wav")
+            mime = mime or mime_type_for(audio_path)
 
             data = {"source": "mic_app", "model": self.model}
             if self.language:
                 data["language"] = self.language
 
-            with open(audio_path, "rb") as audio_file:
-                files = {"file": (audio_path.name, audio_file, mime)}
-                response = self.client.post(
+            # Read off the loop: a file body would be read on it, holding up
+            # every other request in flight while a large upload is sent.
+            content = await asyncio.to_thread(audio_path.read_bytes)
+            limits = self.api.upload_timeouts(len(content))
+            files = {"file": (audio_path.name, content, mime)}
+            response = await asyncio.wait_for(
+                self.client.post(
                     routes.transcribe(),
                     headers=headers,
                     files=files,
                     data=data,
-                )
+                    timeout=limits.timeout,
+                ),
+                limits.deadline_s,
+            )
 
-            if response.status_code == 200:
-                result = response.json()
-                text = result.get("text", "")
-                if not text:
-                    raise TranscriptionError("API returned empty transcription")
-                logger.info("Transcription OK")
-                return text.strip()
+            return self._read_transcription(response)
 
-            self._handle_error_response(response)
+        except (httpx.TimeoutException, asyncio.TimeoutError):
+            raise NetworkError("Request timeout — API took too long to respond")
+        except httpx.RequestError as e:
+            raise NetworkError(f"Network error: {e}")
+        except TranscriptionError:
+            raise
+        except Exception as e:
+            raise TranscriptionError(f"Unexpected error: {e}")
 
-        except httpx.TimeoutException:
-            raise TranscriptionError("Request timeout — API took too long to respond")
+    def _read_transcription(self, response: httpx.Response) -> str:
+        if response.status_code == 200:
+            result = response.json()
+            text = result.get("text", "")
+            if not text:
+                raise EmptyTranscriptionError("API returned empty transcription")
+            logger.info("Transcription OK")
+            return text.strip()
+
+        self._handle_error_response(response)
+
+    # ── Streaming upload ────────────────────────────────────
+
+    def transcribe_stream(
+        self,
+        chunks: Iterable[bytes],
+        filename: str = "recording.wav",
+        mime: str = "audio/wav",
+        cancel: CancelToken | None = None,
+    ) -> str:
+        """Transcribe audio whose bytes are still being produced.
+
+        `chunks` is sent as the file part of a multipart request with chunked
+        transfer encoding, so the upload runs while the recording does and is
+        nearly complete by the time the last chunk arrives. There is no retry:
+        the body is consumed as it is sent and cannot be replayed, so callers
+        keep a copy of the audio to fall back on. An exception raised by
+        `chunks` aborts the request and propagates.
+        """
+        return self._run(self.atranscribe_stream(chunks, filename, mime), cancel)
+
+    async def atranscribe_stream(
+        self,
+        chunks: Iterable[bytes],
+        filename: str = "recording.wav",
+        mime: str = "audio/wav",
+    ) -> str:
+        boundary = secrets.token_hex(16)
+        fields = {"source": "mic_app", "model": self.model}
+        if self.language:
+            fields["language"] = self.language
+        sent = 0
+        recorded = asyncio.Event()
+
+        async def body() -> AsyncIterator[bytes]:
+            nonlocal sent
+            for name, value in fields.items():
+                yield (
+                    f"--{boundary}\r\n"
+                    f'Content-Disposition: form-data; name="{name}"\r\n\r\n'
+                    f"{value}\r\n"
+                ).encode()
+            yield (
+                f"--{boundary}\r\n"
+                f'Content-Disposition: form-data; name="file"; filename="{filename}"\r\n'
+                f"Content-Type: {mime}\r\n\r\n"
+            ).encode()
+            # `chunks` blocks until the recorder has more; wait for it off
+            # the loop, so other requests keep moving meanwhile.
+            it = iter(chunks)
+            while (chunk := await asyncio.to_thread(next, it, None)) is not None:
+                sent += len(chunk)
+                yield chunk
+            recorded.set()
+            yield f"\r\n--{boundary}--\r\n".encode()
+
+        headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": f"multipart/form-data; boundary={boundary}",
+        }
+        try:
+            # The answer may take as long as the largest upload allowed. The
+            # recording runs as long as the user talks, so the deadline only
+            # starts once it is over, sized to what it came to.
+            limits = self.api.upload_timeouts(self.MAX_UPLOAD_MB * 1024 * 1024)
+            # An iterator body has no length, so httpx sends it chunked.
+            post = asyncio.ensure_future(
+                self.client.post(
+                    routes.transcribe(),
+                    headers=headers,
+                    content=body(),
+                    timeout=limits.timeout,
+                )
+            )
+            ended = asyncio.ensure_future(recorded.wait())
+            try:
+                await asyncio.wait({post, ended}, return_when=asyncio.FIRST_COMPLETED)
+                deadline_s = self.api.upload_timeouts(sent).deadline_s
+                response = await asyncio.wait_for(post, deadline_s)
+            finally:
+                post.cancel()
+                ended.cancel()
+            return self._read_transcription(response)
+        except (httpx.TimeoutException, asyncio.TimeoutError):
+            raise NetworkError("Request timeout — API took too long to respond")
         except httpx.RequestError as e:
-            raise TranscriptionError(f"Network error: {e}")
+            raise NetworkError(f"Network error: {e}")
         except TranscriptionError:
             raise
         except Exception as e:
@@ -161,17 +633,28 @@ class Transcriber:
 
     # ── Transform ───────────────────────────────────────────
 
-    def transform(self, text: str, instructions: str) -> str:
+    def transform(
+        self, text: str, instructions: str, cancel: CancelToken | None = None
+    ) -> str:
         """
         Transform text using the Dicto /api/v1/transform endpoint (Dicto format).
 
         Args:
             text: The text to transform
             instructions: System prompt / instructions for transformation
+            cancel: Aborts the request, raising TranscriptionCancelled
 
         Returns:
             Transformed text
         """
+        return self._with_retries(
+            lambda: self._run(self.atransform(text, instructions), cancel),
+            cancel,
+            what="Transform",
+            retryable=TRANSIENT_ERRORS,
+        )
+
+    async def atransform(self, text: str, instructions: str) -> str:
         try:
             headers = {
                 "Authorization": f"Bearer {self.api_key}",
@@ -184,10 +667,12 @@ class Transcriber:
                 "model": self.transformation_model,
             }
 
-            response = self.client.post(
+            response = await self.client.post(
                 routes.transform(),
                 headers=headers,
                 json=payload,
+                timeout=self.TRANSFORM_TIMEOUT_S
+                + self.TRANSFORM_S_PER_1K_CHARS * len(text) / 1000,
             )
 
             if response.status_code == 200:
@@ -200,9 +685,9 @@ class Transcriber:
             self._handle_error_response(response)
 
         except httpx.TimeoutException:
-            raise TranscriptionError("Transform request timeout")
+            raise NetworkError("Transform request timeout")
         except httpx.RequestError as e:
-            raise TranscriptionError(f"Network error: {e}")
+            raise NetworkError(f"Network error: {e}")
         except TranscriptionError:
             raise
         except Exception as e:
@@ -216,11 +701,15 @@ class Transcriber:
         Returns:
             List of dicts with keys: name, instructions
         """
+        return self._run(self.aget_favorite_presets())
+
+    async def aget_favorite_presets(self) -> list[dict]:
         try:
             headers = {"Authorization": f"Bearer {self.api_key}"}
-            response = self.client.get(
+            response = await self.client.get(
                 routes.presets(),
                 headers=headers,
+                timeout=self.PRESETS_TIMEOUT_S,
             )
             if response.status_code == 200:
                 data = response.json()
@@ -236,13 +725,17 @@ class Transcriber:
 
     def _handle_error_response(self, response: httpx.Response) -> NoReturn:
         """Parse error response and raise appropriate exception."""
-        if response.status_code == 401:
+        status = response.status_code
+        if status == 401:
             raise APIKeyError("Invalid or missing API key")
-        elif response.status_code == 429:
-            raise RateLimitError("Spending limit reached")
-        else:
-            msg = self._parse_error_message(response)
-            raise TranscriptionError(f"API error ({response.status_code}): {msg}")
+        retry_after = None
+        if status in (429, 503):
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+        if status == 429:
+            raise RateLimitError("Spending limit reached", retry_after=retry_after)
+        msg = self._parse_error_message(response)
+        error = ServerError if status >= 500 else TranscriptionError
+        raise error(f"API error ({status}): {msg}", retry_after=retry_after)
 
     @staticmethod
     def _parse_error_message(response: httpx.Response) -> str:
@@ -257,8 +750,8 @@ class Transcriber:
         return response.text[:200]
 
     def close(self):
-        if getattr(self, "client", None):
-            self.client.close()
+        if getattr(self, "_owns_api", False):
+            self.api.close()
 
     def __del__(self):
         self.close()
@@ -0,0 +1,358 @@
+"""
+Transcription queue: recordings whose transcription failed, retried until it works.
+
+`Transcriber` retries a request three times within a few seconds, which covers
+a dropped packet but not a train tunnel or a Wi-Fi that comes back after ten
+minutes; after that the controller used to show the error and delete the
+recording. Now a recording that failed for a reason time can fix (network,
+timeouts, server errors, rate limits) becomes a job here instead.
+
+Each job is a directory under `queue/` next to config.yaml holding the audio
+(`audio.wav`) and a `job.json` with the settings it is to be transcribed with
+(language, model), the attempts so far, the last error and when to try next.
+The file is rewritten atomically after every attempt, so the queue carries on
+where it left off after a restart.
+
+One background worker drains the queue, oldest job first, with exponential
+backoff and jitter per job (`BASE_DELAY_S` doubling up to `MAX_DELAY_S`). A
+rate limit holds the whole queue, not just the job that hit it, for at least
+`RATE_LIMIT_DELAY_S`; so does a rejected API key, which only the user can fix,
+and a server that asked for a wait (`Retry-After` on a 429 or 503), for at
+least that long.
+Errors that no retry can fix (no speech, audio too short or too long) drop the
+job. A job that finally succeeds is handed to `on_result` and deleted.
+The queue gives up on a job after `MAX_ATTEMPTS` failed attempts or once it is
+`MAX_AGE_S` old, whatever the error: the job is marked failed, kept on disk
+with its audio (later runs skip it) and handed to `on_failure`, so the user
+learns that its text is not coming.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import random
+import shutil
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+
+from src.services.recording_journal import write_json_atomic
+from src.services.transcriber import (
+    APIKeyError,
+    AudioTooLongError,
+    AudioTooShortError,
+    EmptyTranscriptionError,
+    RateLimitError,
+    TranscriptionError,
+)
+
+logger = logging.getLogger(__name__)
+
+JOB = "job.json"
+AUDIO = "audio.wav"
+# First retry after ~30 s, then doubling: 1, 2, 4 ... minutes, capped at 30.
+BASE_DELAY_S = 30.0
+MAX_DELAY_S = 30 * 60.0
+# After a rate limit the API is not asked again, for any job, before this.
+RATE_LIMIT_DELAY_S = 10 * 60.0
+# Past either, a job is given up on: 5-7 h of backoff, or three days.
+MAX_ATTEMPTS = 20
+MAX_AGE_S = 3 * 24 * 3600.0
+# Errors the same audio will hit again however long we wait.
+PERMANENT_ERRORS = (AudioTooShortError, AudioTooLongError, EmptyTranscriptionError)
+
+
+def is_retryable(error: Exception) -> bool:
+    """Whether a failed transcription is worth queueing for later."""
+    return isinstance(error, TranscriptionError) and not isinstance(
+        error, PERMANENT_ERRORS + (APIKeyError,)
+    )
+
+
+def retry_delay(attempts: int) -> float:
+    """Seconds to wait after the `attempts`-th failure.
+
+    Exponential, with "equal jitter" (a random point in the upper half of the
+    window), so jobs that failed together do not all come back together.
+    """
+    delay = min(MAX_DELAY_S, BASE_DELAY_S * 2 ** max(0, attempts - 1))
+    return random.uniform(delay / 2, delay)
+
+
+@dataclass(eq=False)
+class TranscriptionJob:
+    """One queued recording. `path` is its directory."""
+
+    path: Path
+    options: dict
+    created: float
+    attempts: int = 0
+    # time.time() of the next try; wall-clock, so it survives a restart.
+    next_attempt: float = 0.0
+    last_error: str | None = None
+    # Given up on; kept on disk for the user, never retried.
+    failed: bool = False
+
+    @property
+    def id(self) -> str:
+        return self.path.name
+
+    @property
+    def audio(self) -> Path:
+        return self.path / AUDIO
+
+    def save(self):
+        write_json_atomic(
+            self.path / JOB,
+            {
+                "options": self.options,
+                "created": self.created,
+                "attempts": self.attempts,
+                "next_attempt": self.next_attempt,
+                "last_error": self.last_error,
+                "failed": self.failed,
+            },
+        )
+
+    @classmethod
+    def load(cls, path: Path) -> TranscriptionJob:
+        with open(path / JOB, encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(
+            path=path,
+            options=data["options"],
+            created=data["created"],
+            attempts=data.get("attempts", 0),
+            next_attempt=data.get("next_attempt", 0.0),
+            last_error=data.get("last_error"),
+            failed=data.get("failed", False),
+        )
+
+    def delete(self):
+        shutil.rmtree(self.path, ignore_errors=True)
+
+
+class TranscriptionQueue:
+    """Disk-backed queue of transcriptions, drained by a background worker.
+
+    `transcribe(job)` does one attempt and returns the text or raises (a
+    `TranscriptionError` to classify it); `on_result(job, text)` receives each
+    success and `on_failure(job, error)` each job given up on. All are called
+    on the worker thread.
+    """
+
+    def __init__(
+        self,
+        root: str | Path,
+        transcribe: Callable[[TranscriptionJob], str],
+        on_result: Callable[[TranscriptionJob, str], None],
+        on_failure: Callable[[TranscriptionJob, str], None] | None = None,
+    ):
+        self.root = Path(root)
+        self._transcribe = transcribe
+        self._on_result = on_result
+        self._on_failure = on_failure
+        self._cond = threading.Condition()
+        self._jobs: list[TranscriptionJob] = self._load()
+        # No attempt at all before this time.monotonic() (rate limit, bad key).
+        self._hold_until = 0.0
+        self._stopping = False
+        self._thread: threading.Thread | None = None
+
+    def _load(self) -> list[TranscriptionJob]:
+        if not self.root.is_dir():
+            return []
+        jobs = []
+        for path in sorted(p for p in self.root.iterdir() if p.is_dir()):
+            try:
+                job = TranscriptionJob.load(path)
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning(f"Skipping unreadable queued job {path.name}: {e}")
+                continue
+            if job.failed:
+                continue
+            if not job.audio.exists():
+                logger.warning(f"Dropping queued job {job.id}: its audio is gone")
+                job.delete()
+                continue
+            jobs.append(job)
+        if jobs:
+            logger.info(f"{len(jobs)} transcription(s) queued from an earlier run")
+        return sorted(jobs, key=lambda j: j.created)
+
+    def __len__(self) -> int:
+        with self._cond:
+            return len(self._jobs)
+
+    def jobs(self) -> list[TranscriptionJob]:
+        with self._cond:
+            return list(self._jobs)
+
+    def enqueue(
+        self, audio_path: str, options: dict, error: str | None = None
+    ) -> TranscriptionJob:
+        """Queue a recording, moving the file into the queue.
+
+        `error` is why it failed just now, if it did; the first retry then
+        waits out the backoff instead of running straight away.
+        """
+        path = self.root / f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        path.mkdir(parents=True)
+        job = TranscriptionJob(path=path, options=dict(options), created=time.time())
+        if error is not None:
+            job.attempts = 1
+            job.last_error = error
+            job.next_attempt = time.time() + retry_delay(1)
+        try:
+            shutil.move(audio_path, job.audio)
+        except OSError:
+            job.delete()
+            raise
+        try:
+            job.save()
+        except OSError:
+            shutil.move(job.audio, audio_path)
+            job.delete()
+            raise
+        with self._cond:
+            self._jobs.append(job)
+            self._cond.notify_all()
+        logger.info(f"Transcription queued for retry: {job.id}")
+        return job
+
+    # ── Worker ──────────────────────────────────────────────
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stopping = False
+        self._thread = threading.Thread(
+            target=self._run, name="dicto-transcription-queue", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        """Stop the worker. An attempt in flight is left to finish on its own."""
+        thread, self._thread = self._thread, None
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        if thread is not None:
+            thread.join(timeout)
+
+    def wake(self):
+        """Retry now instead of waiting out the backoff (e.g. back online)."""
+        with self._cond:
+            now = time.time()
+            for job in self._jobs:
+                job.next_attempt = min(job.next_attempt, now)
+            self._hold_until = 0.0
+            self._cond.notify_all()
+
+    def _next_due(self) -> tuple[TranscriptionJob | None, float | None]:
+        """The job to try now, or else how long to wait (None: until notified)."""
+        if not self._jobs:
+            return None, None
+        held = self._hold_until - time.monotonic()
+        if held > 0:
+            return None, held
+        job = min(self._jobs, key=lambda j: (j.next_attempt, j.created))
+        wait = job.next_attempt - time.time()
+        return (job, None) if wait <= 0 else (None, wait)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while True:
+                    if self._stopping:
+                        return
+                    job, wait = self._next_due()
+                    if job is not None:
+                        break
+                    self._cond.wait(wait)
+            self._attempt(job)
+
+    def _attempt(self, job: TranscriptionJob):
+        logger.info(
+            f"Retrying queued transcription {job.id} (attempt {job.attempts + 1})"
+        )
+        try:
+            text = self._transcribe(job)
+        except PERMANENT_ERRORS as e:
+            logger.warning(f"Dropping queued transcription {job.id}: {e}")
+            self._remove(job)
+            return
+        except APIKeyError as e:
+            self._failed(job, e, hold=MAX_DELAY_S, count=False)
+            return
+        except RateLimitError as e:
+            self._failed(job, e, hold=max(RATE_LIMIT_DELAY_S, e.retry_after or 0.0))
+            return
+        except TranscriptionError as e:
+            self._failed(job, e, hold=e.retry_after or 0.0)
+            return
+        except Exception as e:
+            self._failed(job, e)
+            return
+        logger.info(f"Queued transcription {job.id} succeeded")
+        try:
+            self._on_result(job, text)
+        except Exception as e:
+            logger.error(f"Error delivering queued transcription {job.id}: {e}")
+        self._remove(job)
+
+    def _failed(
+        self,
+        job: TranscriptionJob,
+        error: Exception,
+        hold: float = 0.0,
+        count: bool = True,
+    ):
+        if count:
+            job.attempts += 1
+        if job.attempts >= MAX_ATTEMPTS or time.time() - job.created >= MAX_AGE_S:
+            self._give_up(job, error)
+            return
+        delay = max(hold, retry_delay(job.attempts))
+        job.next_attempt = time.time() + delay
+        job.last_error = str(error)
+        with self._cond:
+            if hold:
+                self._hold_until = time.monotonic() + delay
+        logger.warning(
+            f"Queued transcription {job.id} failed ({error}); next try in {delay:.0f}s"
+        )
+        try:
+            job.save()
+        except OSError as e:
+            logger.error(f"Could not update queued job {job.id}: {e}")
+
+    def _give_up(self, job: TranscriptionJob, error: Exception):
+        job.failed = True
+        job.last_error = str(error)
+        with self._cond:
+            if job in self._jobs:
+                self._jobs.remove(job)
+        logger.error(
+            f"Giving up on queued transcription {job.id} after {job.attempts} "
+            f"attempt(s) ({error}); its audio is kept at {job.audio}"
+        )
+        try:
+            job.save()
+        except OSError as e:
+            logger.error(f"Could not update queued job {job.id}: {e}")
+        if self._on_failure is not None:
+            try:
+                self._on_failure(job, str(error))
+            except Exception as e:
+                logger.error(f"Error reporting failed transcription {job.id}: {e}")
+
+    def _remove(self, job: TranscriptionJob):
+        with self._cond:
+            if job in self._jobs:
+                self._jobs.remove(job)
+        job.delete()
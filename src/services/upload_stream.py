@@ -0,0 +1,208 @@
+"""
+Uploading a recording while it is being captured, as one streaming request.
+
+In the default flow the upload starts after the hotkey is released, so a long
+dictation on a slow uplink spends seconds pushing bytes the client has had all
+along. In `transcription.upload_mode: stream` the transcription request is
+opened as soon as the mic is, and the recorder feeds the captured audio into
+its body (chunked transfer encoding) as it arrives. On release only the last
+~100 ms of audio are still to be sent, and what remains is the server's time.
+
+The body is a WAV whose header cannot know the final length, so it uses the
+streaming convention of maximal RIFF/data sizes; decoders then read the data
+until the stream ends. The recording is still saved to a file as usual, which
+is what the controller falls back to when a streamed upload fails: a
+streamed body cannot be replayed.
+"""
+
+from __future__ import annotations
+
+import logging
+import queue
+import struct
+import threading
+from concurrent.futures import Future
+from typing import Iterator
+
+import numpy as np
+
+from src.services.event_loop import CancelToken
+from src.services.transcriber import (
+    AudioTooLongError,
+    Transcriber,
+    TranscriptionError,
+)
+
+logger = logging.getLogger(__name__)
+
+# Queue sentinels: end of the recording / abandon the upload.
+_END = object()
+_ABORT = object()
+
+# Upper bound on one HTTP chunk. Blocks are coalesced up to this when the
+# network falls behind, so a slow uplink does not pay per-chunk overhead for
+# every 64 ms capture block.
+MAX_CHUNK_BYTES = 64 * 1024
+
+# RIFF and data sizes for a WAV of unknown length.
+_UNKNOWN_SIZE = 0xFFFFFFFF
+
+
+def streaming_wav_header(samplerate: int, channels: int) -> bytes:
+    """44-byte 16-bit PCM WAV header for a stream of unknown length."""
+    block_align = channels * 2
+    return b"".join(
+        [
+            b"RIFF",
+            struct.pack("<I", _UNKNOWN_SIZE),
+            b"WAVE",
+            b"fmt ",
+            struct.pack(
+                "<IHHIIHH",
+                16,  # fmt chunk size
+                1,  # PCM
+                channels,
+                samplerate,
+                samplerate * block_align,
+                block_align,
+                16,  # bits per sample
+            ),
+            b"data",
+            struct.pack("<I", _UNKNOWN_SIZE),
+        ]
+    )
+
+
+class WavByteStream:
+    """Captured int16 blocks in, WAV bytes out, across threads.
+
+    `feed()`/`close()` are called by the producer (the recording thread);
+    iterating yields the header and then the audio as it arrives, blocking
+    until there is more, and ends after `close()`. `abort()`, or feeding past
+    `max_bytes`, makes the iterator raise instead, which aborts the request
+    reading from it.
+    """
+
+    def __init__(self, samplerate: int, channels: int, max_bytes: int | None = None):
+        self.samplerate = samplerate
+        self.channels = channels
+        self.max_bytes = max_bytes
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._frames = 0
+        self._bytes = 0
+        self._done = False
+
+    @property
+    def frames(self) -> int:
+        return self._frames
+
+    def feed(self, block: np.ndarray):
+        if self._done:
+            return
+        data = np.ascontiguousarray(block, dtype="<i2").tobytes()
+        self._bytes += len(data)
+        if self.max_bytes is not None and self._bytes > self.max_bytes:
+            logger.warning(
+                f"Streamed upload passed {self.max_bytes / 1024 / 1024:.0f} MB; "
+                "abandoning it"
+            )
+            self._done = True
+            self._queue.put(_ABORT)
+            return
+        self._frames += len(block)
+        self._queue.put(data)
+
+    def close(self) -> int:
+        """End the stream; returns the number of frames fed."""
+        if not self._done:
+            self._done = True
+            self._queue.put(_END)
+        return self._frames
+
+    def abort(self):
+        self._done = True
+        self._queue.put(_ABORT)
+
+    def __iter__(self) -> Iterator[bytes]:
+        yield streaming_wav_header(self.samplerate, self.channels)
+        while True:
+            item = self._queue.get()
+            pending = []
+            size = 0
+            # Coalesce whatever else is already waiting into one chunk.
+            while item is not _END and item is not _ABORT:
+                pending.append(item)
+                size += len(item)
+                if size >= MAX_CHUNK_BYTES:
+                    item = None
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    item = None
+                    break
+            if pending:
+                yield b"".join(pending)
+            if item is _END:
+                return
+            if item is _ABORT:
+                raise AudioTooLongError("Streamed upload abandoned")
+
+
+class StreamingUpload:
+    """One recording uploaded as a single chunked request while it is captured.
+
+    Plugs into `AudioRecorder.set_capture_tap`: `capture_tap` opens the
+    request on a dedicated thread as soon as the recorder knows its sample
+    rate, `feed`/`flush` pass the audio through, and `finish()` waits for the
+    server's answer.
+    """
+
+    def __init__(self, transcriber: Transcriber):
+        self._transcriber = transcriber
+        self._stream: WavByteStream | None = None
+        self._result: Future = Future()
+        self._cancel = CancelToken()
+
+    def capture_tap(self, samplerate: int, channels: int) -> "StreamingUpload":
+        max_bytes = int(self._transcriber.MAX_UPLOAD_MB * 1024 * 1024)
+        self._stream = WavByteStream(samplerate, channels, max_bytes=max_bytes)
+        threading.Thread(
+            target=self._run, name="dicto-stream-upload", daemon=True
+        ).start()
+        return self
+
+    def _run(self):
+        assert self._stream is not None
+        try:
+            text = self._transcriber.transcribe_stream(
+                self._stream, cancel=self._cancel
+            )
+        except BaseException as e:
+            self._result.set_exception(e)
+        else:
+            self._result.set_result(text)
+
+    def feed(self, block: np.ndarray):
+        assert self._stream is not None
+        self._stream.feed(block)
+
+    def flush(self) -> int:
+        assert self._stream is not None
+        return self._stream.close()
+
+    def finish(self, frames: int, timeout: float | None = None) -> str:
+        """Wait for the transcription of the streamed recording."""
+        if self._stream is None:
+            raise TranscriptionError("Streamed upload never started")
+        logger.info(
+            f"Streamed {frames / self._stream.samplerate:.1f}s of audio; "
+            "waiting for the transcription"
+        )
+        return self._result.result(timeout=timeout)
+
+    def cancel(self):
+        """Abandon the upload, mid-body or waiting for the answer."""
+        if self._stream is not None:
+            self._stream.abort()
+        self._cancel.cancel()
@@ -0,0 +1,243 @@
+"""
+Voice activity detection and silence compaction before upload.
+
+Dictation audio carries a lot of nothing: the second before the user starts
+talking, the pause while they think, the tail before they release the hotkey.
+All of it is uploaded and run through the model. This module finds the speech
+with a cheap per-frame detector (energy, plus zero-crossing rate so quiet
+fricatives like "s" and "f" are not mistaken for silence) and plans a compacted
+copy of the recording: leading and trailing silence trimmed, long pauses
+shortened. A recording with no speech at all is recognised here too, so it can
+be rejected without a round trip to the API.
+
+Everything is vectorized over 20 ms frames, and files are analysed block by
+block, so a two-hour recording never has to be loaded whole.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+import soundfile as sf
+
+from src.services.segmenter import FRAME_S, SILENCE_RMS, frame_rms
+
+# Speech is a frame this many times louder than the room's noise floor, never
+# quieter than SILENCE_RMS. The bar is capped at this fraction (-26 dB) of the
+# recording's loud frames, so a take that is all speech, whose "floor" is the
+# dips between syllables, does not lose its quieter words.
+SPEECH_OVER_FLOOR = 3.0
+SPEECH_UNDER_PEAK = 0.05
+# Unvoiced consonants are quiet but noisy: a frame with at least this fraction
+# of sign changes counts as speech at half the energy threshold.
+FRICATIVE_ZCR = 0.3
+# Kept around every stretch of speech, so word onsets and decays survive.
+PAD_S = 0.25
+# Pauses longer than this are shortened to KEEP_PAUSE_S. A second of silence is
+# still a natural break; more than that is thinking time.
+MAX_PAUSE_S = 1.0
+KEEP_PAUSE_S = 0.5
+# Compacting rewrites the file; not worth it to save less than this.
+MIN_SAVING_S = 0.5
+
+
+def frame_zcr(audio: np.ndarray, frame_len: int) -> np.ndarray:
+    """Zero-crossing rate (0-1) of consecutive `frame_len`-sample frames.
+
+    Same framing as `frame_rms`: multichannel audio is averaged to mono and a
+    trailing partial frame is measured on its own.
+    """
+    if audio.ndim > 1:
+        audio = audio.mean(axis=1) if audio.shape[1] > 1 else audio[:, 0]
+    n = len(audio)
+    if n == 0:
+        return np.zeros(0, dtype=np.float32)
+    signs = np.signbit(audio)
+    # crossings[i] is a sign change between samples i and i+1; counting the
+    # one into each frame's first sample keeps every frame at frame_len steps.
+    crossings = np.empty(n, dtype=np.float32)
+    crossings[0] = 0
+    crossings[1:] = signs[1:] != signs[:-1]
+    full = n // frame_len
+    out = np.empty(full + (1 if n % frame_len else 0), dtype=np.float32)
+    if full:
+        out[:full] = crossings[: full * frame_len].reshape(full, frame_len).mean(axis=1)
+    if n % frame_len:
+        out[full] = crossings[full * frame_len :].mean()
+    return out
+
+
+def detect_speech(rms: np.ndarray, zcr: np.ndarray) -> np.ndarray:
+    """Boolean speech mask over frames, from their RMS and zero-crossing rate.
+
+    The threshold follows the recording's own noise floor (its quietest tenth
+    of frames), so a noisy room does not read as continuous speech.
+    """
+    if len(rms) == 0:
+        return np.zeros(0, dtype=bool)
+    floor, peak = np.percentile(rms, [10, 99])
+    threshold = max(
+        SILENCE_RMS, min(SPEECH_OVER_FLOOR * floor, SPEECH_UNDER_PEAK * peak)
+    )
+    voiced = rms >= threshold
+    fricative = (zcr >= FRICATIVE_ZCR) & (rms >= threshold / 2)
+    return voiced | fricative
+
+
+def _runs(mask: np.ndarray) -> list[tuple[int, int]]:
+    """(start, end) index ranges of the True runs in `mask`."""
+    edges = np.diff(mask.astype(np.int8), prepend=0, append=0)
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    return list(zip(starts.tolist(), ends.tolist()))
+
+
+def plan_kept_ranges(
+    speech: np.ndarray,
+    frame_len: int,
+    total_samples: int,
+    pad_frames: int,
+    max_pause_frames: int,
+    keep_pause_frames: int,
+) -> list[tuple[int, int]]:
+    """Sample ranges to keep, given a per-frame speech mask.
+
+    Speech is padded by `pad_frames` on both sides; what is left outside the
+    first and last speech is dropped, and any pause longer than
+    `max_pause_frames` keeps only `keep_pause_frames`, split between its two
+    ends. Empty when there is no speech.
+    """
+    if not speech.any():
+        return []
+    if pad_frames > 0:
+        # Dilate the mask: a frame is kept if speech is within pad_frames.
+        kernel = np.ones(2 * pad_frames + 1, dtype=np.int32)
+        speech = np.convolve(speech.astype(np.int32), kernel, mode="same") > 0
+    head = keep_pause_frames // 2
+    tail = keep_pause_frames - head
+    ranges: list[tuple[int, int]] = []
+    for start, end in _runs(speech):
+        if ranges and start - ranges[-1][1] <= max_pause_frames:
+            # Short pause: keep it whole.
+            ranges[-1] = (ranges[-1][0], end)
+        elif ranges:
+            prev_start, prev_end = ranges[-1]
+            ranges[-1] = (prev_start, prev_end + head)
+            ranges.append((start - tail, end))
+        else:
+            ranges.append((start, end))
+    return [
+        (start * frame_len, min(end * frame_len, total_samples))
+        for start, end in ranges
+        if start * frame_len < total_samples
+    ]
+
+
+@dataclass
+class Compaction:
+    """The parts of a recording worth uploading."""
+
+    samplerate: int
+    total: int  # samples in the recording
+    ranges: list[tuple[int, int]]  # sample ranges to keep, in order
+
+    @property
+    def kept(self) -> int:
+        return sum(end - start for start, end in self.ranges)
+
+    @property
+    def removed(self) -> int:
+        return self.total - self.kept
+
+    @property
+    def has_speech(self) -> bool:
+        return bool(self.ranges)
+
+
+def plan_compaction(
+    audio: np.ndarray,
+    samplerate: int,
+    max_pause_s: float = MAX_PAUSE_S,
+    keep_pause_s: float = KEEP_PAUSE_S,
+    pad_s: float = PAD_S,
+) -> Compaction:
+    """Plan the compaction of in-memory int16 audio."""
+    frame_len = max(1, int(samplerate * FRAME_S))
+    return _plan(
+        frame_rms(audio, frame_len),
+        frame_zcr(audio, frame_len),
+        frame_len,
+        len(audio),
+        samplerate,
+        max_pause_s,
+        keep_pause_s,
+        pad_s,
+    )
+
+
+def plan_file_compaction(
+    path: str,
+    max_pause_s: float = MAX_PAUSE_S,
+    keep_pause_s: float = KEEP_PAUSE_S,
+    pad_s: float = PAD_S,
+) -> Compaction:
+    """Like `plan_compaction`, for a sound file, without loading it whole."""
+    with sf.SoundFile(path) as f:
+        samplerate, total = f.samplerate, f.frames
+        frame_len = max(1, int(samplerate * FRAME_S))
+        rms, zcr = [], []
+        for block in f.blocks(blocksize=frame_len * 4096, dtype="int16"):
+            rms.append(frame_rms(block, frame_len))
+            zcr.append(frame_zcr(block, frame_len))
+    if not rms:
+        return Compaction(samplerate, total, [])
+    return _plan(
+        np.concatenate(rms),
+        np.concatenate(zcr),
+        frame_len,
+        total,
+        samplerate,
+        max_pause_s,
+        keep_pause_s,
+        pad_s,
+    )
+
+
+def _plan(
+    rms, zcr, frame_len, total, samplerate, max_pause_s, keep_pause_s, pad_s
+) -> Compaction:
+    frames_per_s = samplerate / frame_len
+    ranges = plan_kept_ranges(
+        detect_speech(rms, zcr),
+        frame_len,
+        total,
+        pad_frames=int(pad_s * frames_per_s),
+        max_pause_frames=int(max_pause_s * frames_per_s),
+        keep_pause_frames=int(keep_pause_s * frames_per_s),
+    )
+    return Compaction(samplerate, total, ranges)
+
+
+def write_compacted(src: str, dst: str, ranges: list[tuple[int, int]]):
+    """Copy the kept `ranges` of `src` into a new 16-bit WAV at `dst`."""
+    blocksize = 1 << 18
+    with (
+        sf.SoundFile(src) as f_in,
+        sf.SoundFile(
+            dst,
+            mode="w",
+            samplerate=f_in.samplerate,
+            channels=f_in.channels,
+            subtype="PCM_16",
+        ) as f_out,
+    ):
+        for start, end in ranges:
+            f_in.seek(start)
+            remaining = end - start
+            while remaining > 0:
+                block = f_in.read(min(blocksize, remaining), dtype="int16")
+                if not len(block):
+                    break
+                f_out.write(block)
+                remaining -= len(block)
@@ -82,6 +82,8 @@ class MainWindow(BuildMixin, SettingsMixin, StateMixin, UpdatesMixin, QMainWindo
         self.is_recording = False
         self.is_processing = False
         self.last_transcription = ""
+        # Live transcription text so far, for the recording/processing preview.
+        self._partial_text = ""
         self._drag_pos = None
         self._elapsed_seconds = 0
         self._copied = False
@@ -96,6 +98,7 @@ class MainWindow(BuildMixin, SettingsMixin, StateMixin, UpdatesMixin, QMainWindo
         self._section_labels: dict[str, QLabel] = {}  # key -> section QLabel
         self._hotkey_labels: dict[str, QLabel] = {}  # key -> hotkey row QLabel
         self._audio_monitor = None  # AudioMonitor while test is active
+        self._last_audio_monitor = None  # the last finished test, for reports
         self._pending_update = None  # UpdateInfo once a newer release is found
         self._update_check_thread = None
         self._update_install_thread = None
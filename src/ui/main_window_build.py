@@ -475,6 +475,13 @@ class BuildMixin:
         self.recording_label.setStyleSheet(RECORDING_LABEL)
         layout.addWidget(self.recording_label)
 
+        # Live transcription preview (upload_mode "live"); empty otherwise.
+        self.live_preview = QLabel("")
+        self.live_preview.setStyleSheet(IDLE_TEXT)
+        self.live_preview.setWordWrap(True)
+        self.live_preview.hide()
+        layout.addWidget(self.live_preview)
+
         # Animated dots timer
         self._dots_count = 0
         self._dots_timer = QTimer(self)
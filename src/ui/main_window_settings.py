@@ -68,6 +68,12 @@ class SettingsMixin:
         self._prev_page = self.content_stack.currentIndex()
         self.content_stack.setCurrentIndex(3)  # settings page
         self._refresh_report_log_view()
+        # PortAudio only sees a mic plugged in since start-up after a rescan,
+        # which runs in the background; the list shows what it knows so far.
+        from src.services.recorder import get_capture_hub
+
+        get_capture_hub().devices.request_refresh()
+        self._populate_input_devices()
         # The user is now looking at the Updates section, so the badge has done
         # its job — but keep the pending update itself actionable.
         if self._pending_update is not None:
@@ -114,7 +120,6 @@ class SettingsMixin:
         self.report_status_label.show()
 
     def _send_report(self):
-        import httpx
         from src.utils.logger import get_log_buffer
 
         self.send_report_button.setEnabled(False)
@@ -122,36 +127,64 @@ class SettingsMixin:
         logs = "\n".join(get_log_buffer())
         self.report_log_view.setPlainText(logs)
 
+        api = getattr(self.controller, "api", None)
         try:
             api_key = self.settings.transcription_api_key if self.settings else ""
-            headers = {
-                "Authorization": f"Bearer {api_key}",
-                "Content-Type": "application/json",
-            }
-            base_url = os.environ.get("DICTO_API_URL", "https://dicto.up.railway.app")
-            response = httpx.post(
-                f"{base_url}/api/report",
-                headers=headers,
-                json={"logs": logs, "source": "desktop_app"},
-                timeout=15.0,
+            sent = api is not None and api.send_report(
+                api_key,
+                {
+                    "logs": logs,
+                    "source": "desktop_app",
+                    "audio_telemetry": self._audio_telemetry_report(),
+                    "task_lanes": self.controller.get_task_stats()
+                    if self.controller
+                    else {},
+                    "connection": self._connection_report(),
+                },
             )
-            if response.status_code in (200, 201):
-                self.report_status_label.setText(t("report_sent"))
-                self.report_status_label.setStyleSheet(
-                    "color: #4ade80; font-size: 11px;"
-                )
-            else:
-                self.report_status_label.setText(t("report_send_failed"))
-                self.report_status_label.setStyleSheet(
-                    f"color: {RED}; font-size: 11px;"
-                )
         except Exception:
+            sent = False
+        if sent:
+            self.report_status_label.setText(t("report_sent"))
+            self.report_status_label.setStyleSheet("color: #4ade80; font-size: 11px;")
+        else:
             self.report_status_label.setText(t("report_send_failed"))
             self.report_status_label.setStyleSheet(f"color: {RED}; font-size: 11px;")
 
         self.report_status_label.show()
         self.send_report_button.setEnabled(True)
 
+    def _audio_telemetry_report(self) -> dict:
+        """Capture stream statistics of the last recording and mic test.
+
+        Overflows, callback timing and dropped audio, so a report about choppy
+        recordings carries the numbers that explain them.
+        """
+        report = {}
+        recorder = getattr(self.controller, "recorder", None)
+        if recorder is not None:
+            report["last_recording"] = recorder.get_telemetry().as_dict()
+        monitor = self._audio_monitor or self._last_audio_monitor
+        if monitor is not None:
+            report["mic_test"] = monitor.get_telemetry().as_dict()
+        return report
+
+    def _connection_report(self) -> dict:
+        """Connection reuse, handshake times and retry budget of the API client,
+        and hedging."""
+        api = getattr(self.controller, "api", None)
+        if api is None:
+            return {}
+        report = {
+            "http2": api.http2,
+            **api.connection_stats.as_dict(),
+            "retry_budget": api.retry_budget.as_dict(),
+        }
+        hedging = getattr(self.controller, "hedging", None)
+        if hedging is not None:
+            report["hedging"] = hedging.as_dict()
+        return report
+
     def _close_panel(self):
         self._settings_open = False
         self._models_open = False
@@ -172,11 +205,15 @@ class SettingsMixin:
         from src.services.recorder import list_input_devices
 
         self.input_device_combo.blockSignals(True)
+        current = self.input_device_combo.currentData()
         self.input_device_combo.clear()
         self.input_device_combo.addItem(t("system_default"), None)
         for dev in list_input_devices():
             suffix = f" ({t('default')})" if dev["is_default"] else ""
             self.input_device_combo.addItem(f"{dev['name']}{suffix}", dev["id"])
+        self.input_device_combo.setCurrentIndex(
+            max(0, self.input_device_combo.findData(current))
+        )
         self.input_device_combo.blockSignals(False)
 
     def _load_settings(self):
@@ -417,6 +454,8 @@ class SettingsMixin:
     def _stop_audio_monitor(self):
         if self._audio_monitor:
             self._audio_monitor.stop()
+            # Kept for its telemetry, which the error report includes.
+            self._last_audio_monitor = self._audio_monitor
             self._audio_monitor = None
         self.test_audio_button.setText(t("test_audio"))
         self.test_audio_waveform.stop()
@@ -281,6 +281,9 @@ class StateMixin:
             self.content_stack.setCurrentIndex(1)  # recording page
         self.recording_label.setText(t("listening"))
         self.recording_label.setStyleSheet(RECORDING_LABEL)
+        self._partial_text = ""
+        self.live_preview.clear()
+        self.live_preview.hide()
         self.record_button.setText("")
         self.record_button.setIcon(_make_icon(SVG_STOP, 16, "white"))
         self.record_button.setStyleSheet(RECORD_BUTTON_RECORDING)
@@ -361,7 +364,9 @@ class StateMixin:
             self._prev_page = 2  # done page
         else:
             self.content_stack.setCurrentIndex(2)  # done page
-        self.transcription_text.clear()
+        # In live mode most of the text is already in; keep showing it while
+        # the tail is transcribed.
+        self.transcription_text.setText(self._partial_text)
         self.processing_label.setText(t("processing"))
         self.processing_label.setStyleSheet(PROCESSING_LABEL)
         self.processing_label.show()
@@ -476,6 +481,20 @@ class StateMixin:
         # Tabs
         self._update_tabs_enabled(False)
 
+    @Slot(str)
+    def update_partial_transcription(self, text: str):
+        """Preview of a live transcription, while recording or processing."""
+        if not (self.is_recording or self.is_processing) or getattr(
+            self, "_is_editing", False
+        ):
+            return
+        self._partial_text = text
+        if self.is_recording:
+            self.live_preview.setText(text)
+            self.live_preview.show()
+        else:
+            self.transcription_text.setText(text)
+
     @Slot(str)
     def update_transcription(self, text: str):
         self.last_transcription = text
@@ -13,6 +13,7 @@ from PySide6.QtWidgets import (
     QPushButton,
 )
 from PySide6.QtCore import Qt, QTimer, QPoint, Signal
+from PySide6.QtGui import QFontMetrics
 
 from src.i18n import t
 from src.ui.main_window_styles import (
@@ -200,7 +201,7 @@ class OverlayWindow(QWidget):
         )
         self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
         self.setStyleSheet("background: transparent;")
-        self.setFixedSize(170, 60)
+        self.setFixedSize(170, self._HEIGHT)
         self._position_window()
         self.hide()
 
@@ -339,12 +340,50 @@ class OverlayWindow(QWidget):
         self.icon_stack.hide()
         card_layout.addWidget(self.icon_stack)
 
+        # Live transcription preview: the end of the text so far, one line.
+        self.preview_label = QLabel("")
+        self.preview_label.setStyleSheet(
+            f"color: {TEXT_DIM}; font-size: 10px; {LABEL_BASE}"
+        )
+        self.preview_label.setContentsMargins(8, 0, 8, 0)
+        self.preview_label.hide()
+        card_layout.addWidget(self.preview_label)
+
         # Hidden sub_label kept for error messages only
         self.sub_label = QLabel("")
         self.sub_label.hide()
 
         main_layout.addWidget(self.card)
 
+    # Card height without / with the preview line.
+    _HEIGHT = 60
+    _HEIGHT_WITH_PREVIEW = 76
+
+    def show_partial(self, text: str):
+        """Show the tail of a live transcription under the waveform.
+
+        Only while recording or processing; the card is far too narrow for the
+        whole text, so it keeps the most recent words and puts everything in
+        the tooltip.
+        """
+        if self.current_state not in ("recording", "processing") or not text:
+            return
+        metrics = QFontMetrics(self.preview_label.font())
+        self.preview_label.setText(
+            metrics.elidedText(text, Qt.TextElideMode.ElideLeft, self.width() - 20)
+        )
+        self.preview_label.setToolTip(text)
+        if self.preview_label.isHidden():
+            self.preview_label.show()
+            self.setFixedSize(self.width(), self._HEIGHT_WITH_PREVIEW)
+
+    def _clear_preview(self):
+        self.preview_label.setText("")
+        self.preview_label.setToolTip("")
+        if not self.preview_label.isHidden():
+            self.preview_label.hide()
+            self.setFixedSize(self.width(), self._HEIGHT)
+
     def _update_action_btn_icon(self):
         self.action_btn.setIcon(_make_overlay_icon(SVG_SETTINGS_SMALL, 14, TEXT_DIM))
 
@@ -445,6 +484,7 @@ class OverlayWindow(QWidget):
     def show_idle(self):
         self.current_state = "idle"
         self._stop_animations()
+        self._clear_preview()
         self.status_label.setText(t("ready"))
         self.status_label.setStyleSheet(
             f"color: {TEXT}; font-size: 12px; font-weight: 600; {LABEL_BASE}"
@@ -461,6 +501,7 @@ class OverlayWindow(QWidget):
 
     def show_recording(self):
         self.current_state = "recording"
+        self._clear_preview()
         self.status_label.setText(t("recording"))
         self.status_label.setStyleSheet(
             f"color: {TEXT}; font-size: 12px; font-weight: 600; {LABEL_BASE}"
@@ -496,6 +537,7 @@ class OverlayWindow(QWidget):
     def show_success(self, auto_hide_delay: int = 1500):
         self.current_state = "success"
         self._stop_animations()
+        self._clear_preview()
         self.status_label.setText(t("copied_to_clipboard").upper())
         self.status_label.setStyleSheet(
             f"color: {GREEN}; font-size: 12px; font-weight: 600; {LABEL_BASE}"
@@ -522,6 +564,7 @@ class OverlayWindow(QWidget):
         """
         self.current_state = "warning"
         self._stop_animations()
+        self._clear_preview()
         self.status_label.setText(message)
         self.status_label.setStyleSheet(
             f"color: {AMBER}; font-size: 12px; font-weight: 600; {LABEL_BASE}"
@@ -541,6 +584,7 @@ class OverlayWindow(QWidget):
     def show_error(self, message: str = "Error", auto_hide_delay: int = 3000):
         self.current_state = "error"
         self._stop_animations()
+        self._clear_preview()
         self.status_label.setText(f"{t('error')}: {message}")
         self.status_label.setStyleSheet(
             f"color: {RED}; font-size: 12px; font-weight: 600; {LABEL_BASE}"
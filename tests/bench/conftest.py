@@ -0,0 +1,29 @@
+"""Shared helpers for the benchmark suite.
+
+Benchmarks are marked `bench` and excluded from `make test`/CI; run them with
+`make bench` (or `pytest -m bench -s tests/bench`). Each one prints a small
+table and asserts only the property it exists to demonstrate, with generous
+bounds so a loaded machine does not turn them red.
+"""
+
+from __future__ import annotations
+
+import pytest
+
+
+@pytest.fixture
+def bench_report(capsys):
+    """Print a titled table of rows straight to the terminal."""
+
+    def _report(title: str, header: list[str], rows: list[list]):
+        widths = [
+            max(len(str(h)), *(len(str(r[i])) for r in rows))
+            for i, h in enumerate(header)
+        ]
+        with capsys.disabled():
+            print(f"\n── {title}")
+            print("  ".join(str(h).rjust(w) for h, w in zip(header, widths)))
+            for row in rows:
+                print("  ".join(str(c).rjust(w) for c, w in zip(row, widths)))
+
+    return _report
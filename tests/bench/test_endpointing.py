@@ -0,0 +1,78 @@
+"""Benchmark: CPU cost of end-of-speech detection on live capture blocks.
+
+With `behavior.auto_stop` the detector sees every 1024-frame block the mic
+delivers, so its cost is paid continuously while recording. The table shows the
+CPU time it takes per second of audio at the usual mic rates, and how long
+after the last word it stops the recording.
+"""
+
+from __future__ import annotations
+
+import time
+
+import numpy as np
+import pytest
+
+from src.services.endpointing import EndpointDetector
+
+pytestmark = pytest.mark.bench
+
+BLOCK = 1024
+MINUTES = 10
+RATES = (16000, 44100, 48000)
+
+
+def _dictation(rate: int, seconds: float) -> np.ndarray:
+    """Speech-like audio: syllable bursts with a pause every few seconds."""
+    rng = np.random.default_rng(3)
+    n = int(seconds * rate)
+    t = np.arange(n) / rate
+    envelope = np.clip(np.sin(2 * np.pi * 2.0 * t), 0, None) ** 2
+    envelope *= (np.sin(2 * np.pi * 0.15 * t) > -0.6).astype(np.float64)
+    voiced = np.sin(2 * np.pi * 140 * t) + 0.5 * np.sin(2 * np.pi * 280 * t)
+    audio = envelope * (3000 * voiced + 800 * rng.standard_normal(n))
+    audio += 30 * rng.standard_normal(n)
+    return audio.astype(np.int16).reshape(-1, 1)
+
+
+def test_endpointing_cpu_per_second_of_audio(bench_report):
+    rows = []
+    for rate in RATES:
+        audio = _dictation(rate, MINUTES * 60)
+        # Never fires on continuous dictation, so every block is measured.
+        detector = EndpointDetector(rate, trailing_silence_s=10.0)
+        blocks = [audio[i : i + BLOCK] for i in range(0, len(audio), BLOCK)]
+        t0 = time.process_time()
+        for block in blocks:
+            detector.feed(block)
+        cpu = time.process_time() - t0
+        assert not detector.fired
+
+        tail = np.concatenate(
+            [_dictation(rate, 3.0), np.zeros((rate * 3, 1), np.int16)]
+        )
+        stopper = EndpointDetector(rate, trailing_silence_s=1.0)
+        fired_at = None
+        for i in range(0, len(tail), BLOCK):
+            if stopper.feed(tail[i : i + BLOCK]):
+                fired_at = (i + BLOCK) / rate
+                break
+        assert fired_at is not None
+
+        per_second = cpu / (MINUTES * 60)
+        rows.append(
+            [
+                f"{rate}",
+                f"{1e6 * cpu / len(blocks):.1f}",
+                f"{1000 * per_second:.2f}",
+                f"{100 * per_second:.3f}%",
+                f"{fired_at - 3.0:.2f}",
+            ]
+        )
+        # A small fraction of one core, far below the 64/21 ms block period.
+        assert per_second < 0.02
+    bench_report(
+        "end-of-speech detection (1024-frame blocks, 1 s trailing silence)",
+        ["rate", "us/block", "cpu ms/s", "of a core", "stop after s"],
+        rows,
+    )
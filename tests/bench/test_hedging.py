@@ -0,0 +1,86 @@
+"""Benchmark: transcription tail latency with and without hedged requests.
+
+The stand-in server answers most uploads in `FAST_S` but one in
+`1 / SLOW_EVERY` (at random, the same sequence for both clients) takes
+`SLOW_S`, like a request landing on an overloaded instance. Without hedging
+those set the p99; with it, an upload still unanswered at the observed p90
+gets a copy, which is almost always fast. Times are scaled down from the real
+API's (hence the small `min_delay_s`). The first `WARMUP` uploads, before the
+policy has latencies to go by, are not measured: in the app it learns them
+once per session.
+"""
+
+from __future__ import annotations
+
+import random
+import time
+
+import pytest
+
+from src.services.hedging import HedgePolicy
+from src.services.transcriber import Transcriber
+
+pytestmark = pytest.mark.bench
+
+FAST_S = 0.05
+SLOW_S = 1.0
+SLOW_EVERY = 20
+REQUESTS = 100
+WARMUP = 20
+
+
+def _percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[int(q * (len(ordered) - 1))]
+
+
+def _run(stand_in_server, wav: str, hedging: HedgePolicy | None) -> list[float]:
+    rng = random.Random(7)
+    stand_in_server.latency = lambda r: (
+        SLOW_S if rng.random() < 1 / SLOW_EVERY else FAST_S
+    )
+    t = Transcriber(
+        api_key="sk-dicto-test", upload_codec="wav", trim_silence=False, hedging=hedging
+    )
+    times = []
+    try:
+        for _ in range(WARMUP):
+            t.transcribe(wav)
+        for _ in range(REQUESTS):
+            t0 = time.perf_counter()
+            assert t.transcribe(wav) == "hello world"
+            times.append(time.perf_counter() - t0)
+    finally:
+        t.close()
+    return times
+
+
+def test_hedging_cuts_the_tail(stand_in_server, speech_like_wav, bench_report):
+    wav = speech_like_wav(1.0)
+    rows = []
+    p99 = {}
+    for name, hedging in (
+        ("plain", None),
+        ("hedged", HedgePolicy(min_delay_s=4 * FAST_S, max_extra=0.1)),
+    ):
+        before = len(stand_in_server.requests)
+        times = _run(stand_in_server, wav, hedging)
+        sent = len(stand_in_server.requests) - before - WARMUP
+        p99[name] = _percentile(times, 0.99)
+        rows.append(
+            [
+                name,
+                f"{_percentile(times, 0.5) * 1000:.0f}",
+                f"{_percentile(times, 0.9) * 1000:.0f}",
+                f"{p99[name] * 1000:.0f}",
+                f"{max(times) * 1000:.0f}",
+                f"{(sent - REQUESTS) / REQUESTS:.0%}",
+            ]
+        )
+    bench_report(
+        f"upload → text, {REQUESTS} uploads, 1 in {SLOW_EVERY} answered after "
+        f"{SLOW_S * 1000:.0f} ms instead of {FAST_S * 1000:.0f} ms",
+        ["client", "p50 ms", "p90 ms", "p99 ms", "max ms", "extra requests"],
+        rows,
+    )
+    assert p99["hedged"] < p99["plain"] / 2
@@ -0,0 +1,65 @@
+"""Benchmark: hotkey-release → text with and without a preconnect.
+
+After an idle spell the client's pool is empty, so the upload that follows a
+dictation first sets up a connection. The stand-in server charges every new
+connection `CONNECT_S` (standing in for DNS + TCP + TLS to a distant API);
+a preconnect at the hotkey press pays it while the user is still speaking.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from src.services.transcriber import Transcriber
+
+pytestmark = pytest.mark.bench
+
+CONNECT_S = 0.2
+SPEAKING_S = 0.5
+RUNS = 3
+
+
+def _release_to_text(wav: str, preconnect: bool) -> tuple[float, dict]:
+    t = Transcriber(api_key="sk-dicto-test", trim_silence=False)
+    try:
+        if preconnect:
+            # What the controller does on the background lane at the press.
+            threading.Thread(target=t.preconnect, daemon=True).start()
+        time.sleep(SPEAKING_S)
+        t0 = time.perf_counter()
+        assert t.transcribe(wav) == "hello world"
+        return time.perf_counter() - t0, t.connection_stats.as_dict()
+    finally:
+        t.close()
+
+
+def test_preconnect_takes_the_handshake_off_the_critical_path(
+    stand_in_server, speech_like_wav, bench_report
+):
+    stand_in_server.connect_latency = CONNECT_S
+    wav = speech_like_wav(2.0)
+    rows = []
+    best = {}
+    for preconnect in (False, True):
+        times = []
+        for _ in range(RUNS):
+            elapsed, stats = _release_to_text(wav, preconnect)
+            times.append(elapsed)
+        best[preconnect] = min(times)
+        rows.append(
+            [
+                "preconnect" if preconnect else "cold",
+                f"{min(times) * 1000:.0f}",
+                f"{max(times) * 1000:.0f}",
+                f"{stats['reused']}/{stats['requests']}",
+            ]
+        )
+    bench_report(
+        f"release → text, {CONNECT_S * 1000:.0f} ms connection setup",
+        ["client", "best ms", "worst ms", "reused/requests"],
+        rows,
+    )
+    assert best[True] < best[False] - CONNECT_S / 2
@@ -0,0 +1,87 @@
+"""Benchmark: hotkey-release → file-ready latency vs. recording length.
+
+The in-memory recorder concatenates, resamples and encodes the whole take in
+stop_recording(), so its stop cost grows with the recording. With
+stream_to_disk the blocks are already in the file and stop only drains the
+writer queue and patches the WAV header, so the cost should stay flat.
+"""
+
+from __future__ import annotations
+
+import time
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from src.services.recorder import AudioRecorder
+
+pytestmark = pytest.mark.bench
+
+RATE = 16000
+BLOCK = 1024
+STREAM_DURATIONS_S = (5, 60, 600, 7200)
+# The in-memory path needs the whole take (plus copies) in RAM; two hours of it
+# is the problem being solved, not something worth paying for in a benchmark.
+MEMORY_DURATIONS_S = (5, 60, 600)
+
+
+def _blocks(seconds: int):
+    block = (np.random.default_rng(0).standard_normal((BLOCK, 1)) * 500).astype(
+        np.int16
+    )
+    for _ in range(seconds * RATE // BLOCK):
+        yield block.copy()
+
+
+def _stop_streaming(seconds: int) -> float:
+    with patch("src.services.recorder.sd"):
+        r = AudioRecorder(sample_rate=RATE, stream_to_disk=True)
+        r.is_recording = True
+        r._open_sink(RATE)
+        sink = r._sink
+        for block in _blocks(seconds):
+            sink.write(block)
+        # Real capture arrives at 1x speed and the writer keeps up easily, so
+        # at release time only the last block or so is still pending.
+        while sink.frames_written < sink.frames_queued:
+            time.sleep(0.005)
+        sink.write(np.zeros((BLOCK, 1), dtype=np.int16))
+
+        t0 = time.perf_counter()
+        path = r.stop_recording()
+        elapsed = time.perf_counter() - t0
+        assert path is not None
+        r.cleanup_temp_file()
+        return elapsed
+
+
+def _stop_in_memory(seconds: int) -> float:
+    with patch("src.services.recorder.sd"):
+        r = AudioRecorder(sample_rate=RATE)
+        r.is_recording = True
+        for block in _blocks(seconds):
+            r.frames.append(block)
+        t0 = time.perf_counter()
+        path = r.stop_recording()
+        elapsed = time.perf_counter() - t0
+        assert path is not None
+        r.cleanup_temp_file()
+        return elapsed
+
+
+def test_stop_latency_is_flat_with_stream_to_disk(bench_report):
+    streaming = {s: _stop_streaming(s) for s in STREAM_DURATIONS_S}
+    in_memory = {s: _stop_in_memory(s) for s in MEMORY_DURATIONS_S}
+
+    rows = []
+    for s in STREAM_DURATIONS_S:
+        mem = f"{in_memory[s] * 1000:.1f}" if s in in_memory else "-"
+        rows.append([f"{s}s", f"{streaming[s] * 1000:.2f}", mem])
+    bench_report(
+        "stop_recording latency (ms)", ["recording", "stream_to_disk", "memory"], rows
+    )
+
+    # Flat: two hours must stop about as fast as five seconds.
+    assert max(streaming.values()) < 0.25
+    assert streaming[7200] < streaming[5] * 20 + 0.05
@@ -0,0 +1,101 @@
+"""Benchmark: release-to-text latency, streamed upload vs temp-file upload.
+
+Runs the real Transcriber against the local stand-in server with a throttled
+uplink. Capture is simulated at SPEEDUP times real time, and the uplink is
+sped up by the same factor, so the ratios match a real take on a 1 Mbit/s
+uplink while the benchmark stays short; the "real" columns scale the measured
+times back. The server answers instantly, so the numbers are pure transfer.
+"""
+
+from __future__ import annotations
+
+import time
+
+import numpy as np
+import pytest
+import soundfile as sf
+
+from src.services.audio_sink import new_temp_recording_path
+from src.services.transcriber import Transcriber
+from src.services.upload_stream import StreamingUpload
+
+pytestmark = pytest.mark.bench
+
+SPEEDUP = 10
+UPLINK_BYTES_PER_S = 1_000_000 / 8
+DURATIONS = (10, 30, 60)
+BLOCK_S = 0.1
+
+
+def _file_upload(audio: np.ndarray, rate: int, codec: str) -> float:
+    """Release → text for the current flow: write the WAV, then upload it."""
+    t = Transcriber(api_key="sk-dicto-test", upload_codec=codec)
+    try:
+        t0 = time.perf_counter()
+        path = new_temp_recording_path()
+        sf.write(path, audio, rate, subtype="PCM_16")
+        assert t.transcribe(path) == "hello world"
+        return time.perf_counter() - t0
+    finally:
+        t.close()
+
+
+def _streamed_upload(audio: np.ndarray, rate: int) -> float:
+    """Release → text when the body was sent during the (simulated) capture."""
+    t = Transcriber(api_key="sk-dicto-test")
+    try:
+        upload = StreamingUpload(t)
+        tap = upload.capture_tap(rate, 1)
+        block = int(rate * BLOCK_S)
+        start = time.perf_counter()
+        for i, offset in enumerate(range(0, len(audio), block)):
+            tap.feed(audio[offset : offset + block])
+            # Pace the "capture" at SPEEDUP x real time.
+            delay = start + (i + 1) * BLOCK_S / SPEEDUP - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        t0 = time.perf_counter()
+        frames = tap.flush()
+        assert upload.finish(frames, timeout=60) == "hello world"
+        return time.perf_counter() - t0
+    finally:
+        t.close()
+
+
+def test_streamed_upload_latency(stand_in_server, speech_like_wav, bench_report):
+    stand_in_server.upload_bytes_per_s = UPLINK_BYTES_PER_S * SPEEDUP
+    rows = []
+    results = {}
+    for seconds in DURATIONS:
+        audio, rate = sf.read(
+            speech_like_wav(seconds, name=f"s{seconds}.wav"),
+            dtype="int16",
+            always_2d=True,
+        )
+        wav = _file_upload(audio, rate, "wav")
+        flac = _file_upload(audio, rate, "flac")
+        stream = _streamed_upload(audio, rate)
+        results[seconds] = (wav, flac, stream)
+        rows.append(
+            [seconds]
+            + [f"{v * 1000:.0f}" for v in (wav, flac, stream)]
+            + [f"{v * SPEEDUP:.2f}" for v in (wav, flac, stream)]
+        )
+
+    bench_report(
+        f"release→text, 16 kHz speech-like audio, 1 Mbit/s uplink "
+        f"(simulated at {SPEEDUP}x)",
+        [
+            "take (s)",
+            "file wav ms",
+            "file flac ms",
+            "stream ms",
+            "real wav s",
+            "real flac s",
+            "real stream s",
+        ],
+        rows,
+    )
+
+    wav, flac, stream = results[max(DURATIONS)]
+    assert stream * 3 < flac < wav
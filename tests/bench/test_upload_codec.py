@@ -0,0 +1,52 @@
+"""Benchmark: bytes on the wire and release-to-text latency per upload codec.
+
+Runs the real Transcriber against the local stand-in server with its uplink
+throttled to 10 Mbit/s, so the numbers include encoding time plus the upload a
+real connection would pay for, but no server-side work.
+"""
+
+from __future__ import annotations
+
+import time
+from pathlib import Path
+
+import pytest
+
+from src.services.audio_codec import opus_available
+from src.services.transcriber import Transcriber
+
+pytestmark = pytest.mark.bench
+
+SECONDS = 120
+UPLINK_BYTES_PER_S = 10_000_000 / 8
+
+
+def test_upload_codecs(stand_in_server, speech_like_wav, bench_report):
+    stand_in_server.upload_bytes_per_s = UPLINK_BYTES_PER_S
+    wav = speech_like_wav(SECONDS)
+    wav_bytes = Path(wav).stat().st_size
+
+    codecs = ["wav", "flac"] + (["opus"] if opus_available() else [])
+    results = {}
+    for codec in codecs:
+        t = Transcriber(api_key="sk-dicto-test", upload_codec=codec)
+        t0 = time.perf_counter()
+        assert t.transcribe(wav) == "hello world"
+        elapsed = time.perf_counter() - t0
+        t.close()
+        body = stand_in_server.requests_to("/transcribe")[-1].body
+        results[codec] = (len(body), elapsed)
+
+    bench_report(
+        f"{SECONDS}s of 16 kHz speech-like audio over a 10 Mbit/s uplink",
+        ["codec", "bytes on wire", "vs wav", "release→text (s)"],
+        [
+            [c, f"{b:,}", f"{wav_bytes / b:.1f}x", f"{e:.2f}"]
+            for c, (b, e) in results.items()
+        ],
+    )
+
+    assert results["flac"][0] < results["wav"][0]
+    assert results["flac"][1] < results["wav"][1]
+    if "opus" in results:
+        assert results["opus"][0] * 4 < results["wav"][0]
@@ -0,0 +1,81 @@
+"""Benchmark: how much audio silence compaction keeps off the wire.
+
+A dictation take is mostly speech with a lead-in, a tail and thinking pauses.
+The table shows, for a few shapes of take, how many seconds and bytes the
+compacted upload saves and what the analysis costs per minute of audio.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+
+import numpy as np
+import pytest
+import soundfile as sf
+
+from src.services.vad import plan_file_compaction, write_compacted
+
+pytestmark = pytest.mark.bench
+
+RATE = 16000
+
+
+def _take(tmp_path, name: str, layout: list[tuple[str, float]]) -> str:
+    """WAV from a list of ("speech" | "pause", seconds) stretches."""
+    rng = np.random.default_rng(7)
+    parts = []
+    for kind, seconds in layout:
+        n = int(seconds * RATE)
+        t = np.arange(n) / RATE
+        if kind == "speech":
+            envelope = 0.3 + 0.7 * np.clip(np.sin(2 * np.pi * 2.0 * t), 0, None) ** 2
+            voiced = np.sin(2 * np.pi * 140 * t) + 0.5 * np.sin(2 * np.pi * 280 * t)
+            parts.append(envelope * (3000 * voiced + 800 * rng.standard_normal(n)))
+        else:
+            parts.append(np.zeros(n))
+    audio = np.concatenate(parts)
+    audio += 30 * rng.standard_normal(len(audio))  # room noise floor
+    path = tmp_path / f"{name}.wav"
+    sf.write(str(path), audio.astype(np.int16), RATE, subtype="PCM_16")
+    return str(path)
+
+
+TAKES = {
+    "quick note": [("pause", 0.8), ("speech", 6), ("pause", 1.2)],
+    "thinking": [("pause", 1.5)]
+    + [("speech", 8), ("pause", 3)] * 5
+    + [("speech", 8), ("pause", 2)],
+    "long memo": [("pause", 1)] + [("speech", 20), ("pause", 1.5)] * 15,
+}
+
+
+def test_silence_compaction_savings(tmp_path, bench_report):
+    rows = []
+    for name, layout in TAKES.items():
+        path = _take(tmp_path, name.replace(" ", "_"), layout)
+        speech_s = sum(s for kind, s in layout if kind == "speech")
+        t0 = time.perf_counter()
+        plan = plan_file_compaction(path)
+        analysis = time.perf_counter() - t0
+        out = str(tmp_path / f"{name.replace(' ', '_')}.compact.wav")
+        write_compacted(path, out, plan.ranges)
+        total_s = plan.total / RATE
+        rows.append(
+            [
+                name,
+                f"{total_s:.1f}",
+                f"{plan.kept / RATE:.1f}",
+                f"{100 * plan.removed / plan.total:.0f}%",
+                f"{(os.path.getsize(path) - os.path.getsize(out)) / 1024:.0f}",
+                f"{1000 * analysis / (total_s / 60):.1f}",
+            ]
+        )
+        # Every second of speech survives; nearly all of the dead air goes.
+        assert plan.kept / RATE >= speech_s
+        assert plan.kept / RATE < speech_s + 0.25 * 2 * len(layout)
+    bench_report(
+        "silence compaction before upload",
+        ["take", "audio s", "kept s", "removed", "KB saved", "ms/min"],
+        rows,
+    )
@@ -33,6 +33,19 @@ requires_pynput = pytest.mark.skipif(
 )
 
 
+@pytest.fixture(autouse=True)
+def fresh_capture_hub(monkeypatch):
+    """Give every test its own CaptureHub.
+
+    The process-wide hub keeps streams open while they have subscribers and
+    caches negotiated sample rates; tests patch `sd` one at a time, so neither
+    may carry over from one test to the next.
+    """
+    from src.services import recorder
+
+    monkeypatch.setattr(recorder, "_capture_hub", recorder.CaptureHub())
+
+
 @pytest.fixture
 def tmp_config(tmp_path):
     """Create a temporary config.yaml and return its path."""
@@ -63,8 +76,11 @@ def sample_audio_file(tmp_path):
     """Create a small valid WAV file for testing."""
     import struct
 
+    import numpy as np
+
     wav_path = tmp_path / "test.wav"
-    # Minimal WAV: 16-bit mono, 16kHz, 0.1s of silence
+    # Minimal WAV: 16-bit mono, 16kHz, 0.1s of a 440 Hz tone (not silence,
+    # which the transcriber rejects before uploading)
     sample_rate = 16000
     num_samples = 1600
     data_size = num_samples * 2  # 16-bit = 2 bytes per sample
@@ -85,5 +101,50 @@ def sample_audio_file(tmp_path):
         # data chunk
         f.write(b"data")
         f.write(struct.pack("<I", data_size))
-        f.write(b"\x00" * data_size)
+        t = np.arange(num_samples) / sample_rate
+        tone = (np.sin(2 * np.pi * 440 * t) * 3000).astype("<i2")
+        f.write(tone.tobytes())
     return str(wav_path)
+
+
+@pytest.fixture
+def stand_in_server(monkeypatch):
+    """A running local stand-in for the Dicto API, with routes pointed at it.
+
+    Tweak its behaviour (latency, throttling, injected errors) through the
+    attributes of `tests.stand_in_server.StandInServer`.
+    """
+    from src.services import routes
+    from tests.stand_in_server import StandInServer
+
+    server = StandInServer().start()
+    monkeypatch.setattr(routes, "BASE_URL", server.url)
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def speech_like_wav(tmp_path):
+    """Factory for a WAV of speech-like audio (noise bursts shaped like syllables).
+
+    Pure silence or a sine compress unrealistically well; this keeps the codec
+    and VAD numbers honest without shipping a recording.
+    """
+    import numpy as np
+    import soundfile as sf
+
+    def _make(seconds: float, rate: int = 16000, name: str = "speech.wav") -> str:
+        rng = np.random.default_rng(1234)
+        n = int(seconds * rate)
+        t = np.arange(n) / rate
+        # ~4 syllables/s, with a pause every few seconds.
+        envelope = np.clip(np.sin(2 * np.pi * 2.0 * t), 0, None) ** 2
+        envelope *= (np.sin(2 * np.pi * 0.15 * t) > -0.6).astype(np.float64)
+        voiced = np.sin(2 * np.pi * 140 * t) + 0.5 * np.sin(2 * np.pi * 280 * t)
+        audio = envelope * (3000 * voiced + 800 * rng.standard_normal(n))
+        audio += 30 * rng.standard_normal(n)  # room noise floor
+        path = tmp_path / name
+        sf.write(str(path), audio.astype(np.int16), rate, subtype="PCM_16")
+        return str(path)
+
+    return _make
@@ -0,0 +1,109 @@
+"""A minimal HTTP/2 (h2c, prior knowledge) stand-in for the Dicto API.
+
+`tests.stand_in_server` speaks HTTP/1.1 only. This one answers every request
+with `{"text": ...}` after `latency` seconds, each stream on its own thread,
+and counts connections and the most streams in flight at once, so a test can
+check that concurrent requests were multiplexed over one connection. Needs
+the `h2` package.
+"""
+
+from __future__ import annotations
+
+import json
+import socket
+import threading
+import time
+
+import h2.config
+import h2.connection
+import h2.events
+
+
+class H2StandIn:
+    def __init__(self, text: str = "hello world", latency: float = 0.2):
+        self.text = text
+        self.latency = latency
+        self.connections = 0
+        self.streams = 0
+        self.max_in_flight = 0
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self._sock: socket.socket | None = None
+
+    @property
+    def url(self) -> str:
+        assert self._sock is not None, "server not started"
+        host, port = self._sock.getsockname()[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "H2StandIn":
+        self._sock = socket.create_server(("127.0.0.1", 0))
+        threading.Thread(target=self._accept, daemon=True).start()
+        return self
+
+    def stop(self):
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+
+    def _accept(self):
+        assert self._sock is not None
+        while True:
+            try:
+                conn, _ = self._sock.accept()
+            except OSError:
+                return
+            with self._lock:
+                self.connections += 1
+            threading.Thread(target=self._serve, args=(conn,), daemon=True).start()
+
+    def _serve(self, sock: socket.socket):
+        h2c = h2.connection.H2Connection(h2.config.H2Configuration(client_side=False))
+        send_lock = threading.Lock()
+        with send_lock:
+            h2c.initiate_connection()
+            sock.sendall(h2c.data_to_send())
+        with sock:
+            while True:
+                try:
+                    data = sock.recv(65535)
+                except OSError:
+                    return
+                if not data:
+                    return
+                with send_lock:
+                    events = h2c.receive_data(data)
+                    for event in events:
+                        if isinstance(event, h2.events.DataReceived):
+                            h2c.acknowledge_received_data(
+                                event.flow_controlled_length, event.stream_id
+                            )
+                    sock.sendall(h2c.data_to_send())
+                for event in events:
+                    if isinstance(event, h2.events.StreamEnded):
+                        threading.Thread(
+                            target=self._respond,
+                            args=(h2c, sock, send_lock, event.stream_id),
+                            daemon=True,
+                        ).start()
+
+    def _respond(self, h2c, sock, send_lock, stream_id: int):
+        with self._lock:
+            self.streams += 1
+            self._in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self._in_flight)
+        time.sleep(self.latency)
+        body = json.dumps({"text": self.text}).encode()
+        with self._lock:
+            self._in_flight -= 1
+        with send_lock:
+            h2c.send_headers(
+                stream_id,
+                [
+                    (":status", "200"),
+                    ("content-type", "application/json"),
+                    ("content-length", str(len(body))),
+                ],
+            )
+            h2c.send_data(stream_id, body, end_stream=True)
+            sock.sendall(h2c.data_to_send())
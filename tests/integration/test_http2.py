@@ -0,0 +1,51 @@
+"""Integration test: concurrent API calls multiplexed over one HTTP/2 connection."""
+
+from __future__ import annotations
+
+import threading
+
+import pytest
+
+from src.services import routes
+from src.services.api_client import ApiClient
+from src.services.transcriber import Transcriber
+
+
+@pytest.fixture
+def h2_server(monkeypatch):
+    pytest.importorskip("h2")
+    from tests.h2_stand_in import H2StandIn
+
+    server = H2StandIn(latency=0.3).start()
+    monkeypatch.setattr(routes, "BASE_URL", server.url)
+    yield server
+    server.stop()
+
+
+def test_a_transcription_and_transforms_share_one_connection(
+    h2_server, speech_like_wav
+):
+    api = ApiClient(http2=True, http1=False)
+    transcriber = Transcriber(api_key="sk-dicto-test", trim_silence=False, api=api)
+    wav = speech_like_wav(1.0)
+    results = []
+    calls = [lambda: transcriber.transcribe(wav)] + [
+        lambda: transcriber.transform("hello", "make formal") for _ in range(3)
+    ]
+    threads = [threading.Thread(target=lambda c=c: results.append(c())) for c in calls]
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(10)
+    finally:
+        api.close()
+
+    assert results == ["hello world"] * 4
+    assert h2_server.connections == 1
+    assert h2_server.streams == 4
+    # Answered together, not one after the other.
+    assert h2_server.max_in_flight == 4
+    stats = api.connection_stats.as_dict()
+    assert stats["new_connections"] == 1
+    assert stats["reused"] == 3
@@ -0,0 +1,57 @@
+"""Integration test: live segments go to the API while capture is still running."""
+
+from __future__ import annotations
+
+import io
+import time
+
+import soundfile as sf
+
+from src.services.live_transcription import LiveTranscription
+from src.services.segmenter import LiveSegmenter
+from src.services.transcriber import Transcriber
+
+
+def _length_echo(request):
+    """Answer with the number of frames uploaded, to check stitching order."""
+    if not request.path.endswith("/transcribe"):
+        return None
+    _, _, payload = request.form_parts()["file"]
+    frames = sf.info(io.BytesIO(payload)).frames
+    return 200, {"text": f"n{frames}"}, {}
+
+
+def test_segments_are_uploaded_before_release(stand_in_server, speech_like_wav):
+    stand_in_server.responder = _length_echo
+    stand_in_server.latency = 0.05
+    audio, rate = sf.read(speech_like_wav(20), dtype="int16", always_2d=True)
+
+    transcriber = Transcriber(api_key="sk-dicto-test")
+    partials: list[str] = []
+    emitted = []
+    live = LiveTranscription(transcriber, on_partial=partials.append)
+
+    def on_segment(segment):
+        emitted.append(segment)
+        live.submit(segment)
+
+    segmenter = LiveSegmenter(rate, 1, on_segment)
+    try:
+        # "Capture" 20 s of audio in ~1 s of wall time.
+        for start in range(0, len(audio), rate):
+            segmenter.feed(audio[start : start + rate])
+            time.sleep(0.05)
+        released_at = time.monotonic()
+        count = segmenter.flush()
+        text = live.finish(count, timeout=10)
+    finally:
+        transcriber.close()
+
+    assert count >= 3
+    assert text == " ".join(f"n{len(s.audio)}" for s in emitted)
+    # Everything but the tail was already on its way before the release.
+    requests = stand_in_server.requests_to("/transcribe")
+    assert len(requests) == count
+    early = [r for r in requests if r.started_at < released_at]
+    assert len(early) >= count - 1
+    assert partials and text.startswith(partials[0])
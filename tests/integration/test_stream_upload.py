@@ -0,0 +1,99 @@
+"""Integration tests: one chunked upload that runs while the recording does."""
+
+from __future__ import annotations
+
+import io
+import time
+
+import httpx
+import numpy as np
+import pytest
+import soundfile as sf
+
+from src.services.api_client import UploadTimeouts
+from src.services.transcriber import (
+    NetworkError,
+    Transcriber,
+    TranscriptionCancelled,
+    TranscriptionError,
+)
+from src.services.upload_stream import StreamingUpload
+
+
+@pytest.fixture
+def transcriber():
+    t = Transcriber(api_key="sk-dicto-test", language="en")
+    yield t
+    t.close()
+
+
+def _capture(upload: StreamingUpload, seconds: float, rate: int = 16000):
+    """Feed `seconds` of audio through the tap at ~20x real time."""
+    tap = upload.capture_tap(rate, 1)
+    rng = np.random.default_rng(5)
+    block = rate // 10
+    for _ in range(int(seconds * 10)):
+        tap.feed((rng.standard_normal((block, 1)) * 2000).astype(np.int16))
+        time.sleep(0.005)
+    return tap.flush()
+
+
+def test_body_is_sent_while_capturing(stand_in_server, transcriber):
+    upload = StreamingUpload(transcriber)
+    frames = _capture(upload, seconds=5)
+    released_at = time.monotonic()
+    assert upload.finish(frames, timeout=10) == "hello world"
+
+    (request,) = stand_in_server.requests_to("/transcribe")
+    assert request.chunked
+    assert request.first_body_at < released_at
+    assert request.headers["Authorization"] == "Bearer sk-dicto-test"
+    parts = request.form_parts()
+    assert parts["source"][2] == b"mic_app"
+    assert parts["language"][2] == b"en"
+    filename, content_type, payload = parts["file"]
+    assert (filename, content_type) == ("recording.wav", "audio/wav")
+    info = sf.info(io.BytesIO(payload))
+    assert (info.samplerate, info.frames) == (16000, frames)
+
+
+def test_api_errors_surface_from_finish(stand_in_server, transcriber):
+    stand_in_server.responder = lambda r: (500, {"error": {"message": "boom"}}, {})
+    upload = StreamingUpload(transcriber)
+    frames = _capture(upload, seconds=1)
+    with pytest.raises(TranscriptionError, match="boom"):
+        upload.finish(frames, timeout=10)
+
+
+def test_cancel_aborts_the_request(stand_in_server, transcriber):
+    upload = StreamingUpload(transcriber)
+    tap = upload.capture_tap(16000, 1)
+    tap.feed(np.zeros((1600, 1), np.int16))
+    upload.cancel()
+    with pytest.raises(TranscriptionCancelled):
+        upload.finish(0, timeout=10)
+    assert stand_in_server.requests_to("/transcribe") == []
+
+
+def _short_deadline(transcriber, seconds: float):
+    transcriber.api.upload_timeouts = lambda nbytes: UploadTimeouts(
+        timeout=httpx.Timeout(30.0), deadline_s=seconds
+    )
+
+
+def test_the_deadline_starts_when_the_recording_ends(stand_in_server, transcriber):
+    _short_deadline(transcriber, 0.3)
+    upload = StreamingUpload(transcriber)
+    frames = _capture(upload, seconds=10)  # ~0.5 s of streaming
+    assert upload.finish(frames, timeout=10) == "hello world"
+
+
+def test_a_slow_answer_misses_the_deadline(stand_in_server, transcriber):
+    stand_in_server.latency = 5.0
+    _short_deadline(transcriber, 0.3)
+    upload = StreamingUpload(transcriber)
+    frames = _capture(upload, seconds=1)
+    t0 = time.monotonic()
+    with pytest.raises(NetworkError, match="timeout"):
+        upload.finish(frames, timeout=10)
+    assert time.monotonic() - t0 < 3
@@ -0,0 +1,113 @@
+"""Integration tests: queued transcriptions against a stand-in server that fails."""
+
+from __future__ import annotations
+
+import threading
+import time
+
+import numpy as np
+import pytest
+import soundfile as sf
+
+from src.services import transcription_queue
+from src.services.transcriber import Transcriber
+from src.services.transcription_queue import TranscriptionQueue
+
+OPTIONS = {"language": "en", "model": "v3-turbo"}
+
+
+@pytest.fixture
+def transcriber(monkeypatch):
+    monkeypatch.setattr(transcription_queue, "BASE_DELAY_S", 0.02)
+    monkeypatch.setattr(transcription_queue, "MAX_DELAY_S", 0.1)
+    monkeypatch.setattr(transcription_queue, "RATE_LIMIT_DELAY_S", 0.1)
+    # One request per attempt, so every failure reaches the queue.
+    monkeypatch.setattr(Transcriber, "MAX_RETRIES", 1)
+    t = Transcriber(api_key="sk-dicto-test", language="en", trim_silence=False)
+    yield t
+    t.close()
+
+
+def _recording(tmp_path, name: str) -> str:
+    path = tmp_path / name
+    rng = np.random.default_rng(7)
+    sf.write(str(path), (rng.standard_normal(16000) * 2000).astype(np.int16), 16000)
+    return str(path)
+
+
+class Flaky:
+    """Fails requests in a repeating pattern: 503, 429, then one success."""
+
+    def __init__(self, pattern=(503, 429, 200)):
+        self.pattern = pattern
+        self.count = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, request):
+        with self.lock:
+            status = self.pattern[self.count % len(self.pattern)]
+            self.count += 1
+        if status == 200:
+            return None
+        return status, {"error": {"message": "flaky"}}, {}
+
+
+def _drain(queue: TranscriptionQueue, results: list, expected: int, timeout=10):
+    deadline = time.monotonic() + timeout
+    while len(results) < expected and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def test_every_job_gets_through_an_intermittent_server(
+    stand_in_server, transcriber, tmp_path
+):
+    stand_in_server.responder = Flaky()
+    results = []
+    queue = TranscriptionQueue(
+        tmp_path / "queue",
+        transcribe=lambda job: transcriber.transcribe(str(job.audio)),
+        on_result=lambda job, text: results.append(text),
+    )
+    for i in range(3):
+        queue.enqueue(_recording(tmp_path, f"{i}.wav"), OPTIONS)
+    queue.start()
+    try:
+        _drain(queue, results, 3)
+    finally:
+        queue.stop()
+    assert results == ["hello world"] * 3
+    assert len(queue) == 0
+    # Two failures for every success.
+    assert len(stand_in_server.requests_to("/transcribe")) == 9
+
+
+def test_the_queue_survives_a_restart(stand_in_server, transcriber, tmp_path):
+    stand_in_server.responder = lambda r: (503, {"error": {"message": "down"}}, {})
+    queue = TranscriptionQueue(
+        tmp_path / "queue",
+        transcribe=lambda job: transcriber.transcribe(str(job.audio)),
+        on_result=lambda job, text: pytest.fail("the server is down"),
+    )
+    queue.enqueue(_recording(tmp_path, "a.wav"), OPTIONS, error="Network error")
+    queue.enqueue(_recording(tmp_path, "b.wav"), OPTIONS)
+    queue.start()
+    time.sleep(0.3)
+    queue.stop()
+    assert all(job.attempts >= 1 for job in queue.jobs())
+
+    # Next run: the server is back, if still unreliable.
+    stand_in_server.responder = Flaky(pattern=(503, 200))
+    results = []
+    restarted = TranscriptionQueue(
+        tmp_path / "queue",
+        transcribe=lambda job: transcriber.transcribe(str(job.audio)),
+        on_result=lambda job, text: results.append(text),
+    )
+    assert len(restarted) == 2
+    restarted.start()
+    try:
+        _drain(restarted, results, 2)
+    finally:
+        restarted.stop()
+    assert results == ["hello world"] * 2
+    assert list((tmp_path / "queue").iterdir()) == []
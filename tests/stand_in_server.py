@@ -0,0 +1,261 @@
+"""A local stand-in for the Dicto API, for tests and benchmarks.
+
+It speaks just enough of the real API (transcribe, transform, presets, report)
+to exercise the transcriber over a real socket, records every request it
+receives, and can be made slow, throttled or faulty so timing behaviour can be
+measured without touching the network. Use it through the `stand_in_server`
+fixture in `tests/conftest.py`, which also points `routes.BASE_URL` at it.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from dataclasses import dataclass, field
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable
+
+
+@dataclass
+class RecordedRequest:
+    """One request as the server saw it."""
+
+    method: str
+    path: str
+    headers: dict[str, str]
+    body: bytes
+    # True when the client sent `Transfer-Encoding: chunked`.
+    chunked: bool = False
+    # time.monotonic() when the request line arrived / the first body bytes
+    # arrived / the body was complete. For a chunked upload that started while
+    # the client was still producing audio, first_body_at is well before
+    # body_done_at.
+    started_at: float = 0.0
+    first_body_at: float = 0.0
+    body_done_at: float = 0.0
+
+    def form_parts(self) -> dict[str, tuple[str | None, str, bytes]]:
+        """Multipart fields as {name: (filename, content_type, payload)}."""
+        content_type = self.headers.get("Content-Type", "")
+        message = BytesParser(policy=HTTP).parsebytes(
+            f"Content-Type: {content_type}\r\n\r\n".encode() + self.body
+        )
+        parts = {}
+        for part in message.iter_parts():
+            name = part.get_param("name", header="content-disposition")
+            parts[name] = (
+                part.get_filename(),
+                part.get_content_type(),
+                part.get_payload(decode=True) or b"",
+            )
+        return parts
+
+    def json(self) -> dict:
+        return json.loads(self.body or b"{}")
+
+
+# A responder gets the recorded request and returns (status, json_body, headers),
+# or None to fall through to the default behaviour.
+Responder = Callable[[RecordedRequest], "tuple[int, dict, dict] | None"]
+
+
+@dataclass
+class StandInServer:
+    """Threaded HTTP server answering like the Dicto API.
+
+    - `text`: what transcribe/transform return.
+    - `latency`: seconds to wait after the body arrives before answering; a
+      float, or a callable taking the request for per-request latency.
+    - `upload_bytes_per_s`: throttle how fast request bodies are read, to
+      emulate a slow uplink (None = as fast as loopback allows).
+    - `responder`: hook to inject errors or custom answers.
+    - `connect_latency`: seconds each new connection waits before its first
+      request is read, standing in for the DNS, TCP and TLS setup of a real
+      link (a reused keep-alive connection does not pay it again).
+    """
+
+    text: str = "hello world"
+    latency: float | Callable[[RecordedRequest], float] = 0.0
+    upload_bytes_per_s: float | None = None
+    responder: Responder | None = None
+    connect_latency: float = 0.0
+    requests: list[RecordedRequest] = field(default_factory=list)
+    # Uploads the client gave up on mid-body (never answered).
+    aborted: int = 0
+
+    def __post_init__(self):
+        self._lock = threading.Lock()
+        self._httpd: ThreadingHTTPServer | None = None
+        self._thread: threading.Thread | None = None
+
+    # ── Lifecycle ───────────────────────────────────────────
+
+    @property
+    def url(self) -> str:
+        assert self._httpd is not None, "server not started"
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StandInServer":
+        server = self
+
+        class Handler(_Handler):
+            stand_in = server
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, name="stand-in-server", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+    def __enter__(self) -> "StandInServer":
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+    # ── Helpers ─────────────────────────────────────────────
+
+    def record(self, request: RecordedRequest):
+        with self._lock:
+            self.requests.append(request)
+
+    def note_aborted(self):
+        with self._lock:
+            self.aborted += 1
+
+    def requests_to(self, path_suffix: str) -> list[RecordedRequest]:
+        with self._lock:
+            return [r for r in self.requests if r.path.endswith(path_suffix)]
+
+    def latency_for(self, request: RecordedRequest) -> float:
+        if callable(self.latency):
+            return self.latency(request)
+        return self.latency
+
+
+class _Handler(BaseHTTPRequestHandler):
+    stand_in: StandInServer
+    protocol_version = "HTTP/1.1"
+    _first_body_at = 0.0
+
+    def log_message(self, format, *args):  # keep test output clean
+        pass
+
+    def setup(self):
+        super().setup()
+        if self.stand_in.connect_latency:
+            time.sleep(self.stand_in.connect_latency)
+
+    # ── Body reading ────────────────────────────────────────
+
+    def _read(self, n: int) -> bytes:
+        bps = self.stand_in.upload_bytes_per_s
+        if not bps:
+            return self.rfile.read(n)
+        out = bytearray()
+        while len(out) < n:
+            piece = self.rfile.read(min(16384, n - len(out)))
+            if not piece:
+                break
+            out += piece
+            time.sleep(len(piece) / bps)
+        return bytes(out)
+
+    def _read_chunked(self) -> bytes:
+        body = bytearray()
+        while True:
+            size_line = self.rfile.readline().strip()
+            if not size_line:
+                raise ConnectionAbortedError("client abandoned a chunked body")
+            if not self._first_body_at:
+                self._first_body_at = time.monotonic()
+            size = int(size_line.split(b";")[0], 16)
+            if size == 0:
+                # Trailer section ends with an empty line.
+                while self.rfile.readline().strip():
+                    pass
+                return bytes(body)
+            body += self._read(size)
+            self.rfile.readline()  # CRLF after each chunk
+
+    def _read_request(self) -> RecordedRequest:
+        started = time.monotonic()
+        self._first_body_at = 0.0
+        chunked = "chunked" in self.headers.get("Transfer-Encoding", "").lower()
+        if chunked:
+            body = self._read_chunked()
+        else:
+            body = self._read(int(self.headers.get("Content-Length", 0) or 0))
+            self._first_body_at = started
+        return RecordedRequest(
+            method=self.command,
+            path=self.path,
+            headers=dict(self.headers.items()),
+            body=body,
+            chunked=chunked,
+            started_at=started,
+            first_body_at=self._first_body_at,
+            body_done_at=time.monotonic(),
+        )
+
+    # ── Responses ───────────────────────────────────────────
+
+    def _send_json(self, status: int, payload: dict, headers: dict | None = None):
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, str(value))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _respond(self, request: RecordedRequest):
+        server = self.stand_in
+        server.record(request)
+        delay = server.latency_for(request)
+        if delay:
+            time.sleep(delay)
+        if server.responder is not None:
+            answer = server.responder(request)
+            if answer is not None:
+                status, payload, headers = answer
+                self._send_json(status, payload, headers)
+                return
+        if request.path.endswith("/presets"):
+            self._send_json(200, {"presets": []})
+        elif request.path.endswith("/report"):
+            self._send_json(201, {"ok": True})
+        elif request.method == "HEAD":
+            self.send_response(200)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+        else:
+            self._send_json(200, {"text": server.text})
+
+    def do_POST(self):
+        try:
+            request = self._read_request()
+        except ConnectionError:
+            self.stand_in.note_aborted()
+            self.close_connection = True
+            return
+        self._respond(request)
+
+    def do_GET(self):
+        self._respond(self._read_request())
+
+    def do_HEAD(self):
+        self._respond(self._read_request())
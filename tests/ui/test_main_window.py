@@ -233,3 +233,33 @@ class TestRestoreClipboardSetting:
         win.restore_clipboard_checkbox.setChecked(False)
         win.restore_clipboard_checkbox.setChecked(True)
         assert settings.restore_clipboard is True
+
+
+class TestLivePreview:
+    def test_partial_shows_on_the_recording_page(self, win):
+        win.set_recording_state()
+        win.update_partial_transcription("so far")
+        assert win.live_preview.text() == "so far"
+        assert not win.live_preview.isHidden()
+
+    def test_partial_carries_over_into_processing(self, win):
+        win.set_recording_state()
+        win.update_partial_transcription("so far")
+        win.set_processing_state()
+        assert win.transcription_text.toPlainText() == "so far"
+        win.update_partial_transcription("so far and more")
+        assert win.transcription_text.toPlainText() == "so far and more"
+
+    def test_new_recording_clears_the_preview(self, win):
+        win.set_recording_state()
+        win.update_partial_transcription("old")
+        win.set_idle_state()
+        win.set_recording_state()
+        assert win.live_preview.isHidden()
+        win.set_processing_state()
+        assert win.transcription_text.toPlainText() == ""
+
+    def test_ignored_when_idle(self, win):
+        win.set_idle_state()
+        win.update_partial_transcription("late")
+        assert win.live_preview.isHidden()
@@ -164,3 +164,30 @@ class TestOverlayDragging:
         overlay.move(overlay.pos() + QPoint(120, 90))
 
         assert overlay._popover.pos() != before
+
+
+class TestOverlayLivePreview:
+    def test_partial_text_shows_while_recording(self, overlay):
+        overlay.show_recording()
+        overlay.show_partial("hello there")
+        assert overlay.preview_label.isVisible()
+        assert "there" in overlay.preview_label.text()
+        assert overlay.preview_label.toolTip() == "hello there"
+
+    def test_long_text_keeps_the_latest_words(self, overlay):
+        overlay.show_recording()
+        text = "word " * 50 + "latest"
+        overlay.show_partial(text)
+        assert overlay.preview_label.text().endswith("latest")
+
+    def test_ignored_outside_recording_and_processing(self, overlay):
+        overlay.show_idle()
+        overlay.show_partial("stale")
+        assert overlay.preview_label.isHidden()
+
+    def test_cleared_on_success(self, overlay):
+        overlay.show_recording()
+        overlay.show_partial("hello")
+        overlay.show_success(auto_hide_delay=100000)
+        assert overlay.preview_label.isHidden()
+        assert overlay.height() == OverlayWindow._HEIGHT
@@ -73,39 +73,74 @@ class TestReportLogView:
 
 
 class TestSendReport:
-    def test_send_report_success(self, win, monkeypatch):
-        import httpx
+    @pytest.fixture
+    def api(self, win, stand_in_server):
+        from src.services.api_client import ApiClient
 
-        mock_resp = MagicMock()
-        mock_resp.status_code = 200
-        monkeypatch.setattr(httpx, "post", MagicMock(return_value=mock_resp))
+        api = ApiClient()
+        win.controller = MagicMock(api=api, recorder=None, hedging=None)
+        win.controller.get_task_stats.return_value = {}
+        yield api
+        api.close()
 
+    def test_send_report_success(self, win, api, stand_in_server):
         win._toggle_settings()
         win._send_report()
 
         assert win.report_status_label.text() == t("report_sent")
         assert not win.report_status_label.isHidden()
+        (request,) = stand_in_server.requests_to("/api/report")
+        assert request.headers["Authorization"] == "Bearer sk-test"
+        assert request.json()["source"] == "desktop_app"
 
-    def test_send_report_failure(self, win, monkeypatch):
-        import httpx
-
-        mock_resp = MagicMock()
-        mock_resp.status_code = 500
-        monkeypatch.setattr(httpx, "post", MagicMock(return_value=mock_resp))
+    def test_send_report_failure(self, win, api, stand_in_server):
+        stand_in_server.responder = lambda r: (500, {"error": {"message": "x"}}, {})
 
         win._toggle_settings()
         win._send_report()
 
         assert win.report_status_label.text() == t("report_send_failed")
 
-    def test_send_report_network_error(self, win, monkeypatch):
-        import httpx
+    def test_send_report_network_error(self, win, api, monkeypatch):
+        from src.services import routes
 
-        monkeypatch.setattr(
-            httpx, "post", MagicMock(side_effect=Exception("network error"))
-        )
+        # Nothing listens on the discard port.
+        monkeypatch.setattr(routes, "BASE_URL", "http://127.0.0.1:9")
 
         win._toggle_settings()
         win._send_report()
 
         assert win.report_status_label.text() == t("report_send_failed")
+
+    def test_send_report_without_a_controller(self, win):
+        win.controller = None
+        win._send_report()
+
+        assert win.report_status_label.text() == t("report_send_failed")
+
+    def test_report_carries_the_audio_telemetry(self, win, api, stand_in_server):
+        from src.services.audio_telemetry import CaptureTelemetry
+
+        telemetry = CaptureTelemetry()
+        telemetry.stream("mic", 16000).input_overflows = 2
+        win.controller.recorder = MagicMock()
+        win.controller.recorder.get_telemetry.return_value = telemetry
+
+        win._send_report()
+
+        (request,) = stand_in_server.requests_to("/api/report")
+        audio = request.json()["audio_telemetry"]
+        assert audio["last_recording"]["mic"]["input_overflows"] == 2
+        assert "mic_test" not in audio
+        assert request.json()["connection"]["requests"] == 0
+        assert "hedging" not in request.json()["connection"]
+
+    def test_report_carries_the_hedging_stats(self, win, api, stand_in_server):
+        from src.services.hedging import HedgePolicy
+
+        win.controller.hedging = HedgePolicy()
+        win._send_report()
+
+        (request,) = stand_in_server.requests_to("/api/report")
+        hedging = request.json()["connection"]["hedging"]
+        assert hedging == {"requests": 0, "hedged": 0, "won": 0, "delay_ms": None}
@@ -0,0 +1,86 @@
+"""Unit tests for the shared API client."""
+
+from __future__ import annotations
+
+from src.config.settings import Settings
+from src.services import api_client
+from src.services.api_client import ApiClient
+from src.services.connection_stats import MIN_TIMED_BODY_BYTES
+from src.services.transcriber import Transcriber
+
+
+def test_falls_back_to_http1_without_h2(monkeypatch):
+    monkeypatch.setattr(api_client, "http2_available", lambda: False)
+    api = ApiClient(http2=True)
+    assert api.http2 is False
+    api.close()
+
+
+def test_built_from_settings(tmp_path):
+    settings = Settings(config_path=str(tmp_path / "config.yaml"))
+    settings.network_http2 = False
+    api = ApiClient.from_settings(settings)
+    assert api.http2 is False
+    api.close()
+
+
+def test_transcribers_share_the_client_and_do_not_close_it():
+    api = ApiClient()
+    first = Transcriber(api_key="sk-dicto-test", api=api)
+    second = Transcriber(api_key="sk-dicto-test", language="en", api=api)
+    assert first.client is second.client is api.client
+    assert first.connection_stats is api.connection_stats
+    first.close()
+    assert not api.client.is_closed
+    api.close()
+
+
+def test_a_transcriber_without_one_owns_its_own():
+    t = Transcriber(api_key="sk-dicto-test")
+    client = t.client
+    t.close()
+    assert client.is_closed
+
+
+def test_send_report(stand_in_server):
+    api = ApiClient()
+    assert api.send_report("sk-dicto-test", {"logs": "x"})
+    (request,) = stand_in_server.requests_to("/api/report")
+    assert request.json() == {"logs": "x"}
+    stand_in_server.responder = lambda r: (500, {"error": {"message": "no"}}, {})
+    assert not api.send_report("sk-dicto-test", {"logs": "x"})
+    api.close()
+
+
+def test_upload_timeouts_grow_with_the_payload():
+    api = ApiClient()
+    clip = api.upload_timeouts(64 * 1024)
+    file = api.upload_timeouts(20 * 1024 * 1024)
+    assert clip.deadline_s < 30
+    assert file.timeout.read > clip.timeout.read
+    assert file.deadline_s > 120
+    assert file.timeout.connect == clip.timeout.connect
+    api.close()
+
+
+def test_upload_deadline_follows_the_measured_uplink():
+    api = ApiClient()
+    before = api.upload_timeouts(20 * 1024 * 1024).deadline_s
+    api.connection_stats.uplink_bps = 10_000_000
+    assert api.upload_timeouts(20 * 1024 * 1024).deadline_s < before / 2
+    api.close()
+
+
+def test_large_uploads_measure_the_uplink(stand_in_server):
+    api = ApiClient()
+    api.run(api.client.post(stand_in_server.url + "/api/report", content=b"x" * 1024))
+    assert api.connection_stats.uplink_bps is None
+    api.run(
+        api.client.post(
+            stand_in_server.url + "/api/report",
+            content=b"x" * (2 * MIN_TIMED_BODY_BYTES),
+        )
+    )
+    assert api.connection_stats.uplink_bps > 0
+    assert api.connection_stats.as_dict()["uplink_kbps"] > 0
+    api.close()
@@ -0,0 +1,145 @@
+"""Unit tests for the FrameArena capture buffer."""
+
+from __future__ import annotations
+
+import numpy as np
+
+from src.services.audio_buffer import FrameArena, FrameRing
+
+
+def _ramp(start: int, n: int) -> np.ndarray:
+    return np.arange(start, start + n, dtype=np.int16).reshape(-1, 1)
+
+
+class TestAppend:
+    def test_len_is_running_frame_count(self):
+        arena = FrameArena(channels=1, initial_frames=8)
+        arena.append(_ramp(0, 5))
+        arena.append(_ramp(5, 7))
+        assert len(arena) == 12
+
+    def test_blocks_spanning_chunks_keep_order(self):
+        arena = FrameArena(channels=1, initial_frames=4)
+        for start in range(0, 100, 10):
+            arena.append(_ramp(start, 10))
+        np.testing.assert_array_equal(arena.to_array().ravel(), np.arange(100))
+
+    def test_chunks_grow_geometrically_up_to_the_cap(self):
+        arena = FrameArena(channels=1, initial_frames=4, max_chunk_frames=16)
+        arena.append(np.zeros((100, 1), dtype=np.int16))
+        sizes = [len(c) for c in arena._chunks]
+        assert sizes[:3] == [4, 8, 16]
+        assert all(size == 16 for size in sizes[3:])
+
+    def test_channels_taken_from_first_block(self):
+        arena = FrameArena()
+        arena.append(np.zeros((10, 2), dtype=np.int16))
+        assert arena.channels == 2
+        assert arena.to_array().shape == (10, 2)
+
+    def test_one_dimensional_mono_blocks(self):
+        arena = FrameArena(channels=1)
+        arena.append(np.ones(10, dtype=np.int16))
+        assert arena.to_array().shape == (10, 1)
+
+    def test_source_block_is_copied(self):
+        arena = FrameArena(channels=1)
+        block = _ramp(0, 4)
+        arena.append(block)
+        block[:] = 0
+        np.testing.assert_array_equal(arena.to_array().ravel(), [0, 1, 2, 3])
+
+
+class TestViews:
+    def test_views_share_memory_with_the_arena(self):
+        arena = FrameArena(channels=1, initial_frames=4)
+        arena.append(_ramp(0, 10))
+        views = arena.views()
+        assert sum(len(v) for v in views) == 10
+        assert all(np.shares_memory(v, c) for v, c in zip(views, arena._chunks))
+
+    def test_single_chunk_to_array_is_a_view(self):
+        arena = FrameArena(channels=1)
+        arena.append(_ramp(0, 10))
+        assert np.shares_memory(arena.to_array(), arena._chunks[0])
+
+    def test_iter_blocks_covers_everything(self):
+        arena = FrameArena(channels=1, initial_frames=7)
+        arena.append(_ramp(0, 50))
+        blocks = list(arena.iter_blocks(4))
+        assert all(len(b) <= 4 for b in blocks)
+        np.testing.assert_array_equal(np.concatenate(blocks).ravel(), np.arange(50))
+
+    def test_empty_arena(self):
+        arena = FrameArena(channels=1)
+        assert arena.views() == []
+        assert arena.to_array().shape == (0, 1)
+
+    def test_clear_releases_chunks(self):
+        arena = FrameArena(channels=1)
+        arena.append(_ramp(0, 10))
+        arena.clear()
+        assert len(arena) == 0
+        assert arena.capacity == 0
+
+
+class TestFrameRing:
+    def test_pop_returns_everything_queued_in_order(self):
+        ring = FrameRing(capacity=16, channels=1)
+        ring.push(_ramp(0, 5))
+        ring.push(_ramp(5, 3))
+        assert len(ring) == 8
+        np.testing.assert_array_equal(ring.pop().ravel(), np.arange(8))
+        assert ring.pop() is None
+
+    def test_wraps_around(self):
+        ring = FrameRing(capacity=10, channels=1)
+        out = []
+        for start in range(0, 60, 6):
+            assert ring.push(_ramp(start, 6))
+            out.append(ring.pop())
+        np.testing.assert_array_equal(np.concatenate(out).ravel(), np.arange(60))
+
+    def test_full_ring_drops_the_whole_block(self):
+        ring = FrameRing(capacity=10, channels=1)
+        assert ring.push(_ramp(0, 8))
+        assert not ring.push(_ramp(8, 4))
+        assert ring.overflows == 1
+        assert ring.dropped_frames == 4
+        np.testing.assert_array_equal(ring.pop().ravel(), np.arange(8))
+
+    def test_popped_array_is_a_copy(self):
+        ring = FrameRing(capacity=8, channels=2)
+        ring.push(np.ones((4, 2), np.int16))
+        block = ring.pop()
+        ring.push(np.zeros((8, 2), np.int16))
+        assert block.shape == (4, 2)
+        assert np.all(block == 1)
+
+    def test_concurrent_producer_and_consumer(self):
+        import threading
+
+        ring = FrameRing(capacity=4096, channels=1)
+        total = 200_000
+        out = []
+
+        def produce():
+            start = 0
+            while start < total:
+                n = min(1000, total - start)
+                block = (np.arange(start, start + n) % 30000).astype(np.int16)
+                if ring.push(block.reshape(-1, 1)):
+                    start += n
+
+        producer = threading.Thread(target=produce)
+        producer.start()
+        received = 0
+        while received < total:
+            block = ring.pop()
+            if block is not None:
+                out.append(block)
+                received += len(block)
+        producer.join()
+        np.testing.assert_array_equal(
+            np.concatenate(out).ravel(), (np.arange(total) % 30000).astype(np.int16)
+        )
@@ -0,0 +1,79 @@
+"""Unit tests for upload encoding."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+import soundfile as sf
+
+from src.services import audio_codec
+from src.services.audio_codec import encode_for_upload, mime_type_for, resolve_codec
+
+
+class TestMimeType:
+    @pytest.mark.parametrize(
+        "name,mime",
+        [
+            ("a.wav", "audio/wav"),
+            ("a.flac", "audio/flac"),
+            ("a.ogg", "audio/ogg"),
+            ("a.MP3", "audio/mpeg"),
+            ("a.unknown", "audio/wav"),
+        ],
+    )
+    def test_by_extension(self, name, mime):
+        assert mime_type_for(name) == mime
+
+
+class TestResolveCodec:
+    def test_unknown_codec_uploads_wav(self):
+        assert resolve_codec("mp3") == "wav"
+
+    def test_opus_falls_back_to_flac_when_unavailable(self):
+        with patch.object(audio_codec, "opus_available", return_value=False):
+            assert resolve_codec("opus") == "flac"
+
+    def test_opus_falls_back_to_flac_for_unsupported_rate(self):
+        with patch.object(audio_codec, "opus_available", return_value=True):
+            assert resolve_codec("opus", samplerate=44100) == "flac"
+            assert resolve_codec("opus", samplerate=16000) == "opus"
+
+
+class TestEncodeForUpload:
+    def test_wav_is_passed_through(self, speech_like_wav):
+        path = speech_like_wav(1.0)
+        assert encode_for_upload(path, "wav") == Path(path)
+
+    def test_non_wav_input_is_passed_through(self, tmp_path):
+        path = tmp_path / "clip.ogg"
+        path.write_bytes(b"x")
+        assert encode_for_upload(path, "flac") == path
+
+    def test_flac_is_lossless_and_smaller(self, speech_like_wav):
+        path = speech_like_wav(5.0)
+        encoded = encode_for_upload(path, "flac")
+        try:
+            assert encoded.suffix == ".flac"
+            assert encoded.stat().st_size < Path(path).stat().st_size
+            original, _ = sf.read(path, dtype="int16")
+            roundtrip, rate = sf.read(str(encoded), dtype="int16")
+            assert rate == 16000
+            np.testing.assert_array_equal(original, roundtrip)
+        finally:
+            encoded.unlink()
+
+    @pytest.mark.skipif(
+        not audio_codec.opus_available(), reason="libsndfile built without Opus"
+    )
+    def test_opus_is_much_smaller(self, speech_like_wav):
+        path = speech_like_wav(5.0)
+        encoded = encode_for_upload(path, "opus")
+        try:
+            assert encoded.suffix == ".ogg"
+            assert encoded.stat().st_size * 4 < Path(path).stat().st_size
+            assert sf.info(str(encoded)).frames > 0
+        finally:
+            encoded.unlink()
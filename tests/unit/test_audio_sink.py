@@ -0,0 +1,60 @@
+"""Unit tests for the streaming recording sink."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import soundfile as sf
+
+from src.services.audio_sink import StreamingWavSink, new_temp_recording_path
+
+
+def _block(n: int, value: int = 100) -> np.ndarray:
+    return np.full((n, 1), value, dtype=np.int16)
+
+
+class TestStreamingWavSink:
+    def test_blocks_land_in_order(self, tmp_path):
+        path = str(tmp_path / "rec.wav")
+        sink = StreamingWavSink(path, samplerate=16000)
+        for i in range(10):
+            sink.write(_block(1024, value=i))
+        assert sink.close() == 10 * 1024
+
+        data, rate = sf.read(path, dtype="int16")
+        assert rate == 16000
+        assert len(data) == 10 * 1024
+        assert data[0] == 0 and data[-1] == 9
+
+    def test_frames_queued_counts_before_the_writer_catches_up(self, tmp_path):
+        sink = StreamingWavSink(str(tmp_path / "rec.wav"), samplerate=16000)
+        sink.write(_block(1600))
+        sink.write(_block(1600))
+        assert sink.frames_queued == 3200
+        sink.close()
+
+    def test_write_after_close_is_ignored(self, tmp_path):
+        path = str(tmp_path / "rec.wav")
+        sink = StreamingWavSink(path, samplerate=16000)
+        sink.write(_block(100))
+        sink.close()
+        sink.write(_block(100))
+        assert sf.info(path).frames == 100
+
+    def test_discard_deletes_the_file(self, tmp_path):
+        path = tmp_path / "rec.wav"
+        sink = StreamingWavSink(str(path), samplerate=16000)
+        sink.write(_block(100))
+        sink.discard()
+        assert not path.exists()
+
+
+def test_new_temp_recording_path_creates_empty_file():
+    path = Path(new_temp_recording_path())
+    try:
+        assert path.exists()
+        assert path.name.startswith("voice_recording_")
+        assert path.suffix == ".wav"
+    finally:
+        path.unlink()
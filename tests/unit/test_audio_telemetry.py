@@ -0,0 +1,107 @@
+"""Unit tests for per-recording capture stream telemetry."""
+
+from unittest.mock import MagicMock, patch
+
+from src.services.audio_telemetry import (
+    BUCKETS_MS,
+    CaptureTelemetry,
+    Histogram,
+    StreamTelemetry,
+)
+
+
+class TestHistogram:
+    def test_empty(self):
+        h = Histogram()
+        assert h.percentile(0.5) == 0.0
+        assert h.as_dict()["count"] == 0
+
+    def test_percentiles_report_bucket_edges(self):
+        h = Histogram()
+        for _ in range(98):
+            h.add(0.3)
+        h.add(7.0)
+        h.add(12.0)
+        assert h.percentile(0.5) == 0.5
+        assert h.percentile(0.99) == 10
+        assert h.percentile(1.0) == 20
+        assert h.max == 12.0
+
+    def test_values_past_the_last_edge_report_the_maximum(self):
+        h = Histogram()
+        h.add(BUCKETS_MS[-1] * 3)
+        assert h.percentile(0.99) == BUCKETS_MS[-1] * 3
+        assert h.as_dict()["buckets_ms"] == {f">{BUCKETS_MS[-1]:g}": 1}
+
+    def test_as_dict_lists_only_used_buckets(self):
+        h = Histogram()
+        h.add(1)
+        h.add(1.5)
+        assert h.as_dict()["buckets_ms"] == {"<=1": 1, "<=2": 1}
+
+
+class TestStreamTelemetry:
+    def _clock(self, *times):
+        return patch(
+            "src.services.audio_telemetry.time.perf_counter",
+            MagicMock(side_effect=times),
+        )
+
+    def test_callback_duration_and_jitter(self):
+        stats = StreamTelemetry("mic", 16000)
+        # 1024 frames at 16 kHz are 64 ms apart; the second callback is 16 ms
+        # late and takes 3 ms.
+        with self._clock(0.0, 0.001, 0.080, 0.083):
+            stats.callback_finished(stats.callback_started(1024))
+            stats.callback_finished(stats.callback_started(1024))
+        assert stats.callbacks == 2
+        assert stats.frames == 2048
+        assert stats.callback_ms.count == 2
+        assert abs(stats.callback_ms.max - 3.0) < 1e-6
+        assert stats.jitter_ms.count == 1
+        assert abs(stats.jitter_ms.max - 16.0) < 1e-6
+
+    def test_flags_and_drops_make_it_unclean(self):
+        stats = StreamTelemetry("mic", 16000)
+        stats.callback_started(
+            512, MagicMock(input_overflow=False, input_underflow=False)
+        )
+        assert stats.clean
+        stats.callback_started(
+            512, MagicMock(input_overflow=True, input_underflow=False)
+        )
+        stats.dropped(512)
+        assert stats.input_overflows == 1
+        assert stats.dropped_blocks == 1
+        assert stats.dropped_frames == 512
+        assert not stats.clean
+
+    def test_queue_depth_is_recorded_in_milliseconds(self):
+        stats = StreamTelemetry("mic", 16000)
+        stats.queued(800)
+        assert stats.queue_ms.max == 50.0
+
+
+class TestCaptureTelemetry:
+    def test_no_streams_is_clean(self):
+        telemetry = CaptureTelemetry()
+        assert telemetry.clean
+        assert telemetry.summary() == "no streams"
+        assert telemetry.as_dict() == {}
+
+    def test_as_dict_per_stream(self):
+        telemetry = CaptureTelemetry()
+        telemetry.stream("mic", 16000).callback_started(1600)
+        telemetry.stream("loopback", 48000).dropped(480)
+        report = telemetry.as_dict()
+        assert set(report) == {"mic", "loopback"}
+        assert report["mic"]["seconds"] == 0.1
+        assert report["loopback"]["dropped_blocks"] == 1
+        assert not telemetry.clean
+        assert "loopback: 0 callbacks" in telemetry.summary()
+
+    def test_reopening_a_stream_starts_it_over(self):
+        telemetry = CaptureTelemetry()
+        telemetry.stream("mic", 16000).dropped(10)
+        telemetry.stream("mic", 16000)
+        assert telemetry.clean
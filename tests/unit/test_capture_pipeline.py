@@ -0,0 +1,194 @@
+"""Unit tests for the capture pipeline and its stages."""
+
+from __future__ import annotations
+
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from src.services.capture_pipeline import (
+    CapturePipeline,
+    CaptureStage,
+    DownmixStage,
+    FeedStage,
+    LevelMeter,
+    QueuedStage,
+    ResampleStage,
+)
+from src.services.resampler import StreamingResampler
+
+
+class Scale(CaptureStage):
+    name = "scale"
+
+    def __init__(self, factor: int):
+        super().__init__()
+        self.factor = factor
+
+    def process(self, block):
+        return block * self.factor
+
+
+class HoldBack(CaptureStage):
+    """Keeps the last frame of the stream until flush()."""
+
+    name = "hold"
+
+    def __init__(self):
+        super().__init__()
+        self.held = None
+
+    def process(self, block):
+        out = (
+            block[:-1] if self.held is None else np.concatenate([self.held, block[:-1]])
+        )
+        self.held = block[-1:]
+        return out
+
+    def flush(self):
+        held, self.held = self.held, None
+        return held
+
+
+class Boom(CaptureStage):
+    name = "boom"
+
+    def __init__(self, required: bool):
+        super().__init__()
+        self.required = required
+
+    def process(self, block):
+        raise RuntimeError("boom")
+
+
+def _block(*values) -> np.ndarray:
+    return np.array(values, dtype=np.int16).reshape(-1, 1)
+
+
+class TestCapturePipeline:
+    def test_blocks_flow_through_the_stages_in_order(self):
+        seen = []
+        pipeline = CapturePipeline([Scale(2), FeedStage("out", seen.append), Scale(3)])
+        pipeline.push(_block(1, 2))
+        np.testing.assert_array_equal(seen[0].ravel(), [2, 4])
+
+    def test_observers_fan_out_the_same_block(self):
+        a, b = [], []
+        pipeline = CapturePipeline([FeedStage("a", a.append), FeedStage("b", b.append)])
+        block = _block(5)
+        pipeline.push(block)
+        assert a[0] is block and b[0] is block
+
+    def test_flush_runs_held_back_audio_through_later_stages(self):
+        seen = []
+        sink = FeedStage("out", seen.append)
+        pipeline = CapturePipeline([HoldBack(), Scale(10), sink])
+        pipeline.push(_block(1, 2, 3))
+        pipeline.flush()
+        np.testing.assert_array_equal(np.concatenate(seen).ravel(), [10, 20, 30])
+
+    def test_a_failing_optional_stage_is_dropped(self):
+        seen = []
+        boom = Boom(required=False)
+        pipeline = CapturePipeline([boom, FeedStage("out", seen.append)])
+        pipeline.push(_block(1))
+        pipeline.push(_block(2))
+        assert boom.failed
+        assert pipeline.stage("boom") is None
+        assert len(seen) == 2
+
+    def test_a_failing_required_stage_raises(self):
+        pipeline = CapturePipeline([Boom(required=True)])
+        with pytest.raises(RuntimeError):
+            pipeline.push(_block(1))
+
+    def test_empty_output_ends_the_blocks_trip(self):
+        seen = []
+        pipeline = CapturePipeline([HoldBack(), FeedStage("out", seen.append)])
+        pipeline.push(_block(1))  # held back entirely
+        assert seen == []
+
+    def test_feed_stage_keeps_the_flush_result(self):
+        stage = FeedStage("tap", lambda block: None, lambda: 7)
+        CapturePipeline([stage]).flush()
+        assert stage.result == 7
+
+
+class TestStages:
+    def test_level_meter(self):
+        meter = LevelMeter()
+        meter.process(np.full((100, 1), 200, np.int16))
+        assert meter.level == pytest.approx(0.5)
+        meter.process(np.full((100, 1), 4000, np.int16))
+        assert meter.level == 1.0
+
+    def test_downmix(self):
+        out = DownmixStage().process(np.array([[100, 300], [0, 0]], np.int16))
+        assert out.dtype == np.float32
+        np.testing.assert_array_equal(out, [200, 0])
+
+    def test_resample_stage_flushes_the_tail(self):
+        stage = ResampleStage(StreamingResampler(48000, 16000))
+        out = [stage.process(np.zeros((4800, 1), np.int16)) for _ in range(10)]
+        out.append(stage.flush())
+        assert sum(len(b) for b in out) == 16000
+
+
+class TestQueuedStage:
+    def test_runs_the_stage_on_another_thread(self):
+        threads = []
+        seen = []
+
+        def feed(block):
+            threads.append(threading.current_thread())
+            seen.append(block)
+
+        queued = QueuedStage(FeedStage("tap", feed, lambda: len(seen)))
+        block = _block(1)
+        assert queued.process(block) is block
+        queued.process(_block(2))
+        queued.flush()
+        assert len(seen) == 2
+        assert queued.stage.result == 2
+        assert threading.current_thread() not in threads
+
+    def test_backpressure_then_failure_when_stuck(self):
+        release = threading.Event()
+        queued = QueuedStage(
+            FeedStage("tap", lambda block: release.wait(5)), max_blocks=1, timeout=0.05
+        )
+        queued.process(_block(1))  # taken by the worker, which blocks
+        time.sleep(0.02)
+        queued.process(_block(2))  # fills the queue
+        started = time.monotonic()
+        with pytest.raises(RuntimeError):
+            queued.process(_block(3))
+        assert time.monotonic() - started >= 0.05
+        release.set()
+        queued.close()
+
+    def test_worker_errors_surface_on_the_next_call(self):
+        def feed(block):
+            raise ValueError("bad block")
+
+        queued = QueuedStage(FeedStage("tap", feed))
+        queued.process(_block(1))
+        with pytest.raises(ValueError):
+            queued.flush()
+
+    def test_a_stuck_optional_stage_leaves_the_pipeline(self):
+        release = threading.Event()
+        seen = []
+        queued = QueuedStage(
+            FeedStage("tap", lambda block: release.wait(5), required=False),
+            max_blocks=1,
+            timeout=0.01,
+        )
+        pipeline = CapturePipeline([queued, FeedStage("writer", seen.append)])
+        for value in range(5):
+            pipeline.push(_block(value))
+        assert queued.failed
+        assert len(seen) == 5
+        release.set()
@@ -2,12 +2,14 @@
 
 from __future__ import annotations
 
-from unittest.mock import patch
+import threading
+from unittest.mock import ANY, patch
 
 import pytest
 
 from src.config.settings import Settings
 from src.controller import Controller, AppState
+from src.services.transcriber import TranscriptionCancelled
 
 
 @pytest.fixture
@@ -23,10 +25,12 @@ def controller(mock_settings, qtbot):
     """Controller with mocked external services."""
     with (
         patch("src.controller.AudioRecorder") as MockRecorder,
-        patch("src.controller.Transcriber"),
+        patch("src.controller.Transcriber") as MockTranscriber,
         patch("src.controller.HotkeyListener"),
         patch("src.controller.KeyboardService"),
     ):
+        MockTranscriber.return_value.language = mock_settings.transcription_language
+        MockTranscriber.return_value.model = mock_settings.transcription_model
         recorder = MockRecorder.return_value
         recorder.is_recording = False
         recorder.start_recording.return_value = True
@@ -97,6 +101,31 @@ class TestCancel:
         assert controller._cancelled is True
         assert controller.current_state == AppState.IDLE
 
+    def test_cancel_during_processing_aborts_the_transcription(self, controller, qtbot):
+        started = threading.Event()
+
+        def transcribe(path, cancel):
+            started.set()
+            if cancel.wait(5):
+                raise TranscriptionCancelled("Cancelled")
+            return "too late"
+
+        controller.transcriber.transcribe.side_effect = transcribe
+        controller.start()
+        controller._on_hotkey_press()
+        controller._on_hotkey_release()
+        assert started.wait(5)
+        with qtbot.waitSignal(controller._transcription_cancelled, timeout=1000):
+            controller.cancel()
+        assert controller._cancelled is False
+        controller.recorder.cleanup_temp_file.assert_called()
+
+        # The transcription lane is free for the next dictation right away.
+        controller.transcriber.transcribe.side_effect = None
+        controller.transcriber.transcribe.return_value = "next"
+        with qtbot.waitSignal(controller._transcription_done, timeout=1000):
+            controller._transcribe_audio("/tmp/next.wav")
+
     def test_cancel_ignored_when_idle(self, controller, qtbot):
         controller.start()
         controller.cancel()
@@ -192,7 +221,9 @@ class TestTransform:
         with qtbot.waitSignal(controller.transform_completed, timeout=1000) as blocker:
             controller.request_transform("formal", "hello", "make formal")
         assert blocker.args == ["formal", "Hello, good day."]
-        controller.transcriber.transform.assert_called_once_with("hello", "make formal")
+        controller.transcriber.transform.assert_called_once_with(
+            "hello", "make formal", cancel=ANY
+        )
 
     def test_transform_error(self, controller, qtbot):
         controller.transcriber.transform.side_effect = Exception("API error")
@@ -200,3 +231,361 @@ class TestTransform:
             controller.request_transform("formal", "hello", "make formal")
         assert blocker.args[0] == "formal"
         assert "API error" in blocker.args[1]
+
+    def test_a_newer_selection_cancels_the_transform_in_flight(self, controller, qtbot):
+        started = threading.Event()
+
+        def transform(text, instructions, cancel):
+            if instructions == "make formal":
+                started.set()
+                if cancel.wait(5):
+                    raise TranscriptionCancelled("Cancelled")
+            return f"{instructions}: {text}"
+
+        controller.transcriber.transform.side_effect = transform
+        failed = []
+        controller.transform_failed.connect(lambda *args: failed.append(args))
+        controller.request_transform("formal", "hello", "make formal")
+        assert started.wait(5)
+        # The transform lane runs one at a time: the new one can only finish
+        # this soon if the first was aborted.
+        with qtbot.waitSignal(controller.transform_completed, timeout=1000) as blocker:
+            controller.request_transform("casual", "hello", "make casual")
+        assert blocker.args == ["casual", "make casual: hello"]
+        assert failed == []
+
+
+class TestTaskLanes:
+    def test_a_slow_transform_does_not_hold_up_a_transcription(self, controller, qtbot):
+        release = threading.Event()
+        controller.transcriber.transform.side_effect = lambda *a, **kw: release.wait(5)
+        controller.transcriber.transcribe.return_value = "hello"
+        try:
+            controller.request_transform("formal", "hello", "make formal")
+            with qtbot.waitSignal(controller._transcription_done, timeout=1000):
+                controller._transcribe_audio("/tmp/test.wav")
+        finally:
+            release.set()
+        stats = controller.get_task_stats()
+        assert stats["transcription"]["wait_ms"]["count"] == 1
+        assert stats["transform"]["wait_ms"]["count"] == 1
+
+
+class TestPreconnect:
+    def test_recording_start_warms_the_connection(self, controller, qtbot):
+        controller._start_recording()
+        qtbot.waitUntil(lambda: controller.transcriber.preconnect.called, timeout=1000)
+
+    def test_not_when_disabled(self, controller, mock_settings, qtbot):
+        mock_settings.transcription_preconnect = False
+        controller._start_recording()
+        qtbot.wait(50)
+        controller.transcriber.preconnect.assert_not_called()
+
+    def test_not_in_stream_mode(self, controller, mock_settings, qtbot):
+        mock_settings.transcription_upload_mode = "stream"
+        with patch("src.controller.StreamingUpload"):
+            controller._start_recording()
+        qtbot.wait(50)
+        controller.transcriber.preconnect.assert_not_called()
+
+
+class TestHedging:
+    def test_off_by_default(self, controller):
+        assert controller.hedging is None
+
+    def test_transcribers_share_one_policy(self, mock_settings):
+        mock_settings.transcription_hedge_requests = True
+        mock_settings.transcription_hedge_max_extra = 0.05
+        with (
+            patch("src.controller.AudioRecorder"),
+            patch("src.controller.Transcriber") as MockTranscriber,
+            patch("src.controller.HotkeyListener"),
+            patch("src.controller.KeyboardService"),
+        ):
+            ctrl = Controller(mock_settings)
+        try:
+            assert ctrl.hedging is not None
+            assert ctrl.hedging.max_extra == 0.05
+            assert MockTranscriber.call_args.kwargs["hedging"] is ctrl.hedging
+        finally:
+            ctrl._pool.shutdown(wait=False, cancel_futures=True)
+
+
+class TestLiveMode:
+    """upload_mode "live": segments are transcribed while recording."""
+
+    @pytest.fixture
+    def live_controller(self, controller, mock_settings):
+        mock_settings.transcription_upload_mode = "live"
+        return controller
+
+    def test_recording_registers_the_capture_tap(self, live_controller):
+        live_controller.start()
+        live_controller._on_hotkey_press()
+        assert live_controller._live is not None
+        live_controller.recorder.set_capture_tap.assert_called_with(
+            live_controller._live.capture_tap
+        )
+
+    def test_file_mode_clears_the_capture_tap(self, controller):
+        controller.start()
+        controller._on_hotkey_press()
+        assert controller._live is None
+        controller.recorder.set_capture_tap.assert_called_with(None)
+
+    def test_release_delivers_the_live_text(self, live_controller, qtbot):
+        live_controller.start()
+        live_controller._on_hotkey_press()
+        live = live_controller._live
+        live.finish = lambda count: f"{count} segments"
+        live_controller.recorder.get_capture_tap_result.return_value = 2
+        with qtbot.waitSignal(live_controller._transcription_done, timeout=2000) as sig:
+            live_controller._on_hotkey_release()
+        assert sig.args == ["2 segments"]
+        live_controller.transcriber.transcribe.assert_not_called()
+
+    def test_failed_live_falls_back_to_the_file(self, live_controller, qtbot):
+        from src.services.transcriber import TranscriptionError
+
+        live_controller.start()
+        live_controller._on_hotkey_press()
+
+        def fail(count):
+            raise TranscriptionError("segment failed")
+
+        live_controller._live.finish = fail
+        live_controller.recorder.get_capture_tap_result.return_value = 1
+        live_controller.transcriber.transcribe.return_value = "from the file"
+        with qtbot.waitSignal(live_controller._transcription_done, timeout=2000) as sig:
+            live_controller._on_hotkey_release()
+        assert sig.args == ["from the file"]
+        live_controller.transcriber.transcribe.assert_called_once_with(
+            "/tmp/test.wav", cancel=ANY
+        )
+
+    def test_recording_without_live_segments_uses_the_file(
+        self, live_controller, qtbot
+    ):
+        # e.g. system audio was on, so the recorder never segmented.
+        live_controller.start()
+        live_controller._on_hotkey_press()
+        live = live_controller._live
+        live_controller.recorder.get_capture_tap_result.return_value = None
+        live_controller.transcriber.transcribe.return_value = "whole"
+        with qtbot.waitSignal(live_controller._transcription_done, timeout=2000):
+            live_controller._on_hotkey_release()
+        assert live._cancelled
+
+    def test_cancel_while_recording_drops_the_session(self, live_controller):
+        live_controller.start()
+        live_controller._on_hotkey_press()
+        live = live_controller._live
+        live_controller.cancel()
+        assert live_controller._live is None
+        assert live._cancelled
+
+    def test_stream_mode_opens_a_streaming_upload(
+        self, controller, mock_settings, qtbot
+    ):
+        from src.services.upload_stream import StreamingUpload
+
+        mock_settings.transcription_upload_mode = "stream"
+        controller.start()
+        controller._on_hotkey_press()
+        upload = controller._live
+        assert isinstance(upload, StreamingUpload)
+        controller.recorder.set_capture_tap.assert_called_with(upload.capture_tap)
+
+        upload.finish = lambda frames: f"{frames} frames"
+        controller.recorder.get_capture_tap_result.return_value = 16000
+        with qtbot.waitSignal(controller._transcription_done, timeout=2000) as sig:
+            controller._on_hotkey_release()
+        assert sig.args == ["16000 frames"]
+
+
+class TestAutoStop:
+    """behavior.auto_stop: toggle-mode recordings end when the speech does."""
+
+    def test_armed_only_in_toggle_mode(self, controller, mock_settings):
+        mock_settings.auto_stop = True
+        mock_settings.auto_stop_silence_ms = 1500
+        mock_settings.recording_mode = "toggle"
+        controller._configure_auto_stop()
+        controller.recorder.set_auto_stop.assert_called_with(
+            controller._speech_ended.emit, trailing_silence_s=1.5, min_speech_s=0.5
+        )
+
+        mock_settings.recording_mode = "hold"
+        controller._configure_auto_stop()
+        controller.recorder.set_auto_stop.assert_called_with(None)
+
+    def test_disabled_by_default(self, controller):
+        controller.recorder.set_auto_stop.assert_called_with(None)
+
+    def test_speech_end_stops_and_transcribes(self, controller, qtbot):
+        controller.start()
+        controller._on_hotkey_toggle()
+        assert controller.current_state == AppState.RECORDING
+        controller._speech_ended.emit()
+        controller.recorder.stop_recording.assert_called_once()
+        assert controller.current_state == AppState.PROCESSING
+
+    def test_late_speech_end_is_ignored(self, controller, qtbot):
+        controller.current_state = AppState.PROCESSING
+        controller._speech_ended.emit()
+        controller.recorder.stop_recording.assert_not_called()
+
+
+class TestJournal:
+    """audio.journal: recordings survive crashes and failed transcriptions."""
+
+    def _entry(self, mock_settings, value: int = 1):
+        import numpy as np
+
+        from src.services.recording_journal import RecordingJournal
+
+        journal = RecordingJournal(mock_settings.config_path.parent / "journal")
+        entry = journal.begin(16000, 1)
+        entry.append(np.full((1600, 1), value, np.int16))
+        entry.close()
+        return entry
+
+    def test_recorder_writes_to_the_config_dir_journal(self, controller, mock_settings):
+        assert controller._journal.root == mock_settings.config_path.parent / "journal"
+
+    def test_left_over_recordings_are_transcribed_at_start(
+        self, controller, mock_settings, qtbot
+    ):
+        entry = self._entry(mock_settings)
+        controller.transcriber.transcribe.return_value = "recovered text"
+        with qtbot.waitSignal(controller.recovered_transcription, timeout=2000) as sig:
+            controller.start()
+        assert sig.args == ["recovered text"]
+        qtbot.waitUntil(lambda: not entry.path.exists(), timeout=2000)
+
+    def test_a_failed_recovery_stays_queued(self, controller, mock_settings, qtbot):
+        from src.services.transcriber import TranscriptionError
+
+        entry = self._entry(mock_settings)
+        controller.transcriber.transcribe.side_effect = TranscriptionError("offline")
+        controller.start()
+        qtbot.waitUntil(
+            lambda: any(job.attempts for job in controller._queue.jobs()),
+            timeout=2000,
+        )
+        assert not entry.path.exists()
+        (job,) = controller._queue.jobs()
+        assert job.last_error == "offline"
+
+    def test_a_failed_transcription_keeps_the_recording(
+        self, controller, mock_settings, qtbot
+    ):
+        from src.services.recording_journal import FAILED
+
+        entry = self._entry(mock_settings)
+        controller._journal_entry = entry
+        controller._on_transcribe_error("API failed", retryable=True)
+        assert entry.state == FAILED
+        assert entry.path.exists()
+
+    def test_no_speech_discards_the_recording(self, controller, mock_settings, qtbot):
+        from src.services.transcriber import EmptyTranscriptionError
+
+        entry = self._entry(mock_settings)
+        controller._journal_entry = entry
+        with qtbot.waitSignal(controller._transcription_failed):
+            controller._report_failure(
+                "/tmp/a.wav", EmptyTranscriptionError("No speech detected")
+            )
+        assert not entry.path.exists()
+        assert controller._journal.pending() == []
+
+    def test_failed_recordings_are_pruned_without_a_queue(
+        self, controller, mock_settings
+    ):
+        failed = self._entry(mock_settings)
+        failed.mark_failed("offline")
+        interrupted = self._entry(mock_settings, value=2)
+        controller._queue = None
+        controller.start()
+        assert not failed.path.exists()
+        assert interrupted.path.exists()
+
+    @patch("src.controller.ClipboardManager")
+    def test_a_delivered_transcription_deletes_it(
+        self, MockClipboard, controller, mock_settings, qtbot
+    ):
+        MockClipboard.copy.return_value = True
+        entry = self._entry(mock_settings)
+        controller._journal_entry = entry
+        controller._on_transcribe_finished("hello")
+        assert not entry.path.exists()
+
+    def test_journal_can_be_turned_off(self, mock_settings, qtbot):
+        mock_settings.audio_journal = False
+        with (
+            patch("src.controller.AudioRecorder") as MockRecorder,
+            patch("src.controller.Transcriber"),
+            patch("src.controller.HotkeyListener"),
+            patch("src.controller.KeyboardService"),
+        ):
+            ctrl = Controller(mock_settings)
+            assert ctrl._journal is None
+            assert MockRecorder.call_args.kwargs["journal"] is None
+            ctrl._pool.shutdown(wait=False, cancel_futures=True)
+
+
+class TestTranscriptionQueue:
+    """Failures time can fix are queued and retried instead of reported."""
+
+    def test_network_failures_are_deferred(self, controller, qtbot):
+        from src.services.transcriber import TranscriptionError
+
+        with qtbot.waitSignal(controller._transcription_deferred) as sig:
+            controller._report_failure("/tmp/a.wav", TranscriptionError("timeout"))
+        assert sig.args == ["/tmp/a.wav", "timeout"]
+
+    def test_a_bad_key_is_reported_at_once(self, controller, qtbot):
+        from src.services.transcriber import APIKeyError
+
+        with qtbot.waitSignal(controller._transcription_failed):
+            controller._report_failure("/tmp/a.wav", APIKeyError("bad key"))
+
+    def test_a_deferred_recording_moves_to_the_queue(
+        self, controller, mock_settings, qtbot, tmp_path
+    ):
+        audio = tmp_path / "rec.wav"
+        audio.write_bytes(b"RIFF" + bytes(64))
+        controller.current_state = AppState.PROCESSING
+        with qtbot.waitSignal(controller.warning_occurred):
+            controller._on_transcribe_deferred(str(audio), "Network error")
+        assert controller.current_state == AppState.IDLE
+        (job,) = controller._queue.jobs()
+        assert job.audio.exists() and not audio.exists()
+        assert job.last_error == "Network error"
+        assert job.path.parent == mock_settings.config_path.parent / "queue"
+
+    def test_a_cancelled_transcription_is_not_queued(self, controller, qtbot, tmp_path):
+        controller._cancelled = True
+        controller._on_transcribe_deferred(str(tmp_path / "rec.wav"), "timeout")
+        assert controller._queue.jobs() == []
+
+    def test_queued_jobs_keep_their_settings(self, controller, tmp_path):
+        from unittest.mock import MagicMock
+
+        from src.services.transcription_queue import TranscriptionJob
+
+        controller.transcriber.language = "es"
+        controller.transcriber.model = "v3-turbo"
+        job = TranscriptionJob(
+            path=tmp_path, options={"language": "en", "model": "v3"}, created=0
+        )
+        with patch("src.controller.Transcriber") as Snapshot:
+            Snapshot.return_value = MagicMock(**{"transcribe.return_value": "hi"})
+            assert controller._transcribe_queued(job) == "hi"
+        assert Snapshot.call_args.kwargs["language"] == "en"
+        assert Snapshot.call_args.kwargs["model"] == "v3"
+        assert Snapshot.call_args.kwargs["hedging"] is controller.hedging
+        Snapshot.return_value.close.assert_called_once()
+        controller.transcriber.transcribe.assert_not_called()
@@ -0,0 +1,91 @@
+"""Unit tests for end-of-speech detection."""
+
+from __future__ import annotations
+
+import numpy as np
+
+from src.services.endpointing import EndpointDetector
+
+RATE = 16000
+BLOCK = 1024
+
+
+def _speech(seconds: float, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    n = int(seconds * RATE)
+    t = np.arange(n) / RATE
+    voiced = np.sin(2 * np.pi * 140 * t) * 3000 + rng.standard_normal(n) * 500
+    return voiced.astype(np.int16).reshape(-1, 1)
+
+
+def _silence(seconds: float, level: float = 20, seed: int = 1) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return (rng.standard_normal((int(seconds * RATE), 1)) * level).astype(np.int16)
+
+
+def _fired_at(detector: EndpointDetector, audio: np.ndarray) -> float | None:
+    """Seconds into `audio` at which the detector fired, if it did."""
+    for start in range(0, len(audio), BLOCK):
+        if detector.feed(audio[start : start + BLOCK]):
+            return (start + len(audio[start : start + BLOCK])) / RATE
+    return None
+
+
+class TestEndpointDetector:
+    def test_fires_after_the_trailing_silence(self):
+        d = EndpointDetector(RATE, trailing_silence_s=1.0, min_speech_s=0.5)
+        audio = np.concatenate([_silence(0.5), _speech(2), _silence(3)])
+        at = _fired_at(d, audio)
+        assert at is not None
+        # The block the speech ends in still counts as speech.
+        assert 3.5 <= at < 3.5 + 2 * BLOCK / RATE
+
+    def test_shorter_pauses_do_not_end_the_recording(self):
+        d = EndpointDetector(RATE, trailing_silence_s=1.5)
+        audio = np.concatenate(
+            [_speech(1), _silence(1.2), _speech(1, seed=2), _silence(1.0)]
+        )
+        assert _fired_at(d, audio) is None
+
+    def test_take_that_opens_mid_word(self):
+        # No quiet block to learn the floor from until the speech ends.
+        d = EndpointDetector(RATE, trailing_silence_s=1.0)
+        assert _fired_at(d, np.concatenate([_speech(2), _silence(2)])) is not None
+
+    def test_speech_louder_than_the_early_floor_is_not_silence(self):
+        # Speech from the start must not count towards the trailing silence
+        # once the real floor is known.
+        d = EndpointDetector(RATE, trailing_silence_s=1.0)
+        audio = np.concatenate([_speech(3), _silence(0.5), _speech(1, seed=2)])
+        assert _fired_at(d, audio) is None
+
+    def test_silence_alone_never_fires(self):
+        d = EndpointDetector(RATE, trailing_silence_s=0.5)
+        assert _fired_at(d, _silence(5)) is None
+
+    def test_a_blip_is_not_enough_speech(self):
+        d = EndpointDetector(RATE, trailing_silence_s=0.5, min_speech_s=0.5)
+        audio = np.concatenate([_silence(1), _speech(0.2), _silence(2)])
+        assert _fired_at(d, audio) is None
+
+    def test_fires_only_once(self):
+        d = EndpointDetector(RATE, trailing_silence_s=0.5)
+        audio = np.concatenate([_silence(0.5), _speech(1), _silence(1)])
+        assert _fired_at(d, audio) is not None
+        assert d.fired
+        assert not d.feed(_silence(1))
+
+    def test_noisy_room_is_not_speech(self):
+        # A floor well above the absolute silence threshold.
+        d = EndpointDetector(RATE, trailing_silence_s=1.0)
+        audio = np.concatenate(
+            [_silence(1, level=400), _speech(2), _silence(2, level=400)]
+        )
+        assert _fired_at(d, audio) is not None
+
+    def test_digital_silence_and_1d_blocks(self):
+        d = EndpointDetector(RATE, trailing_silence_s=0.5)
+        audio = np.concatenate(
+            [np.zeros(RATE, np.int16), _speech(1)[:, 0], np.zeros(RATE, np.int16)]
+        )
+        assert _fired_at(d, audio) is not None
@@ -0,0 +1,142 @@
+"""Unit tests for the event-loop thread and cancel tokens."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from concurrent.futures import CancelledError, TimeoutError
+
+import pytest
+
+from src.services.event_loop import CancelToken, EventLoopThread
+
+
+@pytest.fixture
+def loop():
+    thread = EventLoopThread(name="test-loop")
+    yield thread
+    thread.stop()
+
+
+class TestCancelToken:
+    def test_callbacks_run_once_on_cancel(self):
+        token = CancelToken()
+        calls = []
+        token.add_callback(lambda: calls.append(1))
+        token.cancel()
+        token.cancel()
+        assert token.cancelled
+        assert calls == [1]
+
+    def test_late_callbacks_run_at_once(self):
+        token = CancelToken()
+        token.cancel()
+        calls = []
+        token.add_callback(lambda: calls.append(1))
+        assert calls == [1]
+
+    def test_removed_callbacks_do_not_run(self):
+        token = CancelToken()
+        calls = []
+
+        def callback():
+            calls.append(1)
+
+        token.add_callback(callback)
+        token.remove_callback(callback)
+        token.cancel()
+        assert calls == []
+
+    def test_wait_wakes_on_cancel(self):
+        token = CancelToken()
+        threading.Timer(0.05, token.cancel).start()
+        t0 = time.monotonic()
+        assert token.wait(5)
+        assert time.monotonic() - t0 < 2
+
+
+class TestEventLoopThread:
+    def test_runs_coroutines_and_returns_their_result(self, loop):
+        async def add(a, b):
+            await asyncio.sleep(0)
+            return a + b
+
+        assert loop.run(add(1, 2)) == 3
+
+    def test_exceptions_propagate(self, loop):
+        async def fail():
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError, match="boom"):
+            loop.run(fail())
+
+    def test_cancel_stops_the_coroutine(self, loop):
+        stopped = threading.Event()
+
+        async def slow():
+            try:
+                await asyncio.sleep(10)
+            finally:
+                stopped.set()
+
+        token = CancelToken()
+        threading.Timer(0.05, token.cancel).start()
+        t0 = time.monotonic()
+        with pytest.raises(CancelledError):
+            loop.run(slow(), token)
+        assert time.monotonic() - t0 < 2
+        assert stopped.wait(2)
+
+    def test_timeout_cancels_the_coroutine(self, loop):
+        stopped = threading.Event()
+
+        async def slow():
+            try:
+                await asyncio.sleep(10)
+            finally:
+                stopped.set()
+
+        with pytest.raises(TimeoutError):
+            loop.run(slow(), timeout=0.05)
+        assert stopped.wait(2)
+
+    def test_an_already_cancelled_token_runs_nothing(self, loop):
+        ran = []
+
+        async def work():
+            ran.append(1)
+
+        token = CancelToken()
+        token.cancel()
+        with pytest.raises(CancelledError):
+            loop.run(work(), token)
+        assert ran == []
+
+    def test_concurrent_callers_share_the_loop(self, loop):
+        async def nap():
+            await asyncio.sleep(0.2)
+            return threading.current_thread().name
+
+        names = []
+        callers = [
+            threading.Thread(target=lambda: names.append(loop.run(nap())))
+            for _ in range(5)
+        ]
+        t0 = time.monotonic()
+        for caller in callers:
+            caller.start()
+        for caller in callers:
+            caller.join()
+        assert names == ["test-loop"] * 5
+        assert time.monotonic() - t0 < 0.2 * 5
+
+    def test_run_after_stop_raises(self):
+        thread = EventLoopThread()
+        thread.stop()
+
+        async def work():
+            return 1
+
+        with pytest.raises(RuntimeError):
+            thread.run(work())
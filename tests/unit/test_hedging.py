@@ -0,0 +1,127 @@
+"""Unit tests for hedged requests."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from src.services.hedging import HedgePolicy
+
+
+def _warmed(latency: float = 0.01, **kwargs) -> HedgePolicy:
+    kwargs.setdefault("min_delay_s", 0.05)
+    kwargs.setdefault("max_extra", 1.0)
+    policy = HedgePolicy(**kwargs)
+    for _ in range(policy.min_samples):
+        policy.record(latency)
+    return policy
+
+
+class Server:
+    """Fake request: each call takes the next of `delays` and answers its index."""
+
+    def __init__(self, *delays: float, errors: dict[int, Exception] | None = None):
+        self.delays = list(delays)
+        self.errors = errors or {}
+        self.calls = 0
+        self.cancelled: list[int] = []
+
+    async def __call__(self) -> int:
+        index = self.calls
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.delays[index])
+        except asyncio.CancelledError:
+            self.cancelled.append(index)
+            raise
+        if index in self.errors:
+            raise self.errors[index]
+        return index
+
+
+def test_no_hedging_until_enough_latencies_are_known():
+    policy = HedgePolicy(min_delay_s=0.01)
+    assert policy.delay() is None
+    server = Server(0.2)
+    assert asyncio.run(policy.run(server)) == 0
+    assert server.calls == 1
+
+
+def test_delay_follows_the_percentile_with_a_floor():
+    policy = HedgePolicy(percentile=0.9, min_delay_s=0.5)
+    for seconds in [0.1] * 9 + [3.0]:
+        policy.record(seconds)
+    assert policy.delay() == 0.5
+    for _ in range(10):
+        policy.record(2.0)
+    assert policy.delay() == 2.0
+
+
+def test_a_slow_request_is_hedged_and_the_loser_cancelled():
+    policy = _warmed()
+    server = Server(5.0, 0.01)
+    assert asyncio.run(policy.run(server)) == 1
+    assert server.cancelled == [0]
+    assert policy.as_dict()["hedged"] == 1
+    assert policy.as_dict()["won"] == 1
+
+
+def test_a_fast_request_is_not_hedged():
+    policy = _warmed()
+    server = Server(0.01)
+    assert asyncio.run(policy.run(server)) == 0
+    assert server.calls == 1
+
+
+def test_the_original_can_still_win():
+    policy = _warmed()
+    server = Server(0.1, 5.0)
+    assert asyncio.run(policy.run(server)) == 0
+    assert server.cancelled == [1]
+    assert policy.won == 0
+
+
+def test_a_failed_copy_waits_for_the_other():
+    policy = _warmed()
+    server = Server(0.1, 0.06, errors={1: RuntimeError("hedge broke")})
+    assert asyncio.run(policy.run(server)) == 0
+
+
+def test_raises_when_every_copy_fails():
+    policy = _warmed()
+    server = Server(
+        0.1, 0.2, errors={0: RuntimeError("first"), 1: RuntimeError("second")}
+    )
+    with pytest.raises(RuntimeError, match="first"):
+        asyncio.run(policy.run(server))
+
+
+def test_extra_load_is_capped():
+    policy = _warmed(max_extra=0.25)
+    # Keep the threshold where it is, whatever these requests take.
+    policy.record = lambda seconds: None
+
+    async def many():
+        for _ in range(8):
+            await policy.run(Server(0.1, 0.01))
+
+    asyncio.run(many())
+    assert policy.requests == 8
+    assert policy.hedged == 2
+
+
+def test_cancelling_the_call_cancels_every_copy():
+    policy = _warmed()
+    server = Server(5.0, 5.0)
+
+    async def cancel_soon():
+        task = asyncio.ensure_future(policy.run(server))
+        await asyncio.sleep(0.1)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        await asyncio.sleep(0)
+
+    asyncio.run(cancel_soon())
+    assert sorted(server.cancelled) == [0, 1]
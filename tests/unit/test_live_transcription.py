@@ -0,0 +1,116 @@
+"""Unit tests for LiveTranscription (transcribing segments during capture)."""
+
+from __future__ import annotations
+
+import threading
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from src.services.live_transcription import LiveTranscription
+from src.services.segmenter import LiveSegment
+from src.services.transcriber import (
+    EmptyTranscriptionError,
+    TranscriptionCancelled,
+    TranscriptionError,
+)
+
+
+def _segment(index: int, level: int = 1000) -> LiveSegment:
+    audio = np.full((1600, 1), level, dtype=np.int16)
+    return LiveSegment(index=index, audio=audio, samplerate=16000, start=index * 1600)
+
+
+def _transcriber(fn) -> MagicMock:
+    transcriber = MagicMock()
+    transcriber.transcribe_audio.side_effect = fn
+    return transcriber
+
+
+class TestLiveTranscription:
+    def test_final_text_is_in_segment_order(self):
+        live = LiveTranscription(
+            _transcriber(lambda audio, rate, cancel: f"s{int(audio[0, 0])}"),
+            max_parallel=3,
+        )
+        for i in range(3):
+            live.submit(_segment(i, level=i))
+        assert live.finish(3) == "s0 s1 s2"
+
+    def test_partials_only_grow_as_an_ordered_prefix(self):
+        # Segment 1 finishes before segment 0: nothing may be published until
+        # segment 0 is in, and then both at once.
+        release_first = threading.Event()
+        partials: list[str] = []
+
+        def transcribe(audio, rate, cancel):
+            if audio[0, 0] == 0:
+                release_first.wait(5)
+            return f"s{int(audio[0, 0])}"
+
+        live = LiveTranscription(
+            _transcriber(transcribe), on_partial=partials.append, max_parallel=2
+        )
+        live.submit(_segment(0, level=0))
+        live.submit(_segment(1, level=1))
+        for _ in range(100):
+            if live._texts.get(1) is not None:
+                break
+            threading.Event().wait(0.01)
+        assert partials == []
+        release_first.set()
+        assert live.finish(2) == "s0 s1"
+        assert partials == ["s0 s1"]
+
+    def test_failed_segment_fails_finish(self):
+        def transcribe(audio, rate, cancel):
+            if audio[0, 0] == 1:
+                raise TranscriptionError("API error (500): boom")
+            return "ok"
+
+        live = LiveTranscription(_transcriber(transcribe))
+        live.submit(_segment(0, level=0))
+        live.submit(_segment(1, level=1))
+        with pytest.raises(TranscriptionError, match="boom"):
+            live.finish(2)
+
+    def test_missing_segment_fails_finish(self):
+        live = LiveTranscription(_transcriber(lambda a, r, c: "x"))
+        live.submit(_segment(0))
+        with pytest.raises(TranscriptionError, match="missing"):
+            live.finish(2)
+
+    def test_all_silent_is_empty(self):
+        live = LiveTranscription(_transcriber(lambda a, r, c: ""))
+        live.submit(_segment(0))
+        with pytest.raises(EmptyTranscriptionError):
+            live.finish(1)
+
+    def test_no_segments_is_empty(self):
+        live = LiveTranscription(_transcriber(lambda a, r, c: "x"))
+        with pytest.raises(EmptyTranscriptionError):
+            live.finish(0)
+
+    def test_submit_after_cancel_is_ignored(self):
+        transcriber = _transcriber(lambda a, r, c: "x")
+        live = LiveTranscription(transcriber)
+        live.cancel()
+        live.submit(_segment(0))
+        transcriber.transcribe_audio.assert_not_called()
+
+    def test_cancel_aborts_segments_in_flight(self):
+        started = threading.Event()
+
+        def transcribe(audio, rate, cancel):
+            started.set()
+            if cancel.wait(5):
+                raise TranscriptionCancelled("Cancelled")
+            return "late"
+
+        live = LiveTranscription(_transcriber(transcribe))
+        live.submit(_segment(0))
+        assert started.wait(5)
+        live.cancel()
+        with pytest.raises(TranscriptionCancelled):
+            live.finish(1, timeout=1)
@@ -2,12 +2,15 @@
 
 from __future__ import annotations
 
+import threading
+import time
 from unittest.mock import MagicMock, patch
 
 import numpy as np
 import pytest
 
-from src.services.recorder import AudioRecorder
+from src.services.audio_mix import LoopbackMixer
+from src.services.recorder import AudioRecorder, _LoopbackConverter
 
 
 class TestInit:
@@ -47,7 +50,8 @@ class TestRecordingState:
     def test_get_duration_with_frames(self):
         with patch("src.services.recorder.sd"):
             r = AudioRecorder(sample_rate=16000)
-            r.frames = [np.zeros(1600), np.zeros(3200)]
+            r.frames.append(np.zeros((1600, 1), dtype=np.int16))
+            r.frames.append(np.zeros((3200, 1), dtype=np.int16))
             assert r.get_recording_duration() == pytest.approx(0.3)
 
     def test_get_duration_after_frames_cleared(self):
@@ -56,7 +60,6 @@ class TestRecordingState:
         with patch("src.services.recorder.sd"):
             r = AudioRecorder(sample_rate=16000)
             r._last_duration = 2.5
-            r.frames = []
             assert r.get_recording_duration() == pytest.approx(2.5)
 
 
@@ -108,7 +111,7 @@ class TestStuckRecordingThread:
             r.is_recording = True
             r.recording_thread = threading.Thread(target=hang, daemon=True)
             r.recording_thread.start()
-            r.frames = [np.zeros((10, 1), dtype=np.int16)]
+            r.frames.append(np.zeros((10, 1), dtype=np.int16))
 
             with patch.object(r.recording_thread, "join", lambda timeout=None: None):
                 r.stop_recording()
@@ -127,7 +130,7 @@ class TestStuckRecordingThread:
             # Session 1 is running; session 2 has since replaced it.
             r._session_id = 2
             r.is_recording = True
-            r.frames = [np.zeros((5, 1), dtype=np.int16)]
+            r.frames.append(np.zeros((5, 1), dtype=np.int16))
 
             # The old thread (session=1) finally reaches its finally block.
             # Force it down the abort path immediately.
@@ -138,7 +141,7 @@ class TestStuckRecordingThread:
 
             # Session 2's state survives untouched.
             assert r.is_recording is True, "stale thread cleared the live flag"
-            assert len(r.frames) == 1, "stale thread wiped live audio frames"
+            assert len(r.frames) == 5, "stale thread wiped live audio frames"
             assert r._record_error is None, "stale thread leaked its error"
 
     def test_recorder_recovers_after_a_hung_recording(self):
@@ -154,7 +157,7 @@ class TestStuckRecordingThread:
                 target=lambda: release.wait(timeout=10), daemon=True
             )
             r.recording_thread.start()
-            r.frames = [np.zeros((10, 1), dtype=np.int16)]
+            r.frames.append(np.zeros((10, 1), dtype=np.int16))
             with patch.object(r.recording_thread, "join", lambda timeout=None: None):
                 r.stop_recording()
 
@@ -173,3 +176,854 @@ class TestStuckRecordingThread:
                 r._record_audio(session=new_session - 1)
 
             assert r.is_recording is True, "the hung thread killed recording #2"
+
+
+class TestStreamToDisk:
+    """stream_to_disk: blocks go to an open WAV file while recording."""
+
+    def test_stop_finalizes_streamed_file(self):
+        import soundfile as sf
+
+        with patch("src.services.recorder.sd"):
+            r = AudioRecorder(sample_rate=16000, stream_to_disk=True)
+            r.is_recording = True
+            r._open_sink(16000)
+            for _ in range(5):
+                r._sink.write(np.ones((1600, 1), dtype=np.int16))
+            assert r.get_recording_duration() == pytest.approx(0.5)
+
+            path = r.stop_recording()
+            try:
+                assert path is not None
+                assert r._sink is None
+                assert sf.info(path).frames == 8000
+                assert r.get_recording_duration() == pytest.approx(0.5)
+            finally:
+                r.cleanup_temp_file()
+
+    def test_empty_stream_returns_none_and_deletes_file(self):
+        from pathlib import Path
+
+        with patch("src.services.recorder.sd"):
+            r = AudioRecorder(stream_to_disk=True)
+            r.is_recording = True
+            r._open_sink(16000)
+            path = r._sink.path
+            assert r.stop_recording() is None
+            assert not Path(path).exists()
+
+    def test_file_is_written_at_the_target_rate(self):
+        import soundfile as sf
+
+        with patch("src.services.recorder.sd"):
+            r = AudioRecorder(sample_rate=16000, stream_to_disk=True)
+            r.is_recording = True
+            r._open_sink(16000)
+            r._pipeline = r._build_pipeline(48000)
+            for _ in range(10):
+                r._pipeline.push(np.zeros((4800, 1), dtype=np.int16))
+            path = r.stop_recording()
+            try:
+                assert sf.info(path).samplerate == 16000
+                assert sf.info(path).frames == 16000
+                assert r.get_recording_duration() == pytest.approx(1.0)
+            finally:
+                r.cleanup_temp_file()
+
+    def test_system_audio_is_mixed_into_the_streamed_file(self):
+        import soundfile as sf
+
+        with patch("src.services.recorder.sd"):
+            r = AudioRecorder(
+                sample_rate=16000, include_system_audio=True, stream_to_disk=True
+            )
+            r.is_recording = True
+            r._open_sink(16000)
+            r._mixer = LoopbackMixer(16000, latency=0.1)
+            r._pipeline = r._build_pipeline(16000)
+            for _ in range(20):
+                r._pipeline.push(np.full((800, 1), 5, np.int16))
+                r._mixer.push(np.full(800, 300, dtype=np.float32))
+            path = r.stop_recording()
+            try:
+                data, _ = sf.read(path, dtype="int16")
+                assert len(data) == 16000
+                assert data[0] == 5  # before the loopback buffer filled up
+                assert data[-1] == 305
+                assert r._mixer is None
+            finally:
+                r.cleanup_temp_file()
+
+
+class TestJournal:
+    """A journal keeps a crash-safe copy of what is recorded."""
+
+    def _record(self, r, blocks: int) -> str | None:
+        r.is_recording = True
+        r._pipeline = r._build_pipeline(16000)
+        for value in range(blocks):
+            r._pipeline.push(np.full((1600, 1), value, np.int16))
+        return r.stop_recording()
+
+    def test_the_journal_matches_the_recording(self, tmp_path):
+        import soundfile as sf
+
+        from src.services.recording_journal import RECORDED, RecordingJournal
+
+        with patch("src.services.recorder.sd"):
+            r = AudioRecorder(journal=RecordingJournal(tmp_path))
+            path = self._record(r, 5)
+            try:
+                entry = r.get_journal_entry()
+                assert entry.state == RECORDED
+                recorded, _ = sf.read(path, dtype="int16")
+                journaled, _ = sf.read(
+                    entry.export_wav(str(tmp_path / "out.wav")), dtype="int16"
+                )
+                np.testing.assert_array_equal(journaled, recorded)
+            finally:
+                r.cleanup_temp_file()
+
+    def test_a_failed_journal_is_dropped_not_the_recording(self, tmp_path):
+        from src.services.recording_journal import RecordingJournal
+
+        with patch("src.services.recorder.sd"):
+            r = AudioRecorder(journal=RecordingJournal(tmp_path))
+            with patch(
+                "src.services.recording_journal.JournalEntry.append",
+                side_effect=OSError("disk full"),
+            ):
+                path = self._record(r, 3)
+            try:
+                assert path is not None
+                assert r.get_journal_entry() is None
+                assert RecordingJournal(tmp_path).pending() == []
+            finally:
+                r.cleanup_temp_file()
+
+    def test_a_failed_flush_drops_the_journal_and_the_tap(self, tmp_path):
+        from src.services.capture_pipeline import CaptureStage
+        from src.services.recording_journal import RecordingJournal
+
+        class BrokenFlush(CaptureStage):
+            name = "broken"
+
+            def flush(self):
+                raise RuntimeError("flush broke")
+
+        tap = MagicMock()
+        tap.flush.return_value = 3
+        with patch("src.services.recorder.sd"):
+            r = AudioRecorder(journal=RecordingJournal(tmp_path))
+            r.set_capture_tap(lambda rate, channels: tap)
+            r.add_capture_stage(lambda rate, channels: BrokenFlush())
+            path = self._record(r, 3)
+            try:
+                assert path is not None
+                assert r.get_capture_tap_result() is None
+                assert r.get_journal_entry() is None
+                assert RecordingJournal(tmp_path).pending() == []
+            finally:
+                r.cleanup_temp_file()
+
+
+class TestCallbackHandOff:
+    """The stream callbacks only queue blocks; the recording thread does the rest."""
+
+    def _start(self, sd, **kwargs) -> tuple[AudioRecorder, object]:
+        sd.default.device = [0, 0]
+        r = AudioRecorder(sample_rate=16000, **kwargs)
+        assert r.start_recording()
+        deadline = time.monotonic() + 2
+        while not sd.InputStream.called and time.monotonic() < deadline:
+            time.sleep(0.005)
+        return r, sd.InputStream.call_args.kwargs["callback"]
+
+    def test_callback_does_no_processing(self):
+        with patch("src.services.recorder.sd") as sd:
+            levels = []
+            r, callback = self._start(sd)
+            r.set_audio_level_callback(levels.append)
+            deadline = time.monotonic() + 2
+            while r._pipeline is None and time.monotonic() < deadline:
+                time.sleep(0.005)
+            callers = []
+            with patch.object(
+                r._pipeline,
+                "push",
+                side_effect=lambda block: callers.append(threading.current_thread()),
+            ):
+                callback(np.full((1024, 1), 800, np.int16), 1024, None, None)
+                assert threading.current_thread() not in callers
+            r.stop_recording()
+
+    def test_blocks_reach_the_file_and_the_level_meter(self):
+        import soundfile as sf
+
+        with patch("src.services.recorder.sd") as sd:
+            levels = []
+            r, callback = self._start(sd)
+            r.set_audio_level_callback(levels.append)
+            for value in (1, 2, 3):
+                callback(np.full((1024, 1), value * 400, np.int16), 1024, None, None)
+            deadline = time.monotonic() + 2
+            while not levels and time.monotonic() < deadline:
+                time.sleep(0.005)
+            # Queued after the last pass of the loop: drained on the way out.
+            callback(np.full((1024, 1), 1600, np.int16), 1024, None, None)
+            path = r.stop_recording()
+            try:
+                data, _ = sf.read(path, dtype="int16")
+                np.testing.assert_array_equal(
+                    data, np.repeat([400, 800, 1200, 1600], 1024)
+                )
+                assert levels and max(levels) <= 1.0
+            finally:
+                r.cleanup_temp_file()
+
+    def test_stream_flags_are_counted(self):
+        with patch("src.services.recorder.sd") as sd:
+            r, callback = self._start(sd)
+            flags = MagicMock(input_overflow=True, input_underflow=False)
+            block = np.zeros((1024, 1), np.int16)
+            callback(block, 1024, None, flags)
+            callback(block, 1024, None, flags)
+            telemetry = r.get_telemetry()
+            mic = telemetry.streams["mic"]
+            assert mic.input_overflows == 2
+            assert mic.input_underflows == 0
+            assert mic.callbacks == 2
+            assert mic.callback_ms.count == 2
+            assert mic.jitter_ms.count == 1
+            assert not telemetry.clean
+            r.stop_recording()
+            r.cleanup_temp_file()
+
+    def test_a_new_recording_starts_clean(self):
+        with patch("src.services.recorder.sd"):
+            r = AudioRecorder()
+            r.get_telemetry().stream("mic", 16000).input_overflows = 3
+            with patch("threading.Thread"):
+                assert r.start_recording()
+            assert r.get_telemetry().clean
+            assert not r.get_telemetry().streams
+            r.is_recording = False
+
+
+class TestLiveSegments:
+    """Capture taps: a LiveSegmenter hands speech segments over during capture."""
+
+    def _speech(self, seconds: float) -> np.ndarray:
+        rng = np.random.default_rng(1)
+        return (rng.standard_normal((int(seconds * 16000), 1)) * 3000).astype(np.int16)
+
+    def _live_recorder(self, segments: list) -> AudioRecorder:
+        from src.services.segmenter import LiveSegmenter
+
+        def tap(rate, channels):
+            return LiveSegmenter(rate, channels, segments.append)
+
+        r = AudioRecorder(sample_rate=16000)
+        r.set_capture_tap(tap)
+        r.is_recording = True
+        r._pipeline = r._build_pipeline(16000)
+        return r
+
+    def _push(self, r: AudioRecorder, audio: np.ndarray):
+        for start in range(0, len(audio), 1024):
+            r._pipeline.push(audio[start : start + 1024])
+
+    def test_segments_are_emitted_while_recording(self):
+        segments = []
+        with patch("src.services.recorder.sd"):
+            r = self._live_recorder(segments)
+            self._push(
+                r, np.concatenate([self._speech(5), np.zeros((16000, 1), np.int16)])
+            )
+            deadline = time.monotonic() + 2
+            while not segments and time.monotonic() < deadline:
+                time.sleep(0.005)
+            assert len(segments) == 1
+            assert r.get_capture_tap_result() is None  # still recording
+            r.stop_recording()
+            r.cleanup_temp_file()
+
+    def test_stop_flushes_the_tail_and_reports_the_count(self):
+        segments = []
+        with patch("src.services.recorder.sd"):
+            r = self._live_recorder(segments)
+            self._push(
+                r,
+                np.concatenate(
+                    [self._speech(5), np.zeros((16000, 1), np.int16), self._speech(2)]
+                ),
+            )
+            path = r.stop_recording()
+            try:
+                assert path is not None
+                assert len(segments) == 2
+                assert r.get_capture_tap_result() == 2
+                assert r._tap_stage is None
+            finally:
+                r.cleanup_temp_file()
+
+    def test_a_failing_tap_is_dropped(self):
+        tap = MagicMock()
+        tap.feed.side_effect = RuntimeError("boom")
+        with patch("src.services.recorder.sd"):
+            r = AudioRecorder(sample_rate=16000)
+            r.set_capture_tap(lambda rate, channels: tap)
+            r.is_recording = True
+            r._pipeline = r._build_pipeline(16000)
+            r._pipeline.push(np.zeros((1024, 1), np.int16))
+            path = r.stop_recording()
+            try:
+                assert path is not None  # the file is still saved
+                assert r.get_capture_tap_result() is None
+                tap.flush.assert_not_called()
+            finally:
+                r.cleanup_temp_file()
+
+    def test_a_stuck_tap_does_not_hold_up_the_recording(self):
+        release = threading.Event()
+        tap = MagicMock()
+        tap.feed.side_effect = lambda block: release.wait(5)
+        with (
+            patch("src.services.recorder.sd"),
+            patch("src.services.capture_pipeline.QUEUE_TIMEOUT_S", 0.05),
+            patch("src.services.capture_pipeline.QUEUE_BLOCKS", 2),
+        ):
+            r = AudioRecorder(sample_rate=16000)
+            r.set_capture_tap(lambda rate, channels: tap)
+            r.is_recording = True
+            r._pipeline = r._build_pipeline(16000)
+            for _ in range(10):
+                r._pipeline.push(np.ones((1024, 1), np.int16))
+            assert r._pipeline.stage("tap") is None
+            assert len(r.frames) == 10 * 1024
+            release.set()
+            path = r.stop_recording()
+            try:
+                assert path is not None
+                assert r.get_capture_tap_result() is None
+            finally:
+                r.cleanup_temp_file()
+
+    def test_added_stages_see_the_recorded_audio(self):
+        from src.services.capture_pipeline import FeedStage
+
+        seen = []
+
+        def factory(rate, channels):
+            assert (rate, channels) == (16000, 1)
+            return FeedStage("mine", seen.append)
+
+        with patch("src.services.recorder.sd"):
+            r = AudioRecorder(sample_rate=16000)
+            r.add_capture_stage(factory)
+            r.is_recording = True
+            r._pipeline = r._build_pipeline(48000)
+            r._pipeline.push(np.ones((4800, 1), np.int16))
+            r.stop_recording()
+            r.cleanup_temp_file()
+            assert sum(len(b) for b in seen) == 1600  # resampled to 16 kHz
+            r.remove_capture_stage(factory)
+            assert r._build_pipeline(16000).stage("mine") is None
+
+    def test_new_recording_resets_the_count(self):
+        with patch("src.services.recorder.sd"):
+            r = AudioRecorder()
+            r._tap_result = 3
+            r.recording_thread = None
+            with patch("threading.Thread"):
+                assert r.start_recording()
+            assert r.get_capture_tap_result() is None
+            r.is_recording = False
+
+
+class TestWarmMic:
+    """audio.warm_mic: one stream stays open and recordings attach to it."""
+
+    def _warm_recorder(self, sd, **kwargs) -> AudioRecorder:
+        sd.default.device = [0, 0]
+        return AudioRecorder(sample_rate=16000, warm_mic=True, **kwargs)
+
+    def _feed(self, sd, value: int, blocks: int, size: int = 1024):
+        callback = sd.InputStream.call_args.kwargs["callback"]
+        for _ in range(blocks):
+            callback(np.full((size, 1), value, np.int16), size, None, None)
+
+    def test_ring_keeps_the_latest_audio(self):
+        with patch("src.services.recorder.sd") as sd:
+            r = self._warm_recorder(sd, preroll_ms=100)
+            for value in range(1, 6):
+                self._feed(sd, value, 1, size=500)
+            preroll = r._warm._preroll()
+            assert len(preroll) == 1600
+            expected = np.repeat([2, 3, 4, 5], 500)[-1600:]
+            np.testing.assert_array_equal(preroll[:, 0], expected)
+            r.close()
+
+    def test_recording_starts_with_the_preroll(self):
+        import soundfile as sf
+
+        with patch("src.services.recorder.sd") as sd:
+            r = self._warm_recorder(sd, preroll_ms=100)
+            self._feed(sd, 1, 3)
+            assert r.start_recording()
+            deadline = time.monotonic() + 2
+            while r._warm._consumer is None and time.monotonic() < deadline:
+                time.sleep(0.005)
+            self._feed(sd, 2, 2)
+            assert r.get_start_latency() is not None
+            path = r.stop_recording()
+            try:
+                data, _ = sf.read(path, dtype="int16")
+                np.testing.assert_array_equal(
+                    data, np.concatenate([np.full(1600, 1), np.full(2048, 2)])
+                )
+                # The warm stream served the recording and is still open.
+                assert sd.InputStream.call_count == 1
+                assert r._warm._consumer is None
+                assert r._warm._ring_filled == 0
+            finally:
+                r.cleanup_temp_file()
+                r.close()
+
+    def test_idle_audio_is_not_recorded_after_detach(self):
+        with patch("src.services.recorder.sd") as sd:
+            r = self._warm_recorder(sd)
+            seen = []
+            r._warm.attach(lambda block, *a: seen.append(block.copy()))
+            r._warm.detach()
+            self._feed(sd, 3, 1)
+            assert seen == []
+            r.close()
+
+    def test_changed_device_records_cold(self):
+        with patch("src.services.recorder.sd") as sd:
+            r = self._warm_recorder(sd)
+            r.input_device = 4  # as if changed mid-recording
+            assert r._usable_warm_mic() is None
+            r.close()
+            assert r._warm is None
+            sd.InputStream.return_value.close.assert_called()
+
+    def test_open_failure_falls_back_to_cold_starts(self):
+        with patch("src.services.recorder.sd") as sd:
+            sd.InputStream.side_effect = RuntimeError("device busy")
+            r = self._warm_recorder(sd)
+            assert r._warm is None
+            assert r._usable_warm_mic() is None
+
+
+class TestLoopbackConverter:
+    def test_downmixes_to_mono_int16(self):
+        data = np.array([[0.5, 0.0], [-1.0, -1.0], [1.0, 0.5]], np.float32)
+        out = _LoopbackConverter(4).convert(data)
+        assert out.shape == (3, 1) and out.dtype == np.int16
+        np.testing.assert_array_equal(out[:, 0], [8191, -32767, 24575])
+
+    def test_mono_input_and_clipping(self):
+        out = _LoopbackConverter(4).convert(np.array([[0.5], [2.0]], np.float32))
+        np.testing.assert_array_equal(out[:, 0], [16383, 32767])
+
+    def test_reuses_its_buffer(self):
+        converter = _LoopbackConverter(4)
+        first = converter.convert(np.zeros((4, 2), np.float32))
+        second = converter.convert(np.ones((4, 2), np.float32))
+        assert np.shares_memory(first, second)
+
+    def test_grows_for_a_larger_block(self):
+        converter = _LoopbackConverter(2)
+        out = converter.convert(np.full((5, 2), 0.5, np.float32))
+        np.testing.assert_array_equal(out[:, 0], [16383] * 5)
+
+
+class TestCaptureHub:
+    """One stream per device, shared by every subscriber."""
+
+    def _block(self, value: int) -> np.ndarray:
+        return np.full((1024, 1), value, np.int16)
+
+    def test_subscribers_share_one_stream(self):
+        from src.services.recorder import CaptureHub
+
+        with patch("src.services.recorder.sd") as sd:
+            hub = CaptureHub()
+            a, b = [], []
+            first = hub.subscribe(None, 1, lambda d, *_: a.append(d[0, 0]), 16000)
+            second = hub.subscribe(None, 1, lambda d, *_: b.append(d[0, 0]), 16000)
+            assert sd.InputStream.call_count == 1
+            callback = sd.InputStream.call_args.kwargs["callback"]
+            callback(self._block(7), 1024, None, None)
+            assert a == b == [7]
+            first.close()
+            sd.InputStream.return_value.close.assert_not_called()
+            callback(self._block(8), 1024, None, None)
+            assert a == [7] and b == [7, 8]
+            second.close()
+            sd.InputStream.return_value.close.assert_called_once()
+
+    def test_the_next_subscriber_reopens_a_closed_device(self):
+        from src.services.recorder import CaptureHub
+
+        with patch("src.services.recorder.sd") as sd:
+            hub = CaptureHub()
+            hub.subscribe(None, 1, lambda *_: None, 16000).close()
+            with hub.subscribe(None, 1, lambda *_: None, 16000):
+                assert sd.InputStream.call_count == 2
+
+    def test_a_dead_stream_is_replaced(self):
+        from src.services.recorder import CaptureHub
+
+        with patch("src.services.recorder.sd") as sd:
+            hub = CaptureHub()
+            old = hub.subscribe(None, 1, lambda *_: None, 16000)
+            sd.InputStream.return_value.active = False
+            assert not old.active
+            sd.InputStream.return_value = MagicMock(active=True)
+            new = hub.subscribe(None, 1, lambda *_: None, 16000)
+            assert new.active
+            assert sd.InputStream.call_count == 2
+            old.close()
+            assert new.active  # closing the dead one leaves the new one open
+            new.close()
+
+    def test_a_device_open_at_another_rate_is_refused(self):
+        from src.services.recorder import CaptureHub
+
+        with patch("src.services.recorder.sd"):
+            hub = CaptureHub()
+            with hub.subscribe(None, 1, lambda *_: None, 48000):
+                assert hub.samplerate(None, 1, 16000) == 48000
+                with pytest.raises(RuntimeError):
+                    hub.subscribe(None, 1, lambda *_: None, 16000)
+
+    def test_a_failing_subscriber_does_not_starve_the_others(self, caplog):
+        from src.services.recorder import CaptureHub
+
+        def broken(*_):
+            raise RuntimeError("boom")
+
+        with patch("src.services.recorder.sd") as sd:
+            hub = CaptureHub()
+            seen = []
+            hub.subscribe(None, 1, broken, 16000)
+            hub.subscribe(None, 1, lambda d, *_: seen.append(d), 16000)
+            callback = sd.InputStream.call_args.kwargs["callback"]
+            with caplog.at_level("DEBUG", logger="src.services.recorder"):
+                callback(self._block(1), 1024, None, None)
+                callback(self._block(1), 1024, None, None)
+            assert len(seen) == 2
+            warnings = [r for r in caplog.records if r.levelname == "WARNING"]
+            assert len(warnings) == 1 and "boom" in warnings[0].getMessage()
+
+    def test_the_monitor_meters_off_the_stream_callback(self):
+        from src.services.recorder import AudioMonitor
+
+        with patch("src.services.recorder.sd") as sd:
+            sd.default.device = [0, 0]
+            threads = []
+            monitor = AudioMonitor(sample_rate=16000)
+            monitor.set_level_callback(
+                lambda level: threads.append(threading.current_thread())
+            )
+            assert monitor.start()
+            try:
+                callback = sd.InputStream.call_args.kwargs["callback"]
+                callback(self._block(400), 1024, None, None)
+                assert threads == []
+                deadline = time.monotonic() + 2
+                while not threads and time.monotonic() < deadline:
+                    time.sleep(0.005)
+                assert threads and threads[0] is not threading.current_thread()
+            finally:
+                monitor.stop()
+
+    def test_monitor_and_recording_share_the_mic(self):
+        import soundfile as sf
+
+        from src.services.recorder import AudioMonitor
+
+        with patch("src.services.recorder.sd") as sd:
+            sd.default.device = [0, 0]
+            levels = []
+            monitor = AudioMonitor(sample_rate=16000)
+            monitor.set_level_callback(levels.append)
+            assert monitor.start()
+            r = AudioRecorder(sample_rate=16000)
+            assert r.start_recording()
+            shared = r._hub._streams[(None, 1)]
+            deadline = time.monotonic() + 2
+            while len(shared.subscribers) < 2 and time.monotonic() < deadline:
+                time.sleep(0.005)
+            callback = sd.InputStream.call_args.kwargs["callback"]
+            callback(self._block(400), 1024, None, None)
+            path = r.stop_recording()
+            try:
+                assert sd.InputStream.call_count == 1
+                assert sf.info(path).frames == 1024
+                # Metered on the monitor's own thread, not in the callback.
+                deadline = time.monotonic() + 2
+                while not levels and time.monotonic() < deadline:
+                    time.sleep(0.005)
+                assert levels == [1.0]
+                # The monitor still holds the stream.
+                sd.InputStream.return_value.close.assert_not_called()
+                monitor.stop()
+                sd.InputStream.return_value.close.assert_called_once()
+            finally:
+                r.cleanup_temp_file()
+
+
+class TestDeviceRegistry:
+    """Device list and accepted rates, cached and refreshed on hotplug."""
+
+    def _device(self, name: str, rate: int = 44100) -> dict:
+        return {
+            "name": name,
+            "hostapi": 0,
+            "max_input_channels": 1,
+            "default_samplerate": rate,
+        }
+
+    def test_device_list_is_cached(self):
+        from src.services.recorder import DeviceRegistry
+
+        with patch("src.services.recorder.sd") as sd:
+            sd.query_devices.return_value = [self._device("mic")]
+            registry = DeviceRegistry()
+            assert registry.devices()[0]["name"] == "mic"
+            assert registry.device(0)["name"] == "mic"
+            assert sd.query_devices.call_count == 1
+            with pytest.raises(ValueError):
+                registry.device(5)
+
+    def test_negotiated_rates_are_cached_per_device(self):
+        from src.services.recorder import DeviceRegistry
+
+        with patch("src.services.recorder.sd") as sd:
+            sd.check_input_settings.side_effect = ValueError("rate")
+            sd.query_devices.return_value = [self._device(str(i)) for i in range(5)]
+            registry = DeviceRegistry()
+            assert registry.input_samplerate(3, 1, 16000) == 44100
+            assert registry.input_samplerate(3, 1, 16000) == 44100
+            assert sd.check_input_settings.call_count == 1
+            registry.input_samplerate(4, 1, 16000)
+            assert sd.check_input_settings.call_count == 2
+            registry.invalidate(3)
+            registry.input_samplerate(3, 1, 16000)
+            assert sd.check_input_settings.call_count == 3
+
+    def test_refresh_reports_a_changed_device_list(self):
+        from src.services.recorder import DeviceRegistry
+
+        with patch("src.services.recorder.sd") as sd:
+            sd.query_devices.return_value = [self._device("mic")]
+            registry = DeviceRegistry()
+            changes = []
+            registry.add_listener(lambda: changes.append(True))
+            registry.input_samplerate(None, 1, 16000)
+            assert not registry.refresh(force=True)
+            assert changes == []
+            sd.query_devices.return_value = [
+                self._device("mic"),
+                self._device("headset"),
+            ]
+            assert registry.refresh(force=True)
+            assert changes == [True]
+            assert len(registry.devices()) == 2
+            registry.input_samplerate(None, 1, 16000)
+            assert sd.check_input_settings.call_count == 2  # rates dropped
+
+    def test_portaudio_is_only_reinitialized_when_the_os_list_changes(self):
+        from src.services.recorder import DeviceRegistry
+
+        with (
+            patch("src.services.recorder.sd") as sd,
+            patch.object(DeviceRegistry, "_os_devices", return_value=("mic",)),
+        ):
+            registry = DeviceRegistry()
+            registry.refresh()  # first look
+            sd._terminate.reset_mock()
+            sd._initialize.reset_mock()
+            assert not registry.refresh()
+            sd._terminate.assert_not_called()
+            DeviceRegistry._os_devices.return_value = ("headset", "mic")
+            registry.refresh()
+            sd._terminate.assert_called_once()
+            sd._initialize.assert_called_once()
+
+    def test_no_os_list_means_no_reinitialization_unless_asked(self):
+        from src.services.recorder import DeviceRegistry
+
+        with (
+            patch("src.services.recorder.sd") as sd,
+            patch.object(DeviceRegistry, "_os_devices", return_value=None),
+        ):
+            registry = DeviceRegistry()
+            registry.refresh()
+            sd._terminate.assert_not_called()
+            registry.refresh(force=True)
+            sd._terminate.assert_called_once()
+
+    def test_a_stream_in_use_holds_off_the_reinitialization(self):
+        from src.services.recorder import CaptureHub
+
+        with patch("src.services.recorder.sd") as sd:
+            hub = CaptureHub()
+            with hub.subscribe(None, 1, lambda *_: None, 16000):
+                hub.devices.refresh(force=True)
+                sd._terminate.assert_not_called()
+            hub.devices.refresh(force=True)
+            sd._terminate.assert_called_once()
+            sd._initialize.assert_called_once()
+
+    def test_standby_streams_are_closed_and_their_owners_told(self):
+        from src.services.recorder import CaptureHub
+
+        with patch("src.services.recorder.sd") as sd:
+            hub = CaptureHub()
+            notified = []
+            hub.devices.add_listener(lambda: notified.append(True))
+            in_use = [True]
+            warm = hub.subscribe(
+                None, 1, lambda *_: None, 16000, standby=lambda: not in_use[0]
+            )
+            hub.devices.refresh(force=True)
+            sd._terminate.assert_not_called()
+            assert warm.active
+            in_use[0] = False
+            hub.devices.refresh(force=True)
+            sd._terminate.assert_called_once()
+            sd.InputStream.return_value.close.assert_called_once()
+            assert not warm.active
+            assert notified == [True]
+            warm.close()
+            sd.InputStream.return_value.close.assert_called_once()
+            # A newcomer opens a fresh stream.
+            hub.subscribe(None, 1, lambda *_: None, 16000).close()
+            assert sd.InputStream.call_count == 2
+
+    def test_the_hotkey_path_does_not_wait_for_a_reinitialization(self):
+        from src.services.recorder import CaptureHub
+
+        with patch("src.services.recorder.sd") as sd:
+            sd.query_devices.return_value = [self._device("mic")]
+            hub = CaptureHub()
+            assert hub.samplerate(None, 1, 16000) == 16000
+            hub.devices.devices()
+            restarting, release = threading.Event(), threading.Event()
+
+            def slow_terminate():
+                restarting.set()
+                release.wait(5)
+
+            sd._terminate.side_effect = slow_terminate
+            refresh = threading.Thread(
+                target=hub.devices.refresh, kwargs={"force": True}
+            )
+            refresh.start()
+            try:
+                assert restarting.wait(5)
+                # Cached lookups answer at once...
+                started = time.monotonic()
+                assert hub.samplerate(None, 1, 16000) == 16000
+                assert hub.devices.devices()[0]["name"] == "mic"
+                assert time.monotonic() - started < 0.5
+                # ...while opening a stream waits for PortAudio to be back.
+                opened = threading.Event()
+                threading.Thread(
+                    target=lambda: (
+                        hub.subscribe(None, 1, lambda *_: None, 16000),
+                        opened.set(),
+                    ),
+                    daemon=True,
+                ).start()
+                assert not opened.wait(0.2)
+                sd.InputStream.assert_not_called()
+            finally:
+                release.set()
+                refresh.join(5)
+            assert opened.wait(5)
+            sd.InputStream.assert_called_once()
+
+    def test_a_failed_open_forgets_the_devices_rate_and_rescans(self):
+        from src.services.recorder import CaptureHub
+
+        with patch("src.services.recorder.sd") as sd:
+            hub = CaptureHub()
+            assert hub.samplerate(2, 1, 16000) == 16000
+            sd.InputStream.side_effect = RuntimeError("unplugged")
+            with (
+                patch.object(hub.devices, "request_refresh") as rescan,
+                pytest.raises(RuntimeError),
+            ):
+                hub.subscribe(2, 1, lambda *_: None, 16000)
+            rescan.assert_called_once_with()
+            hub.samplerate(2, 1, 16000)
+            assert sd.check_input_settings.call_count == 2
+
+    def test_recording_start_uses_the_prefetched_rate(self):
+        with patch("src.services.recorder.sd") as sd:
+            sd.default.device = [0, 0]
+            r = AudioRecorder(sample_rate=16000, watch_devices=True)
+            deadline = time.monotonic() + 2
+            while not sd.check_input_settings.called and time.monotonic() < deadline:
+                time.sleep(0.005)
+            assert r.start_recording()
+            deadline = time.monotonic() + 2
+            while not sd.InputStream.called and time.monotonic() < deadline:
+                time.sleep(0.005)
+            r.stop_recording()
+            assert sd.check_input_settings.call_count == 1
+            r.close()
+            assert r._hub.devices._watch_stop is None
+
+
+class TestAutoStop:
+    """set_auto_stop: the recording thread reports the end of speech once."""
+
+    def test_speech_end_is_reported_while_recording(self):
+        import threading
+
+        rng = np.random.default_rng(0)
+        speech = (rng.standard_normal((16000, 1)) * 3000).astype(np.int16)
+        silence = np.zeros((16000, 1), np.int16)
+        ended = threading.Event()
+        calls = []
+
+        def on_speech_end():
+            calls.append(True)
+            ended.set()
+
+        with patch("src.services.recorder.sd") as sd:
+            sd.default.device = [0, 0]
+            r = AudioRecorder(sample_rate=16000)
+            r.set_auto_stop(on_speech_end, trailing_silence_s=0.5, min_speech_s=0.5)
+            assert r.start_recording()
+            deadline = time.monotonic() + 2
+            while not sd.InputStream.called and time.monotonic() < deadline:
+                time.sleep(0.005)
+            callback = sd.InputStream.call_args.kwargs["callback"]
+            audio = np.concatenate([speech, silence, silence])
+            for start in range(0, len(audio), 1024):
+                block = audio[start : start + 1024]
+                callback(block, len(block), None, None)
+                time.sleep(0.002)  # faster than real time, within the ring
+            assert ended.wait(2)
+            time.sleep(0.3)  # a few more loop turns: still reported once
+            assert calls == [True]
+            assert r.is_recording  # stopping is the callback owner's job
+            r.stop_recording()
+            r.cleanup_temp_file()
+
+    def test_disabled_runs_no_detector(self):
+        with patch("src.services.recorder.sd") as sd:
+            sd.default.device = [0, 0]
+            r = AudioRecorder(sample_rate=16000)
+            assert r.start_recording()
+            time.sleep(0.05)
+            assert r._endpoint is None
+            r.stop_recording()
@@ -0,0 +1,165 @@
+"""Unit tests for the crash-safe recording journal."""
+
+from __future__ import annotations
+
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+import numpy as np
+import soundfile as sf
+
+from src.services import recording_journal
+from src.services.recording_journal import (
+    FAILED,
+    RECORDED,
+    RECORDING,
+    JournalStage,
+    RecordingJournal,
+)
+
+ROOT = Path(__file__).resolve().parents[2]
+
+
+def _block(value: int, frames: int = 1600) -> np.ndarray:
+    return np.full((frames, 1), value, np.int16)
+
+
+class TestJournalEntry:
+    def test_round_trip(self, tmp_path):
+        entry = RecordingJournal(tmp_path).begin(16000, 1)
+        entry.append(_block(1))
+        entry.append(_block(2))
+        assert entry.finish() == 3200
+        assert entry.state == RECORDED
+        data, rate = sf.read(entry.export_wav(str(tmp_path / "out.wav")), dtype="int16")
+        assert rate == 16000
+        np.testing.assert_array_equal(data, np.repeat([1, 2], 1600))
+
+    def test_rolls_over_to_a_new_chunk(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(recording_journal, "CHUNK_S", 0.1)
+        entry = RecordingJournal(tmp_path).begin(16000, 1)
+        for value in range(5):
+            entry.append(_block(value))
+        entry.finish()
+        assert len(list(entry.path.glob("*.pcm"))) == 5
+        data, _ = sf.read(entry.export_wav(str(tmp_path / "out.wav")), dtype="int16")
+        np.testing.assert_array_equal(data, np.repeat(range(5), 1600))
+
+    def test_a_torn_last_frame_is_ignored(self, tmp_path):
+        entry = RecordingJournal(tmp_path).begin(16000, 2)
+        entry.append(np.ones((10, 2), np.int16))
+        entry.close()
+        with open(entry.path / "000000.pcm", "ab") as f:
+            f.write(b"\x01\x00")  # half a stereo frame
+        assert entry.frames == 10
+        data, _ = sf.read(entry.export_wav(str(tmp_path / "out.wav")), dtype="int16")
+        assert data.shape == (10, 2)
+
+    def test_state_survives_a_reload(self, tmp_path):
+        journal = RecordingJournal(tmp_path)
+        entry = journal.begin(16000, 1)
+        entry.append(_block(3))
+        entry.finish()
+        entry.mark_failed("upload timed out")
+        (reloaded,) = journal.pending()
+        assert reloaded.state == FAILED
+        assert reloaded.error == "upload timed out"
+        assert reloaded.frames == 1600
+
+    def test_discard_deletes_the_entry(self, tmp_path):
+        journal = RecordingJournal(tmp_path)
+        entry = journal.begin(16000, 1)
+        entry.append(_block(1))
+        entry.discard()
+        assert not entry.path.exists()
+        assert journal.pending() == []
+
+
+class TestRecordingJournal:
+    def test_pending_is_oldest_first(self, tmp_path):
+        journal = RecordingJournal(tmp_path)
+        first = journal.begin(16000, 1)
+        second = journal.begin(16000, 1)
+        assert [e.id for e in journal.pending()] == [first.id, second.id]
+
+    def test_unreadable_entries_are_skipped(self, tmp_path):
+        journal = RecordingJournal(tmp_path)
+        journal.begin(16000, 1)
+        broken = tmp_path / "broken"
+        broken.mkdir()
+        (broken / "index.json").write_text("{not json")
+        assert len(journal.pending()) == 1
+
+    def test_no_directory_no_entries(self, tmp_path):
+        assert RecordingJournal(tmp_path / "missing").pending() == []
+
+
+class TestJournalStage:
+    def test_flush_finishes_close_does_not(self, tmp_path):
+        journal = RecordingJournal(tmp_path)
+        finished = JournalStage(journal.begin(16000, 1))
+        finished.process(_block(1))
+        finished.flush()
+        abandoned = JournalStage(journal.begin(16000, 1))
+        abandoned.process(_block(1))
+        abandoned.close()
+        states = {e.id: e.state for e in journal.pending()}
+        assert states[finished.entry.id] == RECORDED
+        assert states[abandoned.entry.id] == RECORDING
+
+
+# Records through a real AudioRecorder with the sounddevice module replaced,
+# feeds known blocks, and waits until the journal has them before reporting.
+_CHILD = textwrap.dedent(
+    """
+    import sys, time
+    from unittest.mock import MagicMock
+
+    import numpy as np
+
+    sd = MagicMock()
+    sd.default.device = [0, 0]
+    sys.modules["sounddevice"] = sd
+
+    from src.services.recorder import AudioRecorder
+    from src.services.recording_journal import RecordingJournal
+
+    recorder = AudioRecorder(journal=RecordingJournal(sys.argv[1]))
+    recorder.start_recording()
+    deadline = time.monotonic() + 10
+    while not sd.InputStream.called and time.monotonic() < deadline:
+        time.sleep(0.01)
+    callback = sd.InputStream.call_args.kwargs["callback"]
+    for value in range(1, 21):
+        callback(np.full((1600, 1), value, np.int16), 1600, None, None)
+        time.sleep(0.01)
+    while recorder._journal_entry.frames < 32000 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    print("captured", flush=True)
+    time.sleep(60)
+    """
+)
+
+
+def test_a_killed_recorder_leaves_recoverable_audio(tmp_path):
+    journal_dir = tmp_path / "journal"
+    child = subprocess.Popen(
+        [sys.executable, "-c", _CHILD, str(journal_dir)],
+        cwd=ROOT,
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    try:
+        assert child.stdout is not None
+        assert child.stdout.readline().strip() == "captured"
+    finally:
+        child.kill()
+        child.wait(timeout=10)
+
+    (entry,) = RecordingJournal(journal_dir).pending()
+    assert entry.state == RECORDING
+    data, rate = sf.read(entry.export_wav(str(tmp_path / "out.wav")), dtype="int16")
+    assert rate == 16000
+    np.testing.assert_array_equal(data, np.repeat(np.arange(1, 21), 1600))
@@ -0,0 +1,101 @@
+"""Unit tests for the streaming polyphase resampler."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from src.services.resampler import StreamingResampler
+
+
+def _tone(freq: float, rate: int, seconds: float = 1.0, amp: float = 10000.0):
+    t = np.arange(int(rate * seconds)) / rate
+    return (np.sin(2 * np.pi * freq * t) * amp).astype(np.float32).reshape(-1, 1)
+
+
+def _run(resampler: StreamingResampler, audio: np.ndarray, block: int = 1024):
+    out = [resampler.process(audio[i : i + block]) for i in range(0, len(audio), block)]
+    return np.concatenate(out + [resampler.flush()])
+
+
+def _level_db(audio: np.ndarray, reference: float) -> float:
+    # Skip the edges, where the filter sees the zeros around the signal.
+    body = audio[200:-200].astype(np.float64)
+    rms = np.sqrt(np.mean(body**2))
+    return 20 * np.log10(max(rms, 1e-9) / (reference / np.sqrt(2)))
+
+
+class TestLength:
+    @pytest.mark.parametrize("rate", [48000, 44100, 22050, 8000])
+    def test_output_length_matches_the_rate_ratio(self, rate):
+        audio = np.zeros((rate + 123, 1), dtype=np.int16)
+        out = _run(StreamingResampler(rate, 16000), audio)
+        assert len(out) == -(-len(audio) * 16000 // rate)
+
+    def test_block_size_does_not_change_the_output(self):
+        audio = _tone(440, 44100).astype(np.int16)
+        whole = _run(StreamingResampler(44100, 16000), audio, block=len(audio))
+        blocks = _run(StreamingResampler(44100, 16000), audio, block=333)
+        np.testing.assert_array_equal(whole, blocks)
+
+    def test_flush_resets_for_the_next_stream(self):
+        r = StreamingResampler(48000, 16000)
+        audio = _tone(440, 48000).astype(np.int16)
+        first = _run(r, audio)
+        second = _run(r, audio)
+        np.testing.assert_array_equal(first, second)
+
+    def test_equal_rates_pass_through(self):
+        audio = np.arange(100, dtype=np.int16).reshape(-1, 1)
+        np.testing.assert_array_equal(
+            _run(StreamingResampler(16000, 16000), audio), audio
+        )
+
+
+class TestQuality:
+    @pytest.mark.parametrize("rate", [48000, 44100])
+    def test_passband_tone_is_kept(self, rate):
+        out = _run(StreamingResampler(rate, 16000, dtype=np.float32), _tone(1000, rate))
+        assert _level_db(out, 10000) == pytest.approx(0.0, abs=0.1)
+
+    def test_output_is_time_aligned(self):
+        out = _run(
+            StreamingResampler(44100, 16000, dtype=np.float32), _tone(440, 44100)
+        )
+        ideal = _tone(440, 16000, seconds=len(out) / 16000)[: len(out)]
+        assert np.max(np.abs(out[200:-200] - ideal[200:-200])) < 5
+
+    @pytest.mark.parametrize("freq", [9000, 12000, 20000])
+    def test_tones_above_the_output_nyquist_are_attenuated(self, freq):
+        # Linear interpolation folds these back into the speech band almost
+        # undamped; the filter has to keep them below -70 dB.
+        out = _run(
+            StreamingResampler(48000, 16000, dtype=np.float32), _tone(freq, 48000)
+        )
+        assert _level_db(out, 10000) < -70
+
+    def test_int16_output_is_clipped(self):
+        audio = np.full((4800, 1), 32767, dtype=np.int16)
+        audio[::2] = -32768  # full-scale Nyquist square wave rings past full scale
+        loud = np.full((4800, 1), 32767, dtype=np.int16)
+        out = _run(StreamingResampler(48000, 16000), np.concatenate([audio, loud]))
+        assert out.dtype == np.int16
+        assert out.max() <= 32767 and out.min() >= -32768
+
+    def test_stereo_channels_are_independent(self):
+        left = _tone(1000, 48000)
+        stereo = np.concatenate([left, np.zeros_like(left)], axis=1)
+        out = _run(
+            StreamingResampler(48000, 16000, channels=2, dtype=np.float32), stereo
+        )
+        assert out.shape[1] == 2
+        assert _level_db(out[:, :1], 10000) == pytest.approx(0.0, abs=0.1)
+        assert not np.any(out[:, 1])
+
+
+class TestOneDimensional:
+    def test_mono_vectors_come_back_one_dimensional(self):
+        r = StreamingResampler(48000, 16000)
+        out = r.process(np.zeros(4800, dtype=np.int16))
+        assert out.ndim == 1
+        assert r.flush().ndim == 1
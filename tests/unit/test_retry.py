@@ -0,0 +1,74 @@
+"""Unit tests for retry backoff, Retry-After parsing and the retry budget."""
+
+from __future__ import annotations
+
+import email.utils
+import time
+
+import pytest
+
+from src.services.retry import RetryBudget, backoff_delay, parse_retry_after
+
+
+class TestParseRetryAfter:
+    def test_seconds(self):
+        assert parse_retry_after("120") == 120.0
+        assert parse_retry_after(" 5 ") == 5.0
+
+    def test_http_date(self):
+        value = email.utils.formatdate(time.time() + 60, usegmt=True)
+        assert parse_retry_after(value) == pytest.approx(60, abs=2)
+
+    def test_a_date_in_the_past_means_now(self):
+        value = email.utils.formatdate(time.time() - 60, usegmt=True)
+        assert parse_retry_after(value) == 0.0
+
+    @pytest.mark.parametrize("value", [None, "", "soon", "-3"])
+    def test_anything_else_is_ignored(self, value):
+        assert parse_retry_after(value) is None
+
+
+class TestBackoffDelay:
+    def test_full_jitter_stays_in_the_window(self):
+        for attempt in range(6):
+            delays = [backoff_delay(attempt, 2.0, 10.0) for _ in range(200)]
+            assert 0 <= min(delays) and max(delays) <= min(10.0, 2.0 * 2**attempt)
+
+    def test_delays_are_spread_out(self):
+        delays = [backoff_delay(1, 2.0, 10.0) for _ in range(200)]
+        assert max(delays) - min(delays) > 2.0
+
+    def test_retry_after_is_honoured_with_a_little_jitter(self):
+        delays = [backoff_delay(0, 2.0, 10.0, retry_after=30.0) for _ in range(50)]
+        assert all(30.0 <= d <= 32.0 for d in delays)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestRetryBudget:
+    def test_allows_a_burst_then_refuses(self):
+        budget = RetryBudget(capacity=3, refill_per_s=0.1, clock=Clock())
+        assert [budget.try_acquire() for _ in range(4)] == [True, True, True, False]
+        assert budget.as_dict() == {"tokens": 0.0, "spent": 3, "denied": 1}
+
+    def test_tokens_come_back_over_time(self):
+        clock = Clock()
+        budget = RetryBudget(capacity=2, refill_per_s=0.5, clock=clock)
+        budget.try_acquire()
+        budget.try_acquire()
+        assert not budget.try_acquire()
+        clock.now = 2.0
+        assert budget.try_acquire()
+        assert not budget.try_acquire()
+
+    def test_never_holds_more_than_its_capacity(self):
+        clock = Clock()
+        budget = RetryBudget(capacity=2, refill_per_s=1.0, clock=clock)
+        clock.now = 100.0
+        assert budget.as_dict()["tokens"] == 2.0
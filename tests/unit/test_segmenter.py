@@ -0,0 +1,145 @@
+"""Unit tests for splitting long recordings at pauses."""
+
+from __future__ import annotations
+
+import numpy as np
+import soundfile as sf
+
+from src.services.segmenter import (
+    LiveSegmenter,
+    find_split_points,
+    frame_rms,
+    plan_file_segments,
+    plan_segments,
+    split_ranges,
+)
+
+RATE = 16000
+
+
+def _speech_with_pauses(seconds: float, pauses_at: list[float], pause_s=0.6):
+    rng = np.random.default_rng(7)
+    audio = (rng.standard_normal(int(seconds * RATE)) * 3000).astype(np.int16)
+    for at in pauses_at:
+        a = int(at * RATE)
+        audio[a : a + int(pause_s * RATE)] = 0
+    return audio
+
+
+class TestFrameRms:
+    def test_constant_signal(self):
+        audio = np.full(1000, 100, dtype=np.int16)
+        np.testing.assert_allclose(frame_rms(audio, 100), 100.0)
+
+    def test_partial_last_frame_is_measured(self):
+        assert len(frame_rms(np.ones(250, dtype=np.int16), 100)) == 3
+
+    def test_stereo_is_downmixed(self):
+        audio = np.zeros((200, 2), dtype=np.int16)
+        audio[:, 0] = 200
+        np.testing.assert_allclose(frame_rms(audio, 100), 100.0)
+
+
+class TestSplitPoints:
+    def test_short_audio_is_not_split(self):
+        assert plan_segments(np.zeros(RATE, dtype=np.int16), RATE, 5) == [(0, RATE)]
+
+    def test_cuts_land_in_the_pauses(self):
+        audio = _speech_with_pauses(25, pauses_at=[8.5, 17.0])
+        ranges = plan_segments(audio, RATE, max_segment_s=10)
+        assert len(ranges) == 3
+        for _, end in ranges[:-1]:
+            # The cut sample is silent, and so is its neighbourhood.
+            assert np.all(audio[end - 800 : end + 800] == 0)
+
+    def test_segments_never_exceed_the_limit(self):
+        # No pauses at all: cuts still happen, at the limit or before it.
+        audio = _speech_with_pauses(95, pauses_at=[])
+        ranges = plan_segments(audio, RATE, max_segment_s=10)
+        assert all(b - a <= 10 * RATE for a, b in ranges)
+        assert ranges[0][0] == 0 and ranges[-1][1] == len(audio)
+        assert all(a == prev_b for (_, prev_b), (a, _) in zip(ranges, ranges[1:]))
+
+    def test_find_split_points_picks_minimum_energy_frame(self):
+        energy = np.ones(100, dtype=np.float32)
+        energy[85] = 0.0
+        points = find_split_points(energy, 10, 1000, 900, search_samples=200)
+        assert points == [855]
+
+    def test_split_ranges(self):
+        assert split_ranges(10, [3, 7]) == [(0, 3), (3, 7), (7, 10)]
+
+
+def test_plan_file_segments_matches_in_memory_plan(tmp_path):
+    audio = _speech_with_pauses(25, pauses_at=[8.5, 17.0])
+    path = tmp_path / "long.wav"
+    sf.write(str(path), audio, RATE, subtype="PCM_16")
+    rate, ranges = plan_file_segments(str(path), 10)
+    assert rate == RATE
+    assert ranges == plan_segments(audio, RATE, 10)
+
+
+def _phrases(lengths: list[float], gap_s: float) -> np.ndarray:
+    """Noise "phrases" of the given lengths, separated by `gap_s` of silence."""
+    rng = np.random.default_rng(3)
+    parts = []
+    for i, seconds in enumerate(lengths):
+        parts.append((rng.standard_normal(int(seconds * RATE)) * 3000).astype(np.int16))
+        parts.append(np.zeros(int(gap_s * RATE), dtype=np.int16))
+    return np.concatenate(parts)
+
+
+def _run_live(audio: np.ndarray, block: int = 1024, **kwargs):
+    segments = []
+    live = LiveSegmenter(RATE, 1, segments.append, **kwargs)
+    for start in range(0, len(audio), block):
+        live.feed(audio[start : start + block].reshape(-1, 1))
+    count = live.flush()
+    assert count == len(segments)
+    return segments
+
+
+class TestLiveSegmenter:
+    def test_segments_close_at_pauses(self):
+        audio = _phrases([5, 5, 5], gap_s=1.0)
+        segments = _run_live(audio)
+        assert [s.index for s in segments] == [0, 1, 2]
+        for seg in segments[:-1]:
+            end = seg.start + len(seg.audio)
+            assert np.all(audio[end - 1600 : end + 1600] == 0)
+
+    def test_short_pauses_do_not_split_before_the_minimum(self):
+        # Phrases of 1.5 s: a pause arrives well before 4 s of audio.
+        segments = _run_live(_phrases([1.5] * 6, gap_s=0.8))
+        assert all(len(s.audio) >= 4 * RATE for s in segments[:-1])
+
+    def test_long_speech_is_forced_closed(self):
+        segments = _run_live(_phrases([25], gap_s=0.0), max_segment_s=10)
+        assert len(segments) == 3
+        assert all(len(s.audio) <= 10 * RATE for s in segments)
+
+    def test_segments_tile_the_recording(self):
+        audio = _phrases([5, 7, 3], gap_s=1.0)
+        segments = _run_live(audio, block=777)
+        rebuilt = np.concatenate([s.audio[:, 0] for s in segments])
+        assert segments[0].start == 0
+        for prev, seg in zip(segments, segments[1:]):
+            assert seg.start == prev.start + len(prev.audio)
+        np.testing.assert_array_equal(rebuilt, audio[: len(rebuilt)])
+
+    def test_silence_is_not_emitted(self):
+        audio = np.concatenate(
+            [np.zeros(10 * RATE, dtype=np.int16), _phrases([5], gap_s=1.0)]
+        )
+        segments = _run_live(audio)
+        assert [s.index for s in segments] == list(range(len(segments)))
+        assert all(np.abs(s.audio).max() > 1000 for s in segments)
+        # The speech itself (10 s - 15 s) is all inside the one segment.
+        (seg,) = segments
+        assert seg.start <= 10 * RATE and seg.start + len(seg.audio) >= 15 * RATE
+
+    def test_block_size_does_not_change_the_cuts(self):
+        audio = _phrases([5, 6, 4], gap_s=0.7)
+        a = [(s.start, len(s.audio)) for s in _run_live(audio, block=512)]
+        b = [(s.start, len(s.audio)) for s in _run_live(audio, block=4096)]
+        assert a == b
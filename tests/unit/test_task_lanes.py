@@ -0,0 +1,125 @@
+"""Unit tests for the prioritized worker lanes."""
+
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from src.services.task_lanes import Lane, LaneScheduler
+
+LANES = [
+    Lane("urgent", priority=0, limit=1),
+    Lane("normal", priority=1, limit=1),
+    Lane("bulk", priority=2, limit=2),
+]
+
+
+@pytest.fixture
+def scheduler():
+    s = LaneScheduler(LANES)
+    yield s
+    s.shutdown(wait=True, cancel_futures=True)
+
+
+def test_returns_results_through_futures(scheduler):
+    assert scheduler.submit("normal", lambda a, b: a + b, 1, b=2).result(5) == 3
+    with pytest.raises(ValueError):
+        scheduler.submit("normal", int, "x").result(5)
+
+
+def test_a_busy_lane_does_not_block_another(scheduler):
+    release = threading.Event()
+    scheduler.submit("normal", release.wait, 5)
+    try:
+        assert scheduler.submit("urgent", lambda: "done").result(1) == "done"
+    finally:
+        release.set()
+
+
+def test_a_lane_runs_in_order_within_its_limit(scheduler):
+    order = []
+    running = []
+    lock = threading.Lock()
+
+    def task(i):
+        with lock:
+            running.append(i)
+            assert len(running) == 1
+        time.sleep(0.005)
+        order.append(i)
+        with lock:
+            running.remove(i)
+
+    futures = [scheduler.submit("urgent", task, i) for i in range(10)]
+    for f in futures:
+        f.result(5)
+    assert order == list(range(10))
+
+
+def test_most_urgent_lane_goes_first_when_a_worker_frees():
+    scheduler = LaneScheduler(LANES, workers=1)
+    release = threading.Event()
+    order = []
+    try:
+        started = threading.Event()
+        scheduler.submit("bulk", lambda: started.set() or release.wait(5))
+        assert started.wait(5)
+        done = [
+            scheduler.submit("bulk", order.append, "bulk"),
+            scheduler.submit("normal", order.append, "normal"),
+            scheduler.submit("urgent", order.append, "urgent"),
+        ]
+        release.set()
+        for f in done:
+            f.result(5)
+    finally:
+        scheduler.shutdown()
+    assert order == ["urgent", "normal", "bulk"]
+
+
+def test_records_queue_wait_per_lane():
+    scheduler = LaneScheduler(LANES, workers=1)
+    started = threading.Event()
+
+    def slow():
+        started.set()
+        time.sleep(0.05)
+
+    try:
+        scheduler.submit("bulk", slow)
+        assert started.wait(5)
+        scheduler.submit("urgent", lambda: None).result(5)
+        stats = scheduler.stats()
+    finally:
+        scheduler.shutdown()
+    assert stats["urgent"]["wait_ms"]["count"] == 1
+    assert stats["urgent"]["wait_ms"]["max"] >= 30
+    assert stats["bulk"]["wait_ms"]["count"] == 1
+    assert stats["normal"]["wait_ms"]["count"] == 0
+
+
+def test_shutdown_runs_or_cancels_what_is_queued():
+    scheduler = LaneScheduler(LANES, workers=1)
+    release = threading.Event()
+    scheduler.submit("normal", release.wait, 5)
+    kept = scheduler.submit("normal", lambda: "ran")
+    threading.Timer(0.05, release.set).start()
+    scheduler.shutdown(wait=True)
+    assert kept.result(0) == "ran"
+    with pytest.raises(RuntimeError):
+        scheduler.submit("normal", lambda: None)
+
+    scheduler = LaneScheduler(LANES, workers=1)
+    release = threading.Event()
+    scheduler.submit("normal", release.wait, 5)
+    dropped = scheduler.submit("normal", lambda: "ran")
+    scheduler.shutdown(wait=False, cancel_futures=True)
+    release.set()
+    assert dropped.cancelled()
+
+
+def test_unknown_lane(scheduler):
+    with pytest.raises(KeyError):
+        scheduler.submit("nope", lambda: None)
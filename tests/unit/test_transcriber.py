@@ -2,19 +2,29 @@
 
 from __future__ import annotations
 
+import threading
+import time
+
 import pytest
 from unittest.mock import patch, MagicMock
 
 import httpx
 
+from src.services.event_loop import CancelToken
+from src.services.hedging import HedgePolicy
 from src.services.transcriber import (
     Transcriber,
+    TranscriptionCancelled,
     TranscriptionError,
     APIKeyError,
     RateLimitError,
+    ServerError,
+    NetworkError,
     AudioTooShortError,
     AudioTooLongError,
 )
+from src.services.api_client import UploadTimeouts
+from src.services.retry import RetryBudget
 
 
 @pytest.fixture
@@ -132,6 +142,500 @@ class TestTranscribeRequest:
                 transcriber.transcribe(sample_audio_file)
 
 
+def _error_response(status: int, message: str = "error") -> MagicMock:
+    response = MagicMock()
+    response.status_code = status
+    response.headers = {}
+    response.json.return_value = {"error": {"message": message}}
+    return response
+
+
+class TestRetryPolicy:
+    def test_retry_after_is_honoured(self, stand_in_server, sample_audio_file):
+        answers = [(503, {"error": {"message": "busy"}}, {"Retry-After": "3"})]
+        stand_in_server.responder = lambda r: answers.pop() if answers else None
+        t = Transcriber(api_key="sk-dicto-test")
+        with patch("src.services.transcriber.time.sleep") as sleep:
+            assert t.transcribe(sample_audio_file) == "hello world"
+        (delay,) = [c.args[0] for c in sleep.call_args_list]
+        assert 3 <= delay <= 3 + t.RETRY_DELAY
+        t.close()
+
+    def test_a_long_retry_after_is_left_to_the_caller(
+        self, stand_in_server, sample_audio_file
+    ):
+        stand_in_server.responder = lambda r: (
+            429,
+            {"error": {"message": "slow down"}},
+            {"Retry-After": "600"},
+        )
+        t = Transcriber(api_key="sk-dicto-test")
+        with pytest.raises(RateLimitError) as raised:
+            t.transcribe(sample_audio_file)
+        assert raised.value.retry_after == 600
+        assert len(stand_in_server.requests_to("/transcribe")) == 1
+        t.close()
+
+    def test_backoff_is_jittered_and_bounded(self, transcriber, sample_audio_file):
+        with (
+            patch.object(transcriber.client, "post", return_value=_error_response(500)),
+            patch("src.services.transcriber.time.sleep") as sleep,
+        ):
+            with pytest.raises(ServerError):
+                transcriber.transcribe(sample_audio_file)
+        delays = [c.args[0] for c in sleep.call_args_list]
+        assert len(delays) == transcriber.MAX_RETRIES - 1
+        for attempt, delay in enumerate(delays):
+            assert 0 <= delay <= transcriber.RETRY_DELAY * 2**attempt
+
+    def test_the_budget_is_shared_by_transcribe_and_transform(
+        self, transcriber, sample_audio_file
+    ):
+        transcriber.api.retry_budget = RetryBudget(capacity=2, refill_per_s=0)
+        with (
+            patch.object(
+                transcriber.client, "post", return_value=_error_response(503)
+            ) as post,
+            patch("src.services.transcriber.time.sleep"),
+        ):
+            with pytest.raises(ServerError):
+                transcriber.transcribe(sample_audio_file)
+            assert post.call_count == 3
+            with pytest.raises(ServerError):
+                transcriber.transform("text", "format")
+            assert post.call_count == 4
+        assert transcriber.api.retry_budget.denied == 1
+
+    def test_uploads_get_timeouts_for_their_size(self, transcriber, tmp_path):
+        path = tmp_path / "a.wav"
+        path.write_bytes(b"\x00" * 4096)
+        response = MagicMock(status_code=200)
+        response.json.return_value = {"text": "hi"}
+        with patch.object(transcriber.client, "post", return_value=response) as post:
+            transcriber._transcribe_request(path)
+        expected = transcriber.api.upload_timeouts(4096).timeout
+        assert post.call_args.kwargs["timeout"] == expected
+
+    def test_the_file_is_read_off_the_event_loop(self, transcriber, tmp_path):
+        from pathlib import Path
+
+        path = tmp_path / "a.wav"
+        path.write_bytes(b"\x00" * 4096)
+        response = MagicMock(status_code=200)
+        response.json.return_value = {"text": "hi"}
+        readers = []
+        read_bytes = Path.read_bytes
+
+        def record_reader(self):
+            readers.append(threading.current_thread())
+            return read_bytes(self)
+
+        with (
+            patch.object(Path, "read_bytes", record_reader),
+            patch.object(transcriber.client, "post", return_value=response),
+        ):
+            transcriber._transcribe_request(path)
+        assert readers and transcriber.api.loop._thread not in readers
+
+    def test_an_upload_past_its_deadline_is_abandoned(
+        self, stand_in_server, sample_audio_file
+    ):
+        stand_in_server.latency = 5.0
+        t = Transcriber(api_key="sk-dicto-test")
+        t.api.upload_timeouts = lambda nbytes: UploadTimeouts(
+            timeout=httpx.Timeout(30.0), deadline_s=0.2
+        )
+        t.MAX_RETRIES = 1
+        t0 = time.monotonic()
+        with pytest.raises(NetworkError, match="timeout"):
+            t.transcribe(sample_audio_file)
+        assert time.monotonic() - t0 < 3
+        t.close()
+
+
+class TestUploadCodec:
+    def test_flac_upload_sends_flac_mime(self, sample_audio_file):
+        t = Transcriber(api_key="sk-dicto-test", upload_codec="flac")
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {"text": "hi"}
+
+        with patch.object(t.client, "post", return_value=mock_response) as mock_post:
+            assert t.transcribe(sample_audio_file) == "hi"
+
+        filename, _, mime = mock_post.call_args.kwargs["files"]["file"]
+        assert filename.endswith(".flac")
+        assert mime == "audio/flac"
+
+    def test_encoded_copy_is_deleted_afterwards(self, sample_audio_file):
+        from pathlib import Path
+
+        t = Transcriber(api_key="sk-dicto-test", upload_codec="flac")
+        sent = []
+
+        def fake_request(path, mime=None, cancel=None):
+            sent.append(path)
+            return "hi"
+
+        with patch.object(t, "_transcribe_request", side_effect=fake_request):
+            t.transcribe(sample_audio_file)
+
+        assert sent[0] != Path(sample_audio_file)
+        assert not sent[0].exists()
+        assert Path(sample_audio_file).exists()
+
+    def test_encoding_failure_falls_back_to_wav(self, sample_audio_file):
+        t = Transcriber(api_key="sk-dicto-test", upload_codec="flac")
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {"text": "hi"}
+
+        with (
+            patch(
+                "src.services.transcriber.encode_for_upload",
+                side_effect=RuntimeError("codec broke"),
+            ),
+            patch.object(t.client, "post", return_value=mock_response) as mock_post,
+        ):
+            assert t.transcribe(sample_audio_file) == "hi"
+
+        assert mock_post.call_args.kwargs["files"]["file"][2] == "audio/wav"
+
+    def test_size_limit_applies_to_encoded_file(self, tmp_path, speech_like_wav):
+        # A WAV over the cap that compresses under it must go through.
+        t = Transcriber(api_key="sk-dicto-test", upload_codec="flac")
+        t.MAX_UPLOAD_MB = 0.1
+        path = speech_like_wav(4.0)  # ~125 KB as WAV
+
+        with (
+            patch.object(t, "_plan_segments", return_value=None),
+            patch.object(t, "_transcribe_request", return_value="ok"),
+        ):
+            assert t.transcribe(path) == "ok"
+
+    def test_against_stand_in_server(self, stand_in_server, speech_like_wav):
+        t = Transcriber(api_key="sk-dicto-test", upload_codec="flac")
+        assert t.transcribe(speech_like_wav(2.0)) == "hello world"
+
+        (request,) = stand_in_server.requests_to("/transcribe")
+        filename, content_type, payload = request.form_parts()["file"]
+        assert content_type == "audio/flac"
+        assert payload.startswith(b"fLaC")
+
+
+class TestPreconnect:
+    def test_the_upload_reuses_the_preconnected_connection(
+        self, stand_in_server, speech_like_wav
+    ):
+        t = Transcriber(api_key="sk-dicto-test")
+        assert t.preconnect()
+        assert t.transcribe(speech_like_wav(1.0)) == "hello world"
+        assert [r.method for r in stand_in_server.requests] == ["HEAD", "POST"]
+        stats = t.connection_stats.as_dict()
+        assert stats["requests"] == 2
+        assert stats["reused"] == 1
+        assert stats["handshake_ms"]["count"] == 1
+        t.close()
+
+    def test_an_unreachable_api_is_not_an_error(self, monkeypatch):
+        from src.services import routes
+
+        # Nothing listens on the discard port.
+        monkeypatch.setattr(routes, "BASE_URL", "http://127.0.0.1:9")
+        t = Transcriber(api_key="sk-dicto-test")
+        assert t.preconnect() is False
+        assert t.connection_stats.as_dict()["requests"] == 0
+        t.close()
+
+
+class TestCancel:
+    def test_cancel_aborts_the_request_in_flight(
+        self, stand_in_server, speech_like_wav
+    ):
+        # Answers the first upload only after 10 s, the next ones at once.
+        stand_in_server.latency = lambda r: (
+            10.0 if len(stand_in_server.requests) == 1 else 0
+        )
+        t = Transcriber(api_key="sk-dicto-test")
+        path = speech_like_wav(1.0)
+        cancel = CancelToken()
+        threading.Timer(0.3, cancel.cancel).start()
+        t0 = time.monotonic()
+        with pytest.raises(TranscriptionCancelled):
+            t.transcribe(path, cancel=cancel)
+        assert time.monotonic() - t0 < 2.0
+        # Nothing was left hanging: the next request goes straight through.
+        assert t.transcribe(path) == "hello world"
+        t.close()
+
+    def test_a_cancelled_token_sends_nothing(self, stand_in_server):
+        t = Transcriber(api_key="sk-dicto-test")
+        cancel = CancelToken()
+        cancel.cancel()
+        with pytest.raises(TranscriptionCancelled):
+            t.transform("hello", "make formal", cancel=cancel)
+        assert stand_in_server.requests == []
+        t.close()
+
+    def test_cancel_cuts_the_retry_backoff_short(self, transcriber, tmp_path):
+        audio = tmp_path / "a.wav"
+        audio.write_bytes(b"RIFF" + bytes(4096))
+        token = CancelToken()
+
+        def fail(path, mime=None, cancel=None):
+            token.cancel()
+            raise TranscriptionError("Network error: down")
+
+        t0 = time.monotonic()
+        with (
+            patch.object(transcriber, "_transcribe_request", side_effect=fail),
+            pytest.raises(TranscriptionCancelled),
+        ):
+            transcriber._transcribe_with_retries(audio, token)
+        assert time.monotonic() - t0 < transcriber.RETRY_DELAY
+
+
+class TestHedging:
+    def test_a_slow_upload_is_answered_by_its_hedge(
+        self, stand_in_server, speech_like_wav
+    ):
+        # The first upload would take 10 s; its copy is answered at once.
+        stand_in_server.latency = lambda r: (
+            10.0 if len(stand_in_server.requests) == 1 else 0
+        )
+        policy = HedgePolicy(min_delay_s=0.2, max_extra=1.0)
+        for _ in range(policy.min_samples):
+            policy.record(0.05)
+        t = Transcriber(api_key="sk-dicto-test", hedging=policy)
+        t0 = time.monotonic()
+        assert t.transcribe(speech_like_wav(1.0)) == "hello world"
+        assert time.monotonic() - t0 < 2.0
+        first, hedge = stand_in_server.requests_to("/transcribe")
+        assert first.form_parts()["file"] == hedge.form_parts()["file"]
+        assert policy.won == 1
+        t.close()
+
+
+class TestSilenceCompaction:
+    """Silence is trimmed locally before anything is uploaded."""
+
+    @staticmethod
+    def _wav(tmp_path, *parts: tuple[float, int]) -> str:
+        # (seconds, amplitude) stretches of a 200 Hz tone; 0 is silence.
+        import numpy as np
+        import soundfile as sf
+
+        rate = 16000
+        audio = np.concatenate(
+            [
+                amp * np.sin(2 * np.pi * 200 * np.arange(int(s * rate)) / rate)
+                for s, amp in parts
+            ]
+        )
+        path = tmp_path / "dictation.wav"
+        sf.write(str(path), audio.astype(np.int16), rate, subtype="PCM_16")
+        return str(path)
+
+    def test_silent_recording_is_rejected_without_a_request(self, tmp_path):
+        from src.services.transcriber import EmptyTranscriptionError
+
+        t = Transcriber(api_key="sk-dicto-test")
+        path = self._wav(tmp_path, (3.0, 0))
+        with patch.object(t, "_transcribe_request") as req:
+            with pytest.raises(EmptyTranscriptionError):
+                t.transcribe(path)
+        req.assert_not_called()
+
+    def test_long_pauses_are_cut_from_the_upload(self, tmp_path):
+        from pathlib import Path
+
+        import soundfile as sf
+
+        t = Transcriber(api_key="sk-dicto-test")
+        path = self._wav(tmp_path, (2.0, 0), (1.0, 3000), (4.0, 0), (1.0, 3000))
+        sent = []
+
+        def fake_request(p, mime=None, cancel=None):
+            sent.append((Path(p), sf.info(str(p)).duration))
+            return "hi"
+
+        with patch.object(t, "_transcribe_request", side_effect=fake_request):
+            assert t.transcribe(path) == "hi"
+
+        ((uploaded, duration),) = sent
+        # Two 1 s phrases, 0.25 s of padding on each side of the pause and
+        # before the first, and 0.5 s of the pause itself.
+        assert duration == pytest.approx(3.25, abs=0.1)
+        assert not uploaded.exists()
+        assert Path(path).exists()
+
+    def test_disabled_uploads_the_recording_as_is(self, tmp_path):
+        from pathlib import Path
+
+        t = Transcriber(api_key="sk-dicto-test", trim_silence=False)
+        path = self._wav(tmp_path, (2.0, 0), (1.0, 3000), (4.0, 0))
+        with patch.object(t, "_transcribe_request", return_value="hi") as req:
+            assert t.transcribe(path) == "hi"
+        assert req.call_args.args[0] == Path(path)
+
+    def test_analysis_failure_falls_back_to_the_original(self, tmp_path):
+        from pathlib import Path
+
+        t = Transcriber(api_key="sk-dicto-test")
+        path = self._wav(tmp_path, (2.0, 0), (1.0, 3000), (4.0, 0))
+        with (
+            patch(
+                "src.services.transcriber.plan_file_compaction",
+                side_effect=RuntimeError("bad file"),
+            ),
+            patch.object(t, "_transcribe_request", return_value="hi") as req,
+        ):
+            assert t.transcribe(path) == "hi"
+        assert req.call_args.args[0] == Path(path)
+
+
+class TestSegmentedTranscription:
+    """Long recordings are split at pauses and transcribed concurrently."""
+
+    @staticmethod
+    def _long_wav(tmp_path, segments: int, seconds_each: float = 2.0) -> str:
+        # Each "phrase" has a distinct constant level so the fake API can tell
+        # which one it received; a pause separates consecutive ones.
+        import numpy as np
+        import soundfile as sf
+
+        rate = 16000
+        parts = []
+        for i in range(segments):
+            parts.append(np.full(int(seconds_each * rate), 1000 * (i + 1)))
+            parts.append(np.zeros(int(1.0 * rate)))
+        path = tmp_path / "long.wav"
+        sf.write(str(path), np.concatenate(parts).astype(np.int16), rate)
+        return str(path)
+
+    @staticmethod
+    def _echo_level(path, mime=None, cancel=None):
+        import numpy as np
+        import soundfile as sf
+
+        from src.services.transcriber import EmptyTranscriptionError
+
+        data, _ = sf.read(str(path), dtype="int16")
+        if not np.any(data):
+            raise EmptyTranscriptionError("API returned empty transcription")
+        return f"p{int(np.max(data)) // 1000}"
+
+    def test_texts_are_stitched_in_order(self, tmp_path):
+        t = Transcriber(api_key="sk-dicto-test", segment_seconds=3.5)
+        path = self._long_wav(tmp_path, segments=5)
+        with patch.object(t, "_transcribe_request", side_effect=self._echo_level):
+            assert t.transcribe(path) == "p1 p2 p3 p4 p5"
+
+    def test_short_recording_is_not_split(self, sample_audio_file):
+        t = Transcriber(api_key="sk-dicto-test", segment_seconds=3.5)
+        with patch.object(t, "_transcribe_request", return_value="one") as req:
+            assert t.transcribe(sample_audio_file) == "one"
+        req.assert_called_once()
+
+    def test_failed_segment_is_retried_alone(self, tmp_path):
+        t = Transcriber(api_key="sk-dicto-test", segment_seconds=3.5)
+        path = self._long_wav(tmp_path, segments=4)
+        calls: list[str] = []
+        failed = []
+
+        def flaky(p, mime=None, cancel=None):
+            text = self._echo_level(p)
+            calls.append(text)
+            if text == "p3" and not failed:
+                failed.append(True)
+                raise TranscriptionError("API error (502): bad gateway")
+            return text
+
+        with (
+            patch.object(t, "_transcribe_request", side_effect=flaky),
+            patch("src.services.transcriber.time.sleep"),
+        ):
+            assert t.transcribe(path) == "p1 p2 p3 p4"
+        assert sorted(calls) == ["p1", "p2", "p3", "p3", "p4"]
+
+    def test_silent_segment_does_not_fail_the_whole(self, tmp_path):
+        from src.services.transcriber import EmptyTranscriptionError
+
+        t = Transcriber(api_key="sk-dicto-test", segment_seconds=3.5)
+        path = self._long_wav(tmp_path, segments=3)
+
+        def some_empty(p, mime=None, cancel=None):
+            text = self._echo_level(p)
+            if text == "p2":  # e.g. a cough the model drops
+                raise EmptyTranscriptionError("API returned empty transcription")
+            return text
+
+        with patch.object(t, "_transcribe_request", side_effect=some_empty):
+            assert t.transcribe(path) == "p1 p3"
+
+    def test_segment_that_keeps_failing_fails_transcription(self, tmp_path):
+        t = Transcriber(api_key="sk-dicto-test", segment_seconds=3.5)
+        path = self._long_wav(tmp_path, segments=3)
+
+        def broken(p, mime=None, cancel=None):
+            if self._echo_level(p) == "p2":
+                raise TranscriptionError("API error (500): boom")
+            return "ok"
+
+        with (
+            patch.object(t, "_transcribe_request", side_effect=broken),
+            patch("src.services.transcriber.time.sleep"),
+        ):
+            with pytest.raises(TranscriptionError, match="boom"):
+                t.transcribe(path)
+
+    def test_a_failed_segment_aborts_the_ones_in_flight(self, tmp_path):
+        t = Transcriber(
+            api_key="sk-dicto-test", segment_seconds=3.5, max_parallel_segments=3
+        )
+        path = self._long_wav(tmp_path, segments=3)
+        aborted = []
+
+        def one_fails(p, mime=None, cancel=None):
+            if self._echo_level(p) == "p3":
+                raise APIKeyError("bad key")
+            # Stands in for a slow upload that only a cancel ends early.
+            if cancel.wait(10):
+                aborted.append(True)
+                raise TranscriptionCancelled("Cancelled")
+            return "ok"
+
+        t0 = time.monotonic()
+        with patch.object(t, "_transcribe_request", side_effect=one_fails):
+            with pytest.raises(APIKeyError):
+                t.transcribe(path)
+        assert time.monotonic() - t0 < 5
+        assert len(aborted) == 2
+
+    def test_segments_run_concurrently(self, tmp_path):
+        import threading
+
+        t = Transcriber(
+            api_key="sk-dicto-test", segment_seconds=3.5, max_parallel_segments=3
+        )
+        path = self._long_wav(tmp_path, segments=3)
+        barrier = threading.Barrier(3, timeout=5)
+
+        def wait_for_peers(p, mime=None, cancel=None):
+            barrier.wait()  # only passes if all three are in flight at once
+            return self._echo_level(p)
+
+        with patch.object(t, "_transcribe_request", side_effect=wait_for_peers):
+            assert t.transcribe(path) == "p1 p2 p3"
+
+    def test_oversized_file_is_split_to_fit(self, tmp_path):
+        t = Transcriber(api_key="sk-dicto-test", segment_seconds=0)
+        t.MAX_UPLOAD_MB = 0.12  # ~3.5 s of 16 kHz PCM per segment
+        path = self._long_wav(tmp_path, segments=4)
+        with patch.object(t, "_transcribe_request", side_effect=self._echo_level):
+            assert t.transcribe(path) == "p1 p2 p3 p4"
+
+
 class TestTransform:
     def test_success(self, transcriber):
         mock_response = MagicMock()
@@ -166,6 +670,26 @@ class TestTransform:
         assert payload["text"] == "text"
         assert payload["instructions"] == "instructions"
 
+    def test_server_errors_are_retried(self, transcriber):
+        ok = MagicMock(status_code=200)
+        ok.json.return_value = {"text": "ok"}
+        with (
+            patch.object(
+                transcriber.client, "post", side_effect=[_error_response(502), ok]
+            ) as mock_post,
+            patch("src.services.transcriber.time.sleep"),
+        ):
+            assert transcriber.transform("text", "format") == "ok"
+        assert mock_post.call_count == 2
+
+    def test_client_errors_are_not_retried(self, transcriber):
+        with patch.object(
+            transcriber.client, "post", return_value=_error_response(400, "bad")
+        ) as mock_post:
+            with pytest.raises(TranscriptionError, match="bad"):
+                transcriber.transform("text", "format")
+        assert mock_post.call_count == 1
+
 
 class TestErrorParsing:
     def test_parse_error_dict(self, transcriber, sample_audio_file):
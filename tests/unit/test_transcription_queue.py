@@ -0,0 +1,243 @@
+"""Unit tests for the disk-backed transcription queue."""
+
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from src.services import transcription_queue
+from src.services.transcriber import (
+    APIKeyError,
+    EmptyTranscriptionError,
+    RateLimitError,
+    ServerError,
+    TranscriptionError,
+)
+from src.services.transcription_queue import (
+    TranscriptionQueue,
+    is_retryable,
+    retry_delay,
+)
+
+OPTIONS = {"language": "en", "model": "v3-turbo"}
+
+
+@pytest.fixture
+def fast_backoff(monkeypatch):
+    monkeypatch.setattr(transcription_queue, "BASE_DELAY_S", 0.02)
+    monkeypatch.setattr(transcription_queue, "MAX_DELAY_S", 0.1)
+    monkeypatch.setattr(transcription_queue, "RATE_LIMIT_DELAY_S", 0.3)
+
+
+def _audio(tmp_path, name: str = "rec.wav") -> str:
+    path = tmp_path / name
+    path.write_bytes(b"RIFF" + bytes(100))
+    return str(path)
+
+
+class Scripted:
+    """transcribe() that fails with the given errors, then succeeds."""
+
+    def __init__(self, *errors: Exception):
+        self.errors = list(errors)
+        self.calls: list[float] = []
+
+    def __call__(self, job):
+        self.calls.append(time.monotonic())
+        if self.errors:
+            raise self.errors.pop(0)
+        return f"text of {job.id}"
+
+
+class Results:
+    def __init__(self):
+        self.items: list[str] = []
+        self.event = threading.Event()
+
+    def __call__(self, job, text):
+        self.items.append(text)
+        self.event.set()
+
+
+def test_retry_delay_grows_with_jitter_and_is_capped():
+    for attempts in range(1, 12):
+        full = min(
+            transcription_queue.MAX_DELAY_S,
+            transcription_queue.BASE_DELAY_S * 2 ** (attempts - 1),
+        )
+        assert full / 2 <= retry_delay(attempts) <= full
+    assert len({retry_delay(3) for _ in range(20)}) > 1
+
+
+def test_which_errors_are_retried():
+    assert is_retryable(TranscriptionError("Network error"))
+    assert is_retryable(RateLimitError("slow down"))
+    assert not is_retryable(APIKeyError("bad key"))
+    assert not is_retryable(EmptyTranscriptionError("no speech"))
+    assert not is_retryable(ValueError("bug"))
+
+
+class TestEnqueue:
+    def test_moves_the_audio_and_persists_the_job(self, tmp_path):
+        audio = _audio(tmp_path)
+        queue = TranscriptionQueue(tmp_path / "queue", Scripted(), Results())
+        job = queue.enqueue(audio, OPTIONS, error="Network error")
+        assert job.audio.exists()
+        assert not (tmp_path / "rec.wav").exists()
+        assert job.attempts == 1
+        assert job.next_attempt > time.time()
+
+        (reloaded,) = TranscriptionQueue(
+            tmp_path / "queue", Scripted(), Results()
+        ).jobs()
+        assert reloaded.id == job.id
+        assert reloaded.options == OPTIONS
+        assert reloaded.last_error == "Network error"
+
+    def test_jobs_without_audio_are_dropped_on_load(self, tmp_path):
+        queue = TranscriptionQueue(tmp_path / "queue", Scripted(), Results())
+        job = queue.enqueue(_audio(tmp_path), OPTIONS)
+        job.audio.unlink()
+        assert (
+            TranscriptionQueue(tmp_path / "queue", Scripted(), Results()).jobs() == []
+        )
+        assert not job.path.exists()
+
+
+class TestWorker:
+    def test_retries_with_backoff_until_it_succeeds(self, tmp_path, fast_backoff):
+        transcribe = Scripted(TranscriptionError("a"), TranscriptionError("b"))
+        results = Results()
+        queue = TranscriptionQueue(tmp_path / "queue", transcribe, results)
+        job = queue.enqueue(_audio(tmp_path), OPTIONS)
+        queue.start()
+        try:
+            assert results.event.wait(5)
+        finally:
+            queue.stop()
+        assert results.items == [f"text of {job.id}"]
+        assert len(transcribe.calls) == 3
+        gaps = [b - a for a, b in zip(transcribe.calls, transcribe.calls[1:])]
+        assert gaps[0] >= 0.01 and gaps[1] >= 0.02
+        assert len(queue) == 0
+        assert not job.path.exists()
+
+    def test_a_rate_limit_holds_every_job(self, tmp_path, fast_backoff):
+        transcribe = Scripted(RateLimitError("slow down"))
+        results = Results()
+        queue = TranscriptionQueue(tmp_path / "queue", transcribe, results)
+        queue.enqueue(_audio(tmp_path, "a.wav"), OPTIONS)
+        queue.enqueue(_audio(tmp_path, "b.wav"), OPTIONS)
+        queue.start()
+        try:
+            deadline = time.monotonic() + 5
+            while len(results.items) < 2 and time.monotonic() < deadline:
+                time.sleep(0.01)
+        finally:
+            queue.stop()
+        assert len(results.items) == 2
+        # Nothing at all was sent during the hold.
+        assert transcribe.calls[1] - transcribe.calls[0] >= 0.3
+
+    def test_a_retry_after_holds_every_job(self, tmp_path, fast_backoff):
+        transcribe = Scripted(ServerError("API error (503)", retry_after=0.4))
+        results = Results()
+        queue = TranscriptionQueue(tmp_path / "queue", transcribe, results)
+        queue.enqueue(_audio(tmp_path, "a.wav"), OPTIONS)
+        queue.enqueue(_audio(tmp_path, "b.wav"), OPTIONS)
+        queue.start()
+        try:
+            deadline = time.monotonic() + 5
+            while len(results.items) < 2 and time.monotonic() < deadline:
+                time.sleep(0.01)
+        finally:
+            queue.stop()
+        assert len(results.items) == 2
+        assert transcribe.calls[1] - transcribe.calls[0] >= 0.4
+
+    def test_unfixable_errors_drop_the_job(self, tmp_path, fast_backoff):
+        transcribe = Scripted(EmptyTranscriptionError("no speech"))
+        queue = TranscriptionQueue(tmp_path / "queue", transcribe, Results())
+        job = queue.enqueue(_audio(tmp_path), OPTIONS)
+        queue.start()
+        try:
+            deadline = time.monotonic() + 5
+            while len(queue) and time.monotonic() < deadline:
+                time.sleep(0.01)
+        finally:
+            queue.stop()
+        assert len(queue) == 0
+        assert not job.path.exists()
+
+    def test_gives_up_after_too_many_attempts(
+        self, tmp_path, fast_backoff, monkeypatch
+    ):
+        monkeypatch.setattr(transcription_queue, "MAX_ATTEMPTS", 3)
+        transcribe = Scripted(*(TranscriptionError("Network error") for _ in range(5)))
+        failures = Results()
+        queue = TranscriptionQueue(
+            tmp_path / "queue", transcribe, Results(), on_failure=failures
+        )
+        job = queue.enqueue(_audio(tmp_path), OPTIONS, error="Network error")
+        queue.start()
+        try:
+            assert failures.event.wait(5)
+        finally:
+            queue.stop()
+        assert failures.items == ["Network error"]
+        assert len(transcribe.calls) == 2
+        assert len(queue) == 0
+        # Kept for the user, but never retried again.
+        assert job.audio.exists()
+        assert (
+            TranscriptionQueue(tmp_path / "queue", Scripted(), Results()).jobs() == []
+        )
+
+    def test_gives_up_on_a_job_that_is_too_old(self, tmp_path, fast_backoff):
+        transcribe = Scripted(RateLimitError("slow down"))
+        failures = Results()
+        queue = TranscriptionQueue(
+            tmp_path / "queue", transcribe, Results(), on_failure=failures
+        )
+        job = queue.enqueue(_audio(tmp_path), OPTIONS)
+        job.created -= transcription_queue.MAX_AGE_S
+        queue.start()
+        try:
+            assert failures.event.wait(5)
+        finally:
+            queue.stop()
+        assert len(transcribe.calls) == 1
+        assert job.failed
+
+    def test_failures_are_recorded_on_disk(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(transcription_queue, "BASE_DELAY_S", 60)
+        transcribe = Scripted(TranscriptionError("Network error: down"))
+        queue = TranscriptionQueue(tmp_path / "queue", transcribe, Results())
+        queue.enqueue(_audio(tmp_path), OPTIONS)
+        queue.start()
+        try:
+            deadline = time.monotonic() + 5
+            while not transcribe.calls and time.monotonic() < deadline:
+                time.sleep(0.01)
+            time.sleep(0.05)
+        finally:
+            queue.stop()
+        (job,) = TranscriptionQueue(tmp_path / "queue", Scripted(), Results()).jobs()
+        assert job.attempts == 1
+        assert job.last_error == "Network error: down"
+        assert job.next_attempt >= time.time() + 25
+
+    def test_wake_skips_the_backoff(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(transcription_queue, "BASE_DELAY_S", 60)
+        results = Results()
+        queue = TranscriptionQueue(tmp_path / "queue", Scripted(), results)
+        queue.enqueue(_audio(tmp_path), OPTIONS, error="offline")
+        queue.start()
+        try:
+            assert not results.event.wait(0.1)
+            queue.wake()
+            assert results.event.wait(5)
+        finally:
+            queue.stop()
@@ -0,0 +1,73 @@
+"""Unit tests for the streaming WAV body used by upload_mode "stream"."""
+
+from __future__ import annotations
+
+import io
+import threading
+
+import numpy as np
+import pytest
+import soundfile as sf
+
+from src.services.transcriber import AudioTooLongError
+from src.services.upload_stream import (
+    MAX_CHUNK_BYTES,
+    WavByteStream,
+    streaming_wav_header,
+)
+
+
+def test_header_is_44_bytes():
+    assert len(streaming_wav_header(16000, 1)) == 44
+
+
+def test_stream_decodes_as_wav():
+    stream = WavByteStream(16000, 1)
+    audio = (np.arange(4096) % 2000 - 1000).astype(np.int16).reshape(-1, 1)
+    for start in range(0, len(audio), 1024):
+        stream.feed(audio[start : start + 1024])
+    assert stream.close() == 4096
+    data, rate = sf.read(io.BytesIO(b"".join(stream)), dtype="int16")
+    assert rate == 16000
+    np.testing.assert_array_equal(data, audio[:, 0])
+
+
+def test_iteration_follows_the_producer():
+    stream = WavByteStream(16000, 1)
+    chunks = iter(stream)
+    assert len(next(chunks)) == 44
+    got: list[bytes] = []
+    reader = threading.Thread(target=lambda: got.extend(chunks))
+    reader.start()
+    stream.feed(np.ones((100, 1), np.int16))
+    stream.close()
+    reader.join(5)
+    assert not reader.is_alive()
+    assert b"".join(got) == np.ones(100, np.int16).tobytes()
+
+
+def test_waiting_blocks_are_coalesced_into_bounded_chunks():
+    stream = WavByteStream(16000, 1)
+    for _ in range(200):
+        stream.feed(np.zeros((1024, 1), np.int16))
+    stream.close()
+    chunks = list(stream)[1:]
+    assert len(chunks) < 20
+    assert all(len(c) <= MAX_CHUNK_BYTES + 2048 for c in chunks)
+    assert sum(len(c) for c in chunks) == 200 * 2048
+
+
+def test_abort_makes_the_body_raise():
+    stream = WavByteStream(16000, 1)
+    stream.feed(np.zeros((10, 1), np.int16))
+    stream.abort()
+    with pytest.raises(AudioTooLongError):
+        list(stream)
+
+
+def test_feeding_past_the_cap_abandons_the_upload():
+    stream = WavByteStream(16000, 1, max_bytes=4096)
+    for _ in range(3):
+        stream.feed(np.zeros((1024, 1), np.int16))
+    with pytest.raises(AudioTooLongError):
+        list(stream)
@@ -0,0 +1,115 @@
+"""Unit tests for the voice activity detector and silence compaction."""
+
+from __future__ import annotations
+
+import numpy as np
+import soundfile as sf
+
+from src.services.vad import (
+    frame_zcr,
+    plan_compaction,
+    plan_file_compaction,
+    plan_kept_ranges,
+    write_compacted,
+)
+
+RATE = 16000
+
+
+def _speech(seconds: float, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    n = int(seconds * RATE)
+    t = np.arange(n) / RATE
+    voiced = np.sin(2 * np.pi * 140 * t) * 3000 + rng.standard_normal(n) * 500
+    return voiced.astype(np.int16).reshape(-1, 1)
+
+
+def _silence(seconds: float, seed: int = 1) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return (rng.standard_normal((int(seconds * RATE), 1)) * 20).astype(np.int16)
+
+
+class TestFrameZcr:
+    def test_alternating_signal_crosses_every_sample(self):
+        audio = np.tile(np.array([100, -100], dtype=np.int16), 800)
+        zcr = frame_zcr(audio, 320)
+        assert len(zcr) == 5
+        assert np.all(zcr[1:] == 1.0)
+
+    def test_low_tone_rarely_crosses(self):
+        t = np.arange(RATE) / RATE
+        audio = (np.sin(2 * np.pi * 100 * t) * 1000).astype(np.int16)
+        assert frame_zcr(audio, 320).mean() < 0.02
+
+    def test_partial_frame_is_measured(self):
+        assert len(frame_zcr(np.ones(700, dtype=np.int16), 320)) == 3
+
+
+class TestPlanKeptRanges:
+    def test_leading_and_trailing_silence_is_trimmed_to_the_padding(self):
+        speech = np.zeros(100, dtype=bool)
+        speech[40:50] = True
+        assert plan_kept_ranges(speech, 10, 1000, 5, 20, 10) == [(350, 550)]
+
+    def test_short_pause_is_kept_whole(self):
+        speech = np.zeros(100, dtype=bool)
+        speech[10:20] = speech[30:40] = True
+        assert plan_kept_ranges(speech, 1, 100, 0, 10, 4) == [(10, 40)]
+
+    def test_long_pause_is_shortened(self):
+        speech = np.zeros(100, dtype=bool)
+        speech[10:20] = speech[60:70] = True
+        ranges = plan_kept_ranges(speech, 1, 100, 0, 10, 4)
+        assert ranges == [(10, 22), (58, 70)]
+
+    def test_no_speech_keeps_nothing(self):
+        assert plan_kept_ranges(np.zeros(50, dtype=bool), 10, 500, 5, 20, 10) == []
+
+
+class TestPlanCompaction:
+    def test_dictation_with_silence_around_and_a_long_pause(self):
+        audio = np.concatenate(
+            [_silence(2), _speech(3), _silence(4), _speech(2, seed=2), _silence(3)]
+        )
+        plan = plan_compaction(audio, RATE)
+        assert plan.has_speech
+        assert len(plan.ranges) == 2
+        # 5 s of speech + 0.25 s padding per edge + the 0.5 s kept of the pause.
+        assert abs(plan.kept / RATE - 6.5) < 0.1
+        assert abs(plan.removed / RATE - 7.5) < 0.1
+
+    def test_silent_recording_has_no_speech(self):
+        plan = plan_compaction(_silence(5), RATE)
+        assert not plan.has_speech
+        assert plan.removed == plan.total
+
+    def test_continuous_speech_is_left_alone(self):
+        plan = plan_compaction(_speech(5), RATE)
+        assert plan.ranges == [(0, 5 * RATE)]
+
+    def test_quiet_fricatives_count_as_speech(self):
+        rng = np.random.default_rng(3)
+        hiss = (rng.standard_normal((RATE, 1)) * 80).astype(np.int16)
+        audio = np.concatenate([_silence(2), hiss, _silence(2), _speech(1)])
+        plan = plan_compaction(audio, RATE)
+        start, _ = plan.ranges[0]
+        assert start < 2 * RATE
+
+
+class TestFileCompaction:
+    def test_file_plan_matches_the_in_memory_one(self, tmp_path):
+        audio = np.concatenate([_silence(1), _speech(2), _silence(3), _speech(1)])
+        path = tmp_path / "rec.wav"
+        sf.write(str(path), audio, RATE, subtype="PCM_16")
+        assert plan_file_compaction(str(path)) == plan_compaction(audio, RATE)
+
+    def test_write_compacted_copies_the_kept_ranges(self, tmp_path):
+        audio = np.arange(-5000, 5000, dtype=np.int16).reshape(-1, 1)
+        src, dst = tmp_path / "in.wav", tmp_path / "out.wav"
+        sf.write(str(src), audio, RATE, subtype="PCM_16")
+        write_compacted(str(src), str(dst), [(100, 200), (5000, 5050)])
+        data, rate = sf.read(str(dst), dtype="int16")
+        assert rate == RATE
+        np.testing.assert_array_equal(
+            data, np.concatenate([audio[100:200, 0], audio[5000:5050, 0]])
+        )